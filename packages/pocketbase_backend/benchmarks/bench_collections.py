@@ -0,0 +1,73 @@
+"""
+Benchmark: CollectionsClient against the FakePocketBase stand-in.
+
+Measures create/get/list throughput with a configurable simulated server
+latency and an optional share of transient 503 errors, so client-side
+changes (pooling, retries, pagination) can be compared reproducibly.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_collections.py \
+        [--records N] [--latency SECONDS] [--error-rate FRACTION]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from pocketbase.auth import AuthClient
+from pocketbase.collections import CollectionsClient
+from pocketbase.exceptions import PocketBaseError
+from pocketbase.testing import FakePocketBase
+
+
+def main() -> None:
+    """Run the benchmark and print per-operation rates and request counts."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    os.environ["POCKETBASE_RETRY_BASE_DELAY"] = "0"
+
+    with FakePocketBase(latency=args.latency, seed=1) as pb:
+        os.environ["POCKETBASE_URL"] = pb.url
+        AuthClient().login(pb.admin_email, pb.admin_password)
+        client = CollectionsClient()
+        if args.error_rate:
+            pb.inject_error(503, method="GET", count=-1, probability=args.error_rate)
+
+        start = time.perf_counter()
+        ids = [
+            client.create("files", {"name": f"f{i}.blend", "path": f"/f{i}.blend"})[
+                "id"
+            ]
+            for i in range(args.records)
+        ]
+        created = time.perf_counter() - start
+
+        failed = 0
+        start = time.perf_counter()
+        for record_id in ids:
+            try:
+                client.get("files", record_id)
+            except PocketBaseError:
+                # Every retry drew an injected error
+                failed += 1
+        fetched = time.perf_counter() - start
+
+        start = time.perf_counter()
+        listed = len(client.list("files", fields="id,path"))
+        listing = time.perf_counter() - start
+
+    print(f"create: {args.records / created:8.0f} req/s")
+    print(
+        f"get:    {args.records / fetched:8.0f} req/s  ({failed} failed after retries)"
+    )
+    print(f"list:   {listed} records in {listing * 1000:.1f} ms")
+    print(f"requests served: {pb.request_count()}  statuses: {dict(pb.statuses)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: pooled keep-alive session vs. per-call module-level requests.
+
+Runs a minimal local stand-in for the PocketBase records endpoint and measures
+requests/sec for both strategies, single-threaded and with a thread pool.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_session.py [--requests N] [--threads N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import requests  # type: ignore
+
+from pocketbase.session import create_session
+
+
+class _RecordHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small JSON record, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = json.dumps({"id": "rec1", "name": "scene.blend"}).encode()
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        """Serve a fixed record."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *_args: object) -> None:
+        """Silence per-request logging."""
+
+
+def _run(get: Callable[[str], object], url: str, total: int, threads: int) -> float:
+    """Issue `total` GETs with `threads` workers and return requests/sec."""
+    start = time.perf_counter()
+    if threads <= 1:
+        for _ in range(total):
+            get(url)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: get(url), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run the benchmark and print a small results table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RecordHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/collections/files/records/rec1"
+    session = create_session(pool_size=args.threads)
+
+    def per_call(target: str) -> object:
+        return requests.get(target, timeout=10)
+
+    def pooled(target: str) -> object:
+        return session.get(target, timeout=10)
+
+    try:
+        for threads in (1, args.threads):
+            baseline = _run(per_call, url, args.requests, threads)
+            result = _run(pooled, url, args.requests, threads)
+            print(
+                f"threads={threads:<3} per-call: {baseline:8.0f} req/s  "
+                f"pooled: {result:8.0f} req/s  speedup: {result / baseline:4.2f}x"
+            )
+    finally:
+        session.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
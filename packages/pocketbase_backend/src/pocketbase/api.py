@@ -10,6 +10,7 @@ from .utils import load_env
 class PocketBaseAPI:
     """
     Main entry point for PocketBase API operations.
+    All sub-clients share the pooled session from session.get_session().
     """
 
     def __init__(self):
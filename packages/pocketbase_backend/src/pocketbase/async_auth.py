@@ -0,0 +1,120 @@
+"""
+Async authentication for PocketBase.
+"""
+
+from typing import Any, Optional
+from .async_base import AsyncBaseClient
+from .exceptions import PocketBaseAuthError, PocketBaseError
+from .tokens import TokenManager
+
+
+class AsyncAuthClient(AsyncBaseClient):
+    """
+    Async password login, token refresh, and logout for PocketBase.
+    Shares the global TokenManager with the sync AuthClient.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.token_manager = TokenManager()
+        self.user: Optional[dict[str, Any]] = None
+
+    async def login(self, username: str, password: str) -> str:
+        """
+        Logs in to PocketBase using password authentication.
+
+        Args:
+            username (str): Username or email.
+            password (str): Password.
+
+        Returns:
+            str: Auth token.
+
+        Raises:
+            PocketBaseAuthError: If authentication fails.
+        """
+        url = f"{self.base_url}/api/collections/_superusers/auth-with-password"
+        data = {"identity": username, "password": password}
+        try:
+            resp = await self._request("POST", url, "login", json=data, headers={})
+        except PocketBaseAuthError:
+            raise
+        except PocketBaseError as e:
+            raise PocketBaseAuthError(str(e)) from e
+        result = resp.json()
+        token = result.get("token")
+        if not token:
+            raise PocketBaseAuthError("No token returned from PocketBase.")
+        self.user = result.get("record")
+        self.token_manager.set_token(token)
+        return token
+
+    async def refresh_token(self) -> str:
+        """
+        Refreshes the current auth token using the /auth-refresh endpoint.
+
+        Returns:
+            str: New auth token.
+
+        Raises:
+            PocketBaseAuthError: If refresh fails.
+        """
+        token = self.token_manager.get_token()
+        if not token:
+            raise PocketBaseAuthError("No token to refresh.")
+        headers = {"Authorization": token}
+        last_error: Optional[PocketBaseError] = None
+        for auth_collection in ("users", "_superusers"):
+            url = f"{self.base_url}/api/collections/{auth_collection}/auth-refresh"
+            try:
+                resp = await self._request(
+                    "POST", url, "token refresh", headers=headers
+                )
+            except PocketBaseError as e:
+                last_error = e
+                continue
+            new_token = resp.json().get("token")
+            if not new_token:
+                raise PocketBaseAuthError("No token returned from refresh.")
+            self.token_manager.set_token(new_token)
+            return new_token
+        raise PocketBaseAuthError(str(last_error)) from last_error
+
+    async def is_authenticated(self) -> bool:
+        """
+        Check whether the current auth token is usable, locally for JWTs.
+
+        Returns:
+            bool: True if the token is (still) valid.
+        """
+        if not self.token_manager.get_token():
+            return False
+        remaining = self.token_manager.seconds_until_expiry()
+        if remaining is not None:
+            return remaining > 0
+        try:
+            await self.refresh_token()
+            return True
+        except PocketBaseAuthError:
+            return False
+
+    def logout(self) -> None:
+        """
+        Logs out the current user by clearing the token and user info.
+
+        Raises:
+            PocketBaseAuthError: If not logged in.
+        """
+        if not self.token_manager.get_token():
+            raise PocketBaseAuthError("Not logged in.")
+        self.token_manager.clear_token()
+        self.user = None
+
+    def get_token(self) -> Optional[str]:
+        """
+        Returns the current auth token, if logged in.
+
+        Returns:
+            Optional[str]: The auth token, or None if not logged in.
+        """
+        return self.token_manager.get_token()
@@ -0,0 +1,168 @@
+"""
+Shared base for the async PocketBase clients, built on httpx.
+
+Requires the optional ``httpx`` dependency.
+"""
+
+# pylint: disable=too-few-public-methods
+from typing import Any, Optional
+import asyncio
+import os
+from .exceptions import PocketBaseError, error_for_status
+from .resilience import OPEN, RetryPolicy, get_breaker, retry_after_seconds
+from .tokens import TokenManager
+from .utils import get_env_var_typed, load_env
+
+try:
+    import httpx  # type: ignore[import-not-found]
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+def _require_httpx() -> None:
+    """Raise a helpful error if httpx is not installed."""
+    if httpx is None:
+        raise ImportError(
+            "httpx is required for the async PocketBase clients. Please install it."
+        )
+
+
+def create_async_http_client(pool_size: Optional[int] = None) -> Any:
+    """
+    Create a pooled keep-alive httpx.AsyncClient.
+
+    Args:
+        pool_size (Optional[int]): Max pooled connections
+            (defaults to POCKETBASE_POOL_SIZE or DEFAULT_MAX_CONCURRENCY).
+
+    Returns:
+        httpx.AsyncClient: Configured client.
+    """
+    _require_httpx()
+    load_env()
+    if pool_size is None:
+        pool_size = get_env_var_typed(
+            "POCKETBASE_POOL_SIZE", int, DEFAULT_MAX_CONCURRENCY
+        )
+    limits = httpx.Limits(
+        max_connections=pool_size, max_keepalive_connections=pool_size
+    )
+    return httpx.AsyncClient(limits=limits, timeout=10)
+
+
+class AsyncBaseClient:
+    """
+    Base class for async PocketBase API clients.
+    Handles base URL, auth headers, bounded concurrency, and error mapping.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        http: Optional[Any] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        """
+        Initializes the client, loads env, and sets up state.
+
+        Args:
+            token (Optional[str]): Auth token, if available.
+            http (Optional[httpx.AsyncClient]): Shared HTTP client (a pooled one
+                is created if omitted).
+            semaphore (Optional[asyncio.Semaphore]): Shared in-flight request bound.
+            max_concurrency (int): Bound used when no semaphore is given.
+        """
+        _require_httpx()
+        load_env()
+        self.base_url: str = os.environ.get("POCKETBASE_URL", "http://127.0.0.1:8090")
+        self.token: Optional[str] = token
+        self.http = http or create_async_http_client()
+        self.semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+        self.retry_policy = RetryPolicy.from_env()
+
+    def _headers(self) -> dict[str, str]:
+        """
+        Returns headers for requests, including Authorization if a token is set
+        on the client or held by the shared TokenManager.
+
+        Returns:
+            dict[str, str]: HTTP headers.
+        """
+        headers = {"Content-Type": "application/json"}
+        token = self.token or TokenManager().get_token()
+        if token:
+            headers["Authorization"] = token
+        return headers
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        action: str,
+        expected: int = 200,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Send a request under the concurrency bound and map failures.
+        Transient failures of idempotent requests are retried with backoff,
+        and the shared circuit breaker (see pocketbase.resilience) applies.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            action (str): Action name used in error messages (e.g. "create").
+            expected (int): Expected success status code.
+            idempotent (bool): Whether transient failures may be retried.
+            **kwargs: Passed to httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response: The successful response.
+
+        Raises:
+            PocketBaseError: On HTTP errors or unexpected status codes.
+        """
+        kwargs.setdefault("headers", self._headers())
+        policy = self.retry_policy
+        breaker = get_breaker()
+        attempts = policy.attempts if idempotent else 1
+        for attempt in range(1, attempts + 1):
+            breaker.before_call()
+            retry_after = None
+            async with self.semaphore:
+                try:
+                    resp = await self.http.request(method, url, **kwargs)
+                except httpx.HTTPError as e:
+                    error: PocketBaseError = PocketBaseError(
+                        f"HTTP error during {action}: {e}"
+                    )
+                    error.__cause__ = e
+                    resp = None
+                except BaseException:
+                    # Cancelled or failed unexpectedly: free a half-open trial
+                    breaker.release()
+                    raise
+            if resp is not None:
+                if resp.status_code == expected:
+                    breaker.record_success()
+                    return resp
+                error = error_for_status(
+                    resp.status_code,
+                    f"{action.capitalize()} failed: {resp.status_code} {resp.text}",
+                )
+                if resp.status_code not in policy.retry_statuses:
+                    breaker.record_success()
+                    raise error
+                retry_after = retry_after_seconds(resp)
+            breaker.record_failure()
+            if attempt == attempts or breaker.state == OPEN:
+                raise error
+            await asyncio.sleep(policy.delay(attempt, retry_after))
+        raise PocketBaseError(f"{action.capitalize()} failed: no attempts made")
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.http.aclose()
@@ -0,0 +1,72 @@
+"""
+Async PocketBase API clients built on httpx.
+
+Mirrors CollectionsClient, RelationsClient and AuthClient with coroutine
+methods. All clients created through AsyncPocketBaseAPI share one pooled
+httpx.AsyncClient and one semaphore bounding the number of in-flight requests,
+so a single event loop can keep many writes in flight without a thread each.
+Errors are mapped to the same PocketBaseError hierarchy as the sync clients.
+
+The clients live in async_base, async_collections, async_relations and
+async_auth; they are re-exported here.
+
+Requires the optional ``httpx`` dependency.
+"""
+
+# pylint: disable=too-few-public-methods
+from typing import Any, Optional
+import asyncio
+from .async_auth import AsyncAuthClient
+from .async_base import (
+    DEFAULT_MAX_CONCURRENCY,
+    AsyncBaseClient,
+    create_async_http_client,
+)
+from .async_collections import AsyncCollectionsClient
+from .async_relations import AsyncRelationsClient
+
+__all__ = [
+    "DEFAULT_MAX_CONCURRENCY",
+    "AsyncAuthClient",
+    "AsyncBaseClient",
+    "AsyncCollectionsClient",
+    "AsyncPocketBaseAPI",
+    "AsyncRelationsClient",
+    "create_async_http_client",
+]
+
+
+class AsyncPocketBaseAPI:
+    """
+    Async entry point for PocketBase API operations.
+    All sub-clients share one pooled HTTP client and one concurrency bound.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        http: Optional[Any] = None,
+    ) -> None:
+        """
+        Args:
+            max_concurrency (int): Max requests in flight across all sub-clients.
+            http (Optional[httpx.AsyncClient]): HTTP client to share
+                (a pooled one sized to max_concurrency is created if omitted).
+        """
+        self.http = http or create_async_http_client(pool_size=max_concurrency)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.auth = AsyncAuthClient(http=self.http, semaphore=self.semaphore)
+        self.collections = AsyncCollectionsClient(
+            http=self.http, semaphore=self.semaphore
+        )
+        self.relations = AsyncRelationsClient(http=self.http, semaphore=self.semaphore)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        await self.http.aclose()
+
+    async def __aenter__(self) -> "AsyncPocketBaseAPI":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,154 @@
+"""
+Async CRUD and query operations for PocketBase collections.
+"""
+
+from typing import Any, Optional
+from .async_base import AsyncBaseClient
+from .collections import list_params
+from .exceptions import PocketBaseNotFoundError, PocketBaseValidationError
+from .filters import FilterSpec
+from .resilience import new_record_id
+
+
+class AsyncCollectionsClient(AsyncBaseClient):
+    """
+    Async CRUD and query for PocketBase collections.
+    """
+
+    async def create(self, collection: str, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Create a new record in a collection.
+
+        Args:
+            collection (str): Collection name.
+            data (dict): Record data.
+
+        Returns:
+            dict: Created record.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        if not collection or not data:
+            raise ValueError("Collection name and data dict required.")
+        url = f"{self.base_url}/api/collections/{collection}/records"
+        if data.get("id"):
+            resp = await self._request(
+                "POST", url, "create", idempotent=False, json=data
+            )
+            return resp.json()
+        # Client-generated id makes retries safe (see CollectionsClient.create)
+        payload = {**data, "id": new_record_id()}
+        try:
+            resp = await self._request("POST", url, "create", json=payload)
+        except PocketBaseValidationError:
+            try:
+                return await self.get(collection, payload["id"])
+            except PocketBaseNotFoundError:
+                pass
+            raise
+        return resp.json()
+
+    async def get(self, collection: str, record_id: str) -> dict[str, Any]:
+        """
+        Get a record by ID.
+
+        Args:
+            collection (str): Collection name.
+            record_id (str): Record ID.
+
+        Returns:
+            dict: Record data.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        if not collection or not record_id:
+            raise ValueError("Collection and record_id required.")
+        url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
+        resp = await self._request("GET", url, "get")
+        return resp.json()
+
+    async def update(
+        self, collection: str, record_id: str, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Update a record in a collection.
+
+        Args:
+            collection (str): Collection name.
+            record_id (str): Record ID.
+            data (dict): Updated data.
+
+        Returns:
+            dict: Updated record.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        if not collection or not record_id or not data:
+            raise ValueError("Collection, record_id, and data dict required.")
+        url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
+        resp = await self._request("PATCH", url, "update", json=data)
+        return resp.json()
+
+    async def delete(self, collection: str, record_id: str) -> None:
+        """
+        Delete a record from a collection.
+
+        Args:
+            collection (str): Collection name.
+            record_id (str): Record ID.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        if not collection or not record_id:
+            raise ValueError("Collection and record_id required.")
+        url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
+        await self._request("DELETE", url, "delete", expected=204)
+
+    async def query(
+        self,
+        collection: str,
+        filters: Optional[FilterSpec] = None,
+        page: int = 1,
+        per_page: int = 20,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+        expand: Optional[str] = None,
+        skip_total: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Query records in a collection with optional filters and pagination.
+
+        Args:
+            collection (str): Collection name.
+            filters (Optional[str | dict]): Filter expression or field/value mapping.
+            page (int): Page number (1-based).
+            per_page (int): Records per page.
+            sort (Optional[str]): Sort expression, e.g. "-created,name".
+            fields (Optional[str]): Comma-separated fields to return.
+            expand (Optional[str]): Comma-separated relations to expand.
+            skip_total (bool): Skip PocketBase's count query.
+
+        Returns:
+            dict: Query result (records, pagination info).
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        if not collection:
+            raise ValueError("Collection required.")
+        url = f"{self.base_url}/api/collections/{collection}/records"
+        params = list_params(filters, sort, fields, expand)
+        params.update(page=page, perPage=per_page)
+        if skip_total:
+            params["skipTotal"] = 1
+        resp = await self._request("GET", url, "query", params=params)
+        return resp.json()
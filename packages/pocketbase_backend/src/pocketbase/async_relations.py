@@ -0,0 +1,117 @@
+"""
+Async linking and unlinking of PocketBase records.
+"""
+
+from typing import Any, Iterable
+from .async_base import AsyncBaseClient
+from .relations import relation_patch
+
+
+class AsyncRelationsClient(AsyncBaseClient):
+    """
+    Async linking and unlinking of records in PocketBase collections, using
+    atomic ``field+``/``field-`` modifiers (see pocketbase.relations).
+    """
+
+    async def link(
+        self,
+        collection: str,
+        record_id: str,
+        related_collection: str,
+        related_id: str,
+    ) -> dict[str, Any]:
+        """
+        Link a record to another record via a relation field, keeping
+        existing links.
+
+        Args:
+            collection (str): Source collection name.
+            record_id (str): Source record ID.
+            related_collection (str): Related collection name.
+            related_id (str): Related record ID.
+
+        Returns:
+            dict: Updated record data.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        if not all([collection, record_id, related_collection, related_id]):
+            raise ValueError("All arguments are required.")
+        return await self.link_many(
+            collection, record_id, related_collection, [related_id]
+        )
+
+    async def unlink(
+        self,
+        collection: str,
+        record_id: str,
+        related_collection: str,
+        related_id: str,
+    ) -> dict[str, Any]:
+        """
+        Unlink a record from another record via a relation field.
+
+        Args:
+            collection (str): Source collection name.
+            record_id (str): Source record ID.
+            related_collection (str): Related collection name.
+            related_id (str): Related record ID.
+
+        Returns:
+            dict: Updated record data.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        if not all([collection, record_id, related_collection, related_id]):
+            raise ValueError("All arguments are required.")
+        return await self.unlink_many(
+            collection, record_id, related_collection, [related_id]
+        )
+
+    async def link_many(
+        self,
+        collection: str,
+        record_id: str,
+        related_collection: str,
+        related_ids: Iterable[str],
+    ) -> dict[str, Any]:
+        """
+        Append several related records in one atomic request.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        data = relation_patch(related_collection, related_ids, "+")
+        return await self._patch_relation(collection, record_id, data, "link")
+
+    async def unlink_many(
+        self,
+        collection: str,
+        record_id: str,
+        related_collection: str,
+        related_ids: Iterable[str],
+    ) -> dict[str, Any]:
+        """
+        Remove several related records in one atomic request.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        data = relation_patch(related_collection, related_ids, "-")
+        return await self._patch_relation(collection, record_id, data, "unlink")
+
+    async def _patch_relation(
+        self, collection: str, record_id: str, data: dict[str, list[str]], action: str
+    ) -> dict[str, Any]:
+        """PATCH a relation modifier; append/remove are safe to retry."""
+        if not collection or not record_id:
+            raise ValueError("Collection and record_id required.")
+        url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
+        resp = await self._request("PATCH", url, action, json=data)
+        return resp.json()
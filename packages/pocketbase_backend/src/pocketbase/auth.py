@@ -5,12 +5,17 @@ Handles login, logout, token management, OTP, OAuth2, MFA, and impersonation.
 
 import logging
 import os
+import threading
 from typing import Optional, Any
 import requests  # type: ignore
 from .exceptions import PocketBaseAuthError
 from .utils import load_env
 from .tokens import TokenManager
 from .mfa import MFAClient
+from .session import get_session
+
+# Refresh the token in the background once it has less than this many seconds left.
+DEFAULT_REFRESH_MARGIN = 300.0
 
 
 class AuthClient:
@@ -19,16 +24,26 @@ class AuthClient:
     Provides login, logout, token management, OTP, OAuth2, MFA, and impersonation.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
         """
         Initializes the AuthClient, loads environment variables, and sets up state.
+
+        Args:
+            session (Optional[requests.Session]): HTTP session to use
+                (defaults to the shared pooled session).
         """
         load_env()
         self.base_url: str = os.environ.get("POCKETBASE_URL", "http://127.0.0.1:8090")
+        self.session: requests.Session = session or get_session()
         self.token_manager = TokenManager()
         self.mfa_client = MFAClient()
         self.user: Optional[dict[str, Any]] = None
         self.logger = logging.getLogger("AuthClient")
+        self.refresh_margin: float = float(
+            os.environ.get("POCKETBASE_TOKEN_REFRESH_MARGIN", DEFAULT_REFRESH_MARGIN)
+        )
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
 
     def login(self, username: str, password: str) -> str:
         """
@@ -48,7 +63,7 @@ class AuthClient:
         url = f"{self.base_url}/api/collections/_superusers/auth-with-password"
         data = {"identity": username, "password": password}
         try:
-            resp = requests.post(url, json=data, timeout=10)
+            resp = self.session.post(url, json=data, timeout=10)
             if resp.status_code != 200:
                 raise PocketBaseAuthError(
                     f"Login failed: {resp.status_code} {resp.text}"
@@ -123,7 +138,7 @@ class AuthClient:
         url = f"{self.base_url}/api/collections/users/impersonate/{user_id}"
         headers = {"Authorization": token}
         try:
-            resp = requests.post(url, headers=headers, timeout=10)
+            resp = self.session.post(url, headers=headers, timeout=10)
             if resp.status_code != 200:
                 raise PocketBaseAuthError(
                     f"Impersonation failed: {resp.status_code} {resp.text}"
@@ -156,7 +171,7 @@ class AuthClient:
         admin_url = f"{self.base_url}/api/collections/_superusers/auth-refresh"
         headers = {"Authorization": token}
         try:
-            resp = requests.post(user_url, headers=headers, timeout=10)
+            resp = self.session.post(user_url, headers=headers, timeout=10)
             if resp.status_code == 200:
                 result = resp.json()
                 new_token = result.get("token")
@@ -164,7 +179,7 @@ class AuthClient:
                     raise PocketBaseAuthError("No token returned from refresh.")
                 self.token_manager.set_token(new_token)
                 return new_token
-            resp = requests.post(admin_url, headers=headers, timeout=10)
+            resp = self.session.post(admin_url, headers=headers, timeout=10)
             if resp.status_code != 200:
                 raise PocketBaseAuthError(
                     f"Token refresh failed: {resp.status_code} {resp.text}"
@@ -180,21 +195,49 @@ class AuthClient:
             raise PocketBaseAuthError(f"HTTP error during token refresh: {e}") from e
 
     def is_authenticated(self) -> bool:
-        """Check if the current auth token is valid via auth-refresh."""
+        """
+        Check whether the current auth token is usable.
+
+        JWT tokens are validated locally from their ``exp`` claim, so this costs
+        no network round-trip. A token close to expiry is refreshed on a
+        background thread. Tokens whose expiry cannot be decoded fall back to
+        validating via auth-refresh.
+
+        Returns:
+            bool: True if the token is (still) valid.
+        """
         token = self.token_manager.get_token()
         if not token:
             return False
+        remaining = self.token_manager.seconds_until_expiry()
+        if remaining is None:
+            return self._check_token_remote(token)
+        if remaining <= 0:
+            return False
+        if remaining < self.refresh_margin:
+            self._schedule_refresh()
+        return True
+
+    def invalidate(self) -> None:
+        """
+        Drop the current token after the server rejected it (e.g. HTTP 401),
+        so the next is_authenticated() call reports False.
+        """
+        self.token_manager.clear_token()
+
+    def _check_token_remote(self, token: str) -> bool:
+        """Check if an opaque auth token is valid via auth-refresh."""
         user_url = f"{self.base_url}/api/collections/users/auth-refresh"
         admin_url = f"{self.base_url}/api/collections/_superusers/auth-refresh"
         try:
-            resp = requests.post(
+            resp = self.session.post(
                 user_url,
                 headers={"Authorization": token},
                 timeout=5,
             )
             if resp.status_code == 200:
                 return True
-            resp = requests.post(
+            resp = self.session.post(
                 admin_url,
                 headers={"Authorization": token},
                 timeout=5,
@@ -203,6 +246,24 @@ class AuthClient:
         except requests.RequestException:
             return False
 
+    def _schedule_refresh(self) -> None:
+        """Start a background token refresh unless one is already in flight."""
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh, name="pocketbase-token-refresh"
+            )
+            self._refresh_thread.daemon = True
+            self._refresh_thread.start()
+
+    def _background_refresh(self) -> None:
+        """Refresh the token, logging instead of raising on failure."""
+        try:
+            self.refresh_token()
+        except PocketBaseAuthError as e:
+            self.logger.warning("Background token refresh failed: %s", e)
+
     def logout(self) -> None:
         """
         Logs out the current user by clearing the token and user info.
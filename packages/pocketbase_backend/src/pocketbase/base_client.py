@@ -3,36 +3,88 @@ Base client for PocketBase API clients, providing shared auth and header logic.
 """
 
 # pylint: disable=too-few-public-methods
-from typing import Optional
+from typing import Any, Collection, Optional, Union
 import os
+import requests  # type: ignore
+from . import resilience
 from .utils import load_env
+from .tokens import TokenManager
+from .session import get_session
 
 
 class BaseClient:
     """
     Base class for PocketBase API clients.
-    Handles environment loading, base URL, and auth headers.
+    Handles environment loading, base URL, auth headers, and the pooled session.
     """
 
-    def __init__(self, token: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
         """
         Initializes the client, loads env, and sets up state.
 
         Args:
             token (Optional[str]): Auth token, if available.
+            session (Optional[requests.Session]): HTTP session to use
+                (defaults to the shared pooled session).
         """
         load_env()
         self.base_url: str = os.environ.get("POCKETBASE_URL", "http://127.0.0.1:8090")
         self.token: Optional[str] = token
+        self.session: requests.Session = session or get_session()
+        # Resolved once: reading the environment on every request is costly
+        self.retry_policy = resilience.RetryPolicy.from_env()
 
     def _headers(self) -> dict[str, str]:
         """
-        Returns headers for requests, including Authorization if token is set.
+        Returns headers for requests, including Authorization if a token is set
+        on the client or held by the shared TokenManager.
 
         Returns:
             dict[str, str]: HTTP headers.
         """
         headers = {"Content-Type": "application/json"}
-        if self.token:
-            headers["Authorization"] = self.token
+        token = self.token or TokenManager().get_token()
+        if token:
+            headers["Authorization"] = token
         return headers
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        action: str,
+        expected: Union[int, Collection[int]] = 200,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send a request through the shared retry/circuit-breaker layer.
+
+        Args:
+            method (str): Session method name ("get", "post", "patch", "delete").
+            url (str): Request URL.
+            action (str): Action name used in error messages (e.g. "create").
+            expected (int | Collection[int]): Success status code(s).
+            idempotent (bool): Whether transient failures may be retried.
+            **kwargs: Passed to the session method.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            PocketBaseError: On HTTP errors or unexpected status codes.
+        """
+        kwargs.setdefault("headers", self._headers())
+        kwargs.setdefault("timeout", 10)
+        request = getattr(self.session, method)
+        return resilience.call(
+            lambda: request(url, **kwargs),
+            action,
+            expected,
+            idempotent,
+            policy=self.retry_policy,
+        )
@@ -2,10 +2,66 @@
 CRUD and query operations for PocketBase collections.
 """
 
-from typing import Any, Optional
-import requests  # type: ignore
-from .exceptions import PocketBaseError
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional
+from .exceptions import (
+    PocketBaseNotFoundError,
+    PocketBaseValidationError,
+    error_for_status,
+)
 from .base_client import BaseClient
+from .filters import FilterSpec, from_mapping, to_expression
+from .resilience import new_record_id
+
+DEFAULT_PAGE_SIZE = 200
+# PocketBase silently caps perPage at this value
+MAX_PAGE_SIZE = 1000
+# Default limit on sub-requests per /api/batch call (Settings > Batch API)
+BATCH_LIMIT = 50
+
+
+def filters_to_string(filters: dict[str, Any]) -> str:
+    """
+    Convert a field/value mapping into a PocketBase filter expression.
+
+    Args:
+        filters (dict): Query filters (field: value), combined with AND.
+
+    Returns:
+        str: Filter string with escaped literals, e.g. 'field1="foo" && field2=10'.
+    """
+    return from_mapping(filters)
+
+
+def list_params(
+    filter: Optional[FilterSpec] = None,  # pylint: disable=redefined-builtin
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Build the query string for the records list endpoint.
+
+    Args:
+        filter (Optional[str | dict]): Filter expression (see pocketbase.filters),
+            or field/value mapping combined with AND.
+        sort (Optional[str]): Sort expression, e.g. "-created,name".
+        fields (Optional[str]): Comma-separated fields to return.
+        expand (Optional[str]): Comma-separated relations to expand.
+
+    Returns:
+        dict: Query string parameters (without paging).
+    """
+    params: dict[str, Any] = {}
+    if filter:
+        params["filter"] = to_expression(filter)
+    if sort:
+        params["sort"] = sort
+    if fields:
+        params["fields"] = fields
+    if expand:
+        params["expand"] = expand
+    return params
 
 
 class CollectionsClient(BaseClient):
@@ -31,13 +87,21 @@ class CollectionsClient(BaseClient):
         if not collection or not data:
             raise ValueError("Collection name and data dict required.")
         url = f"{self.base_url}/api/collections/{collection}/records"
+        if data.get("id"):
+            # Caller-chosen id: a duplicate is a real conflict, don't retry
+            return self._send("post", url, "create", json=data, idempotent=False).json()
+        # A client-generated id makes retries safe: a repeated attempt fails
+        # validation instead of inserting a second record.
+        payload = {**data, "id": new_record_id()}
         try:
-            resp = requests.post(url, json=data, headers=self._headers(), timeout=10)
-            if resp.status_code != 200:
-                raise PocketBaseError(f"Create failed: {resp.status_code} {resp.text}")
-            return resp.json()
-        except requests.RequestException as e:
-            raise PocketBaseError(f"HTTP error during create: {e}") from e
+            return self._send("post", url, "create", json=payload).json()
+        except PocketBaseValidationError:
+            try:
+                # An earlier attempt committed but its response was lost
+                return self.get(collection, payload["id"])
+            except PocketBaseNotFoundError:
+                pass
+            raise
 
     def get(self, collection: str, record_id: str) -> dict[str, Any]:
         """
@@ -57,13 +121,7 @@ class CollectionsClient(BaseClient):
         if not collection or not record_id:
             raise ValueError("Collection and record_id required.")
         url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
-        try:
-            resp = requests.get(url, headers=self._headers(), timeout=10)
-            if resp.status_code != 200:
-                raise PocketBaseError(f"Get failed: {resp.status_code} {resp.text}")
-            return resp.json()
-        except requests.RequestException as e:
-            raise PocketBaseError(f"HTTP error during get: {e}") from e
+        return self._send("get", url, "get").json()
 
     def update(
         self, collection: str, record_id: str, data: dict[str, Any]
@@ -86,13 +144,7 @@ class CollectionsClient(BaseClient):
         if not collection or not record_id or not data:
             raise ValueError("Collection, record_id, and data dict required.")
         url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
-        try:
-            resp = requests.patch(url, json=data, headers=self._headers(), timeout=10)
-            if resp.status_code != 200:
-                raise PocketBaseError(f"Update failed: {resp.status_code} {resp.text}")
-            return resp.json()
-        except requests.RequestException as e:
-            raise PocketBaseError(f"HTTP error during update: {e}") from e
+        return self._send("patch", url, "update", json=data).json()
 
     def delete(self, collection: str, record_id: str) -> None:
         """
@@ -109,28 +161,74 @@ class CollectionsClient(BaseClient):
         if not collection or not record_id:
             raise ValueError("Collection and record_id required.")
         url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
+        self._send("delete", url, "delete", expected=204)
+
+    def batch(self, requests: List[dict[str, Any]]) -> List[dict[str, Any]]:
+        """
+        Run record requests in one server-side transaction (``/api/batch``,
+        which must be enabled in the PocketBase settings): either all of them
+        are applied or none is.
+
+        Args:
+            requests (list): Sub-requests such as {"method": "POST", "url":
+                "/api/collections/files/records", "body": {...}}, at most
+                BATCH_LIMIT by default.
+
+        Returns:
+            list: {"status", "body"} of each sub-request, in order.
+
+        Raises:
+            PocketBaseError: If the batch, or any sub-request, failed. A
+                failed sub-request raises the error of its own status, e.g.
+                PocketBaseNotFoundError for a PATCH of a deleted record.
+            ValueError: If no requests are given.
+        """
+        if not requests:
+            raise ValueError("At least one batch request required.")
+        # Not retried: a lost response would apply the batch twice
+        resp = self._send(
+            "post",
+            f"{self.base_url}/api/batch",
+            "batch",
+            expected=(200, 400),
+            json={"requests": requests},
+            idempotent=False,
+        )
+        if resp.status_code == 200:
+            return resp.json()
         try:
-            resp = requests.delete(url, headers=self._headers(), timeout=10)
-            if resp.status_code != 204:
-                raise PocketBaseError(f"Delete failed: {resp.status_code} {resp.text}")
-        except requests.RequestException as e:
-            raise PocketBaseError(f"HTTP error during delete: {e}") from e
+            failed = resp.json()["data"]["requests"]
+            index, result = next(iter(failed.items()))
+            status = int(result["code"])
+        except (ValueError, KeyError, TypeError, AttributeError, StopIteration):
+            raise PocketBaseValidationError(f"Batch failed: 400 {resp.text}")
+        raise error_for_status(
+            status, f"Batch failed: request {index}: {status} {result.get('response')}"
+        )
 
     def query(
         self,
         collection: str,
-        filters: Optional[dict[str, Any]] = None,
+        filters: Optional[FilterSpec] = None,
         page: int = 1,
         per_page: int = 20,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+        expand: Optional[str] = None,
+        skip_total: bool = False,
     ) -> dict[str, Any]:
         """
         Query records in a collection with optional filters and pagination.
 
         Args:
             collection (str): Collection name.
-            filters (Optional[dict]): Query filters (field: value).
+            filters (Optional[str | dict]): Filter expression or field/value mapping.
             page (int): Page number (1-based).
             per_page (int): Records per page.
+            sort (Optional[str]): Sort expression, e.g. "-created,name".
+            fields (Optional[str]): Comma-separated fields to return.
+            expand (Optional[str]): Comma-separated relations to expand.
+            skip_total (bool): Skip PocketBase's count query.
 
         Returns:
             dict: Query result (records, pagination info).
@@ -141,19 +239,120 @@ class CollectionsClient(BaseClient):
         """
         if not collection:
             raise ValueError("Collection required.")
+        params = list_params(filters, sort, fields, expand)
+        params.update(page=page, perPage=per_page)
+        if skip_total:
+            params["skipTotal"] = 1
+        return self._fetch_page(collection, params)
+
+    def _fetch_page(self, collection: str, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        GET one page of the records list endpoint.
+
+        Args:
+            collection (str): Collection name.
+            params (dict): Query string parameters.
+
+        Returns:
+            dict: Query result (records, pagination info).
+
+        Raises:
+            PocketBaseError: If API returns an error.
+        """
         url = f"{self.base_url}/api/collections/{collection}/records"
-        params: dict[str, Any] = {"page": page, "perPage": per_page}
-        if filters:
-            # PocketBase expects filter string, e.g. 'field1="foo" && field2>10'
-            filter_str = " && ".join(
-                f'{k}="{v}"' if isinstance(v, str) else f"{k}={v}"
-                for k, v in filters.items()
-            )
-            params["filter"] = filter_str
+        return self._send("get", url, "query", params=params).json()
+
+    def iter_records(
+        self,
+        collection: str,
+        filter: Optional[FilterSpec] = None,  # pylint: disable=redefined-builtin
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        skip_total: bool = True,
+        expand: Optional[str] = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream every matching record, one page at a time.
+
+        The next page is fetched on a background thread while the caller
+        consumes the current one, so at most two pages are held in memory
+        regardless of the result size.
+
+        Args:
+            collection (str): Collection name.
+            filter (Optional[str | dict]): Filter expression, or field/value
+                mapping combined with AND.
+            sort (Optional[str]): Sort expression, e.g. "-created,name".
+            fields (Optional[str]): Comma-separated fields to return.
+            page_size (int): Records per request (at most MAX_PAGE_SIZE).
+            skip_total (bool): Skip PocketBase's count query (the last page is
+                detected by a short or empty page instead of totalPages).
+            expand (Optional[str]): Comma-separated relations to expand.
+
+        Yields:
+            dict: Records in server order.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        if not collection:
+            raise ValueError("Collection required.")
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+        params = list_params(filter, sort, fields, expand)
+        params["perPage"] = min(page_size, MAX_PAGE_SIZE)
+        if skip_total:
+            params["skipTotal"] = 1
+
+        def fetch(page: int) -> dict[str, Any]:
+            return self._fetch_page(collection, {**params, "page": page})
+
+        pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="pocketbase-prefetch"
+        )
         try:
-            resp = requests.get(url, headers=self._headers(), params=params, timeout=10)
-            if resp.status_code != 200:
-                raise PocketBaseError(f"Query failed: {resp.status_code} {resp.text}")
-            return resp.json()
-        except requests.RequestException as e:
-            raise PocketBaseError(f"HTTP error during query: {e}") from e
+            page = 1
+            pending: Optional[Future[dict[str, Any]]] = pool.submit(fetch, page)
+            while pending is not None:
+                result = pending.result()
+                items = result.get("items", [])
+                total_pages = result.get("totalPages", -1)
+                if total_pages >= 0:
+                    has_more = page < total_pages
+                else:
+                    # Compare with the page size the server applied
+                    per_page = result.get("perPage") or params["perPage"]
+                    has_more = bool(items) and len(items) >= per_page
+                page += 1
+                pending = pool.submit(fetch, page) if has_more else None
+                yield from items
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def list(
+        self,
+        collection: str,
+        filter: Optional[FilterSpec] = None,  # pylint: disable=redefined-builtin
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        expand: Optional[str] = None,
+    ) -> List[dict[str, Any]]:
+        """
+        Fetch every matching record into a list (see iter_records).
+
+        Returns:
+            list: All matching records.
+        """
+        return [
+            *self.iter_records(
+                collection,
+                filter=filter,
+                sort=sort,
+                fields=fields,
+                page_size=page_size,
+                expand=expand,
+            )
+        ]
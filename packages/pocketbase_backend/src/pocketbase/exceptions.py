@@ -46,3 +46,43 @@ class PocketBaseServerError(PocketBaseError):
     Args:
         message (str): Error message.
     """
+
+
+class CircuitOpenError(PocketBaseError):
+    """
+    Raised without contacting the server while the circuit breaker is open.
+
+    Args:
+        message (str): Error message.
+    """
+
+
+class PocketBaseStartupError(PocketBaseError):
+    """
+    Raised when a spawned PocketBase server does not become ready.
+
+    Args:
+        message (str): Error message, including the server's stderr if captured.
+    """
+
+
+def error_for_status(status_code: int, message: str) -> PocketBaseError:
+    """
+    Map an HTTP status code to the most specific PocketBase exception.
+
+    Args:
+        status_code (int): HTTP status code returned by PocketBase.
+        message (str): Error message.
+
+    Returns:
+        PocketBaseError: Exception instance to raise.
+    """
+    if status_code in (401, 403):
+        return PocketBaseAuthError(message)
+    if status_code == 404:
+        return PocketBaseNotFoundError(message)
+    if status_code == 400:
+        return PocketBaseValidationError(message)
+    if status_code >= 500:
+        return PocketBaseServerError(message)
+    return PocketBaseError(message)
@@ -0,0 +1,106 @@
+"""
+HTTP layer of the FakePocketBase test server: route table, error bodies and
+the request handler translating HTTP requests into FakePocketBase.handle calls.
+"""
+
+from http.server import BaseHTTPRequestHandler
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Pattern, Tuple, Type
+import json
+import re
+import time
+
+if TYPE_CHECKING:
+    from .testing import FakePocketBase
+
+ROUTES: List[Tuple[str, Pattern[str], str]] = [
+    ("GET", re.compile(r"^/api/health$"), "GET /api/health"),
+    ("POST", re.compile(r"^/api/batch$"), "POST /api/batch"),
+    (
+        "POST",
+        re.compile(r"^/api/collections/(?P<collection>[^/]+)/auth-with-password$"),
+        "POST /api/collections/{collection}/auth-with-password",
+    ),
+    (
+        "POST",
+        re.compile(r"^/api/collections/(?P<collection>[^/]+)/auth-refresh$"),
+        "POST /api/collections/{collection}/auth-refresh",
+    ),
+    (
+        "GET",
+        re.compile(r"^/api/collections/(?P<collection>[^/]+)/records$"),
+        "GET /api/collections/{collection}/records",
+    ),
+    (
+        "POST",
+        re.compile(r"^/api/collections/(?P<collection>[^/]+)/records$"),
+        "POST /api/collections/{collection}/records",
+    ),
+    (
+        "GET",
+        re.compile(r"^/api/collections/(?P<collection>[^/]+)/records/(?P<id>[^/]+)$"),
+        "GET /api/collections/{collection}/records/{id}",
+    ),
+    (
+        "PATCH",
+        re.compile(r"^/api/collections/(?P<collection>[^/]+)/records/(?P<id>[^/]+)$"),
+        "PATCH /api/collections/{collection}/records/{id}",
+    ),
+    (
+        "DELETE",
+        re.compile(r"^/api/collections/(?P<collection>[^/]+)/records/(?P<id>[^/]+)$"),
+        "DELETE /api/collections/{collection}/records/{id}",
+    ),
+]
+
+
+def route(method: str, path: str) -> Tuple[Optional[str], Dict[str, str]]:
+    """Route template and path parameters of a request (None if unknown)."""
+    for route_method, pattern, name in ROUTES:
+        match = pattern.match(path)
+        if match and route_method == method:
+            return name, match.groupdict()
+    return None, {}
+
+
+def error(status: int, message: str, data: Optional[dict] = None) -> Tuple[int, Any]:
+    """Status and body of a PocketBase error response."""
+    return status, {"status": status, "message": message, "data": data or {}}
+
+
+def make_handler(server: "FakePocketBase") -> Type[BaseHTTPRequestHandler]:
+    """Request handler class bound to `server`."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        """Translate HTTP requests into FakePocketBase.handle calls."""
+
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _serve(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                body = raw
+            if server.latency:
+                time.sleep(server.latency)
+            status, payload, extra = server.handle(
+                self.command, self.path, body, dict(self.headers.items())
+            )
+            server.record_status(status)
+            data = b"" if payload is None else json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in extra.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _serve  # noqa: N815
+
+        def log_message(self, *_args: object) -> None:
+            """Silence per-request logging."""
+
+    return _Handler
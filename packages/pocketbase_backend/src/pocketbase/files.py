@@ -1,26 +1,469 @@
 """
 File upload and download for PocketBase.
+
+Uploads stream the file from disk as a multipart body of known length, so
+multi-GB .blend files never have to fit in memory. The content hash is
+computed while the bytes are sent and stored in a text field on the record in
+the same request; an upload is skipped when the record already carries the
+hash of the local file (hashing the file first only when the record has one).
+
+Downloads stream into a ``.part`` file next to the destination, resume an
+interrupted transfer with an HTTP Range request, verify the stored hash and
+atomically rename the result into place.
 """
 
 # pylint: disable=too-few-public-methods
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional, Tuple
+import hashlib
+import mimetypes
+import os
+import secrets
+import threading
+import requests  # type: ignore
+from . import resilience
+from .base_client import BaseClient
+from .exceptions import PocketBaseError
+from .utils import get_env_var_typed, load_env
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_UPLOADS = 4
+DEFAULT_MAX_DOWNLOADS = 4
+DEFAULT_HASH_FIELD = "file_hash"
+HASH_ALGORITHM = "sha256"
+PART_SUFFIX = ".part"
+
+_slots: dict[str, threading.BoundedSemaphore] = {}
+_slots_lock = threading.Lock()
+
+
+def _get_slots(env_key: str, default: int) -> threading.BoundedSemaphore:
+    """Process-wide bound on concurrent transfers, sized from env_key."""
+    with _slots_lock:
+        if env_key not in _slots:
+            load_env()
+            limit = get_env_var_typed(env_key, int, default)
+            _slots[env_key] = threading.BoundedSemaphore(max(1, limit or default))
+        return _slots[env_key]
+
+
+def _quote(value: str) -> str:
+    """Escape a multipart header parameter the way browsers do."""
+    return value.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _get_upload_slots() -> threading.BoundedSemaphore:
+    """Bound on concurrent uploads (POCKETBASE_MAX_UPLOADS)."""
+    return _get_slots("POCKETBASE_MAX_UPLOADS", DEFAULT_MAX_UPLOADS)
+
+
+def _get_download_slots() -> threading.BoundedSemaphore:
+    """Bound on concurrent downloads (POCKETBASE_MAX_DOWNLOADS)."""
+    return _get_slots("POCKETBASE_MAX_DOWNLOADS", DEFAULT_MAX_DOWNLOADS)
+
+
+class HashMemo:
+    """
+    Bounded map from a file's stat identity to its content hash, so unchanged
+    files are never re-read just to decide whether to upload them.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, int, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(st: os.stat_result) -> Tuple[int, int, int, int]:
+        """Identity of a file version: device, inode, size and mtime."""
+        return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def get(self, st: os.stat_result) -> Optional[str]:
+        """Return the memoized hash for this file version, if any."""
+        with self._lock:
+            digest = self._entries.get(self.key(st))
+            if digest is not None:
+                self._entries.move_to_end(self.key(st))
+            return digest
+
+    def put(self, st: os.stat_result, digest: str) -> None:
+        """Remember the hash of a file version."""
+        with self._lock:
+            self._entries[self.key(st)] = digest
+            self._entries.move_to_end(self.key(st))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
 
 
-class FilesClient:
+class MultipartFileStream:
+    """
+    File-like multipart/form-data body streaming one file from disk, hashing
+    it on the way, followed by a text part carrying the hex digest.
+
+    The total length is known up front (the digest has a fixed size), so
+    requests sends a Content-Length instead of chunked encoding.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        field: str,
+        hash_field: str,
+        fields: Optional[dict[str, str]] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        """
+        Args:
+            file_path (str): File to send.
+            field (str): Record file field name.
+            hash_field (str): Record text field receiving the digest.
+            fields (Optional[dict]): Extra text fields sent before the file.
+            chunk_size (int): Bytes read from disk per step.
+        """
+        self.boundary = secrets.token_hex(16)
+        self.hasher = hashlib.new(HASH_ALGORITHM)
+        self.chunk_size = chunk_size
+        self.size = os.path.getsize(file_path)
+        name = os.path.basename(file_path)
+        mime = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        head = b"".join(self._text_part(k, v) for k, v in (fields or {}).items()) + (
+            f"--{self.boundary}\r\n"
+            f"Content-Disposition: form-data; "
+            f'name="{_quote(field)}"; filename="{_quote(name)}"\r\n'
+            f"Content-Type: {mime}\r\n\r\n"
+        ).encode("utf-8")
+        self._hash_field = hash_field
+        self._tail_len = len(self._tail("0" * self.hasher.digest_size * 2))
+        self.length = len(head) + self.size + self._tail_len
+        self._buffer = head
+        self._pos = 0
+        self._file_left = self.size
+        self._file = open(file_path, "rb")  # pylint: disable=consider-using-with
+        self._tail_sent = False
+
+    @property
+    def content_type(self) -> str:
+        """Content-Type header value for this body."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self.length
+
+    def hexdigest(self) -> str:
+        """Digest of the file bytes read so far (complete once fully read)."""
+        return self.hasher.hexdigest()
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to `size` bytes of the body (all remaining if negative)."""
+        if size is None or size < 0:
+            size = self.length
+        pieces = []
+        remaining = size
+        while remaining > 0:
+            if self._pos >= len(self._buffer) and not self._refill():
+                break
+            piece = self._buffer[self._pos : self._pos + remaining]
+            self._pos += len(piece)
+            remaining -= len(piece)
+            pieces.append(piece)
+        return b"".join(pieces)
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
+
+    def _refill(self) -> bool:
+        """Load the next file chunk (or the trailer). False once exhausted."""
+        if self._tail_sent:
+            return False
+        # Never send more than the announced size, even if the file grew
+        chunk = self._file.read(min(self.chunk_size, self._file_left))
+        if chunk:
+            self._file_left -= len(chunk)
+            self.hasher.update(chunk)
+            self._buffer = chunk
+        else:
+            self._file.close()
+            self._buffer = self._tail(self.hexdigest())
+            self._tail_sent = True
+        self._pos = 0
+        return True
+
+    def _text_part(self, name: str, value: str) -> bytes:
+        return (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(name)}"\r\n\r\n{value}\r\n'
+        ).encode("utf-8")
+
+    def _tail(self, digest: str) -> bytes:
+        return (
+            b"\r\n"
+            + self._text_part(self._hash_field, digest)
+            + (f"--{self.boundary}--\r\n".encode("utf-8"))
+        )
+
+
+class FilesClient(BaseClient):
     """
     Handles file upload and download.
     """
 
-    def upload(self, collection: str, record_id: str, file_path: str) -> dict[str, Any]:
+    hash_memo = HashMemo()
+
+    def upload(
+        self,
+        collection: str,
+        record_id: str,
+        file_path: str,
+        field: str = "file",
+        hash_field: str = DEFAULT_HASH_FIELD,
+        content_hash: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
-        Upload a file to a record.
+        Upload a file to a record, streaming it from disk.
+
+        The upload is skipped when the record's `hash_field` already equals
+        the file's hash. That hash is taken from `content_hash`, or from a
+        previous upload of the same unchanged file (device, inode, size and
+        mtime). Otherwise the file is hashed before sending only when the
+        record carries a hash to compare with (say, after a restart), and
+        while it is sent when it does not.
 
         Args:
             collection (str): Collection name.
             record_id (str): Record ID.
             file_path (str): Path to file.
+            field (str): File field on the record.
+            hash_field (str): Text field storing the content hash.
+            content_hash (Optional[str]): Known hex digest of the file.
 
         Returns:
-            dict: Upload result.
+            dict: Upload result with "record", "hash" and "skipped".
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+            OSError: If the file cannot be read.
         """
-        raise NotImplementedError()
+        if not all([collection, record_id, file_path, field, hash_field]):
+            raise ValueError("Collection, record_id, file_path and fields required.")
+        st = os.stat(file_path)
+        url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
+        record = self._send(
+            "get", url, "get", params={"fields": f"id,{hash_field}"}
+        ).json()
+        stored_hash = record.get(hash_field)
+        if stored_hash:
+            # Reading the file is far cheaper than re-sending it
+            known_hash = content_hash or self.hash_memo.get(st)
+            if not known_hash:
+                known_hash = file_sha256(file_path)
+                self.hash_memo.put(st, known_hash)
+            if stored_hash == known_hash:
+                return {"record": record, "hash": known_hash, "skipped": True}
+        with _get_upload_slots():
+            record, digest = self._stream_upload(url, file_path, field, hash_field)
+        self.hash_memo.put(st, digest)
+        return {"record": record, "hash": digest, "skipped": False}
+
+    def upload_many(
+        self,
+        uploads: Iterable[Tuple[str, str, str]],
+        max_workers: Optional[int] = None,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Upload several files in parallel (still bounded by POCKETBASE_MAX_UPLOADS).
+
+        Args:
+            uploads (Iterable[tuple]): (collection, record_id, file_path) items.
+            max_workers (Optional[int]): Worker threads (defaults to the bound).
+            **kwargs: Passed to upload().
+
+        Returns:
+            list: Upload results in input order.
+        """
+        items = list(uploads)
+        workers = max_workers or DEFAULT_MAX_UPLOADS
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.upload, *item, **kwargs) for item in items]
+            return [f.result() for f in futures]
+
+    def _stream_upload(
+        self, url: str, file_path: str, field: str, hash_field: str
+    ) -> Tuple[dict[str, Any], str]:
+        """PATCH the record with a freshly opened stream per attempt."""
+        streams: list[MultipartFileStream] = []
+
+        def send() -> requests.Response:
+            stream = MultipartFileStream(file_path, field, hash_field)
+            streams.append(stream)
+            headers = self._headers()
+            headers["Content-Type"] = stream.content_type
+            headers["Content-Length"] = str(len(stream))
+            try:
+                return self.session.patch(
+                    url, data=stream, headers=headers, timeout=(10, 300)
+                )
+            finally:
+                stream.close()
+
+        resp = resilience.call(send, "upload", policy=self.retry_policy)
+        return resp.json(), streams[-1].hexdigest()
+
+    def download(
+        self,
+        collection: str,
+        record_id: str,
+        dest_path: str,
+        field: str = "file",
+        hash_field: str = DEFAULT_HASH_FIELD,
+        record: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Download a record's file to disk without holding it in memory.
+
+        Bytes go to `dest_path + ".part"`. A leftover part file from an
+        interrupted run (or a connection dropped mid-transfer) is resumed with
+        a Range request. When the record carries `hash_field`, the finished
+        file is verified against it before being renamed onto `dest_path`.
+
+        Args:
+            collection (str): Collection name.
+            record_id (str): Record ID.
+            dest_path (str): Destination file path.
+            field (str): File field on the record.
+            hash_field (str): Text field storing the content hash.
+            record (Optional[dict]): Record already fetched (saves a request).
+
+        Returns:
+            dict: Download result with "path", "hash", "bytes" and "resumed".
+
+        Raises:
+            PocketBaseError: If API returns an error or the hash does not match.
+            ValueError: If arguments are invalid or the record has no file.
+            OSError: If the destination cannot be written.
+        """
+        if not all([collection, record_id, dest_path, field]):
+            raise ValueError("Collection, record_id, dest_path and field required.")
+        if record is None:
+            url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
+            record = self._send(
+                "get", url, "get", params={"fields": f"id,{field},{hash_field}"}
+            ).json()
+        filename = record.get(field)
+        if isinstance(filename, list):
+            filename = filename[0] if filename else None
+        if not filename:
+            raise ValueError(f"Record {record_id} has no file in '{field}'.")
+        url = f"{self.base_url}/api/files/{collection}/{record_id}/{filename}"
+        part_path = dest_path + PART_SUFFIX
+        with _get_download_slots():
+            digest, size, resumed = self._stream_download(url, part_path)
+        expected = record.get(hash_field)
+        if expected and expected != digest:
+            os.remove(part_path)
+            raise PocketBaseError(
+                f"Download hash mismatch for {filename}: {digest} != {expected}"
+            )
+        os.replace(part_path, dest_path)
+        return {"path": dest_path, "hash": digest, "bytes": size, "resumed": resumed}
+
+    def download_many(
+        self,
+        downloads: Iterable[Tuple[str, str, str]],
+        max_workers: Optional[int] = None,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Download several files in parallel (bounded by POCKETBASE_MAX_DOWNLOADS).
+
+        Args:
+            downloads (Iterable[tuple]): (collection, record_id, dest_path) items.
+            max_workers (Optional[int]): Worker threads (defaults to the bound).
+            **kwargs: Passed to download().
+
+        Returns:
+            list: Download results in input order.
+        """
+        items = list(downloads)
+        workers = max_workers or DEFAULT_MAX_DOWNLOADS
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.download, *item, **kwargs) for item in items]
+            return [f.result() for f in futures]
+
+    def _stream_download(self, url: str, part_path: str) -> Tuple[str, int, bool]:
+        """
+        Fill part_path from url, resuming from its current size. A transfer
+        cut off mid-stream is resumed up to the retry policy's attempt count.
+
+        Returns:
+            tuple: (hex digest, total bytes, whether a resume happened).
+        """
+        policy = self.retry_policy
+        resumed = False
+        for attempt in range(1, policy.attempts + 1):
+            hasher = hashlib.new(HASH_ALGORITHM)
+            offset = 0
+            if os.path.exists(part_path):
+                # Re-hash what is already on disk; hashlib state can't be saved
+                with open(part_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                        hasher.update(chunk)
+                        offset += len(chunk)
+            headers = {k: v for k, v in self._headers().items() if k != "Content-Type"}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+
+            def send(headers: dict[str, str] = headers) -> requests.Response:
+                return self.session.get(
+                    url, headers=headers, stream=True, timeout=(10, 300)
+                )
+
+            resp = resilience.call(
+                send, "download", expected=(200, 206, 416), policy=policy
+            )
+            try:
+                if resp.status_code == 416:
+                    if _range_total(resp) == offset:
+                        # Nothing left past our offset: the part file is complete
+                        return hasher.hexdigest(), offset, resumed
+                    # The part file is longer than the remote file (e.g. left
+                    # over from another version of it): start over
+                    os.remove(part_path)
+                    continue
+                if resp.status_code == 200 and offset:
+                    # Server ignored the Range header; start over
+                    hasher, offset = hashlib.new(HASH_ALGORITHM), 0
+                resumed = resumed or resp.status_code == 206
+                with open(part_path, "ab" if offset else "wb") as out:
+                    for chunk in resp.iter_content(CHUNK_SIZE):
+                        out.write(chunk)
+                        hasher.update(chunk)
+                        offset += len(chunk)
+                    out.flush()
+                    os.fsync(out.fileno())
+                return hasher.hexdigest(), offset, resumed
+            except requests.RequestException as e:
+                if attempt == policy.attempts:
+                    raise PocketBaseError(f"HTTP error during download: {e}") from e
+                resumed = True
+            finally:
+                resp.close()
+        raise PocketBaseError(f"Download failed after {policy.attempts} attempts")
+
+
+def _range_total(resp: requests.Response) -> Optional[int]:
+    """Full size from a Content-Range header ("bytes */N" on a 416), if any."""
+    total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+def file_sha256(file_path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Hex digest of a file, read in chunks."""
+    hasher = hashlib.new(HASH_ALGORITHM)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
@@ -0,0 +1,299 @@
+"""
+Safe builders for PocketBase filter expressions.
+
+Values are always rendered as escaped literals, so user-controlled strings
+(file names, paths) cannot change the structure of the expression.
+
+The subset these builders emit (``field op literal`` conditions joined with
+``&&`` / ``||`` and parentheses) can also be parsed back with parse() and
+evaluated with matches(), for local stand-ins of the server. Parsed nodes are
+tuples: ``("and", [nodes])``, ``("or", [nodes])`` and
+``("cond", field, op, value)``.
+"""
+
+from datetime import datetime
+import operator
+import re
+from typing import Any, Iterable, List, Tuple, Union
+
+OPERATORS = frozenset(
+    {
+        "=",
+        "!=",
+        ">",
+        ">=",
+        "<",
+        "<=",
+        "~",
+        "!~",
+        "?=",
+        "?!=",
+        "?>",
+        "?>=",
+        "?<",
+        "?<=",
+        "?~",
+        "?!~",
+    }
+)
+
+_FIELD_RE = re.compile(r"^@?[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_:][A-Za-z0-9_:]*)*$")
+
+
+def literal(value: Any) -> str:
+    """
+    Render a Python value as a PocketBase filter literal.
+
+    Args:
+        value: str, int, float, bool, None or datetime.
+
+    Returns:
+        str: Literal, e.g. '"it\\"s"', '10', 'true', 'null'.
+
+    Raises:
+        ValueError: If the value cannot be represented safely.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        value = value.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] + "Z"
+    if isinstance(value, str):
+        if value.endswith("\\"):
+            # A trailing backslash would escape the closing quote
+            raise ValueError(f"Filter value cannot end with a backslash: {value!r}")
+        return '"' + value.replace('"', '\\"') + '"'
+    raise ValueError(f"Unsupported filter value type: {type(value).__name__}")
+
+
+def field(name: str) -> str:
+    """
+    Validate a field name (dotted paths and @request/@collection allowed).
+
+    Raises:
+        ValueError: If the name is not a plain identifier path.
+    """
+    if not _FIELD_RE.match(name):
+        raise ValueError(f"Invalid filter field: {name!r}")
+    return name
+
+
+def cond(name: str, op: str, value: Any) -> str:
+    """
+    Build a single `field op value` condition.
+
+    Raises:
+        ValueError: On an unknown operator, bad field name or value.
+    """
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown filter operator: {op!r}")
+    return f"{field(name)}{op}{literal(value)}"
+
+
+def like(name: str, value: str) -> str:
+    """Build a `field ~ value` (contains / LIKE) condition."""
+    return cond(name, "~", value)
+
+
+def between(name: str, low: Any, high: Any) -> str:
+    """Build an inclusive range condition `low <= field <= high`."""
+    return all_of(cond(name, ">=", low), cond(name, "<=", high))
+
+
+def _join(sep: str, exprs: Iterable[str]) -> str:
+    parts = [e for e in exprs if e]
+    if len(parts) == 1:
+        return parts[0]
+    return sep.join(f"({p})" for p in parts)
+
+
+def all_of(*exprs: str) -> str:
+    """Combine expressions with `&&` (empty expressions are skipped)."""
+    return _join(" && ", exprs)
+
+
+def any_of(*exprs: str) -> str:
+    """Combine expressions with `||` (empty expressions are skipped)."""
+    return _join(" || ", exprs)
+
+
+def from_mapping(filters: dict[str, Any]) -> str:
+    """
+    Convert a field/value mapping into an AND-ed equality expression.
+
+    A list/tuple/set value matches any of its elements.
+    """
+    parts = []
+    for key, value in filters.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            alternatives = any_of(*(cond(key, "=", v) for v in value))
+            parts.append(f"({alternatives})" if len(value) > 1 else alternatives)
+        else:
+            parts.append(cond(key, "=", value))
+    return " && ".join(parts)
+
+
+FilterSpec = Union[str, dict[str, Any]]
+
+
+def to_expression(spec: FilterSpec) -> str:
+    """Accept a prebuilt expression or a field/value mapping."""
+    return from_mapping(spec) if isinstance(spec, dict) else spec
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    \s*(?:
+        (?P<paren>[()])
+      | (?P<logic>&&|\|\|)
+      | (?P<op>!=|>=|<=|!~|=|>|<|~)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )
+    """,
+    re.VERBOSE,
+)
+
+Node = Tuple[Any, ...]
+
+_COMPARISONS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+def tokenize(expression: str) -> List[Tuple[str, str]]:
+    """
+    Split a filter expression into (kind, text) tokens.
+
+    Raises:
+        ValueError: On characters outside the supported syntax.
+    """
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Unsupported filter syntax at {pos}: {expression!r}")
+        kind = match.lastgroup or ""
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+def _value(kind: str, text: str) -> Any:
+    if kind == "string":
+        # Only the quote character is escaped (see pocketbase.filters.literal)
+        quote = text[0]
+        return text[1:-1].replace("\\" + quote, quote)
+    if kind == "number":
+        return float(text) if "." in text else int(text)
+    if kind == "name" and text in ("true", "false", "null"):
+        return {"true": True, "false": False, "null": None}[text]
+    raise ValueError(f"Expected a literal, got {text!r}")
+
+
+class _Parser:
+    def __init__(self, tokens: List[Tuple[str, str]]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> Tuple[str, str]:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return ("end", "")
+
+    def take(self, kind: str) -> str:
+        token_kind, text = self.peek()
+        if token_kind != kind:
+            raise ValueError(f"Expected {kind}, got {text or 'end of filter'!r}")
+        self.pos += 1
+        return text
+
+    def parse_or(self) -> Node:
+        nodes = [self.parse_and()]
+        while self.peek() == ("logic", "||"):
+            self.pos += 1
+            nodes.append(self.parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and(self) -> Node:
+        nodes = [self.parse_atom()]
+        while self.peek() == ("logic", "&&"):
+            self.pos += 1
+            nodes.append(self.parse_atom())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_atom(self) -> Node:
+        if self.peek() == ("paren", "("):
+            self.pos += 1
+            node = self.parse_or()
+            self.take("paren")
+            return node
+        name = self.take("name")
+        op = self.take("op")
+        kind, text = self.peek()
+        self.pos += 1
+        return ("cond", name, op, _value(kind, text))
+
+
+def parse(expression: str) -> Node:
+    """
+    Parse a filter expression into a tree.
+
+    Raises:
+        ValueError: If the expression uses unsupported syntax (e.g. the
+            ``?=`` any-of operators or ``@request`` macros).
+    """
+    parser = _Parser(tokenize(expression))
+    node = parser.parse_or()
+    if parser.peek()[0] != "end":
+        raise ValueError(f"Unexpected {parser.peek()[1]!r} in filter {expression!r}")
+    return node
+
+
+def like_pattern(value: Any) -> str:
+    """Return the LIKE pattern for ``~``: wrapped in % unless it has its own."""
+    text = str(value)
+    return text if "%" in text else f"%{text}%"
+
+
+def _like(text: Any, pattern: str) -> bool:
+    """SQL LIKE semantics (% and _ wildcards, case-insensitive)."""
+    regex = "".join(
+        ".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern
+    )
+    return re.fullmatch(regex, str(text), re.IGNORECASE | re.DOTALL) is not None
+
+
+def matches(node: Node, record: dict) -> bool:
+    """
+    Evaluate a parsed filter against a record, as the SQL rendering would.
+    Missing fields compare as null.
+    """
+    if node[0] == "and":
+        return all(matches(child, record) for child in node[1])
+    if node[0] == "or":
+        return any(matches(child, record) for child in node[1])
+    _, name, op, value = node
+    actual = record.get(name)
+    if op == "=":
+        return actual == value
+    if op == "!=":
+        return actual != value
+    if op in ("~", "!~"):
+        found = actual is not None and _like(actual, like_pattern(value))
+        return found if op == "~" else actual is not None and not found
+    if actual is None or value is None:
+        return False
+    try:
+        return _COMPARISONS[op](actual, value)
+    except TypeError:
+        return False
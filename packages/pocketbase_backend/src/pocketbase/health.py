@@ -0,0 +1,97 @@
+"""
+Readiness checks against PocketBase's ``/api/health`` endpoint.
+
+Used instead of fixed sleeps after spawning the server: polling starts with a
+short interval and backs off exponentially, so startup completes as soon as
+the server answers, and a configurable deadline bounds the wait.
+"""
+
+from typing import Any, Callable, Optional
+import time
+import requests  # type: ignore
+from .exceptions import PocketBaseStartupError
+from .session import get_session
+from .utils import get_env_var_typed, load_env
+
+DEFAULT_STARTUP_TIMEOUT = 10.0
+
+
+def check_health(
+    base_url: str, session: Optional[requests.Session] = None, timeout: float = 1.0
+) -> bool:
+    """
+    Return True if PocketBase answers its health endpoint with 200.
+
+    Args:
+        base_url (str): Server URL, e.g. "http://127.0.0.1:8090".
+        session (Optional[requests.Session]): Session to use (shared by default).
+        timeout (float): Per-request timeout in seconds.
+    """
+    try:
+        resp = (session or get_session()).get(
+            f"{base_url.rstrip('/')}/api/health", timeout=timeout
+        )
+    except requests.RequestException:
+        return False
+    return resp.status_code == 200
+
+
+def startup_timeout() -> float:
+    """Deadline for server startup (POCKETBASE_STARTUP_TIMEOUT, seconds)."""
+    load_env()
+    value = get_env_var_typed(
+        "POCKETBASE_STARTUP_TIMEOUT", float, DEFAULT_STARTUP_TIMEOUT
+    )
+    return DEFAULT_STARTUP_TIMEOUT if value is None else value
+
+
+def wait_until_ready(
+    base_url: str,
+    timeout: Optional[float] = None,
+    initial_interval: float = 0.01,
+    max_interval: float = 0.5,
+    process: Optional[Any] = None,
+    stderr: Optional[Callable[[], str]] = None,
+    probe: Optional[Callable[[str], bool]] = None,
+) -> float:
+    """
+    Poll the health endpoint until it answers, the process exits, or the
+    deadline passes.
+
+    Args:
+        base_url (str): Server URL.
+        timeout (Optional[float]): Deadline in seconds (POCKETBASE_STARTUP_TIMEOUT
+            or 10 by default).
+        initial_interval (float): First poll interval; doubles up to max_interval.
+        max_interval (float): Longest poll interval.
+        process (Optional[subprocess.Popen]): Server process; its early exit
+            aborts the wait.
+        stderr (Optional[Callable[[], str]]): Returns captured server output,
+            included in the error on failure.
+        probe (Optional[Callable[[str], bool]]): Health check (check_health).
+
+    Returns:
+        float: Seconds until the server was ready.
+
+    Raises:
+        PocketBaseStartupError: If the process exits or the deadline passes.
+    """
+    timeout = startup_timeout() if timeout is None else timeout
+    probe = probe or check_health
+    started = time.monotonic()
+    deadline = started + timeout
+    interval = initial_interval
+    while True:
+        if probe(base_url):
+            return time.monotonic() - started
+        if process is not None and process.poll() is not None:
+            reason = f"PocketBase exited with code {process.returncode} during startup"
+            break
+        now = time.monotonic()
+        if now >= deadline:
+            reason = f"PocketBase was not ready within {timeout:g}s"
+            break
+        time.sleep(min(interval, deadline - now))
+        interval = min(interval * 2, max_interval)
+    output = stderr().strip() if stderr is not None else ""
+    raise PocketBaseStartupError(f"{reason}: {output}" if output else reason)
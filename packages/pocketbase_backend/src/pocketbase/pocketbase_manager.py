@@ -10,12 +10,15 @@ Usage:
 """
 
 # pylint: disable=consider-using-with
+from collections import deque
 import subprocess
 import os
+import threading
 import time
-from typing import Optional
+from typing import IO, Optional
 import typer
 from rich.console import Console
+from .health import wait_until_ready
 
 console = Console()
 app = typer.Typer()
@@ -32,35 +35,122 @@ class PocketBaseManager:
         port: int = 8090,
         *,
         app_console: Console | None = None,
+        cwd: Optional[str] = None,
+        output_lines: int = 500,
     ):
         """
         Args:
             binary_path (str, optional): Path to the PocketBase binary. Defaults to './pocketbase'.
             port (int): Port to run PocketBase on.
+            cwd (str, optional): Working directory (where pb_data lives).
+            output_lines (int): Server output lines kept in the ring buffer.
         """
         self.console = app_console or console
         self.binary_path = binary_path or os.path.join(
             os.path.dirname(__file__), "pocketbase"
         )
         self.port = port
+        self.cwd = cwd
         self.process: Optional[subprocess.Popen[bytes]] = None
+        # Server stdout/stderr is drained continuously so a chatty server can
+        # never block on a full pipe; only the most recent lines are kept.
+        self.output: deque[str] = deque(maxlen=output_lines)
+        self._drain_thread: Optional[threading.Thread] = None
 
-    def start(self):
+    @property
+    def base_url(self) -> str:
+        """URL the managed server listens on."""
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: Optional[float] = None) -> float:
         """
-        Starts the PocketBase server as a subprocess.
+        Starts the PocketBase server as a subprocess and waits until its
+        health endpoint answers.
+
+        Args:
+            timeout (Optional[float]): Readiness deadline in seconds
+                (POCKETBASE_STARTUP_TIMEOUT or 10 by default).
+
+        Returns:
+            float: Seconds the server took to become ready.
+
+        Raises:
+            PocketBaseStartupError: If the server exits or is not ready in
+                time; the message includes its stderr.
         """
         if self.process is not None:
             raise RuntimeError("PocketBase is already running.")
         self.process = subprocess.Popen(
             [self.binary_path, "serve", "--http", f"127.0.0.1:{self.port}"],
+            cwd=self.cwd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
         )
-        # Wait a moment for the server to start
-        time.sleep(2)
+        self._drain_thread = threading.Thread(
+            target=self._drain,
+            args=(self.process.stdout,),
+            name="pocketbase-output",
+            daemon=True,
+        )
+        self._drain_thread.start()
+        try:
+            elapsed = wait_until_ready(
+                self.base_url,
+                timeout=timeout,
+                process=self.process,
+                stderr=self._abort_and_collect_stderr,
+            )
+        except Exception:
+            self.process = None
+            raise
         self.console.print(
-            f"[green]PocketBase started on http://127.0.0.1:{self.port}[/]"
+            f"[green]PocketBase started on {self.base_url} in {elapsed:.2f}s[/]"
         )
+        return elapsed
+
+    def is_running(self) -> bool:
+        """Whether the server process exists and has not exited."""
+        return self.process is not None and self.process.poll() is None
+
+    def recent_output(self, lines: Optional[int] = None) -> str:
+        """
+        Return the last server output lines from the ring buffer.
+
+        Args:
+            lines (Optional[int]): Number of lines (all buffered by default).
+        """
+        buffered = list(self.output)
+        if lines is not None:
+            buffered = buffered[-lines:]
+        return "\n".join(buffered)
+
+    def _drain(self, stream: Optional[IO[bytes]]) -> None:
+        """Reader thread: move server output lines into the ring buffer."""
+        if stream is None:
+            return
+        with stream:
+            for raw in iter(stream.readline, b""):
+                self.output.append(raw.decode("utf-8", errors="replace").rstrip())
+
+    def _terminate(self) -> None:
+        """Terminate (then kill) the process and wait for the output drain."""
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self._drain_thread is not None:
+            self._drain_thread.join(timeout=2)
+            self._drain_thread = None
+
+    def _abort_and_collect_stderr(self) -> str:
+        """Stop a failed server and return its last output."""
+        self._terminate()
+        return self.recent_output(50)
 
     def stop(self):
         """
@@ -69,11 +159,7 @@ class PocketBaseManager:
         if self.process is None:
             self.console.print("[yellow]PocketBase is not running.")
             return
-        self.process.terminate()
-        try:
-            self.process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            self.process.kill()
+        self._terminate()
         self.console.print("[green]PocketBase stopped.")
         self.process = None
 
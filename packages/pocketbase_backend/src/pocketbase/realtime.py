@@ -0,0 +1,342 @@
+"""
+Realtime (server-sent events) client for PocketBase collections.
+
+PocketBase pushes record changes over ``GET /api/realtime``. The first event
+(``PB_CONNECT``) carries a client id, which is then used to POST the set of
+topics (``"rename_logs"``, ``"files/<id>"``, ...) the client wants. The
+connection is kept open on a background thread, re-established with backoff
+when it drops, and subscriptions are re-submitted on every new client id.
+
+PocketBase does not replay events missed while disconnected. With
+``resume=True`` the client re-reads records of collection-wide topics whose
+``updated`` timestamp is newer than the last one seen and dispatches them with
+the ``"resume"`` action (deletes cannot be recovered this way).
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List
+from typing import Optional, Tuple, cast
+import asyncio
+import json
+import logging
+import random
+import threading
+import requests  # type: ignore
+from .base_client import BaseClient
+from .collections import CollectionsClient
+from .exceptions import PocketBaseError, error_for_status
+from .filters import cond
+from .session import create_session
+
+CONNECT_EVENT = "PB_CONNECT"
+# PocketBase drops idle realtime clients after 5 minutes
+READ_TIMEOUT = 330.0
+
+Callback = Callable[["RealtimeEvent"], None]
+
+
+@dataclass(frozen=True)
+class RealtimeEvent:
+    """A record change pushed by PocketBase."""
+
+    topic: str
+    action: str
+    record: Dict[str, Any] = field(default_factory=dict)
+
+
+def iter_sse(lines: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """
+    Parse a text/event-stream into (event, data, id) tuples.
+
+    Args:
+        lines (Iterable[str]): Decoded lines without line terminators.
+
+    Yields:
+        tuple: Event name (default "message"), joined data lines, last event id.
+    """
+    event, last_id = "", ""
+    data: List[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield event or "message", "\n".join(data), last_id
+            event, data = "", []
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if name == "event":
+            event = value
+        elif name == "data":
+            data.append(value)
+        elif name == "id":
+            last_id = value
+    if data:
+        yield event or "message", "\n".join(data), last_id
+
+
+class RealtimeClient(BaseClient):
+    """
+    Subscribes to PocketBase realtime topics and dispatches pushed changes
+    to callbacks or async iterators.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        stream_session: Optional[requests.Session] = None,
+        resume: bool = True,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        """
+        Args:
+            token (Optional[str]): Auth token, if available.
+            session (Optional[requests.Session]): Session for subscription and
+                resume requests (defaults to the shared pooled session).
+            stream_session (Optional[requests.Session]): Session holding the
+                long-lived event stream, kept apart so it does not occupy a
+                pooled connection.
+            resume (bool): Re-read records changed while disconnected.
+            reconnect_delay (float): First reconnect delay in seconds.
+            max_reconnect_delay (float): Upper bound for the reconnect backoff.
+        """
+        super().__init__(token=token, session=session)
+        self.logger = logging.getLogger("RealtimeClient")
+        self.stream_session = stream_session or create_session(pool_size=1)
+        self.resume = resume
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.client_id: Optional[str] = None
+        self.connected = threading.Event()
+        self.reconnects = 0
+        self._callbacks: Dict[str, List[Callback]] = {}
+        self._last_updated: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response: Optional[requests.Response] = None
+
+    def subscribe(self, topic: str, callback: Callback) -> Callable[[], None]:
+        """
+        Register a callback for a topic ("collection" or "collection/record_id").
+        Callbacks run on the reader thread and should return quickly.
+
+        Args:
+            topic (str): Realtime topic.
+            callback (Callable[[RealtimeEvent], None]): Change handler.
+
+        Returns:
+            Callable[[], None]: Function removing this subscription.
+
+        Raises:
+            ValueError: If topic is empty.
+            PocketBaseError: If updating a live connection's topics fails.
+        """
+        if not topic:
+            raise ValueError("Topic required.")
+        with self._lock:
+            is_new = topic not in self._callbacks
+            self._callbacks.setdefault(topic, []).append(callback)
+        if is_new and self.connected.is_set():
+            self._submit_subscriptions()
+        return lambda: self.unsubscribe(topic, callback)
+
+    def unsubscribe(self, topic: str, callback: Optional[Callback] = None) -> None:
+        """
+        Remove one callback, or every callback of a topic.
+
+        Args:
+            topic (str): Realtime topic.
+            callback (Optional[Callable]): Callback to remove (all if None).
+        """
+        with self._lock:
+            callbacks = self._callbacks.get(topic, [])
+            if callback is not None and callback in callbacks:
+                callbacks.remove(callback)
+            if callback is None or not callbacks:
+                self._callbacks.pop(topic, None)
+                self._last_updated.pop(topic, None)
+                changed = True
+            else:
+                changed = False
+        if changed and self.connected.is_set():
+            self._submit_subscriptions()
+
+    def topics(self) -> List[str]:
+        """Currently subscribed topics."""
+        with self._lock:
+            return sorted(self._callbacks)
+
+    def start(self) -> None:
+        """Open the event stream on a background thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pocketbase-realtime", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Close the event stream and wait for the reader thread to exit."""
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.connected.clear()
+
+    async def events(
+        self, topic: str, max_queue: int = 1000
+    ) -> AsyncIterator[RealtimeEvent]:
+        """
+        Iterate a topic's events from asyncio code. Starts the client if needed.
+        When the consumer falls behind by more than max_queue events, the
+        oldest are dropped.
+
+        Args:
+            topic (str): Realtime topic.
+            max_queue (int): Events buffered for a slow consumer.
+
+        Yields:
+            RealtimeEvent: Pushed changes.
+        """
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[RealtimeEvent]" = asyncio.Queue(max_queue)
+
+        def enqueue(event: RealtimeEvent) -> None:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+        def forward(event: RealtimeEvent) -> None:
+            loop.call_soon_threadsafe(enqueue, event)
+
+        unsubscribe = self.subscribe(topic, forward)
+        self.start()
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+    def _run(self) -> None:
+        """Reader thread: keep the stream open until stop() is called."""
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                if self._listen():
+                    delay = self.reconnect_delay
+            except (requests.RequestException, PocketBaseError, ValueError) as e:
+                if self._stop.is_set():
+                    break
+                self.logger.warning("Realtime connection lost: %s", e)
+            self.connected.clear()
+            self.client_id = None
+            if self._stop.is_set():
+                break
+            self.reconnects += 1
+            self._stop.wait(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _listen(self) -> bool:
+        """
+        Hold one stream connection open and dispatch its events.
+
+        Returns:
+            bool: True if the connection was established (resets the backoff).
+        """
+        headers = self._headers()
+        headers["Accept"] = "text/event-stream"
+        resp = self.stream_session.get(
+            f"{self.base_url}/api/realtime",
+            headers=headers,
+            stream=True,
+            timeout=(10, READ_TIMEOUT),
+        )
+        self._response = resp
+        established = False
+        try:
+            if resp.status_code != 200:
+                raise error_for_status(
+                    resp.status_code,
+                    f"Realtime connect failed: {resp.status_code} {resp.text}",
+                )
+            resp.encoding = "utf-8"
+            # With an encoding set, decode_unicode yields str lines only
+            lines = cast(Iterator[str], resp.iter_lines(decode_unicode=True))
+            for event, data, _ in iter_sse(lines):
+                if self._stop.is_set():
+                    break
+                payload = json.loads(data) if data else {}
+                if event == CONNECT_EVENT:
+                    self.client_id = payload.get("clientId")
+                    self._submit_subscriptions()
+                    if self.resume and self.reconnects:
+                        self._catch_up()
+                    established = True
+                    self.connected.set()
+                else:
+                    self._dispatch(
+                        RealtimeEvent(
+                            event, payload.get("action", ""), payload.get("record", {})
+                        )
+                    )
+        finally:
+            self._response = None
+            resp.close()
+        return established
+
+    def _submit_subscriptions(self) -> None:
+        """Send the full topic set for the current client id."""
+        if not self.client_id:
+            return
+        url = f"{self.base_url}/api/realtime"
+        data = {"clientId": self.client_id, "subscriptions": self.topics()}
+        try:
+            resp = self.session.post(
+                url, json=data, headers=self._headers(), timeout=10
+            )
+            if resp.status_code not in (200, 204):
+                raise error_for_status(
+                    resp.status_code,
+                    f"Realtime subscribe failed: {resp.status_code} {resp.text}",
+                )
+        except requests.RequestException as e:
+            raise PocketBaseError(f"HTTP error during realtime subscribe: {e}") from e
+
+    def _catch_up(self) -> None:
+        """Dispatch records of collection topics updated while disconnected."""
+        with self._lock:
+            pending = {
+                topic: since
+                for topic, since in self._last_updated.items()
+                if "/" not in topic
+            }
+        records = CollectionsClient(token=self.token, session=self.session)
+        for topic, since in pending.items():
+            for record in records.iter_records(
+                topic, filter=cond("updated", ">", since), sort="updated"
+            ):
+                self._dispatch(RealtimeEvent(topic, "resume", record))
+
+    def _dispatch(self, event: RealtimeEvent) -> None:
+        """Run the topic's callbacks, isolating their failures."""
+        with self._lock:
+            updated = event.record.get("updated")
+            if isinstance(updated, str) and updated > self._last_updated.get(
+                event.topic, ""
+            ):
+                self._last_updated[event.topic] = updated
+            callbacks = list(self._callbacks.get(event.topic, ()))
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.logger.exception("Realtime callback failed for %s", event.topic)
@@ -1,13 +1,38 @@
 """
 Relations operations for PocketBase records (link/unlink).
+
+Edits use PocketBase's ``field+`` (append) and ``field-`` (remove) modifiers,
+so each change is a single PATCH applied atomically on the server instead of
+a read-modify-write of the whole relation list.
 """
 
-from typing import Any
-import requests  # type: ignore
-from .exceptions import PocketBaseError
+from typing import Any, Iterable
 from .base_client import BaseClient
 
 
+def relation_patch(
+    related_collection: str, related_ids: Iterable[str], op: str
+) -> dict[str, list[str]]:
+    """
+    Build the PATCH body appending ("+") or removing ("-") relation ids.
+
+    Args:
+        related_collection (str): Relation field (named after the related collection).
+        related_ids (Iterable[str]): Related record IDs.
+        op (str): "+" or "-".
+
+    Returns:
+        dict: e.g. {"friends+": ["def", "ghi"]}.
+
+    Raises:
+        ValueError: If the field, operator or ids are invalid.
+    """
+    ids = [str(rid) for rid in related_ids]
+    if not related_collection or op not in ("+", "-") or not ids or not all(ids):
+        raise ValueError("Relation field, operator and non-empty related ids required.")
+    return {f"{related_collection}{op}": list(dict.fromkeys(ids))}
+
+
 class RelationsClient(BaseClient):
     """
     Handles linking and unlinking records in PocketBase collections.
@@ -21,7 +46,8 @@ class RelationsClient(BaseClient):
         related_id: str,
     ) -> dict[str, Any]:
         """
-        Link a record to another record via a relation field.
+        Link a record to another record via a relation field, keeping
+        existing links.
 
         Args:
             collection (str): Source collection name.
@@ -38,17 +64,7 @@ class RelationsClient(BaseClient):
         """
         if not all([collection, record_id, related_collection, related_id]):
             raise ValueError("All arguments are required.")
-        # PocketBase expects the relation field to be updated with the related_id
-        # We'll PATCH the source record's relation field (named after related_collection)
-        url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
-        data = {related_collection: [related_id]}
-        try:
-            resp = requests.patch(url, json=data, headers=self._headers(), timeout=10)
-            if resp.status_code != 200:
-                raise PocketBaseError(f"Link failed: {resp.status_code} {resp.text}")
-            return resp.json()
-        except requests.RequestException as e:
-            raise PocketBaseError(f"HTTP error during link: {e}") from e
+        return self.link_many(collection, record_id, related_collection, [related_id])
 
     def unlink(
         self,
@@ -75,31 +91,73 @@ class RelationsClient(BaseClient):
         """
         if not all([collection, record_id, related_collection, related_id]):
             raise ValueError("All arguments are required.")
+        return self.unlink_many(collection, record_id, related_collection, [related_id])
+
+    def link_many(
+        self,
+        collection: str,
+        record_id: str,
+        related_collection: str,
+        related_ids: Iterable[str],
+    ) -> dict[str, Any]:
+        """
+        Append several related records in one atomic request.
+
+        Args:
+            collection (str): Source collection name.
+            record_id (str): Source record ID.
+            related_collection (str): Related collection name.
+            related_ids (Iterable[str]): Related record IDs.
+
+        Returns:
+            dict: Updated record data.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        return self._patch_relation(
+            collection,
+            record_id,
+            relation_patch(related_collection, related_ids, "+"),
+            "link",
+        )
+
+    def unlink_many(
+        self,
+        collection: str,
+        record_id: str,
+        related_collection: str,
+        related_ids: Iterable[str],
+    ) -> dict[str, Any]:
+        """
+        Remove several related records in one atomic request.
+
+        Args:
+            collection (str): Source collection name.
+            record_id (str): Source record ID.
+            related_collection (str): Related collection name.
+            related_ids (Iterable[str]): Related record IDs.
+
+        Returns:
+            dict: Updated record data.
+
+        Raises:
+            PocketBaseError: If API returns an error.
+            ValueError: If arguments are invalid.
+        """
+        return self._patch_relation(
+            collection,
+            record_id,
+            relation_patch(related_collection, related_ids, "-"),
+            "unlink",
+        )
+
+    def _patch_relation(
+        self, collection: str, record_id: str, data: dict[str, list[str]], action: str
+    ) -> dict[str, Any]:
+        """PATCH a relation modifier; append/remove are safe to retry."""
+        if not collection or not record_id:
+            raise ValueError("Collection and record_id required.")
         url = f"{self.base_url}/api/collections/{collection}/records/{record_id}"
-        # To unlink, fetch the current relation list, remove related_id, and PATCH
-        try:
-            get_resp = requests.get(url, headers=self._headers(), timeout=10)
-            if get_resp.status_code != 200:
-                raise PocketBaseError(
-                    f"Unlink fetch failed: {get_resp.status_code} {get_resp.text}"
-                )
-            record = get_resp.json()
-            current_rel_raw = record.get(related_collection, [])
-            if not isinstance(current_rel_raw, list):
-                raise PocketBaseError(
-                    f"Relation field '{related_collection}' is not a list."
-                )
-            # Assume all relation IDs are strings
-            current_rel: list[str] = [str(rid) for rid in current_rel_raw]  # type: ignore
-            updated_rel: list[str] = [rid for rid in current_rel if rid != related_id]
-            patch_data: dict[str, list[str]] = {related_collection: updated_rel}
-            patch_resp = requests.patch(
-                url, json=patch_data, headers=self._headers(), timeout=10
-            )
-            if patch_resp.status_code != 200:
-                raise PocketBaseError(
-                    f"Unlink failed: {patch_resp.status_code} {patch_resp.text}"
-                )
-            return patch_resp.json()
-        except requests.RequestException as e:
-            raise PocketBaseError(f"HTTP error during unlink: {e}") from e
+        return self._send("patch", url, action, json=data).json()
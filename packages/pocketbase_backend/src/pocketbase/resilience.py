@@ -0,0 +1,287 @@
+"""
+Retries and circuit breaking for PocketBase requests.
+
+Transient failures (connection errors, timeouts, 429 and 5xx responses, which
+PocketBase's SQLite returns under write contention) are retried with jittered
+exponential backoff, but only for idempotent operations. A process-wide
+circuit breaker counts consecutive transient failures and, once open, fails
+calls immediately until a cool-down has passed, so callers can switch to local
+buffering instead of stalling on every request.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Collection, List, Optional, Union
+import random
+import secrets
+import string
+import threading
+import time
+import requests  # type: ignore
+from .exceptions import CircuitOpenError, PocketBaseError, error_for_status
+from .utils import get_env_var_typed, load_env
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_RECORD_ID_ALPHABET = string.ascii_lowercase + string.digits
+_ID_LIMIT = 256 - 256 % len(_RECORD_ID_ALPHABET)
+_ID_TABLE = bytes(
+    ord(_RECORD_ID_ALPHABET[b % len(_RECORD_ID_ALPHABET)]) for b in range(256)
+)
+_ID_REJECT = bytes(range(_ID_LIMIT, 256))
+
+_breaker: Optional["CircuitBreaker"] = None
+_breaker_lock = threading.Lock()
+
+
+def new_record_id(length: int = 15) -> str:
+    """
+    Generate a PocketBase-compatible record id ([a-z0-9], 15 chars).
+
+    Creating records with a client-chosen id makes a retried create safe: a
+    duplicate attempt fails validation instead of inserting a second row.
+    """
+    # One CSPRNG draw per id instead of one per character. Bytes at or above
+    # the largest multiple of 36 are dropped so every character is uniform.
+    while True:
+        chars = secrets.token_bytes(length + 8).translate(_ID_TABLE, _ID_REJECT)
+        if len(chars) >= length:
+            return chars[:length].decode("ascii")
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff settings."""
+
+    attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    retry_statuses: Collection[int] = field(default=TRANSIENT_STATUSES)
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from POCKETBASE_RETRY_ATTEMPTS / POCKETBASE_RETRY_BASE_DELAY."""
+        load_env()
+        return cls(
+            attempts=get_env_var_typed("POCKETBASE_RETRY_ATTEMPTS", int, 3) or 1,
+            base_delay=get_env_var_typed("POCKETBASE_RETRY_BASE_DELAY", float, 0.1)
+            or 0.0,
+        )
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before the next attempt ("full jitter").
+
+        Args:
+            attempt (int): Number of the attempt that just failed (1-based).
+            retry_after (Optional[float]): Server-provided Retry-After.
+        """
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        wait = random.uniform(0, cap)
+        if retry_after is not None:
+            wait = max(wait, min(retry_after, self.max_delay))
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker: closed -> open after `failure_threshold`
+    consecutive transient failures, half-open after `reset_timeout` seconds
+    (one trial call), closed again on success.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds to stay open before a trial call.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            if self._state == OPEN and self._cooled_down():
+                return HALF_OPEN
+            return self._state
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Call listener(new_state) on every state change."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def before_call(self) -> None:
+        """
+        Admit a call or fail fast.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or its trial is running).
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            if self._state == OPEN and not self._cooled_down():
+                raise CircuitOpenError("PocketBase circuit open; failing fast.")
+            if self._trial_in_flight:
+                raise CircuitOpenError("PocketBase circuit half-open; trial in flight.")
+            self._trial_in_flight = True
+            changed = self._set_state(HALF_OPEN)
+        self._notify(changed)
+
+    def record_success(self) -> None:
+        """Reset the failure count and close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            changed = self._set_state(CLOSED)
+        self._notify(changed)
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            changed = None
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                changed = self._set_state(OPEN)
+        self._notify(changed)
+
+    def release(self) -> None:
+        """
+        Give back the half-open trial slot of a call that ended with neither
+        a success nor a transient failure (e.g. an unexpected exception).
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """Force the circuit closed."""
+        self.record_success()
+
+    def _cooled_down(self) -> bool:
+        return self._clock() - self._opened_at >= self.reset_timeout
+
+    def _set_state(self, state: str) -> Optional[str]:
+        """Change state; return it if it changed. Caller must hold the lock."""
+        if state == self._state:
+            return None
+        self._state = state
+        return state
+
+    def _notify(self, state: Optional[str]) -> None:
+        if state is None:
+            return
+        for listener in list(self._listeners):
+            listener(state)
+
+
+def get_breaker() -> CircuitBreaker:
+    """
+    Return the process-wide breaker shared by all clients, configured from
+    POCKETBASE_BREAKER_THRESHOLD and POCKETBASE_BREAKER_RESET.
+    """
+    global _breaker  # pylint: disable=global-statement
+    if _breaker is None:
+        with _breaker_lock:
+            if _breaker is None:
+                load_env()
+                _breaker = CircuitBreaker(
+                    get_env_var_typed("POCKETBASE_BREAKER_THRESHOLD", int, 5) or 5,
+                    get_env_var_typed("POCKETBASE_BREAKER_RESET", float, 10.0) or 0.0,
+                )
+    return _breaker
+
+
+def retry_after_seconds(resp: Any) -> Optional[float]:
+    """Parse a numeric Retry-After header, if present."""
+    value = getattr(resp, "headers", {}).get("Retry-After")
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def call(
+    send: Callable[[], requests.Response],
+    action: str,
+    expected: Union[int, Collection[int]] = 200,
+    idempotent: bool = True,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> requests.Response:
+    """
+    Run a request through the breaker, retrying transient failures.
+
+    Args:
+        send (Callable[[], requests.Response]): Performs one attempt.
+        action (str): Action name used in error messages (e.g. "create").
+        expected (int | Collection[int]): Success status code(s).
+        idempotent (bool): Whether the request may be retried.
+        policy (Optional[RetryPolicy]): Backoff settings (read from the
+            environment on every call by default; clients pass their own).
+        breaker (Optional[CircuitBreaker]): Breaker (shared one by default).
+        sleep (Callable[[float], None]): Sleep function.
+
+    Returns:
+        requests.Response: The successful response.
+
+    Raises:
+        CircuitOpenError: If the circuit is open.
+        PocketBaseError: On non-transient errors, or after the last attempt.
+    """
+    policy = policy or RetryPolicy.from_env()
+    breaker = breaker or get_breaker()
+    accepted = {expected} if isinstance(expected, int) else set(expected)
+    attempts = policy.attempts if idempotent else 1
+    for attempt in range(1, attempts + 1):
+        breaker.before_call()
+        retry_after = None
+        try:
+            resp = send()
+        except requests.RequestException as e:
+            error: PocketBaseError = PocketBaseError(f"HTTP error during {action}: {e}")
+            error.__cause__ = e
+        except BaseException:
+            # Not a transport failure: free a half-open trial
+            breaker.release()
+            raise
+        else:
+            if resp.status_code in accepted:
+                breaker.record_success()
+                return resp
+            error = error_for_status(
+                resp.status_code,
+                f"{action.capitalize()} failed: {resp.status_code} {resp.text}",
+            )
+            if resp.status_code not in policy.retry_statuses:
+                # The server answered; it is up even if it rejected the request
+                breaker.record_success()
+                raise error
+            retry_after = retry_after_seconds(resp)
+        breaker.record_failure()
+        if attempt == attempts or breaker.state == OPEN:
+            raise error
+        sleep(policy.delay(attempt, retry_after))
+    raise PocketBaseError(f"{action.capitalize()} failed: no attempts made")
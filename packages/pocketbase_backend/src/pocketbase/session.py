@@ -0,0 +1,87 @@
+"""
+Shared, pooled HTTP session for PocketBase API clients.
+
+All clients reuse one requests.Session so TCP connections are kept alive and
+pooled across requests instead of being opened per call. The connection pool
+is thread-safe; the session carries no per-client state (auth headers are
+passed per request).
+"""
+
+from typing import Optional
+import threading
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from .utils import get_env_var_typed, load_env
+
+DEFAULT_POOL_SIZE = 10
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean environment variable value."""
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def create_session(
+    pool_size: Optional[int] = None, compression: Optional[bool] = None
+) -> requests.Session:
+    """
+    Create a new keep-alive session with a sized connection pool.
+
+    Args:
+        pool_size (Optional[int]): Max pooled connections per host
+            (defaults to POCKETBASE_POOL_SIZE or 10).
+        compression (Optional[bool]): Ask the server for gzip/deflate responses
+            (defaults to POCKETBASE_HTTP_COMPRESSION or True).
+
+    Returns:
+        requests.Session: Configured session.
+
+    Raises:
+        ValueError: If pool_size is not positive.
+    """
+    load_env()
+    if pool_size is None:
+        pool_size = get_env_var_typed("POCKETBASE_POOL_SIZE", int, DEFAULT_POOL_SIZE)
+    if compression is None:
+        compression = get_env_var_typed(
+            "POCKETBASE_HTTP_COMPRESSION", _parse_bool, True
+        )
+    if not pool_size or pool_size < 1:
+        raise ValueError("pool_size must be a positive integer.")
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    session.headers["Accept-Encoding"] = "gzip, deflate" if compression else "identity"
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide shared session, creating it on first use.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session  # pylint: disable=global-statement
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def reset_session() -> None:
+    """
+    Close and drop the shared session (e.g. after fork or config changes).
+    The next get_session() call creates a fresh one.
+    """
+    global _session  # pylint: disable=global-statement
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
@@ -0,0 +1,143 @@
+"""
+Supervision of a managed PocketBase process.
+
+A monitor thread checks the process and its ``/api/health`` endpoint
+periodically. When the process exits, or the health check fails
+``failure_threshold`` times in a row, listeners are told the server is
+"down", the process is restarted with exponential backoff, and listeners are
+told it is "up" again once it answers. Server output is drained by
+PocketBaseManager into its ring buffer, so a crash can be diagnosed from
+``manager.recent_output()``.
+"""
+
+from typing import Callable, List, Optional
+import logging
+import threading
+from .exceptions import PocketBaseError
+from .health import check_health
+from .pocketbase_manager import PocketBaseManager
+from .utils import get_env_var_typed, load_env
+
+UP = "up"
+DOWN = "down"
+
+logger = logging.getLogger(__name__)
+
+
+class PocketBaseSupervisor:
+    """Keep a PocketBaseManager's server alive and report its availability."""
+
+    def __init__(
+        self,
+        manager: PocketBaseManager,
+        check_interval: Optional[float] = None,
+        failure_threshold: int = 3,
+        restart_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        probe: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        """
+        Args:
+            manager (PocketBaseManager): Manager owning the server process.
+            check_interval (Optional[float]): Seconds between health checks
+                (POCKETBASE_HEALTH_INTERVAL or 5 by default).
+            failure_threshold (int): Consecutive failed checks before restart.
+            restart_backoff (float): First delay between restart attempts;
+                doubles up to max_backoff.
+            max_backoff (float): Longest delay between restart attempts.
+            probe (Optional[Callable[[str], bool]]): Health check (check_health).
+        """
+        if check_interval is None:
+            load_env()
+            check_interval = (
+                get_env_var_typed("POCKETBASE_HEALTH_INTERVAL", float, 5.0) or 5.0
+            )
+        self.manager = manager
+        self.check_interval = check_interval
+        self.failure_threshold = failure_threshold
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self.restarts = 0
+        self.state = DOWN
+        self._probe = probe
+        self._listeners: List[Callable[[str], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Call listener("down" | "up") whenever availability changes."""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """Start the server if needed, then the monitor thread."""
+        if not self.manager.is_running():
+            self.manager.start()
+        self._set_state(UP)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pocketbase-supervisor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop monitoring and shut the server down."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval + 5)
+            self._thread = None
+        if self.manager.process is not None:
+            self.manager.stop()
+
+    def check(self) -> bool:
+        """Return True if the process is alive and its health endpoint answers."""
+        if not self.manager.is_running():
+            return False
+        probe = self._probe or check_health
+        return probe(self.manager.base_url)
+
+    def restart(self) -> None:
+        """Restart the server, retrying with backoff until it is ready or stopped."""
+        self._set_state(DOWN)
+        delay = self.restart_backoff
+        while not self._stop.is_set():
+            if self.manager.process is not None:
+                self.manager.stop()
+            try:
+                self.manager.start()
+            except (PocketBaseError, OSError) as exc:
+                logger.warning(
+                    "PocketBase restart failed (retrying in %.1fs): %s", delay, exc
+                )
+                if self._stop.wait(delay):
+                    return
+                delay = min(delay * 2, self.max_backoff)
+                continue
+            self.restarts += 1
+            self._set_state(UP)
+            return
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stop.wait(self.check_interval):
+            if self.check():
+                failures = 0
+                continue
+            failures += 1
+            if self.manager.is_running() and failures < self.failure_threshold:
+                continue
+            logger.warning(
+                "PocketBase unhealthy; restarting. Last output:\n%s",
+                self.manager.recent_output(20),
+            )
+            failures = 0
+            self.restart()
+
+    def _set_state(self, state: str) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        for listener in list(self._listeners):
+            try:
+                listener(state)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("PocketBase supervisor listener failed")
@@ -0,0 +1,429 @@
+"""
+Local PocketBase stand-in for tests and benchmarks.
+
+FakePocketBase runs a threaded HTTP server on 127.0.0.1 implementing the
+subset of the API that the clients in this package use: records CRUD (with
+filter/sort/fields/paging and ``field+``/``field-`` relation modifiers),
+superuser auth-with-password and auth-refresh, ``/api/batch`` and
+``/api/health``. Latency, injected errors and per-route request counts are
+configurable, so client performance work can be measured reproducibly without
+the real binary.
+
+Usage:
+    with FakePocketBase(latency=0.005) as pb:
+        os.environ["POCKETBASE_URL"] = pb.url
+        pb.inject_error(503, method="POST", path=r"/records$", count=2)
+        ...
+        print(pb.request_count("POST /api/collections/{collection}/records"))
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qs, urlsplit
+import base64
+import json
+import random
+import re
+import secrets
+import threading
+import time
+
+from .fake_http import error, make_handler, route
+from .filters import matches, parse
+from .resilience import new_record_id
+
+SUPERUSERS = "_superusers"
+HOST = "127.0.0.1"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] + "Z"
+
+
+def _b64(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+@dataclass
+class InjectedError:
+    """A canned error response served instead of handling matching requests."""
+
+    status: int
+    method: Optional[str] = None
+    path: Optional[Pattern[str]] = None
+    count: int = 1
+    retry_after: Optional[float] = None
+    probability: float = 1.0
+    body: Dict[str, Any] = field(default_factory=dict)
+
+    def applies(self, method: str, path: str, rng: random.Random) -> bool:
+        """Whether this error should answer the request."""
+        if self.count == 0:
+            return False
+        if self.method and self.method != method:
+            return False
+        if self.path is not None and self.path.search(path) is None:
+            return False
+        return self.probability >= 1.0 or rng.random() < self.probability
+
+
+class FakePocketBase:  # pylint: disable=too-many-instance-attributes
+    """
+    In-process PocketBase stand-in. Records are kept in memory per collection
+    (collections are created on first write); superuser credentials are the
+    admin_email / admin_password given to the constructor.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        admin_email: str = "admin@example.com",
+        admin_password: str = "changeme",
+        token_ttl: float = 3600.0,
+        require_auth: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            latency (float): Seconds added before every response.
+            admin_email (str): Superuser identity accepted by auth-with-password.
+            admin_password (str): Superuser password.
+            token_ttl (float): Lifetime of issued tokens (their ``exp`` claim).
+            require_auth (bool): Reject records/batch requests without a valid
+                token (401), like superuser-only collection rules.
+            seed (Optional[int]): Seed for probabilistic error injection.
+        """
+        self.latency = latency
+        self.admin_email = admin_email
+        self.admin_password = admin_password
+        self.token_ttl = token_ttl
+        self.require_auth = require_auth
+        self.records: Dict[str, Dict[str, dict]] = {}
+        self.counts: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self._tokens: Dict[str, float] = {}
+        self._errors: List[InjectedError] = []
+        self._random = random.Random(seed)
+        self._admin = {
+            "id": new_record_id(),
+            "collectionName": SUPERUSERS,
+            "email": admin_email,
+        }
+        self._lock = threading.RLock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self._server is None:
+            raise RuntimeError("FakePocketBase is not running.")
+        return f"http://{HOST}:{self._server.server_port}"
+
+    def start(self) -> str:
+        """Start serving on a free port and return the base URL."""
+        self._server = ThreadingHTTPServer((HOST, 0), make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-pocketbase", daemon=True
+        )
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakePocketBase":
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def inject_error(
+        self,
+        status: int,
+        method: Optional[str] = None,
+        path: Optional[str] = None,
+        count: int = 1,
+        retry_after: Optional[float] = None,
+        probability: float = 1.0,
+    ) -> InjectedError:
+        """
+        Answer the next `count` matching requests with `status`.
+
+        Args:
+            status (int): HTTP status to return.
+            method (Optional[str]): Only requests with this method.
+            path (Optional[str]): Regex searched in the request path.
+            count (int): Number of requests to fail (-1 for all).
+            retry_after (Optional[float]): Retry-After header value.
+            probability (float): Chance that a matching request fails, for
+                error rates spread over a run (with count=-1).
+
+        Returns:
+            InjectedError: The rule (its `count` shows what is left).
+        """
+        rule = InjectedError(
+            status=status,
+            method=method.upper() if method else None,
+            path=re.compile(path) if path else None,
+            count=count,
+            retry_after=retry_after,
+            probability=probability,
+            body=error(status, "Injected error.")[1],
+        )
+        with self._lock:
+            self._errors.append(rule)
+        return rule
+
+    def clear_errors(self) -> None:
+        """Remove all injected errors."""
+        with self._lock:
+            self._errors.clear()
+
+    def request_count(self, route: Optional[str] = None) -> int:
+        """
+        Requests served, in total or for one route template such as
+        "POST /api/collections/{collection}/records".
+        """
+        with self._lock:
+            if route is None:
+                return sum(self.counts.values())
+            return self.counts[route]
+
+    def reset_stats(self) -> None:
+        """Zero the request and status counters."""
+        with self._lock:
+            self.counts.clear()
+            self.statuses.clear()
+
+    def issue_token(self, ttl: Optional[float] = None) -> str:
+        """Return a superuser token, as auth-with-password would."""
+        expires = time.time() + (self.token_ttl if ttl is None else ttl)
+        token = ".".join(
+            (
+                _b64({"alg": "none", "typ": "JWT"}),
+                _b64({"id": self._admin["id"], "type": "auth", "exp": int(expires)}),
+                secrets.token_urlsafe(16),
+            )
+        )
+        with self._lock:
+            self._tokens[token] = expires
+        return token
+
+    def handle(
+        self, method: str, raw_path: str, body: Any, headers: Dict[str, str]
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Serve one request. Returns (status, JSON body, extra headers).
+        Used by the HTTP handler and for each request of a batch.
+        """
+        parts = urlsplit(raw_path)
+        path, query = parts.path, parse_qs(parts.query)
+        name, params = route(method, path)
+        with self._lock:
+            self.counts[name or f"{method} {path}"] += 1
+            for rule in self._errors:
+                if rule.applies(method, path, self._random):
+                    if rule.count > 0:
+                        rule.count -= 1
+                    extra = {}
+                    if rule.retry_after is not None:
+                        extra["Retry-After"] = str(rule.retry_after)
+                    return rule.status, rule.body, extra
+        if name is None:
+            return (*error(404, "The requested resource wasn't found."), {})
+        status, payload = self._dispatch(name, params, query, body, headers)
+        return status, payload, {}
+
+    def record_status(self, status: int) -> None:
+        """Count a response status (called by the HTTP handler)."""
+        with self._lock:
+            self.statuses[status] += 1
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        token = headers.get("Authorization", "")
+        token = token[7:] if token.startswith("Bearer ") else token
+        with self._lock:
+            expires = self._tokens.get(token)
+        return expires is not None and expires > time.time()
+
+    def _dispatch(  # pylint: disable=too-many-return-statements
+        self,
+        route: str,
+        params: Dict[str, str],
+        query: Dict[str, List[str]],
+        body: Any,
+        headers: Dict[str, str],
+    ) -> Tuple[int, Any]:
+        collection = params.get("collection", "")
+        if route == "GET /api/health":
+            return 200, {"code": 200, "message": "API is healthy.", "data": {}}
+        if route.endswith("/auth-with-password"):
+            return self._auth_with_password(collection, body)
+        if route.endswith("/auth-refresh"):
+            if collection != SUPERUSERS or not self._authorized(headers):
+                return error(401, "The request requires valid record authorization.")
+            return 200, {"token": self.issue_token(), "record": self._admin}
+        if self.require_auth and not self._authorized(headers):
+            return error(401, "The request requires valid record authorization.")
+        if route == "POST /api/batch":
+            return self._batch(body, headers)
+        if route == "GET /api/collections/{collection}/records":
+            return self._list(collection, query)
+        if route == "POST /api/collections/{collection}/records":
+            return self._create(collection, body)
+        record_id = params["id"]
+        if route.startswith("GET "):
+            record = self.records.get(collection, {}).get(record_id)
+            if record is None:
+                return error(404, "The requested resource wasn't found.")
+            return 200, _project(record, _first(query, "fields"))
+        if route.startswith("PATCH "):
+            return self._update(collection, record_id, body)
+        with self._lock:
+            if self.records.get(collection, {}).pop(record_id, None) is None:
+                return error(404, "The requested resource wasn't found.")
+        return 204, None
+
+    def _auth_with_password(self, collection: str, body: Any) -> Tuple[int, Any]:
+        body = body or {}
+        if (
+            collection != SUPERUSERS
+            or body.get("identity") != self.admin_email
+            or body.get("password") != self.admin_password
+        ):
+            return error(400, "Failed to authenticate.")
+        return 200, {"token": self.issue_token(), "record": self._admin}
+
+    def _list(self, collection: str, query: Dict[str, List[str]]) -> Tuple[int, Any]:
+        try:
+            page = max(1, int(_first(query, "page") or 1))
+            per_page = max(1, min(1000, int(_first(query, "perPage") or 30)))
+        except ValueError:
+            return error(400, "Invalid paging parameters.")
+        with self._lock:
+            items = list(self.records.get(collection, {}).values())
+        expression = _first(query, "filter")
+        if expression:
+            try:
+                node = parse(expression)
+            except ValueError as exc:
+                return error(400, f"Invalid filter: {exc}")
+            items = [r for r in items if matches(node, r)]
+        for term in reversed(
+            [t for t in (_first(query, "sort") or "").split(",") if t]
+        ):
+            items.sort(key=_sort_key(term.lstrip("+-")), reverse=term.startswith("-"))
+        total = len(items)
+        window = items[(page - 1) * per_page : page * per_page]
+        skip_total = (_first(query, "skipTotal") or "") in ("1", "true")
+        fields = _first(query, "fields")
+        return 200, {
+            "page": page,
+            "perPage": per_page,
+            "totalItems": -1 if skip_total else total,
+            "totalPages": -1 if skip_total else max(1, -(-total // per_page)),
+            "items": [_project(r, fields) for r in window],
+        }
+
+    def _create(self, collection: str, body: Any) -> Tuple[int, Any]:
+        if not isinstance(body, dict):
+            return error(400, "Failed to create record (JSON body expected).")
+        record = {k: v for k, v in body.items() if not k.endswith(("+", "-"))}
+        record["id"] = record.get("id") or new_record_id()
+        record["collectionName"] = collection
+        record["created"] = record["updated"] = _now()
+        with self._lock:
+            table = self.records.setdefault(collection, {})
+            if record["id"] in table:
+                return error(
+                    400,
+                    "Failed to create record.",
+                    {"id": {"code": "validation_invalid_id", "message": "Invalid id."}},
+                )
+            table[record["id"]] = record
+        return 200, dict(record)
+
+    def _update(self, collection: str, record_id: str, body: Any) -> Tuple[int, Any]:
+        if not isinstance(body, dict):
+            return error(400, "Failed to update record (JSON body expected).")
+        with self._lock:
+            record = self.records.get(collection, {}).get(record_id)
+            if record is None:
+                return error(404, "The requested resource wasn't found.")
+            for key, value in body.items():
+                if key.endswith(("+", "-")):
+                    name = key[:-1]
+                    current = list(record.get(name) or [])
+                    values = value if isinstance(value, list) else [value]
+                    if key.endswith("+"):
+                        current += [v for v in values if v not in current]
+                    else:
+                        current = [v for v in current if v not in values]
+                    record[name] = current
+                elif key != "id":
+                    record[key] = value
+            record["updated"] = _now()
+            return 200, dict(record)
+
+    def _batch(self, body: Any, headers: Dict[str, str]) -> Tuple[int, Any]:
+        """Run sub-requests in order; all or nothing, like a transaction."""
+        requests = (body or {}).get("requests")
+        if not isinstance(requests, list):
+            return error(400, "Invalid batch request.")
+        with self._lock:
+            snapshot = {
+                c: {i: dict(r) for i, r in t.items()} for c, t in self.records.items()
+            }
+            results = []
+            for index, request in enumerate(requests):
+                status, payload, _ = self.handle(
+                    str(request.get("method", "GET")).upper(),
+                    str(request.get("url", "")),
+                    request.get("body"),
+                    headers,
+                )
+                if status >= 400:
+                    self.records = snapshot
+                    return error(
+                        400,
+                        "Batch transaction failed.",
+                        {
+                            "requests": {
+                                str(index): {"code": status, "response": payload}
+                            }
+                        },
+                    )
+                results.append({"status": status, "body": payload})
+        return 200, results
+
+
+def _first(query: Dict[str, List[str]], key: str) -> Optional[str]:
+    values = query.get(key)
+    return values[0] if values else None
+
+
+def _project(record: dict, fields: Optional[str]) -> dict:
+    if not fields:
+        return dict(record)
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    return {n: record[n] for n in names if n in record}
+
+
+def _sort_key(name: str) -> Callable[[dict], Tuple[bool, Any]]:
+    """Sort key on one field, with records missing it first."""
+
+    def key(record: dict) -> Tuple[bool, Any]:
+        return record.get(name) is not None, record.get(name)
+
+    return key
@@ -3,14 +3,46 @@ Token management utilities for PocketBase authentication.
 All tokens are managed in memory only; no disk persistence.
 """
 
-from typing import Optional
+from typing import Any, Optional
+import base64
+import binascii
+import json
 import threading
+import time
+
+
+def decode_token_expiry(token: str) -> Optional[float]:
+    """
+    Decode the ``exp`` claim of a JWT locally, without verifying its signature.
+
+    Args:
+            token (str): The JWT auth token.
+
+    Returns:
+            Optional[float]: Expiry as a Unix timestamp, or None if the token is
+            not a JWT or carries no ``exp`` claim.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims: Any = json.loads(base64.urlsafe_b64decode(payload.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if not isinstance(claims, dict):
+        return None
+    exp = claims.get("exp")
+    if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+        return None
+    return float(exp)
 
 
 class TokenManager:
     """Global in-memory manager for PocketBase auth tokens."""
 
     _token: Optional[str] = None
+    _expires_at: Optional[float] = None
     _lock = threading.Lock()
 
     def __init__(self) -> None:  # pragma: no cover - nothing to initialize
@@ -18,13 +50,15 @@ class TokenManager:
 
     def set_token(self, token: str) -> None:
         """
-        Set the current auth token.
+        Set the current auth token and cache its decoded expiry.
 
         Args:
                 token (str): The auth token to store.
         """
+        expires_at = decode_token_expiry(token)
         with self._lock:
             TokenManager._token = token
+            TokenManager._expires_at = expires_at
 
     def get_token(self) -> Optional[str]:
         """
@@ -36,9 +70,33 @@ class TokenManager:
         with self._lock:
             return TokenManager._token
 
+    def get_expiry(self) -> Optional[float]:
+        """
+        Get the cached expiry of the current auth token.
+
+        Returns:
+                Optional[float]: Unix timestamp, or None if unknown or not logged in.
+        """
+        with self._lock:
+            return TokenManager._expires_at
+
+    def seconds_until_expiry(self) -> Optional[float]:
+        """
+        Get the number of seconds until the current token expires.
+
+        Returns:
+                Optional[float]: Remaining lifetime (negative once expired), or None
+                if there is no token or its expiry cannot be decoded.
+        """
+        expires_at = self.get_expiry()
+        if expires_at is None:
+            return None
+        return expires_at - time.time()
+
     def clear_token(self) -> None:
         """
         Clear the current auth token from memory.
         """
         with self._lock:
             TokenManager._token = None
+            TokenManager._expires_at = None
@@ -1,4 +1,5 @@
 import pytest
+from pocketbase import resilience
 from pocketbase.tokens import TokenManager
 
 
@@ -8,3 +9,12 @@ def reset_token():
     TokenManager().clear_token()
     yield
     TokenManager().clear_token()
+
+
+@pytest.fixture(autouse=True)
+def reset_breaker(monkeypatch):
+    """Start every test with a closed circuit and no retry delays."""
+    monkeypatch.setenv("POCKETBASE_RETRY_BASE_DELAY", "0")
+    resilience.get_breaker().reset()
+    yield
+    resilience.get_breaker().reset()
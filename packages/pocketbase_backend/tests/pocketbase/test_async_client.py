@@ -0,0 +1,143 @@
+"""
+Tests for the async PocketBase clients in async_client.py.
+"""
+
+import asyncio
+import json
+import pytest
+from pocketbase.exceptions import (
+    PocketBaseAuthError,
+    PocketBaseError,
+    PocketBaseNotFoundError,
+)
+
+httpx = pytest.importorskip("httpx")
+
+# pylint: disable=wrong-import-position
+from pocketbase.async_client import AsyncPocketBaseAPI  # noqa: E402
+
+
+def _api(handler, max_concurrency: int = 8) -> AsyncPocketBaseAPI:
+    """Build an API whose HTTP client is served by a mock transport."""
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncPocketBaseAPI(max_concurrency=max_concurrency, http=http)
+
+
+def test_create_and_query_success():
+    """
+    Expected: create and query return the decoded JSON body.
+    """
+
+    def handler(request):
+        if request.method == "POST":
+            body = json.loads(request.content)
+            assert len(body.pop("id")) == 15
+            return httpx.Response(200, json={"id": "rec1", **body})
+        assert request.url.params["filter"] == 'name="foo"'
+        return httpx.Response(200, json={"items": [{"id": "rec1"}], "page": 1})
+
+    async def run():
+        async with _api(handler) as api:
+            created = await api.collections.create("files", {"name": "foo"})
+            result = await api.collections.query("files", filters={"name": "foo"})
+            return created, result
+
+    created, result = asyncio.run(run())
+    assert created == {"id": "rec1", "name": "foo"}
+    assert result["items"] == [{"id": "rec1"}]
+
+
+def test_error_mapping():
+    """
+    Failure: HTTP status codes map to the same exceptions as the sync clients.
+    """
+
+    def handler(request):
+        return httpx.Response(404, text="Not found")
+
+    async def run():
+        async with _api(handler) as api:
+            await api.collections.get("files", "missing")
+
+    with pytest.raises(PocketBaseNotFoundError) as exc:
+        asyncio.run(run())
+    assert "Get failed: 404" in str(exc.value)
+
+
+def test_transport_error_wrapped():
+    """
+    Failure: network errors are wrapped in PocketBaseError.
+    """
+
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def run():
+        async with _api(handler) as api:
+            await api.collections.delete("files", "rec1")
+
+    with pytest.raises(PocketBaseError) as exc:
+        asyncio.run(run())
+    assert "HTTP error during delete" in str(exc.value)
+
+
+def test_concurrency_is_bounded():
+    """
+    Edge: no more than max_concurrency requests are in flight at once.
+    """
+    state = {"current": 0, "peak": 0}
+
+    async def handler(request):
+        state["current"] += 1
+        state["peak"] = max(state["peak"], state["current"])
+        await asyncio.sleep(0.01)
+        state["current"] -= 1
+        return httpx.Response(200, json={"id": "x"})
+
+    async def run():
+        async with _api(handler, max_concurrency=3) as api:
+            await asyncio.gather(
+                *(api.collections.create("files", {"n": i}) for i in range(20))
+            )
+
+    asyncio.run(run())
+    assert state["peak"] == 3
+
+
+def test_unlink_uses_remove_modifier():
+    """
+    Expected: unlink is a single PATCH with the `field-` modifier.
+    """
+    methods = []
+
+    def handler(request):
+        methods.append(request.method)
+        return httpx.Response(200, json={"id": "abc", **json.loads(request.content)})
+
+    async def run():
+        async with _api(handler) as api:
+            return await api.relations.unlink("users", "abc", "friends", "def")
+
+    assert asyncio.run(run()) == {"id": "abc", "friends-": ["def"]}
+    assert methods == ["PATCH"]
+
+
+def test_auth_login_and_failure():
+    """
+    Expected: login stores the token; a rejected login raises PocketBaseAuthError.
+    """
+
+    def ok(request):
+        return httpx.Response(200, json={"token": "tok", "record": {"id": "u1"}})
+
+    def bad(request):
+        return httpx.Response(400, text="Invalid credentials")
+
+    async def run(handler):
+        async with _api(handler) as api:
+            token = await api.auth.login("admin@example.com", "pw")
+            return token, api.auth.user
+
+    assert asyncio.run(run(ok)) == ("tok", {"id": "u1"})
+    with pytest.raises(PocketBaseAuthError):
+        asyncio.run(run(bad))
@@ -2,6 +2,9 @@
 Tests for AuthClient in auth.py.
 """
 
+import base64
+import json
+import time
 from unittest.mock import patch, MagicMock
 import pytest  # type: ignore
 import requests  # type: ignore
@@ -17,7 +20,7 @@ def test_login_success():
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"token": "abc123", "record": {"id": "user1"}}
-    with patch("pocketbase.auth.requests.post", return_value=mock_response):
+    with patch.object(client.session, "post", return_value=mock_response):
         token = client.login("user@example.com", "password")
         assert token == "abc123"
         assert client.get_token() == "abc123"
@@ -32,7 +35,7 @@ def test_login_failure_invalid_credentials():
     mock_response = MagicMock()
     mock_response.status_code = 400
     mock_response.text = "Invalid credentials"
-    with patch("pocketbase.auth.requests.post", return_value=mock_response):
+    with patch.object(client.session, "post", return_value=mock_response):
         with pytest.raises(PocketBaseError) as exc:
             client.login("baduser", "badpass")
         assert "Login failed" in str(exc.value)
@@ -44,8 +47,9 @@ def test_login_http_error():
     """
     client = AuthClient()
 
-    with patch(
-        "pocketbase.auth.requests.post",
+    with patch.object(
+        client.session,
+        "post",
         side_effect=requests.RequestException("Network down"),
     ):
         with pytest.raises(PocketBaseError) as exc:
@@ -80,7 +84,7 @@ def test_is_authenticated_valid_token():
     client.token_manager.set_token("tok")
     mock_resp = MagicMock()
     mock_resp.status_code = 200
-    with patch("pocketbase.auth.requests.post", side_effect=[mock_resp]):
+    with patch.object(client.session, "post", side_effect=[mock_resp]):
         assert client.is_authenticated()
 
 
@@ -91,5 +95,61 @@ def test_is_authenticated_invalid_token():
     resp1.status_code = 401
     resp2 = MagicMock()
     resp2.status_code = 401
-    with patch("pocketbase.auth.requests.post", side_effect=[resp1, resp2]):
+    with patch.object(client.session, "post", side_effect=[resp1, resp2]):
         assert not client.is_authenticated()
+
+
+def _jwt(exp: float) -> str:
+    """Build an unsigned JWT expiring at the given timestamp."""
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode()
+    return f"header.{payload.rstrip('=')}.sig"
+
+
+def test_is_authenticated_jwt_checked_locally():
+    """
+    A JWT far from expiry is validated without any HTTP request.
+    """
+    client = AuthClient()
+    client.token_manager.set_token(_jwt(time.time() + 3600))
+    with patch.object(client.session, "post") as mock_post:
+        assert client.is_authenticated()
+        mock_post.assert_not_called()
+
+
+def test_is_authenticated_jwt_expired():
+    """
+    An expired JWT is rejected locally; it cannot be refreshed any more.
+    """
+    client = AuthClient()
+    client.token_manager.set_token(_jwt(time.time() - 1))
+    with patch.object(client.session, "post") as mock_post:
+        assert not client.is_authenticated()
+        mock_post.assert_not_called()
+
+
+def test_is_authenticated_refreshes_near_expiry_in_background():
+    """
+    A JWT inside the refresh margin stays valid and is refreshed in the background.
+    """
+    client = AuthClient()
+    client.refresh_margin = 300
+    client.token_manager.set_token(_jwt(time.time() + 10))
+    new_token = _jwt(time.time() + 3600)
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = {"token": new_token}
+    with patch.object(client.session, "post", return_value=mock_resp):
+        assert client.is_authenticated()
+        assert client._refresh_thread is not None
+        client._refresh_thread.join(timeout=5)
+    assert client.get_token() == new_token
+
+
+def test_invalidate_clears_token():
+    """
+    invalidate() drops a token the server rejected.
+    """
+    client = AuthClient()
+    client.token_manager.set_token(_jwt(time.time() + 3600))
+    client.invalidate()
+    assert not client.is_authenticated()
@@ -44,7 +44,7 @@ def test_impersonate_success():
         "token": "imp_token",
         "record": {"id": "imp_user"},
     }
-    with patch("pocketbase.auth.requests.post", return_value=mock_response):
+    with patch.object(client.session, "post", return_value=mock_response):
         token = client.impersonate("user_id", superuser_token="super_token")
         assert token == "imp_token"
         assert client.get_token() == "imp_token"
@@ -60,7 +60,7 @@ def test_refresh_token_success():
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"token": "new_token"}
-    with patch("pocketbase.auth.requests.post", return_value=mock_response):
+    with patch.object(client.session, "post", return_value=mock_response):
         token = client.refresh_token()
         assert token == "new_token"
         assert client.get_token() == "new_token"
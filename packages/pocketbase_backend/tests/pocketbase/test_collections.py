@@ -4,7 +4,7 @@ Tests for CollectionsClient in collections.py.
 
 from unittest.mock import patch, MagicMock
 import pytest
-from pocketbase.collections import CollectionsClient
+from pocketbase.collections import MAX_PAGE_SIZE, CollectionsClient
 from pocketbase.exceptions import PocketBaseError
 
 
@@ -16,7 +16,7 @@ def test_create_success():
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"id": "rec1", "foo": "bar"}
-    with patch("pocketbase.collections.requests.post", return_value=mock_response):
+    with patch.object(client.session, "post", return_value=mock_response):
         result = client.create("test", {"foo": "bar"})
         assert result["id"] == "rec1"
         assert result["foo"] == "bar"
@@ -41,7 +41,7 @@ def test_create_api_error():
     mock_response = MagicMock()
     mock_response.status_code = 400
     mock_response.text = "Bad request"
-    with patch("pocketbase.collections.requests.post", return_value=mock_response):
+    with patch.object(client.session, "post", return_value=mock_response):
         with pytest.raises(PocketBaseError):
             client.create("test", {"foo": "bar"})
 
@@ -54,7 +54,7 @@ def test_get_success():
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"id": "rec1", "foo": "bar"}
-    with patch("pocketbase.collections.requests.get", return_value=mock_response):
+    with patch.object(client.session, "get", return_value=mock_response):
         result = client.get("test", "rec1")
         assert result["id"] == "rec1"
 
@@ -78,7 +78,7 @@ def test_get_api_error():
     mock_response = MagicMock()
     mock_response.status_code = 404
     mock_response.text = "Not found"
-    with patch("pocketbase.collections.requests.get", return_value=mock_response):
+    with patch.object(client.session, "get", return_value=mock_response):
         with pytest.raises(PocketBaseError):
             client.get("test", "rec1")
 
@@ -91,7 +91,7 @@ def test_update_success():
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"id": "rec1", "foo": "baz"}
-    with patch("pocketbase.collections.requests.patch", return_value=mock_response):
+    with patch.object(client.session, "patch", return_value=mock_response):
         result = client.update("test", "rec1", {"foo": "baz"})
         assert result["foo"] == "baz"
 
@@ -117,7 +117,7 @@ def test_update_api_error():
     mock_response = MagicMock()
     mock_response.status_code = 400
     mock_response.text = "Bad request"
-    with patch("pocketbase.collections.requests.patch", return_value=mock_response):
+    with patch.object(client.session, "patch", return_value=mock_response):
         with pytest.raises(PocketBaseError):
             client.update("test", "rec1", {"foo": "baz"})
 
@@ -129,7 +129,7 @@ def test_delete_success():
     client = CollectionsClient(token="tok")
     mock_response = MagicMock()
     mock_response.status_code = 204
-    with patch("pocketbase.collections.requests.delete", return_value=mock_response):
+    with patch.object(client.session, "delete", return_value=mock_response):
         assert client.delete("test", "rec1") is None
 
 
@@ -152,7 +152,7 @@ def test_delete_api_error():
     mock_response = MagicMock()
     mock_response.status_code = 400
     mock_response.text = "Bad request"
-    with patch("pocketbase.collections.requests.delete", return_value=mock_response):
+    with patch.object(client.session, "delete", return_value=mock_response):
         with pytest.raises(PocketBaseError):
             client.delete("test", "rec1")
 
@@ -165,7 +165,7 @@ def test_query_success():
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"items": [{"id": "rec1"}], "page": 1}
-    with patch("pocketbase.collections.requests.get", return_value=mock_response):
+    with patch.object(client.session, "get", return_value=mock_response):
         result = client.query("test", filters={"foo": "bar"}, page=1, per_page=10)
         assert "items" in result
         assert result["page"] == 1
@@ -188,6 +188,111 @@ def test_query_api_error():
     mock_response = MagicMock()
     mock_response.status_code = 400
     mock_response.text = "Bad request"
-    with patch("pocketbase.collections.requests.get", return_value=mock_response):
+    with patch.object(client.session, "get", return_value=mock_response):
         with pytest.raises(PocketBaseError):
             client.query("test", filters={"foo": "bar"})
+
+
+def _page(items):
+    """Build a mock 200 response for a records page."""
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.json.return_value = {"items": items, "totalItems": -1, "totalPages": -1}
+    return resp
+
+
+def test_iter_records_streams_all_pages():
+    """
+    Expected: iter_records follows pages until a short page, with skipTotal.
+    """
+    client = CollectionsClient(token="tok")
+    pages = [_page([{"id": "a"}, {"id": "b"}]), _page([{"id": "c"}])]
+    with patch.object(client.session, "get", side_effect=pages) as mock_get:
+        records = list(
+            client.iter_records(
+                "logs", filter={"file_id": "f1"}, sort="-created", page_size=2
+            )
+        )
+    assert [r["id"] for r in records] == ["a", "b", "c"]
+    params = mock_get.call_args_list[0].kwargs["params"]
+    assert params["skipTotal"] == 1
+    assert params["sort"] == "-created"
+    assert params["filter"] == 'file_id="f1"'
+    assert [c.kwargs["params"]["page"] for c in mock_get.call_args_list] == [1, 2]
+
+
+def test_iter_records_uses_total_pages_without_skip_total():
+    """
+    Edge: with skip_total=False the reported totalPages ends the stream.
+    """
+    client = CollectionsClient(token="tok")
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.json.return_value = {"items": [{"id": "a"}], "totalPages": 1}
+    with patch.object(client.session, "get", return_value=resp) as mock_get:
+        assert client.list("logs", page_size=1) == [{"id": "a"}]
+        records = list(client.iter_records("logs", page_size=1, skip_total=False))
+    assert records == [{"id": "a"}]
+    assert "skipTotal" not in mock_get.call_args.kwargs["params"]
+
+
+def test_iter_records_page_size_above_server_cap():
+    """
+    Edge: page_size is clamped to MAX_PAGE_SIZE, and a page as long as the
+    perPage the server applied is not taken for the last one.
+    """
+    client = CollectionsClient(token="tok")
+    first = _page([{"id": "a"}, {"id": "b"}])
+    first.json.return_value["perPage"] = 2
+    with patch.object(
+        client.session, "get", side_effect=[first, _page([])]
+    ) as mock_get:
+        records = list(client.iter_records("logs", page_size=5000))
+    assert [r["id"] for r in records] == ["a", "b"]
+    assert mock_get.call_args_list[0].kwargs["params"]["perPage"] == MAX_PAGE_SIZE
+    assert mock_get.call_count == 2
+
+
+def test_iter_records_api_error():
+    """
+    Failure: an error on any page is raised to the consumer.
+    """
+    client = CollectionsClient(token="tok")
+    bad = MagicMock()
+    bad.status_code = 500
+    bad.text = "boom"
+    with patch.object(
+        client.session, "get", side_effect=[_page([{"id": "a"}]), bad, bad, bad]
+    ):
+        records = client.iter_records("logs", page_size=1)
+        assert next(records)["id"] == "a"
+        with pytest.raises(PocketBaseError):
+            next(records)
+    with pytest.raises(ValueError):
+        next(client.iter_records("", page_size=1))
+
+
+def test_query_projection_sort_expand():
+    """
+    Expected: query forwards fields, sort, expand and a string filter.
+    """
+    client = CollectionsClient(token="tok")
+    with patch.object(client.session, "get", return_value=_page([])) as mock_get:
+        client.query(
+            "logs",
+            filters='created>="2024-01-01"',
+            sort="-created",
+            fields="id,new_path",
+            expand="file_id",
+            skip_total=True,
+        )
+    params = mock_get.call_args.kwargs["params"]
+    assert params == {
+        "filter": 'created>="2024-01-01"',
+        "sort": "-created",
+        "fields": "id,new_path",
+        "expand": "file_id",
+        "page": 1,
+        "perPage": 20,
+        "skipTotal": 1,
+    }
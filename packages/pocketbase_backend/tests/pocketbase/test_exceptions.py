@@ -9,6 +9,7 @@ from pocketbase.exceptions import (
     PocketBaseNotFoundError,
     PocketBaseValidationError,
     PocketBaseServerError,
+    error_for_status,
 )
 
 
@@ -71,3 +72,23 @@ def test_pocketbase_error_hash():
     """
     error = PocketBaseError("error")
     assert isinstance(hash(error), int)
+
+
+@pytest.mark.parametrize(
+    "status_code, expected",
+    [
+        (401, PocketBaseAuthError),
+        (403, PocketBaseAuthError),
+        (404, PocketBaseNotFoundError),
+        (400, PocketBaseValidationError),
+        (503, PocketBaseServerError),
+        (429, PocketBaseError),
+    ],
+)
+def test_error_for_status(status_code, expected):
+    """
+    Test that HTTP status codes map to the most specific exception type.
+    """
+    exc = error_for_status(status_code, "boom")
+    assert type(exc) is expected
+    assert str(exc) == "boom"
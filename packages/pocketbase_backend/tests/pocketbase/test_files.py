@@ -0,0 +1,216 @@
+"""
+Tests for streaming uploads in files.py.
+"""
+
+import hashlib
+from email.parser import BytesParser
+from email.policy import HTTP
+from unittest.mock import MagicMock, patch
+import pytest
+import requests  # type: ignore
+from pocketbase.exceptions import PocketBaseError
+from pocketbase.files import FilesClient, HashMemo, MultipartFileStream
+
+
+def _resp(status, body=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.text = "err"
+    resp.headers = {}
+    resp.json.return_value = body or {}
+    return resp
+
+
+def _consume(url, data, headers, timeout):  # pylint: disable=unused-argument
+    """Drain the streamed body like the HTTP layer would."""
+    body = b"".join(iter(lambda: data.read(8192), b""))
+    assert len(body) == len(data) == int(headers["Content-Length"])
+    _consume.last = (headers["Content-Type"], body)
+    return _resp(200, {"id": "r1"})
+
+
+def test_multipart_stream_is_valid_form_data(tmp_path):
+    """
+    Expected: the body parses as multipart with the file and its digest.
+    """
+    path = tmp_path / "scene.blend"
+    path.write_bytes(b"BLENDER" * 1000)
+    stream = MultipartFileStream(str(path), "file", "file_hash", chunk_size=100)
+    body = stream.read()
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {stream.content_type}\r\n\r\n".encode() + body
+    )
+    parts = list(message.iter_parts())
+    assert parts[0].get_filename() == "scene.blend"
+    assert parts[0].get_payload(decode=True) == b"BLENDER" * 1000
+    digest = hashlib.sha256(b"BLENDER" * 1000).hexdigest()
+    assert parts[1].get_payload(decode=True).decode() == digest
+    assert len(body) == len(stream)
+
+
+def test_upload_streams_then_skips_unchanged_file(tmp_path):
+    """
+    Expected: the first upload streams and hashes; a repeat is skipped.
+    """
+    path = tmp_path / "a.blend"
+    path.write_bytes(b"x" * 5000)
+    client = FilesClient(token="tok")
+    client.hash_memo = HashMemo()
+    with (
+        patch.object(client.session, "patch", side_effect=_consume) as mock_patch,
+        patch.object(client.session, "get", return_value=_resp(200)) as mock_get,
+    ):
+        first = client.upload("files", "r1", str(path))
+        mock_get.return_value = _resp(200, {"id": "r1", "file_hash": first["hash"]})
+        second = client.upload("files", "r1", str(path))
+    assert first["hash"] == hashlib.sha256(b"x" * 5000).hexdigest()
+    assert not first["skipped"] and second["skipped"]
+    assert mock_patch.call_count == 1
+    assert mock_get.call_args.kwargs["params"] == {"fields": "id,file_hash"}
+
+
+def test_upload_skips_file_already_stored_after_restart(tmp_path):
+    """
+    Edge: with no memoized hash, a record already holding the file's hash
+    is detected by hashing the local file instead of uploading it again.
+    """
+    path = tmp_path / "a.blend"
+    path.write_bytes(b"x" * 5000)
+    client = FilesClient(token="tok")
+    client.hash_memo = HashMemo()
+    stored = {"id": "r1", "file_hash": hashlib.sha256(b"x" * 5000).hexdigest()}
+    with (
+        patch.object(client.session, "patch") as mock_patch,
+        patch.object(client.session, "get", return_value=_resp(200, stored)),
+    ):
+        result = client.upload("files", "r1", str(path))
+    assert result["skipped"]
+    mock_patch.assert_not_called()
+
+
+def test_multipart_filename_quotes_are_escaped(tmp_path):
+    """
+    Edge: quotes and line breaks in a file name cannot break the part header.
+    """
+    path = tmp_path / 'take "2".blend'
+    path.write_bytes(b"data")
+    stream = MultipartFileStream(str(path), "file", "file_hash")
+    body = stream.read()
+    assert b'filename="take %222%22.blend"' in body
+    stream.close()
+
+
+def test_upload_errors(tmp_path):
+    """
+    Failure: invalid arguments, missing files and API errors raise.
+    """
+    client = FilesClient(token="tok")
+    with pytest.raises(ValueError):
+        client.upload("", "r1", "x")
+    with pytest.raises(OSError):
+        client.upload("files", "r1", str(tmp_path / "missing.blend"))
+    path = tmp_path / "a.blend"
+    path.write_bytes(b"x")
+    with (
+        patch.object(client.session, "patch", return_value=_resp(400)),
+        patch.object(client.session, "get", return_value=_resp(200)),
+    ):
+        with pytest.raises(PocketBaseError):
+            client.upload("files", "r1", str(path))
+    with patch.object(client.session, "get", return_value=_resp(404)):
+        with pytest.raises(PocketBaseError):
+            client.upload("files", "r1", str(path))
+
+
+def _stream_resp(status, chunks):
+    resp = _resp(status)
+    resp.iter_content.return_value = chunks
+    return resp
+
+
+def _broken(chunks):
+    """Yield chunks, then fail like a dropped connection."""
+    yield from chunks
+    raise requests.ConnectionError("reset")
+
+
+def test_download_resumes_after_interruption(tmp_path):
+    """
+    Expected: a dropped transfer resumes with Range and is verified and renamed.
+    """
+    data = b"a" * 3000 + b"b" * 2000
+    record = {
+        "id": "r1",
+        "file": "a_x1.blend",
+        "file_hash": hashlib.sha256(data).hexdigest(),
+    }
+    client = FilesClient(token="tok")
+    dest = tmp_path / "a.blend"
+    responses = [
+        _stream_resp(200, _broken([data[:3000]])),
+        _stream_resp(206, [data[3000:]]),
+    ]
+    with patch.object(client.session, "get", side_effect=responses) as mock_get:
+        result = client.download("files", "r1", str(dest), record=record)
+    assert dest.read_bytes() == data
+    assert not (tmp_path / "a.blend.part").exists()
+    assert result["resumed"] and result["bytes"] == 5000
+    assert mock_get.call_args.kwargs["headers"]["Range"] == "bytes=3000-"
+    assert mock_get.call_args.args[0].endswith("/api/files/files/r1/a_x1.blend")
+
+
+def test_download_complete_part_and_restart(tmp_path):
+    """
+    Edge: a complete part file gets 416 and is kept; a server ignoring Range
+    makes the download start over.
+    """
+    data = b"payload"
+    record = {
+        "id": "r1",
+        "file": "f.bin",
+        "file_hash": hashlib.sha256(data).hexdigest(),
+    }
+    client = FilesClient(token="tok")
+    dest = tmp_path / "f.bin"
+    (tmp_path / "f.bin.part").write_bytes(data)
+    complete = _stream_resp(416, [])
+    complete.headers = {"Content-Range": "bytes */7"}
+    with patch.object(client.session, "get", return_value=complete):
+        assert client.download("files", "r1", str(dest), record=record)["bytes"] == 7
+    (tmp_path / "f.bin.part").write_bytes(b"stale")
+    with patch.object(client.session, "get", return_value=_stream_resp(200, [data])):
+        client.download("files", "r1", str(dest), record=record)
+    assert dest.read_bytes() == data
+
+
+def test_download_part_longer_than_remote_restarts(tmp_path):
+    """
+    Edge: a 416 for a part file longer than the remote file (no hash to
+    check against) discards the part file and downloads from scratch.
+    """
+    client = FilesClient(token="tok")
+    dest = tmp_path / "f.bin"
+    (tmp_path / "f.bin.part").write_bytes(b"old, longer version")
+    too_long = _stream_resp(416, [])
+    too_long.headers = {"Content-Range": "bytes */3"}
+    with patch.object(
+        client.session, "get", side_effect=[too_long, _stream_resp(200, [b"new"])]
+    ) as mock_get:
+        result = client.download("files", "r1", str(dest), record={"file": "f.bin"})
+    assert dest.read_bytes() == b"new" and result["bytes"] == 3
+    assert "Range" not in mock_get.call_args.kwargs["headers"]
+
+
+def test_download_hash_mismatch(tmp_path):
+    """
+    Failure: a corrupt transfer is discarded and never renamed into place.
+    """
+    record = {"id": "r1", "file": "f.bin", "file_hash": "0" * 64}
+    client = FilesClient(token="tok")
+    dest = tmp_path / "f.bin"
+    with patch.object(client.session, "get", return_value=_stream_resp(200, [b"x"])):
+        with pytest.raises(PocketBaseError):
+            client.download("files", "r1", str(dest), record=record)
+    assert not dest.exists() and not (tmp_path / "f.bin.part").exists()
+    with pytest.raises(ValueError):
+        client.download("files", "r1", str(dest), record={"id": "r1", "file": ""})
@@ -0,0 +1,72 @@
+"""
+Tests for the filter expression builders in filters.py.
+"""
+
+from datetime import datetime
+import pytest
+from pocketbase import filters
+
+
+def test_literal_escapes_quotes():
+    """
+    Expected: string literals are quoted and embedded quotes escaped.
+    """
+    assert filters.literal('say "hi"') == '"say \\"hi\\""'
+    assert filters.literal(10) == "10"
+    assert filters.literal(True) == "true"
+    assert filters.literal(None) == "null"
+    assert (
+        filters.literal(datetime(2024, 1, 2, 3, 4, 5)) == '"2024-01-02 03:04:05.000Z"'
+    )
+
+
+def test_injection_stays_inside_literal():
+    """
+    Edge: a crafted value cannot add an `||` clause to the expression.
+    """
+    expr = filters.from_mapping({"path": '" || id != "'})
+    assert expr == 'path="\\" || id != \\""'
+
+
+def test_combinators_and_operators():
+    """
+    Expected: ranges, like and any_of produce parenthesised expressions.
+    """
+    assert filters.between("size", 1, 5) == "(size>=1) && (size<=5)"
+    assert filters.like("path", "shots/") == 'path~"shots/"'
+    expr = filters.any_of(filters.cond("a", "=", 1), filters.cond("b", "!=", "x"))
+    assert expr == '(a=1) || (b!="x")'
+    assert filters.all_of("", "a=1") == "a=1"
+    assert (
+        filters.from_mapping({"t": ["x", "y"], "n": 2}) == '((t="x") || (t="y")) && n=2'
+    )
+
+
+def test_invalid_inputs():
+    """
+    Failure: unknown operators, field names and values raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        filters.cond("a", "==", 1)
+    with pytest.raises(ValueError):
+        filters.cond("a=1 ||", "=", 1)
+    with pytest.raises(ValueError):
+        filters.literal(object())
+    with pytest.raises(ValueError):
+        filters.literal("C:\\dir\\")
+
+
+def test_parse_round_trips_builders():
+    """
+    Expected: expressions from the builders parse back and evaluate like
+    the server would, including escaped quotes and backslashes.
+    """
+    expr = filters.all_of(
+        filters.from_mapping({"type": ["file", "dir"]}),
+        filters.like("path", 'C:\\say "hi"'),
+    )
+    node = filters.parse(expr)
+    assert filters.matches(node, {"type": "dir", "path": 'c:\\Say "HI".blend'})
+    assert not filters.matches(node, {"type": "link", "path": 'C:\\say "hi"'})
+    with pytest.raises(ValueError):
+        filters.parse("a = 1 &&")
@@ -0,0 +1,71 @@
+"""
+Tests for readiness probing in health.py and PocketBaseManager.start.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+import pytest
+import requests  # type: ignore
+from pocketbase.exceptions import PocketBaseStartupError
+from pocketbase.health import check_health, wait_until_ready
+from pocketbase.pocketbase_manager import PocketBaseManager
+
+
+def test_wait_until_ready_returns_once_healthy():
+    """
+    Expected: readiness returns as soon as the probe succeeds.
+    """
+    probe = MagicMock(side_effect=[False, False, True])
+    elapsed = wait_until_ready("http://pb", timeout=5, probe=probe)
+    assert probe.call_count == 3
+    assert elapsed < 1
+
+
+def test_check_health_handles_errors():
+    """
+    Edge: connection errors and non-200 answers mean "not ready".
+    """
+    session = MagicMock()
+    session.get.side_effect = requests.ConnectionError("refused")
+    assert check_health("http://pb", session=session) is False
+    session.get.side_effect = None
+    session.get.return_value = MagicMock(status_code=200)
+    assert check_health("http://pb/", session=session) is True
+    assert session.get.call_args.args[0] == "http://pb/api/health"
+
+
+def test_wait_until_ready_failures_include_stderr():
+    """
+    Failure: an exited process or a missed deadline raise with server output.
+    """
+    process = MagicMock()
+    process.poll.return_value = 1
+    process.returncode = 1
+    with pytest.raises(
+        PocketBaseStartupError, match="exited with code 1 during startup: bad flag"
+    ):
+        wait_until_ready(
+            "http://pb",
+            timeout=5,
+            process=process,
+            stderr=lambda: "bad flag\n",
+            probe=lambda _url: False,
+        )
+    with pytest.raises(PocketBaseStartupError, match="not ready within 0.05s"):
+        wait_until_ready("http://pb", timeout=0.05, probe=lambda _url: False)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script")
+def test_manager_start_surfaces_stderr(tmp_path):
+    """
+    Failure: a server that dies on startup reports its stderr.
+    """
+    binary = tmp_path / "pocketbase"
+    binary.write_text("#!/bin/sh\necho 'address already in use' >&2\nexit 2\n")
+    os.chmod(binary, 0o755)
+    manager = PocketBaseManager(binary_path=str(binary), port=1)
+    with patch("pocketbase.health.check_health", return_value=False):
+        with pytest.raises(PocketBaseStartupError, match="address already in use"):
+            manager.start(timeout=5)
+    assert manager.process is None
@@ -0,0 +1,130 @@
+"""
+Tests for RealtimeClient and the SSE parser in realtime.py.
+"""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+import pytest
+from pocketbase.exceptions import PocketBaseAuthError
+from pocketbase.realtime import RealtimeClient, RealtimeEvent, iter_sse
+
+
+def _stream(lines, status=200):
+    """Build a mock streaming response yielding the given SSE lines."""
+    resp = MagicMock()
+    resp.status_code = status
+    resp.text = "denied"
+    resp.iter_lines.return_value = iter(lines)
+    return resp
+
+
+CONNECT = ["id:c1", "event:PB_CONNECT", 'data:{"clientId":"c1"}', ""]
+CREATED = [
+    "event: rename_logs",
+    'data: {"action":"create","record":{"id":"l1","updated":"2024-01-01 00:00:00.000Z"}}',
+    "",
+]
+
+
+def _client():
+    ok = MagicMock()
+    ok.status_code = 204
+    session = MagicMock()
+    session.post.return_value = ok
+    return RealtimeClient(token="tok", session=session, stream_session=MagicMock())
+
+
+def test_iter_sse_parses_events():
+    """
+    Expected: multi-line data, comments and ids are handled.
+    """
+    lines = [": ping", "event: a", "data: 1", "data: 2", "id: x", "", "data: 3"]
+    assert list(iter_sse(lines)) == [("a", "1\n2", "x"), ("message", "3", "x")]
+
+
+def test_listen_subscribes_and_dispatches():
+    """
+    Expected: PB_CONNECT submits topics and later events reach callbacks.
+    """
+    client = _client()
+    received = []
+    client.subscribe("rename_logs", received.append)
+    client.stream_session.get.return_value = _stream(CONNECT + CREATED)
+    assert client._listen() is True  # pylint: disable=protected-access
+    body = client.session.post.call_args.kwargs["json"]
+    assert body == {"clientId": "c1", "subscriptions": ["rename_logs"]}
+    assert received == [
+        RealtimeEvent(
+            "rename_logs",
+            "create",
+            {"id": "l1", "updated": "2024-01-01 00:00:00.000Z"},
+        )
+    ]
+
+
+def test_reconnect_resumes_from_last_update():
+    """
+    Edge: after a reconnect, records updated since the last event are replayed.
+    """
+    client = _client()
+    received = []
+    client.subscribe("rename_logs", received.append)
+    client.stream_session.get.return_value = _stream(CONNECT + CREATED)
+    client._listen()  # pylint: disable=protected-access
+    client.reconnects = 1
+    client.stream_session.get.return_value = _stream(CONNECT)
+    with patch(
+        "pocketbase.realtime.CollectionsClient.iter_records",
+        return_value=iter([{"id": "l2"}]),
+    ) as mock_iter:
+        client._listen()  # pylint: disable=protected-access
+    assert mock_iter.call_args.kwargs["filter"] == 'updated>"2024-01-01 00:00:00.000Z"'
+    assert received[-1] == RealtimeEvent("rename_logs", "resume", {"id": "l2"})
+
+
+def test_connect_rejected_and_callback_errors_isolated():
+    """
+    Failure: an auth error is raised; a failing callback does not stop others.
+    """
+    client = _client()
+    client.stream_session.get.return_value = _stream([], status=403)
+    with pytest.raises(PocketBaseAuthError):
+        client._listen()  # pylint: disable=protected-access
+    good = []
+
+    def bad(_event):
+        raise RuntimeError("boom")
+
+    client.subscribe("files", bad)
+    client.subscribe("files", good.append)
+    client._dispatch(RealtimeEvent("files", "update"))  # pylint: disable=protected-access
+    assert len(good) == 1
+
+
+def test_async_events_iterator():
+    """
+    Expected: events() yields pushed changes to asyncio consumers.
+    """
+    client = _client()
+    connected = threading.Event()
+    client.stream_session.get.side_effect = lambda *a, **k: (
+        connected.wait(1),
+        _stream(CONNECT + CREATED),
+    )[1]
+
+    async def consume():
+        stream = client.events("rename_logs")
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        connected.set()
+        event = await asyncio.wait_for(pending, 2)
+        await stream.aclose()
+        return event
+
+    try:
+        event = asyncio.run(consume())
+    finally:
+        client.stop()
+    assert event.action == "create"
+    assert client.topics() == []
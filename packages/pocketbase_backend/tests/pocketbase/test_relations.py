@@ -28,7 +28,7 @@ def test_link_expected(client: RelationsClient) -> None:
     Args:
         client: The test client fixture.
     """
-    with patch("pocketbase.relations.requests.patch") as mock_patch:
+    with patch.object(client.session, "patch") as mock_patch:
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.json.return_value = {"id": "abc", "friends": ["def"]}
@@ -36,6 +36,7 @@ def test_link_expected(client: RelationsClient) -> None:
         result = client.link("users", "abc", "friends", "def")
         assert result == {"id": "abc", "friends": ["def"]}
         mock_patch.assert_called_once()
+        assert mock_patch.call_args.kwargs["json"] == {"friends+": ["def"]}
 
 
 def test_link_invalid_args(client: RelationsClient) -> None:
@@ -62,7 +63,7 @@ def test_link_api_error(client: RelationsClient) -> None:
     Args:
         client (RelationsClient): The test client fixture.
     """
-    with patch("pocketbase.relations.requests.patch") as mock_patch:
+    with patch.object(client.session, "patch") as mock_patch:
         mock_resp = MagicMock()
         mock_resp.status_code = 400
         mock_resp.text = "Bad Request"
@@ -73,27 +74,23 @@ def test_link_api_error(client: RelationsClient) -> None:
 
 def test_unlink_expected(client: RelationsClient) -> None:
     """
-    Test the unlink function for expected behavior.
+    Test that unlink sends a single PATCH with the remove modifier.
 
     Args:
         client: The test client fixture.
     """
     with (
-        patch("pocketbase.relations.requests.get") as mock_get,
-        patch("pocketbase.relations.requests.patch") as mock_patch,
+        patch.object(client.session, "get") as mock_get,
+        patch.object(client.session, "patch") as mock_patch,
     ):
-        mock_get_resp = MagicMock()
-        mock_get_resp.status_code = 200
-        mock_get_resp.json.return_value = {"id": "abc", "friends": ["def", "ghi"]}
-        mock_get.return_value = mock_get_resp
         mock_patch_resp = MagicMock()
         mock_patch_resp.status_code = 200
         mock_patch_resp.json.return_value = {"id": "abc", "friends": ["ghi"]}
         mock_patch.return_value = mock_patch_resp
         result = client.unlink("users", "abc", "friends", "def")
         assert result == {"id": "abc", "friends": ["ghi"]}
-        mock_get.assert_called_once()
-        mock_patch.assert_called_once()
+        mock_get.assert_not_called()
+        assert mock_patch.call_args.kwargs["json"] == {"friends-": ["def"]}
 
 
 def test_unlink_invalid_args(client: RelationsClient) -> None:
@@ -120,22 +117,7 @@ def test_unlink_api_error(client: RelationsClient) -> None:
     Args:
         client (RelationsClient): The test client fixture.
     """
-    with patch("pocketbase.relations.requests.get") as mock_get:
-        mock_get_resp = MagicMock()
-        mock_get_resp.status_code = 400
-        mock_get_resp.text = "Bad Request"
-        mock_get.return_value = mock_get_resp
-        with pytest.raises(PocketBaseError):
-            client.unlink("users", "abc", "friends", "def")
-
-    with (
-        patch("pocketbase.relations.requests.get") as mock_get,
-        patch("pocketbase.relations.requests.patch") as mock_patch,
-    ):
-        mock_get_resp = MagicMock()
-        mock_get_resp.status_code = 200
-        mock_get_resp.json.return_value = {"id": "abc", "friends": ["def"]}
-        mock_get.return_value = mock_get_resp
+    with patch.object(client.session, "patch") as mock_patch:
         mock_patch_resp = MagicMock()
         mock_patch_resp.status_code = 400
         mock_patch_resp.text = "Bad Patch"
@@ -144,17 +126,21 @@ def test_unlink_api_error(client: RelationsClient) -> None:
             client.unlink("users", "abc", "friends", "def")
 
 
-def test_unlink_relation_not_list(client: RelationsClient) -> None:
+def test_link_many_and_unlink_many(client: RelationsClient) -> None:
     """
-    Test the unlink function when the relation is not a list to ensure correct error handling.
+    Test that bulk edits dedupe ids into one append/remove request.
 
     Args:
         client (RelationsClient): The test client fixture.
     """
-    with patch("pocketbase.relations.requests.get") as mock_get:
-        mock_get_resp = MagicMock()
-        mock_get_resp.status_code = 200
-        mock_get_resp.json.return_value = {"id": "abc", "friends": "notalist"}
-        mock_get.return_value = mock_get_resp
-        with pytest.raises(PocketBaseError):
-            client.unlink("users", "abc", "friends", "def")
+    with patch.object(client.session, "patch") as mock_patch:
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.json.return_value = {"id": "abc"}
+        mock_patch.return_value = mock_resp
+        client.link_many("users", "abc", "friends", ["d", "e", "d"])
+        assert mock_patch.call_args.kwargs["json"] == {"friends+": ["d", "e"]}
+        client.unlink_many("users", "abc", "friends", ("d",))
+        assert mock_patch.call_args.kwargs["json"] == {"friends-": ["d"]}
+    with pytest.raises(ValueError):
+        client.link_many("users", "abc", "friends", [])
@@ -0,0 +1,132 @@
+"""
+Tests for retries and the circuit breaker in resilience.py.
+"""
+
+from unittest.mock import MagicMock, patch
+import pytest
+import requests  # type: ignore
+from pocketbase import resilience
+from pocketbase.collections import CollectionsClient
+from pocketbase.exceptions import (
+    CircuitOpenError,
+    PocketBaseServerError,
+    PocketBaseValidationError,
+)
+
+
+def _resp(status, body=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.text = "err"
+    resp.headers = {}
+    resp.json.return_value = body or {}
+    return resp
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_transient_errors_are_retried():
+    """
+    Expected: a 503 followed by a success returns the success.
+    """
+    send = MagicMock(
+        side_effect=[_resp(503), requests.ConnectionError("x"), _resp(200)]
+    )
+    resp = resilience.call(send, "get", breaker=resilience.CircuitBreaker())
+    assert resp.status_code == 200
+    assert send.call_count == 3
+
+
+def test_non_idempotent_and_client_errors_not_retried():
+    """
+    Edge: 4xx responses and non-idempotent requests make a single attempt.
+    """
+    send = MagicMock(return_value=_resp(400))
+    with pytest.raises(PocketBaseValidationError):
+        resilience.call(send, "create", breaker=resilience.CircuitBreaker())
+    send = MagicMock(return_value=_resp(500))
+    with pytest.raises(PocketBaseServerError):
+        resilience.call(send, "create", idempotent=False)
+    assert send.call_count == 1
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    """
+    Failure: after the threshold the breaker fails fast, then half-opens.
+    """
+    clock = FakeClock()
+    breaker = resilience.CircuitBreaker(
+        failure_threshold=2, reset_timeout=5, clock=clock
+    )
+    states = []
+    breaker.add_listener(states.append)
+    send = MagicMock(return_value=_resp(503))
+    with pytest.raises(PocketBaseServerError):
+        resilience.call(send, "get", breaker=breaker)
+    assert breaker.state == resilience.OPEN
+    assert send.call_count == 2
+    with pytest.raises(CircuitOpenError):
+        resilience.call(send, "get", breaker=breaker)
+    clock.now = 5
+    assert breaker.state == resilience.HALF_OPEN
+    send.return_value = _resp(200)
+    resilience.call(send, "get", breaker=breaker)
+    assert breaker.state == resilience.CLOSED
+    assert states == [resilience.OPEN, resilience.HALF_OPEN, resilience.CLOSED]
+
+
+def test_unexpected_error_frees_the_half_open_trial():
+    """
+    Failure: an exception that is neither a response nor a transport error
+    does not leave the half-open trial taken forever.
+    """
+    clock = FakeClock()
+    breaker = resilience.CircuitBreaker(
+        failure_threshold=1, reset_timeout=5, clock=clock
+    )
+    breaker.record_failure()
+    clock.now = 5
+    with pytest.raises(KeyError):
+        resilience.call(MagicMock(side_effect=KeyError("x")), "get", breaker=breaker)
+    resp = resilience.call(MagicMock(return_value=_resp(200)), "get", breaker=breaker)
+    assert resp.status_code == 200
+    assert breaker.state == resilience.CLOSED
+
+
+def test_client_resolves_retry_policy_once():
+    """
+    Edge: a client reads its retry policy from the environment when it is
+    created, not on every request.
+    """
+    with patch.object(
+        resilience.RetryPolicy, "from_env", wraps=resilience.RetryPolicy.from_env
+    ) as from_env:
+        client = CollectionsClient(token="tok")
+        with patch.object(client.session, "get", return_value=_resp(200)):
+            client.get("files", "a")
+            client.get("files", "b")
+    assert from_env.call_count == 1
+
+
+def test_retried_create_recovers_committed_record():
+    """
+    Edge: when a retry hits the id it already committed, the record is fetched.
+    """
+    client = CollectionsClient(token="tok")
+    posts = [_resp(502), _resp(400)]
+    with (
+        patch.object(client.session, "post", side_effect=posts) as mock_post,
+        patch.object(
+            client.session, "get", return_value=_resp(200, {"id": "x", "name": "a"})
+        ),
+    ):
+        record = client.create("files", {"name": "a"})
+    ids = {c.kwargs["json"]["id"] for c in mock_post.call_args_list}
+    assert len(ids) == 1
+    assert record == {"id": "x", "name": "a"}
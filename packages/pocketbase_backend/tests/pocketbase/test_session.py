@@ -0,0 +1,60 @@
+"""
+Unit tests for the shared pooled HTTP session in session.py.
+"""
+
+from typing import cast
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from requests.adapters import HTTPAdapter
+from pocketbase.session import create_session, get_session, reset_session
+from pocketbase.collections import CollectionsClient
+from pocketbase.relations import RelationsClient
+from pocketbase.auth import AuthClient
+
+
+def test_create_session_pool_and_headers():
+    """
+    Expected: pool size and compression settings are applied to the session.
+    """
+    session = create_session(pool_size=4, compression=False)
+    adapter = cast(HTTPAdapter, session.get_adapter("http://127.0.0.1:8090"))
+    assert adapter._pool_maxsize == 4  # pylint: disable=protected-access
+    assert session.headers["Connection"] == "keep-alive"
+    assert session.headers["Accept-Encoding"] == "identity"
+    assert "gzip" in create_session(compression=True).headers["Accept-Encoding"]
+
+
+def test_create_session_from_env(monkeypatch: MonkeyPatch):
+    """
+    Edge: defaults are read from the environment.
+    """
+    monkeypatch.setenv("POCKETBASE_POOL_SIZE", "7")
+    monkeypatch.setenv("POCKETBASE_HTTP_COMPRESSION", "0")
+    session = create_session()
+    adapter = cast(HTTPAdapter, session.get_adapter("http://x"))
+    assert adapter._pool_maxsize == 7  # pylint: disable=protected-access
+    assert session.headers["Accept-Encoding"] == "identity"
+
+
+def test_create_session_invalid_pool_size():
+    """
+    Failure: a non-positive pool size raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        create_session(pool_size=0)
+
+
+def test_clients_share_session():
+    """
+    Expected: all clients reuse the process-wide session unless given one.
+    """
+    reset_session()
+    shared = get_session()
+    assert CollectionsClient().session is shared
+    assert RelationsClient().session is shared
+    assert AuthClient().session is shared
+    own = create_session(pool_size=1)
+    assert CollectionsClient(session=own).session is own
+    reset_session()
+    assert get_session() is not shared
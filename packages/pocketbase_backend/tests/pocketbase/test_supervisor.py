@@ -0,0 +1,89 @@
+"""
+Tests for PocketBaseSupervisor and the manager's output ring buffer.
+"""
+
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+import pytest
+from pocketbase.exceptions import PocketBaseStartupError
+from pocketbase.pocketbase_manager import PocketBaseManager
+from pocketbase.supervisor import PocketBaseSupervisor
+
+
+def make_manager(running=True):
+    manager = MagicMock()
+    manager.base_url = "http://pb"
+    manager.is_running.return_value = running
+    manager.recent_output.return_value = ""
+    return manager
+
+
+def test_supervisor_restarts_after_repeated_failures():
+    """
+    Expected: failed health checks past the threshold trigger a restart and
+    listeners see down then up.
+    """
+    manager = make_manager()
+    states = []
+    supervisor = PocketBaseSupervisor(
+        manager, check_interval=0.01, failure_threshold=2, probe=lambda _url: False
+    )
+    supervisor.add_listener(states.append)
+    supervisor.start()
+    deadline = time.monotonic() + 2
+    while supervisor.restarts == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    supervisor.stop()
+    assert supervisor.restarts >= 1
+    assert states[:3] == ["up", "down", "up"]
+
+
+def test_supervisor_restart_backs_off_on_failure():
+    """
+    Failure: a server that fails to start is retried with growing delays.
+    """
+    manager = make_manager(running=False)
+    manager.process = None
+    manager.start.side_effect = [
+        PocketBaseStartupError("boom"),
+        PocketBaseStartupError("boom"),
+        None,
+    ]
+    supervisor = PocketBaseSupervisor(
+        manager, check_interval=1, restart_backoff=0.01, max_backoff=0.02
+    )
+    waits = []
+    real_wait = supervisor._stop.wait
+    supervisor._stop.wait = lambda t: waits.append(t) or real_wait(0)
+    supervisor.restart()
+    assert manager.start.call_count == 3
+    assert waits == [0.01, 0.02]
+    assert supervisor.state == "up"
+
+
+def test_supervisor_listener_errors_do_not_stop_notifications():
+    """
+    Edge: a failing listener does not prevent the others from running.
+    """
+    supervisor = PocketBaseSupervisor(make_manager(), check_interval=1)
+    seen = []
+    supervisor.add_listener(MagicMock(side_effect=RuntimeError("bad")))
+    supervisor.add_listener(seen.append)
+    supervisor._set_state("up")
+    assert seen == ["up"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script")
+def test_manager_drains_output_into_ring_buffer(tmp_path):
+    """
+    Expected: server output is drained continuously and only the last lines kept.
+    """
+    binary = tmp_path / "pocketbase"
+    binary.write_text("#!/bin/sh\nfor i in 1 2 3 4 5; do echo line$i; done\nexit 1\n")
+    os.chmod(binary, 0o755)
+    manager = PocketBaseManager(binary_path=str(binary), port=1, output_lines=2)
+    with pytest.raises(PocketBaseStartupError, match="line4\nline5"):
+        manager.start(timeout=5)
+    assert manager.recent_output() == "line4\nline5"
@@ -0,0 +1,195 @@
+"""
+Tests for the FakePocketBase stand-in server, driven by the real clients.
+"""
+
+import time
+import pytest
+import requests  # type: ignore
+from pocketbase.auth import AuthClient
+from pocketbase.collections import CollectionsClient
+from pocketbase.exceptions import (
+    PocketBaseAuthError,
+    PocketBaseNotFoundError,
+    PocketBaseServerError,
+)
+from pocketbase.relations import RelationsClient
+from pocketbase.testing import FakePocketBase
+
+RECORDS = "POST /api/collections/{collection}/records"
+
+
+@pytest.fixture
+def pb(monkeypatch):
+    with FakePocketBase() as server:
+        monkeypatch.setenv("POCKETBASE_URL", server.url)
+        yield server
+
+
+@pytest.fixture
+def logged_in(pb):
+    AuthClient().login(pb.admin_email, pb.admin_password)
+    return pb
+
+
+def test_crud_and_queries_through_clients(logged_in):
+    """
+    Expected: CollectionsClient and RelationsClient work against the stand-in.
+    """
+    client = CollectionsClient()
+    a = client.create("files", {"name": "a.blend", "path": "/a.blend", "size": 3})
+    client.create("files", {"name": "b.blend", "path": "/b.blend", "size": 1})
+    client.update("files", a["id"], {"size": 5})
+    assert client.get("files", a["id"])["size"] == 5
+    listed = client.list("files", filter='size >= 2 || name ~ "b."', sort="-size")
+    assert [r["name"] for r in listed] == ["a.blend", "b.blend"]
+    assert list(client.iter_records("files", fields="name", page_size=1)) == [
+        {"name": "a.blend"},
+        {"name": "b.blend"},
+    ]
+    RelationsClient().link_many("files", a["id"], "tags", ["t1", "t2"])
+    assert client.get("files", a["id"])["tags"] == ["t1", "t2"]
+    client.delete("files", a["id"])
+    assert logged_in.request_count(RECORDS) == 2
+
+
+def test_auth_login_refresh_and_rejection(pb):
+    """
+    Expected: login and refresh issue tokens; bad credentials and missing
+    tokens are rejected.
+    """
+    auth = AuthClient()
+    with pytest.raises(PocketBaseAuthError):
+        auth.login(pb.admin_email, "wrong")
+    with pytest.raises(PocketBaseAuthError):
+        CollectionsClient().list("files")
+    token = auth.login(pb.admin_email, pb.admin_password)
+    assert auth.token_manager.seconds_until_expiry() > 3000
+    assert auth.refresh_token() != token
+
+
+def test_injected_errors_are_retried_and_counted(logged_in):
+    """
+    Failure: transient errors are served as configured, and the client's
+    retries show up in the request accounting.
+    """
+    rule = logged_in.inject_error(503, method="GET", path=r"/records/", count=2)
+    client = CollectionsClient()
+    rec = client.create("files", {"name": "a"})
+    logged_in.reset_stats()
+    assert client.get("files", rec["id"])["name"] == "a"
+    assert rule.count == 0
+    assert logged_in.statuses[503] == 2
+    assert logged_in.request_count() == 3
+    logged_in.inject_error(500, count=-1)
+    with pytest.raises(PocketBaseServerError):
+        client.get("files", rec["id"])
+
+
+def test_probabilistic_errors_are_seeded():
+    """
+    Edge: probability-based injection fails a reproducible share of requests.
+    """
+    shares = []
+    for _ in range(2):
+        with FakePocketBase(seed=7, require_auth=False) as pb:
+            pb.inject_error(503, count=-1, probability=0.3)
+            for _ in range(50):
+                requests.get(f"{pb.url}/api/health", timeout=5)
+            shares.append(pb.statuses[503])
+    assert shares[0] == shares[1]
+    assert 5 <= shares[0] <= 30
+
+
+def test_batch_through_client(logged_in):
+    """
+    Expected: CollectionsClient.batch applies its sub-requests in order.
+    """
+    client = CollectionsClient()
+    url = "/api/collections/files/records"
+    results = client.batch(
+        [
+            {"method": "POST", "url": url, "body": {"id": "a" * 15, "size": 1}},
+            {"method": "PATCH", "url": f"{url}/{'a' * 15}", "body": {"size": 2}},
+        ]
+    )
+    assert [r["status"] for r in results] == [200, 200]
+    assert client.get("files", "a" * 15)["size"] == 2
+    assert logged_in.request_count("POST /api/batch") == 1
+    with pytest.raises(ValueError):
+        client.batch([])
+
+
+def test_batch_sub_request_error_type(logged_in):
+    """
+    Failure: a batch whose PATCH targets a missing record raises
+    PocketBaseNotFoundError and applies none of its writes.
+    """
+    client = CollectionsClient()
+    url = "/api/collections/files/records"
+    with pytest.raises(PocketBaseNotFoundError):
+        client.batch(
+            [
+                {"method": "POST", "url": url, "body": {"id": "b" * 15}},
+                {"method": "PATCH", "url": f"{url}/{'c' * 15}", "body": {"size": 2}},
+            ]
+        )
+    assert client.list("files") == []
+
+
+def test_batch_is_all_or_nothing(logged_in):
+    """
+    Edge: a failing sub-request rolls back the whole batch.
+    """
+    headers = {"Authorization": AuthClient().token_manager.get_token()}
+    url = f"{logged_in.url}/api/batch"
+    ok = requests.post(
+        url,
+        json={
+            "requests": [
+                {
+                    "method": "POST",
+                    "url": "/api/collections/logs/records",
+                    "body": {"n": 1},
+                },
+                {
+                    "method": "POST",
+                    "url": "/api/collections/logs/records",
+                    "body": {"n": 2},
+                },
+            ]
+        },
+        headers=headers,
+        timeout=5,
+    )
+    assert ok.status_code == 200 and len(ok.json()) == 2
+    bad = requests.post(
+        url,
+        json={
+            "requests": [
+                {
+                    "method": "POST",
+                    "url": "/api/collections/logs/records",
+                    "body": {"n": 3},
+                },
+                {
+                    "method": "PATCH",
+                    "url": "/api/collections/logs/records/nope",
+                    "body": {},
+                },
+            ]
+        },
+        headers=headers,
+        timeout=5,
+    )
+    assert bad.status_code == 400
+    assert len(logged_in.records["logs"]) == 2
+
+
+def test_latency_is_applied(pb):
+    """
+    Expected: configured latency delays every response.
+    """
+    pb.latency = 0.05
+    start = time.perf_counter()
+    requests.get(f"{pb.url}/api/health", timeout=5)
+    assert time.perf_counter() - start >= 0.05
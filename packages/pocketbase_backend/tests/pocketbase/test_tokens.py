@@ -2,8 +2,11 @@
 Unit tests for TokenManager (token management utilities).
 """
 
+import base64
+import json
 import threading
-from pocketbase.tokens import TokenManager
+import time
+from pocketbase.tokens import TokenManager, decode_token_expiry
 
 
 def test_token_manager_set_and_get():
@@ -32,3 +35,42 @@ def test_token_manager_thread_safety():
     for t in threads:
         t.join()
     assert tm.get_token() == "thread"
+
+
+def _jwt(payload: dict) -> str:
+    """Build an unsigned JWT carrying the given payload."""
+
+    def encode(part: dict) -> str:
+        raw = json.dumps(part).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(payload)}.sig"
+
+
+def test_decode_token_expiry_jwt():
+    """
+    Test that the exp claim is decoded from a JWT without network access.
+    """
+    assert decode_token_expiry(_jwt({"exp": 1700000000})) == 1700000000.0
+
+
+def test_decode_token_expiry_invalid():
+    """
+    Test that opaque or malformed tokens have no decodable expiry.
+    """
+    assert decode_token_expiry("tok") is None
+    assert decode_token_expiry("a.!!!.c") is None
+    assert decode_token_expiry(_jwt({"id": "user1"})) is None
+
+
+def test_token_manager_tracks_expiry():
+    """
+    Test that set_token caches the expiry and clear_token drops it.
+    """
+    tm = TokenManager()
+    tm.set_token(_jwt({"exp": time.time() + 60}))
+    remaining = tm.seconds_until_expiry()
+    assert remaining is not None and 0 < remaining <= 60
+    tm.clear_token()
+    assert tm.get_expiry() is None
+    assert tm.seconds_until_expiry() is None
@@ -4,12 +4,22 @@ Public API for rename_watcher.
 
 from typing import Any, Callable, Dict, List, Optional
 import os
+import stat
 
 import structlog  # type: ignore
 
+from .config import (
+    get_path_matcher,
+    ignored_dir_matcher,
+    patterns_loosened,
+    scan_roots,
+)
+from .digests import DigestTree, Entry
+from .fingerprint import Fingerprinter
 from .watcher import Watcher
 from .path_map import PathInodeMap
 from .event_processor import EventProcessor
+from .metrics import get_metrics
 
 
 class RenameWatcherAPI:  # pylint: disable=too-many-instance-attributes
@@ -22,13 +32,31 @@ class RenameWatcherAPI:  # pylint: disable=too-many-instance-attributes
         self,
         path: Optional[str] = None,
         matcher: Optional[Callable[[str], bool]] = None,
+        patterns: Optional[Dict[str, Any]] = None,
+        fingerprinter: Optional[Fingerprinter] = None,
     ) -> None:
+        """
+        Args:
+            path (Optional[str]): Directory to watch (cwd by default).
+            matcher (Optional[Callable[[str], bool]]): Path filter.
+            patterns (Optional[Dict[str, Any]]): Include/ignore patterns the
+                matcher was built from (compiled if no matcher is given);
+                lets apply_patterns() skip rescans that cannot find anything.
+            fingerprinter (Optional[Fingerprinter]): Pairs deletes and
+                creates by content (moves across devices, copy then delete).
+        """
         self.logger = structlog.get_logger("RenameWatcherAPI")
         self._subscribers: List[Callable[[Any], None]] = []
+        if matcher is None and patterns is not None:
+            matcher = get_path_matcher(patterns)
         self._matcher = matcher
+        self._patterns = patterns
         self._path = path or os.getcwd()
         self._path_map = PathInodeMap()
-        self._event_processor = EventProcessor(self._path_map, self._emit_high_level)
+        self._fingerprinter = fingerprinter
+        self._event_processor = EventProcessor(
+            self._path_map, self._emit_high_level, fingerprinter=fingerprinter
+        )
         # Force the watcher to use the API's event processor, not its own
         self._watcher = Watcher(
             self._path,
@@ -55,6 +83,141 @@ class RenameWatcherAPI:  # pylint: disable=too-many-instance-attributes
             self._watcher.stop()
             self._watcher_started = False
 
+    @property
+    def path(self) -> str:
+        """Root directory being watched."""
+        return self._path
+
+    @property
+    def fingerprinter(self) -> Optional[Fingerprinter]:
+        """Content fingerprinter, if enabled."""
+        return self._fingerprinter
+
+    def set_matcher(self, matcher: Optional[Callable[[str], bool]]) -> None:
+        """Replace the path matcher; applies to the next raw event."""
+        self._matcher = matcher
+        self._watcher.matcher = matcher
+
+    def apply_patterns(self, patterns: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Switch to new include/ignore patterns without restarting.
+
+        The matcher is compiled first and swapped in atomically, then the
+        watcher state is reconciled incrementally: tracked paths and pending
+        events the new patterns ignore are dropped, and the tree is scanned
+        for newly included files only when the patterns got less strict.
+
+        Args:
+            patterns (Dict[str, Any]): Patterns as from read_patterns().
+
+        Returns:
+            Dict[str, Any]: Counts of removed and added paths, dropped
+                pending events, and whether a scan ran.
+        """
+        matcher = get_path_matcher(patterns)
+        old_matcher, previous = self._matcher, self._patterns
+        scan = old_matcher is not None and (
+            previous is None or patterns_loosened(previous, patterns)
+        )
+        with self._event_processor.lock:
+            self.set_matcher(matcher)
+            self._patterns = patterns
+            removed = [p for p in self._path_map.path_to_inode if not matcher(p)]
+            for path in removed:
+                self._path_map.remove(path)
+            dropped = self._event_processor.discard_pending(matcher)
+        added: Dict[str, int] = {}
+        if scan:
+            roots = (
+                scan_roots(previous, patterns, self._path)
+                if previous is not None
+                else [self._path]
+            )
+            added = self._scan_included(
+                roots, old_matcher, matcher, ignored_dir_matcher(patterns)
+            )
+        with self._event_processor.lock:
+            for path, inode in added.items():
+                if self._path_map.get_inode(path) is None:
+                    self._path_map.add(path, inode)
+        summary = {
+            "removed": len(removed),
+            "added": len(added),
+            "dropped_pending": dropped,
+            "scanned": scan,
+        }
+        self.logger.info("Patterns applied", **summary)
+        return summary
+
+    @staticmethod
+    def _scan_included(
+        roots: List[str],
+        old: Optional[Callable[[str], bool]],
+        new: Callable[[str], bool],
+        ignored_dir: Callable[[str], bool],
+    ) -> Dict[str, int]:
+        """
+        Files under `roots` that `new` includes and `old` did not. Directories
+        whose whole content `new` ignores are not entered.
+        """
+        found: Dict[str, int] = {}
+        stack = list(roots)
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not ignored_dir(entry.path):
+                                stack.append(entry.path)
+                        elif new(entry.path) and not (old and old(entry.path)):
+                            found[entry.path] = entry.inode()
+                    except OSError:
+                        # Vanished while scanning; the watcher reports it
+                        continue
+        return found
+
+    def flush(self) -> int:
+        """
+        Emit events held back by the debounce window now.
+
+        Returns:
+            int: Number of pending raw events that were flushed.
+        """
+        pending = self._event_processor.pending_count
+        self._event_processor.flush()
+        return pending
+
+    def tracked_paths(self) -> Dict[str, int]:
+        """Copy of the path -> inode map built while watching."""
+        return dict(self._path_map.path_to_inode)
+
+    def digest_tree(self) -> DigestTree:
+        """
+        Directory digests over the tracked files, stat-ed now (files that
+        vanished or lie outside the watch root are left out).
+        """
+        root = os.path.abspath(self._path)
+        prefix = root.rstrip(os.sep) + os.sep
+        entries: Dict[str, Entry] = {}
+        for path in self.tracked_paths():
+            if not path.startswith(prefix):
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                entries[path] = (st.st_ino, st.st_size, st.st_mtime)
+        return DigestTree.from_entries(root, entries)
+
+    def pending_events(self) -> int:
+        """Raw events held back by the debounce window, not yet emitted."""
+        return self._event_processor.pending_count
+
     def subscribe(self, callback: Callable[[Any], None]) -> None:
         """
         Subscribe to high-level events (on_rename, on_move, etc.).
@@ -98,6 +261,7 @@ class RenameWatcherAPI:  # pylint: disable=too-many-instance-attributes
             except Exception as e:  # pylint: disable=broad-exception-caught
                 # Broad exception is okay here.
                 # One bad subscriber shouldn't stop others.
+                get_metrics().inc("events_dropped", reason="subscriber_error")
                 self.logger.error(
                     "Subscriber callback failed",
                     subscriber=repr(cb),
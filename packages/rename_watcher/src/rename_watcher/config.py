@@ -4,7 +4,7 @@ Configuration and environment loading for rename_watcher.
 
 import os
 import pathlib
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, List, Optional
 from dotenv import load_dotenv  # type: ignore[import]
 
 load_dotenv()
@@ -77,6 +77,159 @@ def get_env_patterns() -> Dict[str, Any]:
     return {"include": include, "ignore": ignore, "priority": "ignore"}
 
 
+def read_patterns(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load include/ignore patterns for a reload. Unlike get_config(), an
+    unreadable or invalid TOML file is an error rather than a silent
+    fallback, so a half-saved file never replaces working patterns.
+
+    Args:
+        config_path (Optional[str]): TOML file (BLENDMAN_CONFIG_TOML by default).
+
+    Returns:
+        Dict[str, Any]: Patterns as from get_patterns_from_config(), or the
+            environment patterns if the file does not exist.
+
+    Raises:
+        ValueError: If the file cannot be read or parsed.
+    """
+    if not tomli:
+        raise ImportError("tomli is required for TOML config parsing.")
+    toml_path = (
+        config_path or os.getenv("BLENDMAN_CONFIG_TOML") or "blendman_config.toml"
+    )
+    if not os.path.exists(toml_path):
+        return get_env_patterns()
+    try:
+        with open(toml_path, "rb") as f:
+            config = tomli.load(f)
+    except (OSError, tomli.TOMLDecodeError) as exc:
+        raise ValueError(f"Cannot load config {toml_path}: {exc}") from exc
+    return get_patterns_from_config(config)
+
+
+def patterns_loosened(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    """
+    Whether `new` patterns may include a path that `old` excluded, i.e.
+    whether applying them requires scanning for newly included files.
+    Conservative: True whenever a rule that excluded paths went away.
+
+    Args:
+        old (Dict[str, Any]): Patterns currently applied.
+        new (Dict[str, Any]): Patterns about to be applied.
+    """
+    if old.get("priority", "ignore") != new.get("priority", "ignore"):
+        return True
+    if set(old["ignore"]) - set(new["ignore"]):
+        return True
+    old_include, new_include = set(old["include"]), set(new["include"])
+    if not old_include:
+        # Everything not ignored was already included
+        return False
+    if not new_include:
+        return True
+    added = {p for p in new_include - old_include if not p.startswith("!")}
+    unnegated = {p for p in old_include - new_include if p.startswith("!")}
+    return bool(added or unnegated)
+
+
+def _pattern_root(pattern: str, root: str) -> Optional[str]:
+    """
+    Directory under `root` holding every path `pattern` can match, or None if
+    it cannot match below `root`. Patterns are matched against absolute
+    paths, so only those with a slash before the end are anchored; the rest
+    match at any depth.
+    """
+    core = pattern.lstrip("!").rstrip("/")
+    if "/" not in core:
+        return root
+    literal = core
+    for char in "*?[\\":
+        literal = literal.split(char, 1)[0]
+    glob = literal != core
+    if glob:
+        # Matches of the glob lie in the directory before it
+        literal = literal.rsplit("/", 1)[0]
+    prefix = "/" + literal.strip("/")
+    base = "/" + pathlib.PurePath(root).as_posix().strip("/")
+    if prefix == base or base.startswith(prefix + "/"):
+        return root
+    if not prefix.startswith(base + "/"):
+        return None
+    directory = os.path.join(root, *prefix[len(base) + 1 :].split("/"))
+    if glob or os.path.isdir(directory):
+        return directory
+    # A single file: scan the folder it would appear in
+    return os.path.dirname(directory)
+
+
+def scan_roots(old: Dict[str, Any], new: Dict[str, Any], root: str) -> List[str]:
+    """
+    Directories to scan for files that `new` patterns include and `old`
+    excluded: the subtrees the added includes, removed ignores and removed
+    include negations can match, instead of the whole watch root.
+
+    Args:
+        old (Dict[str, Any]): Patterns currently applied.
+        new (Dict[str, Any]): Patterns about to be applied.
+        root (str): Watch root.
+
+    Returns:
+        List[str]: Non-overlapping directories (empty if nothing can be gained).
+    """
+    old_include, new_include = set(old["include"]), set(new["include"])
+    if old.get("priority", "ignore") != new.get("priority", "ignore") or (
+        old_include and not new_include
+    ):
+        return [root]
+    rules = set(old["ignore"]) - set(new["ignore"])
+    if old_include:
+        rules |= {p for p in new_include - old_include if not p.startswith("!")}
+        rules |= {p for p in old_include - new_include if p.startswith("!")}
+    found = {_pattern_root(rule, root) for rule in rules}
+    roots: List[str] = []
+    for directory in sorted(d for d in found if d is not None):
+        if not any(directory.startswith(os.path.join(r, "")) for r in roots):
+            roots.append(directory)
+    return roots
+
+
+def _preprocess(pat: str) -> str:
+    """
+    Convert bare extensions (e.g., '.blend') to '*.blend' for pathspec compatibility.
+    Handles negation (!.blend -> !*.blend).
+    """
+    if pat.startswith("!"):
+        core = pat[1:]
+        if core.startswith(".") and all(c not in core for c in "/*?[]!\\"):
+            return "!*" + core
+        return pat
+    if pat.startswith(".") and all(c not in pat for c in "/*?[]!\\"):
+        return "*" + pat
+    return pat
+
+
+def ignored_dir_matcher(patterns: Dict[str, Any]) -> Callable[[str], bool]:
+    """
+    Whether everything below a directory is ignored by `patterns`, so a scan
+    can skip it. Never true when includes take priority or an ignore
+    pattern is negated, as files below could then still be included.
+    """
+    if not pathspec:
+        raise ImportError("pathspec is required for gitignore-style pattern matching.")
+    ignore = [_preprocess(p) for p in patterns["ignore"]]
+    if patterns.get("priority", "ignore") == "include" or any(
+        p.startswith("!") for p in ignore
+    ):
+        return lambda _directory: False
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", ignore)
+
+    def ignored(directory: str) -> bool:
+        return bool(spec.match_file(pathlib.PurePath(directory).as_posix() + "/"))
+
+    return ignored
+
+
 def get_path_matcher(patterns: Dict[str, Any]) -> Callable[[str], bool]:
     """
     Return a matcher function that returns True if a path should be included (not ignored),
@@ -91,22 +244,8 @@ def get_path_matcher(patterns: Dict[str, Any]) -> Callable[[str], bool]:
     if not pathspec:
         raise ImportError("pathspec is required for gitignore-style pattern matching.")
 
-    def preprocess(pat: str) -> str:
-        """
-        Convert bare extensions (e.g., '.blend') to '*.blend' for pathspec compatibility.
-        Handles negation (!.blend -> !*.blend).
-        """
-        if pat.startswith("!"):
-            core = pat[1:]
-            if core.startswith(".") and all(c not in core for c in "/*?[]!\\"):
-                return "!*" + core
-            return pat
-        if pat.startswith(".") and all(c not in pat for c in "/*?[]!\\"):
-            return "*" + pat
-        return pat
-
-    ignore_patterns = [preprocess(p) for p in patterns["ignore"]]
-    include_patterns = [preprocess(p) for p in patterns["include"]]
+    ignore_patterns = [_preprocess(p) for p in patterns["ignore"]]
+    include_patterns = [_preprocess(p) for p in patterns["include"]]
     priority = patterns.get("priority", "ignore")
     ignore_spec = pathspec.PathSpec.from_lines("gitwildmatch", ignore_patterns)
     # Split include patterns into positive and negative (negated with '!')
@@ -0,0 +1,204 @@
+"""
+Merkle-style directory digests for rename_watcher.
+
+Every directory holding tracked files gets two digests:
+
+- ``local`` covers its own listing: (name, inode, size, mtime) of each file
+  and the names of its subdirectories;
+- ``tree`` covers ``local`` plus the ``tree`` digest of every subdirectory,
+  so it changes whenever anything below the directory changes.
+
+Two states of a tree are compared by walking down from the root and only
+descending into subdirectories whose ``tree`` digests differ, so an
+unchanged tree is verified with a single comparison. Digests are computed
+lazily and cached; changing an entry invalidates its ancestors only.
+"""
+
+import hashlib
+import os
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Set, Tuple
+
+# inode, size, mtime
+Entry = Tuple[int, int, float]
+
+
+class DirDigest(NamedTuple):
+    """Digests of one directory (hex strings)."""
+
+    local: str
+    tree: str
+
+
+def _hash() -> Any:
+    return hashlib.blake2b(digest_size=16)
+
+
+class DigestTree:
+    """
+    Directory digests over a set of files below one root. Not thread-safe.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        Args:
+            root (str): Absolute directory the files live under.
+        """
+        self.root = root.rstrip(os.sep) or os.sep
+        self._files: Dict[str, Dict[str, Entry]] = {self.root: {}}
+        self._subdirs: Dict[str, Set[str]] = {self.root: set()}
+        self._cache: Dict[str, DirDigest] = {}
+
+    @classmethod
+    def from_entries(cls, root: str, entries: Mapping[str, Entry]) -> "DigestTree":
+        """
+        Build a tree from absolute file paths -> (inode, size, mtime).
+
+        Raises:
+            ValueError: If a path is not below the root.
+        """
+        tree = cls(root)
+        files_by_dir = tree._files
+        for path, entry in entries.items():
+            directory, _, name = path.rpartition(os.sep)
+            files = files_by_dir.get(directory or os.sep)
+            if files is None:
+                files = tree._add_dir(directory or os.sep, path)
+            files[name] = entry
+        return tree
+
+    def __contains__(self, directory: object) -> bool:
+        return directory in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def dirs(self) -> Iterator[str]:
+        """Every tracked directory, the root included."""
+        return iter(self._files)
+
+    def files(self, directory: str) -> Dict[str, Entry]:
+        """Name -> entry for the files directly in `directory`."""
+        return dict(self._files.get(directory, {}))
+
+    def subdirs(self, directory: str) -> Set[str]:
+        """Absolute paths of the tracked subdirectories of `directory`."""
+        return {
+            os.path.join(directory, name) for name in self._subdirs.get(directory, ())
+        }
+
+    def _invalidate(self, directory: str) -> None:
+        while True:
+            self._cache.pop(directory, None)
+            if directory == self.root:
+                return
+            directory = os.path.dirname(directory)
+
+    def _add_dir(self, directory: str, path: str) -> Dict[str, Entry]:
+        """Register `directory` and its missing ancestors; return its files."""
+        if not directory.startswith(self.root.rstrip(os.sep) + os.sep):
+            raise ValueError(f"{path!r} is not below {self.root!r}")
+        child = directory
+        while child not in self._files:
+            self._files[child] = {}
+            self._subdirs.setdefault(child, set())
+            parent, child_name = os.path.split(child)
+            self._subdirs.setdefault(parent, set()).add(child_name)
+            self._cache.pop(parent, None)
+            child = parent
+        return self._files[directory]
+
+    def set(self, path: str, entry: Entry) -> None:
+        """
+        Add or update a file.
+
+        Raises:
+            ValueError: If `path` is not below the root.
+        """
+        directory, name = os.path.split(path)
+        files = self._files.get(directory)
+        if files is None:
+            files = self._add_dir(directory, path)
+        files[name] = entry
+        self._invalidate(directory)
+
+    def remove(self, path: str) -> bool:
+        """
+        Remove a file; directories left without tracked files are pruned.
+
+        Returns:
+            bool: Whether the file was tracked.
+        """
+        directory, name = os.path.split(path)
+        files = self._files.get(directory)
+        if files is None or files.pop(name, None) is None:
+            return False
+        self._invalidate(directory)
+        while (
+            directory != self.root
+            and not self._files[directory]
+            and not self._subdirs[directory]
+        ):
+            del self._files[directory]
+            del self._subdirs[directory]
+            self._cache.pop(directory, None)
+            parent, child_name = os.path.split(directory)
+            self._subdirs[parent].discard(child_name)
+            directory = parent
+        return True
+
+    def digest(self, directory: str = "") -> DirDigest:
+        """
+        Digests of a tracked directory (the root by default).
+
+        Raises:
+            KeyError: If the directory holds no tracked files.
+        """
+        directory = directory or self.root
+        cached = self._cache.get(directory)
+        if cached is not None:
+            return cached
+        names = sorted(self._subdirs[directory])
+        listing = "".join(
+            f"f\0{name}\0{inode}\0{size}\0{mtime:.3f}\n"
+            for name, (inode, size, mtime) in sorted(self._files[directory].items())
+        ) + "".join(f"d\0{name}\n" for name in names)
+        local = _hash()
+        local.update(listing.encode("utf-8", "surrogateescape"))
+        tree = _hash()
+        tree.update(local.digest())
+        for name in names:
+            tree.update(
+                f"{name}\0{self.digest(os.path.join(directory, name)).tree}\n".encode()
+            )
+        result = DirDigest(local.hexdigest(), tree.hexdigest())
+        self._cache[directory] = result
+        return result
+
+    def digests(self) -> Dict[str, DirDigest]:
+        """Digests of every tracked directory."""
+        return {directory: self.digest(directory) for directory in self._files}
+
+    def changed(self, other: Mapping[str, DirDigest]) -> List[str]:
+        """
+        Directories whose own listing differs from `other` (digests of
+        another state of the same tree), visiting only subtrees whose
+        ``tree`` digest differs.
+
+        Directories present only in `other` are not visited; they show up
+        as a changed ``local`` digest of their parent.
+
+        Returns:
+            List[str]: Changed directories, parents before children.
+        """
+        changed: List[str] = []
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            mine = self.digest(directory)
+            theirs = other.get(directory)
+            if theirs == mine:
+                continue
+            if theirs is None or theirs.local != mine.local:
+                changed.append(directory)
+            stack.extend(sorted(self.subdirs(directory), reverse=True))
+        return changed
@@ -2,19 +2,39 @@
 Event correlation and rename/move detection for rename_watcher.
 """
 
-from typing import Any, Dict, Optional, Callable, List
+from typing import Any, Dict, Optional, Callable, List, NamedTuple
 import os
+import threading
 import time
 
 import structlog  # type: ignore
 
+from .fingerprint import Fingerprinter
 from .path_map import PathInodeMap
+from .recent import RecentEvents
+from .metrics import get_metrics, origin
+
+
+class _ContentCheck(NamedTuple):
+    """A content match picked under EventProcessor.lock and hashed without it."""
+
+    path: str
+    # True when `path` is a new file looking for a vanished one
+    new: bool
+    # Paths on the other side to compare with (for a new file: once hashed)
+    others: List[str]
+    now: float
 
 
 class EventProcessor:
     """
     Processes and correlates raw file system events to detect renames and moves, including
     recursive path updates for nested folders.
+
+    With a Fingerprinter, a delete and a create are also paired when the new
+    file holds the deleted file's content (cross-device moves, copy then
+    delete), even after one of them was emitted: the move then carries
+    ``merge`` so the record created for the copy is folded into the original.
     """
 
     def flush(self) -> None:
@@ -25,12 +45,14 @@ class EventProcessor:
         now = (
             time.monotonic() + self.DEBOUNCE_WINDOW + 1
         )  # Ensure all pending events are flushed
-        self._flush_pending_events(now)
+        with self.lock:
+            self._flush_pending_events(now)
 
     def __init__(
         self,
         path_map: PathInodeMap,
         emit_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        fingerprinter: Optional[Fingerprinter] = None,
     ) -> None:
         """
         Initialize the event processor.
@@ -38,23 +60,71 @@ class EventProcessor:
         Args:
             path_map (PathInodeMap): The path-inode map for tracking file/folder paths.
             emit_event (Optional[Callable]): Callback to emit high-level events.
+            fingerprinter (Optional[Fingerprinter]): Enables pairing by content.
         """
         self._pending_deletes: Dict[str, float] = {}
         self._pending_creates: Dict[str, float] = {}
         self._pending_payloads: Dict[str, Dict[str, Any]] = {}
+        # Arrival times (time.monotonic) of pending events, for latency metrics
+        self._received: Dict[str, float] = {}
         self.path_map = path_map
         self.emit_event = emit_event
+        self.fingerprinter = fingerprinter
+        # Emitted, unpaired creates/deletes a content match may still pair
+        self._recent = RecentEvents()
+        # Serialises the watchdog thread with flush() and pattern reloads
+        self.lock = threading.RLock()
 
     DEBOUNCE_WINDOW = 0.5  # seconds
+    # How long emitted creates/deletes stay candidates for a content match
+    CORRELATION_WINDOW = 300.0  # seconds
+    # Above this many candidates, only ones the fingerprint index points to are hashed
+    RESCAN_LIMIT = 64
 
-    def process(self, event: Dict[str, Any]) -> None:
+    def discard_pending(self, keep: Callable[[str], bool]) -> int:
+        """
+        Drop pending creates/deletes whose path no longer passes `keep`.
+
+        Returns:
+            int: Number of pending events dropped.
+        """
+        dropped = 0
+        with self.lock:
+            for pending in (self._pending_creates, self._pending_deletes):
+                for path in [p for p in pending if not keep(p)]:
+                    del pending[path]
+                    self._pending_payloads.pop(path, None)
+                    self._received.pop(path, None)
+                    dropped += 1
+            self._recent.discard(keep)
+        return dropped
+
+    @property
+    def pending_count(self) -> int:
+        """Creates and deletes held back waiting for a move partner."""
+        return len(self._pending_creates) + len(self._pending_deletes)
+
+    def process(self, event: Dict[str, Any], received: Optional[float] = None) -> None:
         """
         Process a raw event and emit high-level events if detected.
 
         Args:
             event (Dict[str, Any]): Raw event from watcher. Must include 'type', 'src_path',
                 and optionally 'dest_path'.
+            received (Optional[float]): time.monotonic() when the raw event
+                arrived (defaults to now).
+
+        Files are hashed for a content match without holding `lock`, which is
+        only taken to pick the candidates and to apply the pairing.
         """
+        with self.lock:
+            check = self._process(event, received)
+        if check is not None:
+            self._match_content(check)
+
+    def _process(
+        self, event: Dict[str, Any], received: Optional[float]
+    ) -> Optional[_ContentCheck]:
         log = structlog.get_logger("EventProcessor")
         log.info("process called", pid=os.getpid(), event_data=event)
         event_type = event.get("type")
@@ -65,31 +135,61 @@ class EventProcessor:
             log.info(
                 "process handling native move", src_path=src_path, dest_path=dest_path
             )
-            self._handle_native_move(src_path, dest_path)
-            return
+            self._handle_native_move(src_path, dest_path, received)
+            return None
 
         now = time.monotonic()
+        if received is None:
+            received = now
+
+        check = None
+        if event_type == "modified" and src_path and self.fingerprinter:
+            check = self._handle_modified_event(src_path, now)
 
         if event_type == "deleted" and src_path:
-            if self._handle_deleted_event(src_path, now):
+            if self._handle_deleted_event(src_path, now, received):
                 log.info("process handled deleted event", src_path=src_path)
-                return
+                return None
+            check = self._plan_match(src_path, now, new=False)
 
         if event_type == "created" and src_path:
-            if self._handle_created_event(src_path, now):
+            if self._handle_created_event(src_path, now, received):
                 log.info("process handled created event", src_path=src_path)
-                return
+                return None
+            check = self._plan_match(src_path, now, new=True)
 
+        if check is not None:
+            # Pending events are flushed once the match is settled
+            return check
         self._flush_pending_events(now)
+        return None
 
-    def _handle_native_move(self, src_path: str, dest_path: str) -> None:
+    def _emit(self, event_type: str, payload: Dict[str, Any], received: float) -> None:
+        """
+        Emit a high-level event, recording how long it took since the raw
+        event arrived and marking `received` as its origin downstream.
+        """
+        if not self.emit_event:
+            return
+        metrics = get_metrics()
+        metrics.inc("events_emitted")
+        metrics.since("processor", received)
+        with origin(received):
+            self.emit_event(event_type, payload)
+
+    def _handle_native_move(
+        self, src_path: str, dest_path: str, received: Optional[float] = None
+    ) -> None:
         """
         Handle a native move/rename event and emit high-level events for folder and descendants.
 
         Args:
             src_path (str): Source path.
             dest_path (str): Destination path.
+            received (Optional[float]): Arrival time of the raw event.
         """
+        if received is None:
+            received = time.monotonic()
         log = structlog.get_logger("EventProcessor")
         log.info(
             "_handle_native_move called",
@@ -98,6 +198,8 @@ class EventProcessor:
             dest_path=dest_path,
         )
         self.path_map.bulk_update_paths(src_path, dest_path)
+        if self.fingerprinter is not None:
+            self.fingerprinter.move(src_path, dest_path)
         descendants = self.path_map.descendants(dest_path)
         for path, inode in descendants.items():
             if self.emit_event:
@@ -108,7 +210,7 @@ class EventProcessor:
                     "new_parent": dest_path,
                 }
                 log.info("_handle_native_move emitting descendant", payload=payload)
-                self.emit_event("moved", payload)
+                self._emit("moved", payload, received)
         if self.emit_event:
             folder_inode = self.path_map.get_inode(dest_path)
             folder_payload: Dict[str, Any] = {
@@ -118,20 +220,24 @@ class EventProcessor:
                 "new_parent": dest_path,
             }
             log.info("_handle_native_move emitting folder", payload=folder_payload)
-            self.emit_event("moved", folder_payload)
+            self._emit("moved", folder_payload, received)
 
-    def _handle_deleted_event(self, src_path: str, now: float) -> bool:
+    def _handle_deleted_event(
+        self, src_path: str, now: float, received: Optional[float] = None
+    ) -> bool:
         """
         Handle a deleted event, check for possible paired create (move/rename), and emit events.
 
         Args:
             src_path (str): Source path.
             now (float): Current time.
+            received (Optional[float]): Arrival time of the raw event.
 
         Returns:
             bool: True if handled as a move, False otherwise.
         """
         self._pending_deletes[src_path] = now
+        self._received[src_path] = now if received is None else received
         self._pending_payloads[src_path] = {
             "path": src_path,
             "inode": self.path_map.get_inode(src_path),
@@ -139,34 +245,38 @@ class EventProcessor:
         for create_path, create_time in list(self._pending_creates.items()):
             if abs(now - create_time) < self.DEBOUNCE_WINDOW:
                 if src_path.split("/")[-1] == create_path.split("/")[-1]:
-                    if self.emit_event:
-                        self.emit_event(
-                            "moved",
-                            {
-                                "path": create_path,
-                                "inode": self.path_map.get_inode(create_path),
-                                "old_parent": src_path,
-                                "new_parent": create_path,
-                            },
-                        )
+                    self._coalesce(
+                        src_path,
+                        create_path,
+                        {
+                            "path": create_path,
+                            "inode": self.path_map.get_inode(create_path),
+                            "old_parent": src_path,
+                            "new_parent": create_path,
+                        },
+                    )
                     del self._pending_creates[create_path]
                     del self._pending_deletes[src_path]
                     self._pending_payloads.pop(src_path, None)
                     return True
         return False
 
-    def _handle_created_event(self, src_path: str, now: float) -> bool:
+    def _handle_created_event(
+        self, src_path: str, now: float, received: Optional[float] = None
+    ) -> bool:
         """
         Handle a created event, check for possible paired delete (move/rename), and emit events.
 
         Args:
             src_path (str): Source path.
             now (float): Current time.
+            received (Optional[float]): Arrival time of the raw event.
 
         Returns:
             bool: True if handled as a move, False otherwise.
         """
         self._pending_creates[src_path] = now
+        self._received[src_path] = now if received is None else received
         self._pending_payloads[src_path] = {
             "path": src_path,
             "inode": self.path_map.get_inode(src_path),
@@ -174,22 +284,163 @@ class EventProcessor:
         for delete_path, delete_time in list(self._pending_deletes.items()):
             if abs(now - delete_time) < self.DEBOUNCE_WINDOW:
                 if src_path.split("/")[-1] == delete_path.split("/")[-1]:
-                    if self.emit_event:
-                        self.emit_event(
-                            "moved",
-                            {
-                                "path": src_path,
-                                "inode": self.path_map.get_inode(src_path),
-                                "old_parent": delete_path,
-                                "new_parent": src_path,
-                            },
-                        )
+                    self._coalesce(
+                        delete_path,
+                        src_path,
+                        {
+                            "path": src_path,
+                            "inode": self.path_map.get_inode(src_path),
+                            "old_parent": delete_path,
+                            "new_parent": src_path,
+                        },
+                    )
                     del self._pending_deletes[delete_path]
                     del self._pending_creates[src_path]
                     self._pending_payloads.pop(delete_path, None)
                     return True
         return False
 
+    def _handle_modified_event(
+        self, src_path: str, now: float
+    ) -> Optional[_ContentCheck]:
+        """
+        Re-fingerprint a modified file. A file created recently (say, a copy
+        still being written when its create was seen) is checked against
+        vanished files; others are hashed in the background, so their
+        fingerprint is current should they be deleted.
+
+        Returns:
+            Optional[_ContentCheck]: The content match to run, if any.
+        """
+        assert self.fingerprinter is not None
+        if self._is_new(src_path):
+            return self._plan_match(src_path, now, new=True)
+        self.fingerprinter.submit(src_path)
+        return None
+
+    def _is_vanished(self, path: str) -> bool:
+        return path in self._pending_deletes or path in self._recent.deletes
+
+    def _is_new(self, path: str) -> bool:
+        return path in self._pending_creates or path in self._recent.creates
+
+    def _plan_match(self, path: str, now: float, new: bool) -> Optional[_ContentCheck]:
+        """
+        Pick what to hash to pair `path` by content: a new file (`new`) with
+        a vanished one, or a deleted file with a new one holding what it held
+        when last fingerprinted. A new file is only hashed when deletes are
+        pending or a recent one had its size; otherwise it is fingerprinted
+        in the background.
+
+        Returns:
+            Optional[_ContentCheck]: None when there is nothing to compare.
+        """
+        fingerprinter = self.fingerprinter
+        if fingerprinter is None:
+            return None
+        if new:
+            if self._pending_deletes or self._recent.delete_sizes:
+                try:
+                    size: Optional[int] = os.stat(path).st_size
+                except OSError:
+                    size = None
+                if size is not None and (
+                    self._pending_deletes or size in self._recent.delete_sizes
+                ):
+                    return _ContentCheck(path, True, [], now)
+            fingerprinter.submit(path)
+            return None
+        digest = fingerprinter.known(path)
+        if digest is None:
+            return None
+        candidates = fingerprinter.paths_with(digest)
+        creates = (self._pending_creates, self._recent.creates)
+        if sum(map(len, creates)) <= self.RESCAN_LIMIT:
+            # Indexed fingerprints of files still being written may be stale
+            candidates.update(*creates)
+        candidates.discard(path)
+        others = [other for other in candidates if self._is_new(other)]
+        return _ContentCheck(path, False, others, now) if others else None
+
+    def _match_content(self, check: _ContentCheck) -> None:
+        """
+        Hash the files of a planned content match without the lock, then
+        take it to pair them if exactly one candidate matches and both sides
+        are still unpaired; otherwise flush as process() would have.
+        """
+        fingerprinter = self.fingerprinter
+        assert fingerprinter is not None
+        others = check.others
+        if check.new:
+            digest = fingerprinter.fingerprint(check.path)
+            if digest is not None:
+                with self.lock:
+                    others = [
+                        old_path
+                        for old_path in fingerprinter.paths_with(digest)
+                        if self._is_vanished(old_path)
+                    ]
+        pairs = [
+            (other, check.path) if check.new else (check.path, other)
+            for other in others
+        ]
+        matches = [pair for pair in pairs if fingerprinter.same_content(*pair)]
+        with self.lock:
+            # Several identical files vanished: no way to tell which one this is
+            if len(matches) == 1:
+                deleted_path, created_path = matches[0]
+                if self._is_vanished(deleted_path) and self._is_new(created_path):
+                    structlog.get_logger("EventProcessor").info(
+                        "process paired by content",
+                        old_path=deleted_path,
+                        new_path=created_path,
+                    )
+                    self._pair_by_content(deleted_path, created_path)
+                    return
+            if check.new:
+                fingerprinter.submit(check.path)
+            self._flush_pending_events(check.now)
+
+    def _pair_by_content(self, deleted_path: str, created_path: str) -> None:
+        """
+        Emit a vanished file and a new file with its content as one move.
+        If either side was already emitted, the move is flagged ``merge``.
+        """
+        assert self.fingerprinter is not None
+        payload: Dict[str, Any] = {
+            "path": created_path,
+            "inode": self.path_map.get_inode(created_path),
+            "old_parent": deleted_path,
+            "new_parent": created_path,
+        }
+        if (
+            deleted_path not in self._pending_deletes
+            or created_path not in self._pending_creates
+        ):
+            payload["merge"] = True
+        for path, pending in (
+            (deleted_path, self._pending_deletes),
+            (created_path, self._pending_creates),
+        ):
+            pending.pop(path, None)
+            self._pending_payloads.pop(path, None)
+        self._recent.forget_delete(deleted_path)
+        self._recent.creates.pop(created_path, None)
+        self._coalesce(deleted_path, created_path, payload)
+        self.fingerprinter.forget(deleted_path)
+
+    def _coalesce(
+        self, deleted_path: str, created_path: str, payload: Dict[str, Any]
+    ) -> None:
+        """Emit a delete/create pair as one move, timed from the earlier event."""
+        received = [
+            self._received.pop(path)
+            for path in (deleted_path, created_path)
+            if path in self._received
+        ]
+        get_metrics().inc("events_coalesced")
+        self._emit("moved", payload, min(received, default=time.monotonic()))
+
     def _flush_pending_events(self, now: float) -> None:
         """
         Flush all pending create and delete events that have exceeded the debounce window.
@@ -200,10 +451,11 @@ class EventProcessor:
         to_delete: List[str] = []
         for path, t in self._pending_deletes.items():
             if now - t > self.DEBOUNCE_WINDOW:
-                if self.emit_event:
-                    self.emit_event(
-                        "deleted", self._pending_payloads.get(path, {"path": path})
-                    )
+                self._emit(
+                    "deleted",
+                    self._pending_payloads.get(path, {"path": path}),
+                    self._received.pop(path, t),
+                )
                 to_delete.append(path)
         for path in to_delete:
             del self._pending_deletes[path]
@@ -212,11 +464,31 @@ class EventProcessor:
         to_create: List[str] = []
         for path, t in self._pending_creates.items():
             if now - t > self.DEBOUNCE_WINDOW:
-                if self.emit_event:
-                    self.emit_event(
-                        "created", self._pending_payloads.get(path, {"path": path})
-                    )
+                self._emit(
+                    "created",
+                    self._pending_payloads.get(path, {"path": path}),
+                    self._received.pop(path, t),
+                )
                 to_create.append(path)
         for path in to_create:
             del self._pending_creates[path]
             self._pending_payloads.pop(path, None)
+
+        if self.fingerprinter is not None:
+            self._track_recent(to_delete, to_create, now)
+
+    def _track_recent(self, deleted: List[str], created: List[str], now: float) -> None:
+        """
+        Keep emitted deletes (with a known fingerprint) and creates as
+        content-match candidates for CORRELATION_WINDOW seconds.
+        """
+        fingerprinter = self.fingerprinter
+        assert fingerprinter is not None
+        for path in deleted:
+            size = fingerprinter.size_of(path)
+            if size is not None:
+                self._recent.add_delete(path, now, size)
+        for path in created:
+            self._recent.add_create(path, now)
+        for path in self._recent.expire(now, self.CORRELATION_WINDOW):
+            fingerprinter.forget(path)
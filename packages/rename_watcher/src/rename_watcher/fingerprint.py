@@ -0,0 +1,364 @@
+"""
+Content fingerprints for rename_watcher.
+
+A move across devices (copy, then delete) or a copy-then-delete by hand
+gives the file a new inode, so the event processor sees an unrelated delete
+and create. Fingerprints let the two be correlated as a move.
+
+A fingerprint is a partial hash over the file size and its first and last
+blocks: two small reads whatever the file size. Full content hashes are
+only computed lazily, to tell apart large files whose partial hashes
+collide. Both are cached by (inode, size, mtime), so unchanged files are
+never read again; the cache can be kept in a JSON file between runs.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+# inode, size, mtime (the same order as digests.Entry)
+Key = Tuple[int, int, float]
+
+
+def partial_hash(
+    path: str, size: Optional[int] = None, block_size: int = BLOCK_SIZE
+) -> str:
+    """
+    BLAKE2b digest of a file's size, first block and last block.
+
+    Args:
+        path (str): File to read.
+        size (Optional[int]): Known size in bytes (saves a stat call).
+        block_size (int): Bytes read from each end.
+
+    Returns:
+        str: 32-character hex digest.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        digest.update(size.to_bytes(8, "little"))
+        digest.update(f.read(block_size))
+        if size > block_size:
+            f.seek(max(block_size, size - block_size))
+            digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+def full_hash(path: str) -> str:
+    """
+    BLAKE2b digest of a file's whole content.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _key(st: os.stat_result) -> Key:
+    return (st.st_ino, st.st_size, st.st_mtime)
+
+
+class Fingerprinter:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe fingerprint cache and fingerprint -> paths index, with a
+    thread pool for hashing in the background.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        cache_path: Optional[str] = None,
+        block_size: int = BLOCK_SIZE,
+    ) -> None:
+        """
+        Args:
+            workers (int): Hashing threads.
+            cache_path (Optional[str]): JSON file to load the hash cache from
+                and save it to.
+            block_size (int): Bytes hashed at each end of a file.
+        """
+        self.cache_path = cache_path
+        self.block_size = block_size
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="fingerprint")
+        self._lock = threading.Lock()
+        self._partial: Dict[Key, str] = {}
+        self._full: Dict[Key, str] = {}
+        # Last fingerprint seen per path, kept after a delete until forget()
+        self._paths: Dict[str, Tuple[Key, str]] = {}
+        self._index: Dict[str, Set[str]] = {}
+        # Paths with a background job not yet started
+        self._queued: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        if cache_path:
+            self.load()
+
+    def fingerprint(self, path: str, key: Optional[Key] = None) -> Optional[str]:
+        """
+        Partial hash of a file as it is now, read only when its (inode,
+        size, mtime) is not cached. Indexes the path.
+
+        Args:
+            path (str): File to fingerprint.
+            key (Optional[Key]): Its (inode, size, mtime), if just stat-ed.
+
+        Returns:
+            Optional[str]: The fingerprint, or None for unreadable paths and
+                anything but regular files.
+        """
+        if key is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            if not stat.S_ISREG(st.st_mode):
+                return None
+            key = _key(st)
+        with self._lock:
+            cached = self._partial.get(key)
+            if cached is not None:
+                self.hits += 1
+        if cached is None:
+            try:
+                cached = partial_hash(path, key[1], self.block_size)
+            except OSError:
+                return None
+            with self._lock:
+                self.misses += 1
+                self._partial[key] = cached
+        self._index_path(path, key, cached)
+        return cached
+
+    def fingerprint_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Fingerprint files on the pool and wait; unreadable ones are left out."""
+        paths = list(paths)
+        results = self._pool.map(self.fingerprint, paths)
+        return {path: fp for path, fp in zip(paths, results) if fp}
+
+    def submit(self, path: str) -> Optional["Future[Optional[str]]"]:
+        """
+        Fingerprint a file in the background. A file still queued from an
+        earlier call (say, while it is being written) is not queued twice.
+
+        Returns:
+            Optional[Future]: The job, or None if one was already queued.
+        """
+        with self._lock:
+            if path in self._queued:
+                return None
+            self._queued.add(path)
+        return self._pool.submit(self._run_queued, path)
+
+    def _run_queued(self, path: str) -> Optional[str]:
+        with self._lock:
+            self._queued.discard(path)
+        return self.fingerprint(path)
+
+    def prefetch(self, entries: Mapping[str, Key]) -> int:
+        """
+        Index files with cached fingerprints now and hash the others in the
+        background.
+
+        Args:
+            entries (Mapping[str, Key]): Path -> (inode, size, mtime).
+
+        Returns:
+            int: Files queued for hashing.
+        """
+        queued = 0
+        for path, key in entries.items():
+            key = tuple(key)  # type: ignore[assignment]
+            with self._lock:
+                cached = self._partial.get(key)
+            if cached is not None:
+                self._index_path(path, key, cached)
+            else:
+                self._pool.submit(self.fingerprint, path, key)
+                queued += 1
+        return queued
+
+    def _index_path(self, path: str, key: Key, fingerprint: str) -> None:
+        with self._lock:
+            previous = self._paths.get(path)
+            if previous is not None:
+                if previous == (key, fingerprint):
+                    return
+                self._unindex(path, previous[1])
+                if previous[0] != key:
+                    # The file changed; its old hashes cannot match anything again
+                    self._partial.pop(previous[0], None)
+                    self._full.pop(previous[0], None)
+            self._paths[path] = (key, fingerprint)
+            twins = self._index.setdefault(fingerprint, set())
+            collides = key[1] > 2 * self.block_size and any(
+                self._paths[p][0] != key for p in twins
+            )
+            twins.add(path)
+            pending = [
+                (p, self._paths[p][0])
+                for p in twins
+                if collides and self._paths[p][0] not in self._full
+            ]
+        for twin, twin_key in pending:
+            # Same partial hash, different files: full hashes tell them apart
+            self._pool.submit(self._full_for, twin, twin_key)
+
+    def _unindex(self, path: str, fingerprint: str) -> None:
+        twins = self._index.get(fingerprint)
+        if twins is not None:
+            twins.discard(path)
+            if not twins:
+                del self._index[fingerprint]
+
+    def _full_for(self, path: str, key: Key) -> Optional[str]:
+        with self._lock:
+            cached = self._full.get(key)
+        if cached is not None:
+            return cached
+        try:
+            st = os.stat(path)
+            if _key(st) != key:
+                return None
+            digest = full_hash(path)
+        except OSError:
+            return None
+        with self._lock:
+            self._full[key] = digest
+        return digest
+
+    def full(self, path: str) -> Optional[str]:
+        """Full content hash of a file as it is now (computed once per key)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return self._full_for(path, _key(st))
+
+    def known(self, path: str) -> Optional[str]:
+        """Last fingerprint seen for a path, without touching the disk."""
+        with self._lock:
+            entry = self._paths.get(path)
+        return entry[1] if entry else None
+
+    def paths_with(self, fingerprint: str) -> Set[str]:
+        """Paths last seen with this fingerprint."""
+        with self._lock:
+            return set(self._index.get(fingerprint, ()))
+
+    def same_content(self, old_path: str, new_path: str) -> bool:
+        """
+        Whether `new_path` now holds what `old_path` held when it was last
+        fingerprinted (`old_path` may be gone). A size mismatch is caught by
+        a stat alone; large files are also compared by full hash when the old
+        file's full hash is known.
+        """
+        with self._lock:
+            old = self._paths.get(old_path)
+        if old is None:
+            return False
+        old_key, old_fp = old
+        try:
+            st = os.stat(new_path)
+        except OSError:
+            return False
+        if st.st_size != old_key[1] or not stat.S_ISREG(st.st_mode):
+            return False
+        if self.fingerprint(new_path, _key(st)) != old_fp:
+            return False
+        with self._lock:
+            old_full = self._full.get(old_key)
+        if old_key[1] <= 2 * self.block_size or old_full is None:
+            return True
+        return self._full_for(new_path, _key(st)) == old_full
+
+    def size_of(self, path: str) -> Optional[int]:
+        """Size of a path when it was last fingerprinted."""
+        with self._lock:
+            entry = self._paths.get(path)
+        return entry[0][1] if entry else None
+
+    def move(self, old_path: str, new_path: str) -> None:
+        """Re-index a renamed file or folder (and everything below it)."""
+        prefix = old_path.rstrip(os.sep) + os.sep
+        with self._lock:
+            moved = [p for p in self._paths if p == old_path or p.startswith(prefix)]
+            for path in moved:
+                key, fingerprint = self._paths.pop(path)
+                target = new_path + path[len(old_path) :]
+                self._unindex(path, fingerprint)
+                self._paths[target] = (key, fingerprint)
+                self._index.setdefault(fingerprint, set()).add(target)
+
+    def forget(self, path: str) -> None:
+        """Drop a path from the index (its cached hashes stay)."""
+        with self._lock:
+            entry = self._paths.pop(path, None)
+            if entry is not None:
+                self._unindex(path, entry[1])
+
+    def stats(self) -> Dict[str, int]:
+        """Cache hits/misses and index sizes."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached": len(self._partial),
+                "full_hashes": len(self._full),
+                "indexed_paths": len(self._paths),
+            }
+
+    def load(self) -> None:
+        """Load cached hashes from cache_path, ignoring a missing or corrupt file."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            partial = {
+                (int(i), int(s), float(m)): str(h) for i, s, m, h in data["partial"]
+            }
+            full = {(int(i), int(s), float(m)): str(h) for i, s, m, h in data["full"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable fingerprint cache: %r", self.cache_path)
+            return
+        with self._lock:
+            self._partial.update(partial)
+            self._full.update(full)
+
+    def save(self) -> None:
+        """Atomically write cached hashes to cache_path, if configured."""
+        if not self.cache_path:
+            return
+        with self._lock:
+            data = {
+                "partial": [[*key, h] for key, h in self._partial.items()],
+                "full": [[*key, h] for key, h in self._full.items()],
+            }
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def close(self) -> None:
+        """Stop the pool (queued hashing is abandoned) and save the cache."""
+        self._pool.shutdown(wait=False)
+        self.save()
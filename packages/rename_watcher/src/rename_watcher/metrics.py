@@ -0,0 +1,266 @@
+"""
+Pipeline metrics for rename_watcher: event counters and per-stage latency
+histograms.
+
+An event's journey from the raw watchdog callback to a persisted row is
+timed with time.monotonic(). The raw event's arrival time (its "origin")
+travels with the synchronous emit chain in a thread-local, so downstream
+stages in other packages can report end-to-end latency without changing
+event payloads. Metrics are exported as a JSON-safe snapshot and as
+Prometheus text.
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; debounced create/delete pairs land near 0.5s
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+COUNTER_HELP = {
+    "events_in": "Raw file system events received by the watcher.",
+    "events_emitted": "High-level events emitted by the event processor.",
+    "events_coalesced": "Delete/create pairs merged into a single move.",
+    "events_out": "Events persisted by the storage backend.",
+    "events_dropped": "Events discarded before persistence, by reason.",
+    "events_reconciled": "Events synthesized by startup reconciliation, by type.",
+}
+
+STAGE_HELP = (
+    "Per-stage event latency: watcher (raw callback to processor), processor "
+    "(arrival to emit, including debounce), bridge (emit to persist call), "
+    "persist (storage write) and end_to_end (arrival to persisted row)."
+)
+
+_local = threading.local()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe; see PipelineMetrics)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Bucket bounds, per-bucket counts (last is +Inf), sum and count."""
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+def quantile(snapshot: Dict[str, Any], q: float) -> Optional[float]:
+    """
+    Estimate a quantile from a histogram snapshot by linear interpolation
+    within the bucket that holds it, as Prometheus' histogram_quantile does.
+
+    Args:
+        snapshot (Dict[str, Any]): Output of Histogram.snapshot().
+        q (float): Quantile between 0 and 1.
+
+    Returns:
+        Optional[float]: The estimate, or None without observations. Values
+            in the +Inf bucket are reported as the largest finite bound.
+    """
+    total = snapshot["count"]
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    lower = 0.0
+    for bound, count in zip(snapshot["buckets"], snapshot["counts"]):
+        if count and seen + count >= rank:
+            return lower + (bound - lower) * (rank - seen) / count
+        seen += count
+        lower = bound
+    return lower
+
+
+class PipelineMetrics:
+    """Thread-safe registry of labelled counters and stage histograms."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = {}
+        self._stages: Dict[str, Histogram] = {}
+        self.started = time.time()
+
+    def inc(self, name: str, amount: int = 1, **labels: str) -> None:
+        """Increment counter `name` (with optional labels) by `amount`."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record a latency for `stage`."""
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self._buckets)
+            histogram.observe(seconds)
+
+    def since(self, stage: str, start: float) -> None:
+        """Record the time elapsed since the monotonic timestamp `start`."""
+        self.observe(stage, time.monotonic() - start)
+
+    def counter(self, name: str, **labels: str) -> int:
+        """Current value of one counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-safe copy of every counter and histogram."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            stages = {
+                stage: histogram.snapshot()
+                for stage, histogram in sorted(self._stages.items())
+            }
+        return {
+            "started": self.started,
+            "uptime": time.time() - self.started,
+            "counters": counters,
+            "stages": stages,
+        }
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._stages.clear()
+            self.started = time.time()
+
+
+_metrics: Optional[PipelineMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> PipelineMetrics:
+    """Return the process-wide metrics registry shared by all pipeline stages."""
+    global _metrics  # pylint: disable=global-statement
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = PipelineMetrics()
+    return _metrics
+
+
+@contextmanager
+def origin(received: float) -> Iterator[None]:
+    """
+    Mark events emitted inside the block as having arrived at the monotonic
+    time `received`.
+    """
+    previous = getattr(_local, "origin", None)
+    _local.origin = received
+    try:
+        yield
+    finally:
+        _local.origin = previous
+
+
+def current_origin() -> Optional[float]:
+    """Arrival time of the event being emitted on this thread, if any."""
+    return getattr(_local, "origin", None)
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in sorted(labels.items())
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(
+    snapshot: Dict[str, Any],
+    prefix: str = "blendman_watcher_",
+    gauges: Optional[Dict[str, Tuple[str, float]]] = None,
+) -> str:
+    """
+    Render a PipelineMetrics snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot (Dict[str, Any]): Output of PipelineMetrics.snapshot().
+        prefix (str): Prefix for every metric name.
+        gauges (Optional[Dict[str, Tuple[str, float]]]): Extra point-in-time
+            values (e.g. queue depths) as name -> (help text, value).
+
+    Returns:
+        str: Exposition text ending in a newline.
+    """
+    lines: List[str] = []
+    by_name: Dict[str, List[Dict[str, Any]]] = {}
+    for counter in snapshot["counters"]:
+        by_name.setdefault(counter["name"], []).append(counter)
+    for name, samples in by_name.items():
+        metric = f"{prefix}{name}_total"
+        lines.append(f"# HELP {metric} {COUNTER_HELP.get(name, name)}")
+        lines.append(f"# TYPE {metric} counter")
+        for sample in samples:
+            lines.append(f"{metric}{_labels(sample['labels'])} {sample['value']}")
+    if snapshot["stages"]:
+        metric = f"{prefix}stage_latency_seconds"
+        lines.append(f"# HELP {metric} {STAGE_HELP}")
+        lines.append(f"# TYPE {metric} histogram")
+        for stage, hist in snapshot["stages"].items():
+            cumulative = 0
+            bounds = [_number(b) for b in hist["buckets"]] + ["+Inf"]
+            for bound, count in zip(bounds, hist["counts"]):
+                cumulative += count
+                labels = _labels({"stage": stage, "le": bound})
+                lines.append(f"{metric}_bucket{labels} {cumulative}")
+            labels = _labels({"stage": stage})
+            lines.append(f"{metric}_sum{labels} {_number(hist['sum'])}")
+            lines.append(f"{metric}_count{labels} {hist['count']}")
+    uptime = f"{prefix}uptime_seconds"
+    lines.append(f"# HELP {uptime} Seconds since the metrics were (re)started.")
+    lines.append(f"# TYPE {uptime} gauge")
+    lines.append(f"{uptime} {_number(snapshot['uptime'])}")
+    for name, (help_text, value) in (gauges or {}).items():
+        metric = f"{prefix}{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {_number(value)}")
+    return "\n".join(lines) + "\n"
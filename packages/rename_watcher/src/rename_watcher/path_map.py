@@ -63,6 +63,18 @@ class PathInodeMap:
         self.path_to_inode[path] = inode
         self.inode_to_path[inode] = path
 
+    def remove(self, path: str) -> Optional[int]:
+        """
+        Remove a path's mapping.
+
+        Returns:
+            Optional[int]: The inode it mapped to, if any.
+        """
+        inode = self.path_to_inode.pop(path, None)
+        if inode is not None and self.inode_to_path.get(inode) == path:
+            del self.inode_to_path[inode]
+        return inode
+
     def get_inode(self, path: str) -> Optional[int]:
         """
         Get inode for a given path.
@@ -0,0 +1,78 @@
+"""
+Emitted, unpaired creates and deletes that a content match may still pair.
+"""
+
+from typing import Callable, Dict, List, Tuple
+
+
+class RecentEvents:
+    """
+    Creates and deletes EventProcessor emitted without a move partner, kept
+    as content-match candidates for a while. Deletes are also counted by
+    size, so most new files skip hashing. Not thread-safe: EventProcessor
+    only uses it under its lock.
+    """
+
+    def __init__(self) -> None:
+        # Emit time of each create
+        self.creates: Dict[str, float] = {}
+        # Emit time of each delete, and the size it was counted under below
+        self.deletes: Dict[str, Tuple[float, int]] = {}
+        # Size -> number of recent deletes
+        self.delete_sizes: Dict[int, int] = {}
+
+    def add_delete(self, path: str, now: float, size: int) -> None:
+        """Keep a delete whose file had `size` bytes when last fingerprinted."""
+        self.forget_delete(path)
+        self.deletes[path] = (now, size)
+        self.delete_sizes[size] = self.delete_sizes.get(size, 0) + 1
+
+    def add_create(self, path: str, now: float) -> None:
+        """Keep a create, moving it to the end of the emit order."""
+        self.creates.pop(path, None)
+        self.creates[path] = now
+
+    def expire(self, now: float, window: float) -> List[str]:
+        """
+        Drop creates and deletes emitted more than `window` seconds ago.
+
+        Returns:
+            List[str]: The deletes dropped.
+        """
+        expired = []
+        # Both are in emit order, so expired entries are at the front
+        while self.deletes:
+            path, (t, _) = next(iter(self.deletes.items()))
+            if now - t <= window:
+                break
+            self.forget_delete(path)
+            expired.append(path)
+        while self.creates:
+            path, t = next(iter(self.creates.items()))
+            if now - t <= window:
+                break
+            del self.creates[path]
+        return expired
+
+    def forget_delete(self, path: str) -> None:
+        """
+        Drop a recent delete and uncount its size. The size is the one it was
+        counted under: the fingerprint cache may have forgotten the path or
+        re-hashed it since, so its current size could be unknown or another.
+        """
+        entry = self.deletes.pop(path, None)
+        if entry is None:
+            return
+        size = entry[1]
+        count = self.delete_sizes.get(size, 0) - 1
+        if count > 0:
+            self.delete_sizes[size] = count
+        else:
+            self.delete_sizes.pop(size, None)
+
+    def discard(self, keep: Callable[[str], bool]) -> None:
+        """Drop creates and deletes whose path no longer passes `keep`."""
+        for path in [p for p in self.creates if not keep(p)]:
+            del self.creates[path]
+        for path in [p for p in self.deletes if not keep(p)]:
+            self.forget_delete(path)
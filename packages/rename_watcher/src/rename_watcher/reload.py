@@ -0,0 +1,116 @@
+"""
+Config file watching for rename_watcher: calls back when the TOML file
+holding the include/ignore patterns changes, so they can be hot-reloaded.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Optional
+import logging
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None  # type: ignore[assignment]
+    FileSystemEventHandler = Any  # type: ignore[assignment,misc]
+
+logger = logging.getLogger(__name__)
+
+_WRITE_EVENTS = frozenset({"created", "modified", "moved", "closed"})
+
+
+class ConfigWatcher:
+    """
+    Watches one config file and runs `on_change` after it was written.
+
+    The file's directory is watched (not the file), so editors that save by
+    writing a temporary file and renaming it over the original are seen.
+    Bursts of events are debounced into one callback.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[], Any],
+        debounce: float = 0.25,
+    ) -> None:
+        """
+        Args:
+            path (str): Config file to watch.
+            on_change (Callable[[], Any]): Called on the timer thread after
+                the file settles; exceptions are logged, not raised.
+            debounce (float): Seconds without further events before calling.
+        """
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.debounce = debounce
+        self._observer: Optional[Any] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start watching the config file's directory."""
+        if Observer is None:
+            raise ImportError(
+                "watchdog is required for config reloading. Please install it."
+            )
+        if self._observer is not None:
+            return
+        observer = Observer()
+        observer.schedule(
+            self._make_event_handler(), os.path.dirname(self.path), recursive=False
+        )
+        observer.start()
+        self._observer = observer
+
+    def stop(self) -> None:
+        """Stop watching and cancel a pending callback."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def notify(self, path: Optional[str]) -> None:
+        """Schedule the callback if `path` is the watched file."""
+        if not path or os.path.abspath(path) != self.path:
+            return
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.on_change()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # A bad edit must not kill the watcher; the old patterns stay active
+            logger.warning(
+                "Config reload failed: path=%r error=%r", self.path, str(exc)
+            )
+
+    def _make_event_handler(self) -> Any:
+        parent = self
+
+        class Handler(FileSystemEventHandler):  # type: ignore[misc]
+            """Forwards events touching the config file."""
+
+            def on_any_event(self, event: Any) -> None:
+                """Handle any event in the config directory."""
+                # Reading the file on reload raises opened/closed_no_write events
+                if getattr(event, "is_directory", False) or (
+                    getattr(event, "event_type", None) not in _WRITE_EVENTS
+                ):
+                    return
+                parent.notify(getattr(event, "src_path", None))
+                parent.notify(getattr(event, "dest_path", None))
+
+        return Handler()
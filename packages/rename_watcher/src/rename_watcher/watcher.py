@@ -23,6 +23,7 @@ except ImportError:
 
 from .path_map import PathInodeMap
 from .event_processor import EventProcessor
+from .metrics import get_metrics
 
 console = Console()
 logger = logging.getLogger(__name__)
@@ -159,13 +160,27 @@ class Watcher:
                     }
                 )
 
-            def on_modified(self, _event: Any) -> None:
-                """Handle file/directory modification event (optional)."""
-                # No-op: modification events are not handled.
-                return None
+            def on_modified(self, event: Any) -> None:
+                """Handle file modification event (only used for fingerprints)."""
+                if getattr(event, "is_directory", False):
+                    return
+                parent._handle_modified(  # pylint: disable=protected-access
+                    getattr(event, "src_path", None)
+                )
 
         return Handler()
 
+    def _handle_modified(self, path: Optional[str]) -> None:
+        """
+        Pass a file modification to the event processor when it fingerprints
+        files; otherwise modifications are ignored. Not counted in metrics.
+        """
+        if not path or self._event_processor.fingerprinter is None:
+            return
+        if self.matcher and not self.matcher(path):
+            return
+        self._event_processor.process({"type": "modified", "src_path": path})
+
     def _handle_raw_event(self, event: dict[str, Any]) -> None:
         """
         Handle a raw file system event.
@@ -173,11 +188,15 @@ class Watcher:
         Args:
             event (dict[str, Any]): The event dictionary.
         """
+        received = time.monotonic()
+        metrics = get_metrics()
+        metrics.inc("events_in")
         logger.debug("Handling raw event: %r", event)
         # Optionally filter with matcher
         path = event.get("src_path") or event.get("dest_path")
         if self.matcher and path and not self.matcher(path):
             logger.debug("Event filtered by matcher: path=%r", path)
+            metrics.inc("events_dropped", reason="filtered")
             return
         # Track inodes for created files
         if event["type"] == "created" and not event.get("is_directory"):
@@ -193,7 +212,8 @@ class Watcher:
                 # Broad exception is justified: stat may fail for race conditions
                 # so we do not break the event flow.
                 logger.warning("Failed to stat created file: error=%r", str(exc))
-        self._event_processor.process(event)
+        metrics.since("watcher", received)
+        self._event_processor.process(event, received=received)
 
     def _emit_high_level(self, _event_type: str, _payload: dict[str, Any]) -> None:
         """
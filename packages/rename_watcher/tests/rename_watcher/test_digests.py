@@ -0,0 +1,83 @@
+"""
+Unit tests for directory digests in digests.py.
+"""
+
+import os
+
+import pytest
+
+from rename_watcher.digests import DigestTree
+
+ROOT = os.path.join(os.sep, "proj")
+
+
+def p(*parts: str) -> str:
+    return os.path.join(ROOT, *parts)
+
+
+def build() -> DigestTree:
+    return DigestTree.from_entries(
+        ROOT,
+        {
+            p("a.blend"): (1, 10, 1.0),
+            p("shots", "s1.blend"): (2, 20, 2.0),
+            p("shots", "deep", "s2.blend"): (3, 30, 3.0),
+            p("props", "chair.blend"): (4, 40, 4.0),
+        },
+    )
+
+
+def test_digests_are_order_independent_and_roll_up() -> None:
+    """Same entries give the same digests; a deep change reaches the root only."""
+    tree = build()
+    entries = {
+        p("props", "chair.blend"): (4, 40, 4.0),
+        p("shots", "deep", "s2.blend"): (3, 30, 3.0),
+        p("shots", "s1.blend"): (2, 20, 2.0),
+        p("a.blend"): (1, 10, 1.0),
+    }
+    same = DigestTree.from_entries(ROOT, entries)
+    assert same.digests() == tree.digests()
+
+    before = tree.digests()
+    tree.set(p("shots", "deep", "s2.blend"), (3, 31, 3.5))
+    after = tree.digests()
+    assert after[p("props")] == before[p("props")]
+    assert after[ROOT].local == before[ROOT].local
+    assert after[ROOT].tree != before[ROOT].tree
+    assert after[p("shots")].local == before[p("shots")].local
+
+
+def test_changed_descends_only_into_differing_subtrees() -> None:
+    """Only directories with a different listing are reported."""
+    stored = build().digests()
+    tree = build()
+    assert tree.changed(stored) == []
+
+    tree.remove(p("shots", "s1.blend"))
+    tree.set(p("props", "chair2.blend"), (2, 20, 2.0))
+    assert tree.changed(stored) == [p("props"), p("shots")]
+    assert build().changed({}) == [ROOT, p("props"), p("shots"), p("shots", "deep")]
+
+
+def test_remove_prunes_empty_directories() -> None:
+    """Removing the last file of a directory matches a tree built without it."""
+    tree = build()
+    assert tree.remove(p("shots", "deep", "s2.blend")) is True
+    assert tree.remove(p("shots", "deep", "s2.blend")) is False
+    assert p("shots", "deep") not in tree
+    expected = DigestTree.from_entries(
+        ROOT,
+        {
+            p("a.blend"): (1, 10, 1.0),
+            p("shots", "s1.blend"): (2, 20, 2.0),
+            p("props", "chair.blend"): (4, 40, 4.0),
+        },
+    )
+    assert tree.digests() == expected.digests()
+
+
+def test_paths_outside_root_are_rejected() -> None:
+    """Files must live below the root."""
+    with pytest.raises(ValueError):
+        DigestTree(ROOT).set(os.path.join(os.sep, "other", "x.blend"), (1, 1, 1.0))
@@ -0,0 +1,268 @@
+"""
+Unit tests for content fingerprints in fingerprint.py and pairing by content
+in event_processor.py.
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import pytest
+
+from rename_watcher.event_processor import EventProcessor
+from rename_watcher.fingerprint import Fingerprinter, partial_hash
+from rename_watcher.path_map import PathInodeMap
+
+
+@pytest.fixture
+def fingerprinter() -> Iterator[Fingerprinter]:
+    fp = Fingerprinter(workers=2)
+    yield fp
+    fp.close()
+
+
+def make_processor(
+    fingerprinter: Fingerprinter,
+) -> Tuple[EventProcessor, List[Tuple[str, Dict[str, Any]]]]:
+    events: List[Tuple[str, Dict[str, Any]]] = []
+    ep = EventProcessor(
+        PathInodeMap(),
+        emit_event=lambda t, payload: events.append((t, payload)),
+        fingerprinter=fingerprinter,
+    )
+    return ep, events
+
+
+def test_fingerprints_are_cached_by_inode_size_and_mtime(
+    tmp_path: Path, fingerprinter: Fingerprinter
+) -> None:
+    """An unchanged file is read once; a rewritten one is read again."""
+    path = tmp_path / "a.blend"
+    path.write_bytes(b"x" * 1000)
+    first = fingerprinter.fingerprint(str(path))
+    assert first == partial_hash(str(path))
+    assert fingerprinter.fingerprint(str(path)) == first
+    assert (fingerprinter.hits, fingerprinter.misses) == (1, 1)
+
+    path.write_bytes(b"y" * 1000)
+    os.utime(path, ns=(0, 10**9))
+    assert fingerprinter.fingerprint(str(path)) not in (None, first)
+    assert fingerprinter.misses == 2
+    assert fingerprinter.paths_with(first) == set()
+    assert fingerprinter.fingerprint(str(tmp_path)) is None
+
+
+def test_cache_survives_restart_and_ignores_corruption(tmp_path: Path) -> None:
+    """Saved hashes are reused by the next run; a corrupt cache is ignored."""
+    path = tmp_path / "a.blend"
+    path.write_bytes(b"data")
+    cache = tmp_path / "fingerprints.json"
+    first = Fingerprinter(workers=1, cache_path=str(cache))
+    digest = first.fingerprint(str(path))
+    first.close()
+
+    second = Fingerprinter(workers=1, cache_path=str(cache))
+    assert second.fingerprint(str(path)) == digest
+    assert (second.hits, second.misses) == (1, 0)
+    second.close()
+
+    cache.write_text("{not json", encoding="utf-8")
+    third = Fingerprinter(workers=1, cache_path=str(cache))
+    assert third.stats()["cached"] == 0
+    third.close()
+
+
+def test_full_hash_tells_apart_partial_collisions(tmp_path: Path) -> None:
+    """Large files with the same ends but a different middle do not match."""
+    fp = Fingerprinter(workers=1, block_size=4)
+    original = tmp_path / "a.bin"
+    original.write_bytes(b"head" + b"1" * 32 + b"tail")
+    other = tmp_path / "b.bin"
+    other.write_bytes(b"head" + b"2" * 32 + b"tail")
+    copy = tmp_path / "c.bin"
+    shutil.copyfile(original, copy)
+    fp.fingerprint(str(original))
+    fp.full(str(original))
+
+    assert fp.fingerprint(str(other)) == fp.known(str(original))
+    assert not fp.same_content(str(original), str(other))
+    assert fp.same_content(str(original), str(copy))
+    fp.close()
+
+
+def test_copy_then_delete_merges_into_a_move(
+    tmp_path: Path, fingerprinter: Fingerprinter
+) -> None:
+    """
+    A copy emitted as created, then the original deleted (a move across
+    devices), becomes a move flagged for merging.
+    """
+    original = tmp_path / "disk1" / "shot.blend"
+    original.parent.mkdir()
+    original.write_bytes(b"scene" * 100)
+    fingerprinter.fingerprint(str(original))
+    ep, events = make_processor(fingerprinter)
+
+    copy = tmp_path / "disk2" / "shot_v2.blend"
+    copy.parent.mkdir()
+    shutil.copy2(original, copy)
+    ep.process({"type": "created", "src_path": str(copy)})
+    ep.flush()
+    os.remove(original)
+    ep.process({"type": "deleted", "src_path": str(original)})
+
+    assert [t for t, _ in events] == ["created", "moved"]
+    moved = events[-1][1]
+    assert (moved["old_parent"], moved["path"], moved["merge"]) == (
+        str(original),
+        str(copy),
+        True,
+    )
+    assert fingerprinter.known(str(original)) is None
+
+
+def test_pending_pair_with_new_name_is_a_plain_move(
+    tmp_path: Path, fingerprinter: Fingerprinter
+) -> None:
+    """A delete and create inside the debounce window pair by content."""
+    original = tmp_path / "a.blend"
+    original.write_bytes(b"content")
+    fingerprinter.fingerprint(str(original))
+    ep, events = make_processor(fingerprinter)
+
+    os.rename(original, tmp_path / "b.blend")
+    ep.process({"type": "deleted", "src_path": str(original)})
+    ep.process({"type": "created", "src_path": str(tmp_path / "b.blend")})
+
+    assert len(events) == 1 and events[0][0] == "moved"
+    assert "merge" not in events[0][1]
+    assert ep.pending_count == 0
+
+
+def test_restore_written_after_create_is_paired_on_modify(
+    tmp_path: Path, fingerprinter: Fingerprinter
+) -> None:
+    """
+    A file deleted, then restored under a new name and only written after
+    its create was seen, is paired when the write is reported.
+    """
+    original = tmp_path / "a.blend"
+    original.write_bytes(b"precious")
+    fingerprinter.fingerprint(str(original))
+    ep, events = make_processor(fingerprinter)
+    os.remove(original)
+    ep.process({"type": "deleted", "src_path": str(original)})
+    ep.flush()
+
+    restored = tmp_path / "restored.blend"
+    restored.write_bytes(b"")
+    ep.process({"type": "created", "src_path": str(restored)})
+    ep.flush()
+    restored.write_bytes(b"precious")
+    ep.process({"type": "modified", "src_path": str(restored)})
+
+    assert [t for t, _ in events] == ["deleted", "created", "moved"]
+    assert events[-1][1]["merge"] is True
+
+
+def test_files_are_hashed_without_the_processor_lock(
+    tmp_path: Path, fingerprinter: Fingerprinter, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Hashing for a content match leaves the lock free for other threads
+    (flush(), pattern reloads); the pairing itself still happens.
+    """
+    original = tmp_path / "a.blend"
+    original.write_bytes(b"content")
+    fingerprinter.fingerprint(str(original))
+    ep, events = make_processor(fingerprinter)
+    lock_free: List[bool] = []
+
+    def try_lock() -> None:
+        if ep.lock.acquire(timeout=1):
+            ep.lock.release()
+            lock_free.append(True)
+        else:
+            lock_free.append(False)
+
+    def hashing(real: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any) -> Any:
+            other = threading.Thread(target=try_lock)
+            other.start()
+            other.join()
+            return real(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(
+        fingerprinter, "fingerprint", hashing(fingerprinter.fingerprint)
+    )
+    monkeypatch.setattr(
+        fingerprinter, "same_content", hashing(fingerprinter.same_content)
+    )
+    os.rename(original, tmp_path / "b.blend")
+    ep.process({"type": "deleted", "src_path": str(original)})
+    ep.process({"type": "created", "src_path": str(tmp_path / "b.blend")})
+
+    assert lock_free and all(lock_free)
+    assert [t for t, _ in events] == ["moved"]
+
+
+def test_same_size_different_content_is_not_paired(
+    tmp_path: Path, fingerprinter: Fingerprinter
+) -> None:
+    """A new file of the same size but other content stays a create."""
+    original = tmp_path / "a.blend"
+    original.write_bytes(b"aaaa")
+    fingerprinter.fingerprint(str(original))
+    ep, events = make_processor(fingerprinter)
+
+    os.remove(original)
+    (tmp_path / "b.blend").write_bytes(b"bbbb")
+    ep.process({"type": "deleted", "src_path": str(original)})
+    ep.process({"type": "created", "src_path": str(tmp_path / "b.blend")})
+    ep.flush()
+
+    assert sorted(t for t, _ in events) == ["created", "deleted"]
+
+
+def test_identical_copies_are_not_guessed(
+    tmp_path: Path, fingerprinter: Fingerprinter
+) -> None:
+    """Two new copies of a deleted file: neither is taken for the move."""
+    original = tmp_path / "a.blend"
+    original.write_bytes(b"same")
+    fingerprinter.fingerprint(str(original))
+    ep, events = make_processor(fingerprinter)
+
+    for name in ("b.blend", "c.blend"):
+        shutil.copy2(original, tmp_path / name)
+        ep.process({"type": "created", "src_path": str(tmp_path / name)})
+    os.remove(original)
+    ep.process({"type": "deleted", "src_path": str(original)})
+    ep.flush()
+
+    assert sorted(t for t, _ in events) == ["created", "created", "deleted"]
+
+
+def test_dropped_delete_is_uncounted_after_its_hash_is_forgotten(
+    tmp_path: Path, fingerprinter: Fingerprinter
+) -> None:
+    """
+    A recent delete dropped after the cache forgot its path still frees its
+    size, so new files of that size are no longer hashed for it.
+    """
+    original = tmp_path / "a.blend"
+    original.write_bytes(b"data")
+    fingerprinter.fingerprint(str(original))
+    ep, _ = make_processor(fingerprinter)
+    os.remove(original)
+    ep.process({"type": "deleted", "src_path": str(original)})
+    ep.flush()
+    fingerprinter.forget(str(original))
+
+    ep.discard_pending(lambda path: False)
+
+    assert ep._recent.delete_sizes == {}
@@ -0,0 +1,97 @@
+"""
+Unit tests for pipeline metrics in metrics.py.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+from rename_watcher.event_processor import EventProcessor
+from rename_watcher.metrics import (
+    Histogram,
+    PipelineMetrics,
+    current_origin,
+    get_metrics,
+    quantile,
+    render_prometheus,
+)
+from rename_watcher.path_map import PathInodeMap
+from rename_watcher.watcher import Watcher
+
+
+@pytest.fixture
+def metrics() -> Iterator[PipelineMetrics]:
+    """The shared registry, emptied around each test."""
+    registry = get_metrics()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+def test_histogram_quantiles() -> None:
+    """
+    Expected: observations land in the right buckets and quantiles are
+    interpolated within them.
+    """
+    hist = Histogram(buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.05, 0.05, 0.5, 7.0):
+        hist.observe(value)
+    snap = hist.snapshot()
+    assert snap["counts"] == [1, 2, 1, 1]
+    assert snap["count"] == 5
+    assert quantile(snap, 0.5) == pytest.approx(0.01 + 0.09 * 1.5 / 2)
+    assert quantile(snap, 1.0) == 1.0
+    assert quantile(Histogram().snapshot(), 0.5) is None
+
+
+def test_render_prometheus(metrics: PipelineMetrics) -> None:
+    """
+    Expected: counters, labels and cumulative buckets follow the text format.
+    """
+    metrics.inc("events_in", 3)
+    metrics.inc("events_dropped", reason='odd "name"')
+    metrics.observe("persist", 0.002)
+    text = render_prometheus(metrics.snapshot())
+    assert "# TYPE blendman_watcher_events_in_total counter" in text
+    assert "blendman_watcher_events_in_total 3\n" in text
+    assert 'events_dropped_total{reason="odd \\"name\\""} 1' in text
+    assert (
+        'blendman_watcher_stage_latency_seconds_bucket{le="0.0025",stage="persist"} 1'
+        in text
+    )
+    assert 'stage_latency_seconds_bucket{le="+Inf",stage="persist"} 1' in text
+    assert 'stage_latency_seconds_count{stage="persist"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_processor_counts_coalesced_moves(metrics: PipelineMetrics) -> None:
+    """
+    Expected: a delete/create pair is counted as coalesced and emitted once,
+    with the earlier raw event's arrival time as the downstream origin.
+    """
+    seen: List[Tuple[str, Optional[float]]] = []
+
+    def emit_event(event_type: str, _payload: Dict[str, Any]) -> None:
+        seen.append((event_type, current_origin()))
+
+    ep = EventProcessor(PathInodeMap(), emit_event=emit_event)
+    ep.process({"type": "deleted", "src_path": "/a/file.txt"}, received=10.0)
+    ep.process({"type": "created", "src_path": "/b/file.txt"}, received=10.1)
+    assert seen == [("moved", 10.0)]
+    assert current_origin() is None
+    assert metrics.counter("events_coalesced") == 1
+    assert metrics.counter("events_emitted") == 1
+    assert metrics.snapshot()["stages"]["processor"]["count"] == 1
+
+
+def test_watcher_counts_filtered_events(metrics: PipelineMetrics) -> None:
+    """
+    Edge: events rejected by the matcher are counted in and dropped.
+    """
+    watcher = Watcher("/tmp", matcher=lambda path: path.endswith(".blend"))
+    watcher._handle_raw_event(  # pylint: disable=protected-access
+        {"type": "deleted", "src_path": "/tmp/notes.txt"}
+    )
+    assert metrics.counter("events_in") == 1
+    assert metrics.counter("events_dropped", reason="filtered") == 1
+    assert "watcher" not in metrics.snapshot()["stages"]
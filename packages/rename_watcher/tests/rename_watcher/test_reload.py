@@ -0,0 +1,164 @@
+"""
+Unit tests for hot reloading of include/ignore patterns (config.py, api.py, reload.py).
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+
+import pytest  # type: ignore
+
+from rename_watcher.api import RenameWatcherAPI
+from rename_watcher.config import patterns_loosened, read_patterns, scan_roots
+from rename_watcher.reload import ConfigWatcher
+
+
+def patterns(include: List[str], ignore: List[str]) -> Dict[str, Any]:
+    """Build a patterns dict with the default priority."""
+    return {"include": include, "ignore": ignore, "priority": "ignore"}
+
+
+def test_patterns_loosened() -> None:
+    """
+    Expected: only changes that can include new paths require a scan.
+    """
+    base = patterns([".blend"], [".git"])
+    assert not patterns_loosened(base, patterns([".blend"], [".git", "tmp/"]))
+    assert not patterns_loosened(patterns([], [".git"]), base)
+    assert patterns_loosened(base, patterns([".blend", ".png"], [".git"]))
+    assert patterns_loosened(base, patterns([".blend"], []))
+    assert patterns_loosened(base, patterns([], [".git"]))
+    assert patterns_loosened(
+        patterns([".blend", "!old/"], []), patterns([".blend"], [])
+    )
+
+
+def test_scan_roots_follow_the_loosened_rules(tmp_path: Path) -> None:
+    """
+    Edge: anchored rules limit the scan to their subtree; unanchored ones, or
+    a switch to "include everything", need the whole root; rules outside
+    the root need nothing.
+    """
+    root = str(tmp_path)
+    (tmp_path / "cache").mkdir()
+    base = patterns([".blend"], [f"{root}/cache/", "/elsewhere/"])
+    assert scan_roots(base, patterns([".blend"], ["/elsewhere/"]), root) == [
+        str(tmp_path / "cache")
+    ]
+    assert scan_roots(base, patterns([".blend"], [f"{root}/cache/"]), root) == []
+    assert scan_roots(
+        base, patterns([".blend", f"{root}/shots/*.png"], base["ignore"]), root
+    ) == [str(tmp_path / "shots")]
+    assert scan_roots(base, patterns([".blend", ".png"], base["ignore"]), root) == [
+        root
+    ]
+    assert scan_roots(base, patterns([], base["ignore"]), root) == [root]
+
+
+def test_read_patterns_rejects_invalid_toml(tmp_path: Path) -> None:
+    """
+    Failure: a half-written file raises instead of falling back silently.
+    """
+    config = tmp_path / "blendman_config.toml"
+    config.write_text('[include]\npatterns = [".blend"]\n')
+    assert read_patterns(str(config))["include"] == [".blend"]
+    config.write_text("[include\npatterns = [")
+    with pytest.raises(ValueError, match="Cannot load config"):
+        read_patterns(str(config))
+
+
+def test_apply_patterns_reconciles_incrementally(tmp_path: Path) -> None:
+    """
+    Expected: newly ignored map entries are dropped; newly included files are
+    found by a scan, which is skipped when the patterns only got stricter.
+    """
+    (tmp_path / "shots").mkdir()
+    blend = tmp_path / "shots" / "a.blend"
+    png = tmp_path / "shots" / "a.png"
+    blend.write_text("x")
+    png.write_text("x")
+    api = RenameWatcherAPI(path=str(tmp_path), patterns=patterns([".blend"], []))
+    api._path_map.add(str(blend), blend.stat().st_ino)  # pylint: disable=protected-access
+
+    summary = api.apply_patterns(patterns([".blend", ".png"], []))
+    assert summary["scanned"] and summary["added"] == 1
+    assert api.tracked_paths() == {
+        str(blend): blend.stat().st_ino,
+        str(png): png.stat().st_ino,
+    }
+
+    summary = api.apply_patterns(patterns([".blend", ".png"], ["a.png"]))
+    assert not summary["scanned"]
+    assert summary["removed"] == 1
+    assert list(api.tracked_paths()) == [str(blend)]
+
+
+def test_apply_patterns_skips_ignored_and_unmatched_dirs(tmp_path: Path) -> None:
+    """
+    Expected: un-ignoring one folder scans only that folder, and folders the
+    new patterns ignore are not entered.
+    """
+    for folder in ("renders", "cache", "shots"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "a.png").write_text("x")
+    old = patterns([], [f"{tmp_path}/renders/", "cache/", "shots/"])
+    api = RenameWatcherAPI(path=str(tmp_path), patterns=old)
+    visited: List[str] = []
+    scandir = os.scandir
+
+    def spy(path: Any) -> Any:
+        visited.append(str(path))
+        return scandir(path)
+
+    with mock.patch("rename_watcher.api.os.scandir", spy):
+        summary = api.apply_patterns(patterns([], ["cache/", "shots/"]))
+        assert summary["added"] == 1 and visited == [str(tmp_path / "renders")]
+        visited.clear()
+        summary = api.apply_patterns(patterns([], ["cache/"]))
+    assert summary["added"] == 1
+    assert str(tmp_path / "cache") not in visited
+    assert str(tmp_path / "shots" / "a.png") in api.tracked_paths()
+
+
+def test_apply_patterns_drops_pending_events(tmp_path: Path) -> None:
+    """
+    Edge: debounced events for newly ignored paths are never emitted.
+    """
+    api = RenameWatcherAPI(path=str(tmp_path), patterns=patterns([], []))
+    emitted: List[Any] = []
+    api.subscribe(emitted.append)
+    api._event_processor.process(  # pylint: disable=protected-access
+        {"type": "created", "src_path": str(tmp_path / "x.tmp")}
+    )
+    assert api.pending_events() == 1
+    summary = api.apply_patterns(patterns([], [".tmp"]))
+    assert summary["dropped_pending"] == 1
+    api.flush()
+    assert emitted == []
+
+
+def test_config_watcher_fires_on_write(tmp_path: Path) -> None:
+    """
+    Expected: writing the config file triggers one debounced callback;
+    other files in the directory are ignored.
+    """
+    config = tmp_path / "blendman_config.toml"
+    config.write_text("")
+    fired = threading.Event()
+    calls: List[int] = []
+
+    def on_change() -> None:
+        calls.append(1)
+        fired.set()
+
+    watcher = ConfigWatcher(str(config), on_change, debounce=0.1)
+    watcher.start()
+    try:
+        (tmp_path / "other.txt").write_text("x")
+        config.write_text('[ignore]\npatterns = [".tmp"]\n')
+        assert fired.wait(5)
+    finally:
+        watcher.stop()
+    assert calls == [1]
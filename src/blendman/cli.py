@@ -5,6 +5,7 @@ Main Typer CLI app for blendman.
 import typer
 from rich.console import Console
 from blendman.commands.watcher import watcher_app
+from blendman.commands import watcher_control  # noqa: F401  (status/control commands)
 from blendman.commands.config import config_app
 from blendman.commands.backend import backend_app
 from blendman.commands.pocketbase import pocketbase_app
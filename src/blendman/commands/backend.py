@@ -4,6 +4,8 @@ Backend-related CLI commands for blendman.
 
 import typer  # type: ignore
 from rich.console import Console  # type: ignore
+from pocketbase.filters import all_of, cond, like
+from blendman.control import ControlError, control_path, send_command
 from blendman.db_interface import DBInterface
 
 backend_app = typer.Typer()
@@ -14,6 +16,11 @@ console = Console()
 def query(
     query_type: str = typer.Argument(..., help="Type of query: files or logs"),
     file_id: str = typer.Option(None, help="File ID for logs or state queries"),
+    fields: str = typer.Option(
+        None, help="Comma-separated fields to return, e.g. 'new_path,event_type'"
+    ),
+    path: str = typer.Option(None, help="Only logs whose new path contains this"),
+    event_type: str = typer.Option(None, help="Only logs of this event type"),
 ):
     """
     Query backend for files or logs.
@@ -27,15 +34,36 @@ def query(
             console.print("[yellow]Listing all files is not implemented.")
     elif query_type == "logs":
         if file_id:
-            logs = db.get_logs_for_file(file_id)
+            logs = db.get_logs_for_file(file_id, fields=fields)
             console.print(logs)
         else:
-            logs = db.get_global_log()
+            expr = all_of(
+                like("new_path", path) if path else "",
+                cond("event_type", "=", event_type) if event_type else "",
+            )
+            logs = db.get_global_log(filter=expr or None, fields=fields)
             console.print(logs)
     else:
         console.print("[red]Unknown query type. Use 'files' or 'logs'.")
 
 
+@backend_app.command("cache-stats")
+def cache_stats(
+    pidfile: str = typer.Option(
+        "./.blendman_watcher.pid", help="Path to PID file for watcher process."
+    ),
+):
+    """
+    Show hit/miss counters of the running watcher's backend lookup cache.
+    """
+    try:
+        stats = send_command(control_path(pidfile), "stats")
+    except ControlError as exc:
+        console.print(f"[red]cache-stats failed:[/] {exc}")
+        raise typer.Exit(code=1) from exc
+    console.print(stats["cache"])
+
+
 @backend_app.command()
 def manage(command: str = typer.Argument(..., help="Command: start or stop")):
     """
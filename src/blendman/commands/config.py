@@ -18,6 +18,12 @@ patterns = [".blend"]
 
 [ignore]
 patterns = ["*"]
+
+[storage]
+# "pocketbase" (server), "sqlite" (local database file, no server needed)
+# or "memory" (nothing persisted; for tests and benchmarks)
+backend = "pocketbase"
+path = "blendman.db"
 """
     if os.path.exists(path):
         app_console.print(f"[yellow]Config file already exists at {path}.")
@@ -4,12 +4,13 @@ Watcher-related CLI commands for blendman.
 
 # pylint: disable=consider-using-with
 
+import json
 import os
 import logging
 import platform
 import signal
-import socket
 import subprocess
+import threading
 import time
 
 import structlog  # type: ignore
@@ -17,13 +18,31 @@ import typer  # type: ignore
 from rich.console import Console  # type: ignore
 from rich.logging import RichHandler
 
-from rename_watcher.config import get_config
-from blendman.watcher_bridge import WatcherBridge
+from pocketbase.health import check_health
+from pocketbase.pocketbase_manager import PocketBaseManager
+from pocketbase.supervisor import PocketBaseSupervisor
+from rename_watcher.config import get_config, read_patterns
+from rename_watcher.fingerprint import Fingerprinter
+from rename_watcher.reload import ConfigWatcher
+from rename_watcher.metrics import get_metrics
+from blendman.watcher_bridge import DEFAULT_BATCH_SIZE, WatcherBridge
+from blendman.control import (
+    ControlError,
+    ControlServer,
+    WatcherControl,
+    control_path,
+    control_supported,
+    send_command,
+)
 from blendman.db_interface import DBInterface
+from blendman.metrics_server import MetricsServer, bridge_gauges, bridge_health
+from blendman.reconcile import reconcile
+from blendman.storage import storage_settings
 from blendman.commands.config import create_default_config
 
 # Keep track of the watcher instance when running in interactive mode
 _bridge: WatcherBridge | None = None
+_control_server: ControlServer | None = None
 
 
 def setup_logging() -> None:
@@ -50,21 +69,54 @@ def setup_logging() -> None:
 watcher_app = typer.Typer()
 console = Console()
 
+# Seconds between metrics snapshots written by a running watcher
+DEFAULT_METRICS_INTERVAL = 5.0
+
+
+def metrics_path(pidfile: str) -> str:
+    """Path of the metrics snapshot a watcher writes next to its PID file."""
+    return f"{pidfile}.metrics.json"
+
+
+def write_metrics_snapshot(path: str) -> None:
+    """Atomically write this process's pipeline metrics as JSON."""
+    snapshot = get_metrics().snapshot()
+    snapshot["pid"] = os.getpid()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def reload_patterns(bridge: WatcherBridge, config_path: str) -> dict:
+    """
+    Re-read include/ignore patterns and apply them to a running bridge.
+    An invalid config raises ValueError and leaves the current patterns.
+    """
+    patterns = read_patterns(config_path)
+    summary = bridge.watcher.apply_patterns(patterns)
+    structlog.get_logger("blendman.cli").info(
+        "Reloaded watcher patterns", config_path=config_path, **summary
+    )
+    return dict(summary, patterns=patterns)
+
 
 def is_pocketbase_running(host: str = "127.0.0.1", port: int = 8090) -> bool:
-    """Check if the PocketBase server is reachable."""
-    try:
-        with socket.create_connection((host, port), timeout=1):
-            return True
-    except OSError:
-        return False
+    """Check if the PocketBase server answers its health endpoint."""
+    return check_health(f"http://{host}:{port}")
+
 
+def start_pocketbase_if_needed(app_console: Console) -> PocketBaseSupervisor | None:
+    """
+    Start PocketBase if not running and guide the user through first-time setup.
 
-def start_pocketbase_if_needed(app_console: Console) -> None:
-    """Start PocketBase if not running and guide the user through first-time setup."""
+    Returns:
+        PocketBaseSupervisor | None: Supervisor keeping the started server
+            alive, or None if an external server was already running.
+    """
     if is_pocketbase_running():
         app_console.print("[green]PocketBase server is already running.")
-        return
+        return None
 
     backend_dir = os.path.abspath(
         os.path.join(os.path.dirname(__file__), "../../../packages/pocketbase_backend")
@@ -75,12 +127,8 @@ def start_pocketbase_if_needed(app_console: Console) -> None:
     system = platform.system().lower()
     if system == "windows":
         bin_path = os.path.join(backend_dir, "pocketbase_bin.exe")
-        serve_cmd = [bin_path, "serve"]
-        creationflags = subprocess.CREATE_NEW_CONSOLE
     else:
         bin_path = os.path.join(backend_dir, "pocketbase_bin")
-        serve_cmd = [bin_path, "serve"]
-        creationflags = 0
 
     if not os.path.exists(bin_path):
         app_console.print(
@@ -91,16 +139,11 @@ def start_pocketbase_if_needed(app_console: Console) -> None:
     app_console.print(
         "[yellow]PocketBase server not detected. Attempting to start it..."
     )
-    subprocess.Popen(serve_cmd, cwd=backend_dir, creationflags=creationflags)  # pylint: disable=consider-using-with
-
-    # Wait for server to become reachable
-    for _ in range(20):
-        if is_pocketbase_running():
-            app_console.print("[green]PocketBase server started.")
-            break
-        time.sleep(0.5)
-    else:
-        raise RuntimeError("PocketBase server did not start within 10 seconds.")
+    manager = PocketBaseManager(
+        binary_path=bin_path, cwd=backend_dir, app_console=app_console
+    )
+    supervisor = PocketBaseSupervisor(manager)
+    supervisor.start()
 
     if first_run:
         admin_email = os.environ.get("POCKETBASE_ADMIN_EMAIL")
@@ -131,6 +174,7 @@ def start_pocketbase_if_needed(app_console: Console) -> None:
             app_console.print(
                 f"or run '{bin_path} superuser upsert <EMAIL> <PASSWORD>' from the command line."
             )
+    return supervisor
 
 
 @watcher_app.command()
@@ -148,6 +192,32 @@ def start(
     pidfile: str = typer.Option(
         "./.blendman_watcher.pid", help="Path to PID file for watcher process."
     ),
+    metrics_port: int = typer.Option(
+        0,
+        envvar="BLENDMAN_METRICS_PORT",
+        help="Serve /metrics and /health over HTTP on this port (0 disables).",
+    ),
+    metrics_host: str = typer.Option(
+        "127.0.0.1",
+        envvar="BLENDMAN_METRICS_HOST",
+        help="Interface for the metrics endpoint.",
+    ),
+    reload_config: bool = typer.Option(
+        True,
+        "--reload/--no-reload",
+        help="Apply include/ignore pattern changes in the config file live.",
+    ),
+    reconcile_on_start: bool = typer.Option(
+        True,
+        "--reconcile/--no-reconcile",
+        help="Record renames, moves and deletes made while the watcher was stopped.",
+    ),
+    fingerprint: bool = typer.Option(
+        False,
+        "--fingerprint/--no-fingerprint",
+        envvar="BLENDMAN_FINGERPRINT",
+        help="Also match deletes and creates by content (moves across devices).",
+    ),
 ):
     """
     Start the watcher with the given config and bridge events to the backend DB.
@@ -156,6 +226,14 @@ def start(
     """
     setup_logging()
     log = structlog.get_logger("blendman.cli")
+    db: DBInterface | None = None
+    bridge: WatcherBridge | None = None
+    supervisor: PocketBaseSupervisor | None = None
+    metrics_server: MetricsServer | None = None
+    control_server: ControlServer | None = None
+    config_watcher: ConfigWatcher | None = None
+    fingerprinter: Fingerprinter | None = None
+    stop_event = threading.Event()
     console.print(f"[bold green]Starting watcher with config:[/] {config_path}")
     os.environ["BLENDMAN_CONFIG_TOML"] = config_path
     if not os.path.exists(config_path):
@@ -164,13 +242,29 @@ def start(
         )
         create_default_config(config_path, console)
     try:
-        start_pocketbase_if_needed(console)
+        if storage_settings()["backend"] == "pocketbase":
+            supervisor = start_pocketbase_if_needed(console)
         config = get_config()
         console.print(f"[green]Loaded config:[/] {config}")
         db = DBInterface()
+        db.warm_index()
         watch_abspath = os.path.abspath(watch_path)
         matcher = config.get("matcher")
-        bridge = WatcherBridge(db, path=watch_abspath, matcher=matcher)
+        if fingerprint:
+            fingerprinter = Fingerprinter(
+                cache_path=os.environ.get("BLENDMAN_FINGERPRINT_CACHE")
+            )
+        bridge = WatcherBridge(
+            db,
+            path=watch_abspath,
+            matcher=matcher,
+            patterns=config["patterns"],
+            fingerprinter=fingerprinter,
+            batch_size=int(os.environ.get("BLENDMAN_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        )
+        if supervisor is not None:
+            # Queue events while the supervised server restarts
+            supervisor.add_listener(bridge.on_backend_state)
         # Write PID file
         with open(pidfile, "w", encoding="utf-8") as f:
             f.write(str(os.getpid()))
@@ -180,19 +274,63 @@ def start(
             pidfile=pidfile,
             watch_path=watch_abspath,
         )
+        if reconcile_on_start:
+            # Queue live events until the records match the disk
+            bridge.pause()
         bridge.start()
+        if reconcile_on_start:
+            summary = reconcile(db, watch_abspath, matcher, fingerprinter=fingerprinter)
+            console.print(
+                "[green]Reconciled with disk:[/] "
+                f"{summary['moved']} moved, {summary['created']} created, "
+                f"{summary['deleted']} deleted"
+            )
+            bridge.resume()
         console.print(
             (f"[bold green]Watcher started. PID: {os.getpid()} (PID file: {pidfile}).")
         )
-        global _bridge
+        if metrics_port:
+            metrics_server = MetricsServer(
+                metrics_port,
+                host=metrics_host,
+                gauges=lambda: bridge_gauges(bridge),
+                health=lambda: bridge_health(bridge),
+            )
+            metrics_server.start()
+            console.print(f"[green]Metrics at {metrics_server.url}/metrics")
+        if control_supported():
+            control = WatcherControl(
+                bridge,
+                stop_event=stop_event,
+                reload=lambda: reload_patterns(bridge, config_path),
+                snapshot_path=f"{pidfile}.snapshot.json",
+            )
+            control_server = ControlServer(control_path(pidfile), control.handlers())
+            control_server.start()
+        if reload_config:
+            config_watcher = ConfigWatcher(
+                config_path, on_change=lambda: reload_patterns(bridge, config_path)
+            )
+            config_watcher.start()
+        global _bridge, _control_server
         _bridge = bridge
+        _control_server = control_server
         if os.getenv("BLENDMAN_INTERACTIVE"):
             console.print(
                 "[cyan]Watcher running in background. Use 'watcher stop' to stop."
             )
             return
-        while True:
-            time.sleep(1)
+        interval = float(
+            os.environ.get("BLENDMAN_METRICS_INTERVAL", DEFAULT_METRICS_INTERVAL)
+        )
+        next_snapshot = time.monotonic()
+        while not stop_event.is_set():
+            if interval > 0 and time.monotonic() >= next_snapshot:
+                write_metrics_snapshot(metrics_path(pidfile))
+                next_snapshot = time.monotonic() + interval
+            stop_event.wait(1)
+        log.info("Watcher stopped by control request")
+        console.print("[yellow]Watcher stopped by control request.")
     except ValueError as exc:
         log.error("Configuration error", error=str(exc))
         console.print(f"[red]{exc}")
@@ -203,10 +341,29 @@ def start(
         log.error("Error starting watcher", error=str(exc))
         console.print(f"[red]Error starting watcher:[/] {exc}")
     finally:
-        # Remove PID file on exit
+        # Remove PID file (and metrics snapshot) on exit
         if os.path.exists(pidfile) and not os.getenv("BLENDMAN_INTERACTIVE"):
             os.remove(pidfile)
-        _bridge = None
+            if os.path.exists(metrics_path(pidfile)):
+                os.remove(metrics_path(pidfile))
+        if not os.getenv("BLENDMAN_INTERACTIVE"):
+            if config_watcher is not None:
+                config_watcher.stop()
+            if control_server is not None:
+                control_server.stop()
+            if metrics_server is not None:
+                metrics_server.stop()
+            if bridge is not None:
+                # Persist what the writer thread still holds before closing
+                bridge.stop()
+            if fingerprinter is not None:
+                fingerprinter.close()
+            if db is not None:
+                db.close()
+            if supervisor is not None:
+                supervisor.stop()
+            _bridge = None
+            _control_server = None
 
 
 @watcher_app.command()
@@ -216,9 +373,10 @@ def stop(
     ),
 ):
     """
-    Stop the watcher process if running (by PID file).
+    Stop the watcher process if running. Asks the watcher to drain and exit
+    over its control socket, falling back to SIGTERM by PID file.
     """
-    global _bridge
+    global _bridge, _control_server
     if not os.path.exists(pidfile):
         console.print(
             f"[yellow]No watcher PID file found at {pidfile}. Is the watcher running?"
@@ -229,10 +387,17 @@ def stop(
             pid = int(f.read().strip())
         if pid == os.getpid() and _bridge is not None:
             _bridge.stop()
+            _bridge.db_interface.close()
+            if _control_server is not None:
+                _control_server.stop()
+                _control_server = None
             console.print("[green]Stopped watcher.")
             os.remove(pidfile)
             _bridge = None
             return
+        if _stop_via_control(pidfile):
+            console.print(f"[green]Stopped watcher process with PID {pid}.")
+            return
         if platform.system().lower() == "windows":
             import ctypes  # pylint: disable=import-outside-toplevel
 
@@ -252,47 +417,23 @@ def stop(
         console.print(f"[red]Failed to stop watcher: {exc}")
 
 
-@watcher_app.command()
-def status(
-    pidfile: str = typer.Option(
-        "./.blendman_watcher.pid", help="Path to PID file for watcher process."
-    ),
-):
+def _stop_via_control(pidfile: str, timeout: float = 10.0) -> bool:
     """
-    Show watcher status (running or not, by PID file).
+    Request a graceful stop over the control socket and wait for the watcher
+    to remove its PID file. Returns False if the watcher could not be reached
+    or did not exit in time.
     """
-    if not os.path.exists(pidfile):
-        console.print(f"[yellow]Watcher is not running (no PID file at {pidfile}).")
-        return
     try:
-        with open(pidfile, "r", encoding="utf-8") as f:
-            pid = int(f.read().strip())
-        # Check if process is alive
-        if pid == os.getpid() and _bridge is not None:
-            alive = True
-        elif platform.system().lower() == "windows":
-            import ctypes  # pylint: disable=import-outside-toplevel
-
-            process_query_limited_information = 0x1000
-            handle = ctypes.windll.kernel32.OpenProcess(
-                process_query_limited_information, False, pid
-            )
-            if handle:
-                ctypes.windll.kernel32.CloseHandle(handle)
-                alive = True
-            else:
-                alive = False
-        else:
-            try:
-                os.kill(pid, 0)
-                alive = True
-            except OSError:
-                alive = False
-        if alive:
-            console.print(f"[green]Watcher is running (PID {pid}).")
-        else:
-            console.print(
-                f"[yellow]Watcher PID file exists but process {pid} is not running."
-            )
-    except (OSError, ValueError) as exc:
-        console.print(f"[red]Error checking watcher status: {exc}")
+        result = send_command(control_path(pidfile), "stop")
+    except ControlError:
+        return False
+    console.print(
+        f"[cyan]Drained {result['flushed']} pending and {result['queued']} "
+        "queued events."
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not os.path.exists(pidfile):
+            return True
+        time.sleep(0.1)
+    return False
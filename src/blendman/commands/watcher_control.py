@@ -0,0 +1,215 @@
+"""
+Watcher status, metrics and control CLI commands for blendman.
+
+They query a running watcher over its control socket, or else by PID file and
+its last metrics snapshot, and register on the same ``watcher`` command group
+as start/stop.
+"""
+
+# pylint: disable=protected-access
+
+import json
+import os
+import platform
+
+import typer  # type: ignore
+from rich.table import Table  # type: ignore
+
+from rename_watcher.metrics import get_metrics, quantile, render_prometheus
+from blendman.control import FLUSH_WAIT, ControlError, control_path, send_command
+from blendman.commands import watcher
+from blendman.commands.watcher import console, metrics_path, watcher_app
+
+
+def read_metrics_snapshot(pidfile: str, pid: int) -> dict | None:
+    """
+    Metrics of the watcher with the given PID: live when it runs in this
+    process, otherwise from its last snapshot file (None if missing or stale).
+    """
+    if pid == os.getpid() and watcher._bridge is not None:
+        return get_metrics().snapshot()
+    try:
+        with open(metrics_path(pidfile), "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return snapshot if snapshot.get("pid") == pid else None
+
+
+def print_metrics(snapshot: dict) -> None:
+    """Print pipeline counters and per-stage latency percentiles."""
+    counters = Table(title="Pipeline events")
+    counters.add_column("Counter")
+    counters.add_column("Value", justify="right")
+    for counter in snapshot["counters"]:
+        label = ",".join(f"{k}={v}" for k, v in counter["labels"].items())
+        name = f"{counter['name']} ({label})" if label else counter["name"]
+        counters.add_row(name, str(counter["value"]))
+    console.print(counters)
+    stages = Table(title="Stage latency (ms)")
+    for column in ("Stage", "Count", "Mean", "p50", "p95", "p99"):
+        stages.add_column(column, justify="left" if column == "Stage" else "right")
+    for stage, hist in snapshot["stages"].items():
+        mean = hist["sum"] / hist["count"] if hist["count"] else None
+        values = [mean] + [quantile(hist, q) for q in (0.5, 0.95, 0.99)]
+        stages.add_row(
+            stage,
+            str(hist["count"]),
+            *("-" if v is None else f"{v * 1000:.2f}" for v in values),
+        )
+    console.print(stages)
+
+
+def _live_status(pidfile: str, prometheus: bool) -> bool:
+    """
+    Print status and metrics queried over the control socket. Returns False
+    if no watcher answered.
+    """
+    try:
+        state = send_command(control_path(pidfile), "status")
+        stats = send_command(control_path(pidfile), "stats")
+    except ControlError:
+        return False
+    if prometheus:
+        gauges = {name: tuple(gauge) for name, gauge in stats["gauges"].items()}
+        typer.echo(render_prometheus(stats["metrics"], gauges=gauges), nl=False)
+        return True
+    console.print(
+        f"[green]Watcher is running (PID {state['pid']}), watching {state['watch_path']}."
+    )
+    console.print(
+        f"Backend: {state['backend']}  paused: {state['paused']}  "
+        f"queued: {state['queued']}  pending: {state['pending']}"
+    )
+    print_metrics(stats["metrics"])
+    return True
+
+
+def _control(pidfile: str, command: str, **args) -> None:
+    """Run one control command against the watcher and print its result."""
+    try:
+        result = send_command(control_path(pidfile), command, **args)
+    except ControlError as exc:
+        console.print(f"[red]{command} failed:[/] {exc}")
+        raise typer.Exit(code=1) from exc
+    for key, value in result.items():
+        console.print(f"{key}: {value}")
+
+
+@watcher_app.command()
+def flush(
+    pidfile: str = typer.Option(
+        "./.blendman_watcher.pid", help="Path to PID file for watcher process."
+    ),
+    wait: float = typer.Option(
+        FLUSH_WAIT, help="Seconds to wait for the events to be persisted."
+    ),
+):
+    """Emit and persist events held back by the debounce window now."""
+    # The reply only comes once the writer is done, or `wait` ran out
+    _control(pidfile, "flush", wait=wait, timeout=wait + 5.0)
+
+
+@watcher_app.command()
+def pause(
+    pidfile: str = typer.Option(
+        "./.blendman_watcher.pid", help="Path to PID file for watcher process."
+    ),
+):
+    """Queue events instead of persisting them until 'watcher resume'."""
+    _control(pidfile, "pause")
+
+
+@watcher_app.command()
+def resume(
+    pidfile: str = typer.Option(
+        "./.blendman_watcher.pid", help="Path to PID file for watcher process."
+    ),
+):
+    """Persist queued events and resume normal operation."""
+    _control(pidfile, "resume")
+
+
+@watcher_app.command()
+def reload(
+    pidfile: str = typer.Option(
+        "./.blendman_watcher.pid", help="Path to PID file for watcher process."
+    ),
+):
+    """Re-read the config file and apply its include/ignore patterns."""
+    _control(pidfile, "reload")
+
+
+@watcher_app.command()
+def snapshot(
+    pidfile: str = typer.Option(
+        "./.blendman_watcher.pid", help="Path to PID file for watcher process."
+    ),
+    path: str = typer.Option(
+        "", help="Output JSON file (default: next to the PID file)."
+    ),
+):
+    """Write the watcher's path/inode map and metrics to a JSON file."""
+    _control(pidfile, "snapshot", **({"path": os.path.abspath(path)} if path else {}))
+
+
+@watcher_app.command()
+def status(
+    pidfile: str = typer.Option(
+        "./.blendman_watcher.pid", help="Path to PID file for watcher process."
+    ),
+    prometheus: bool = typer.Option(
+        False, "--prometheus", help="Print metrics in Prometheus text format."
+    ),
+):
+    """
+    Show watcher status and pipeline metrics (event counters and per-stage
+    latency), live over the control socket or else by PID file and the
+    watcher's last metrics snapshot.
+    """
+    if os.path.exists(control_path(pidfile)) and _live_status(pidfile, prometheus):
+        return
+    if not os.path.exists(pidfile):
+        console.print(f"[yellow]Watcher is not running (no PID file at {pidfile}).")
+        return
+    try:
+        with open(pidfile, "r", encoding="utf-8") as f:
+            pid = int(f.read().strip())
+        # Check if process is alive
+        if pid == os.getpid() and watcher._bridge is not None:
+            alive = True
+        elif platform.system().lower() == "windows":
+            import ctypes  # pylint: disable=import-outside-toplevel
+
+            process_query_limited_information = 0x1000
+            handle = ctypes.windll.kernel32.OpenProcess(
+                process_query_limited_information, False, pid
+            )
+            if handle:
+                ctypes.windll.kernel32.CloseHandle(handle)
+                alive = True
+            else:
+                alive = False
+        else:
+            try:
+                os.kill(pid, 0)
+                alive = True
+            except OSError:
+                alive = False
+        if alive:
+            snapshot = read_metrics_snapshot(pidfile, pid)
+            if prometheus:
+                if snapshot is not None:
+                    typer.echo(render_prometheus(snapshot), nl=False)
+                return
+            console.print(f"[green]Watcher is running (PID {pid}).")
+            if snapshot is None:
+                console.print("[yellow]No metrics snapshot yet.")
+            else:
+                print_metrics(snapshot)
+        else:
+            console.print(
+                f"[yellow]Watcher PID file exists but process {pid} is not running."
+            )
+    except (OSError, ValueError) as exc:
+        console.print(f"[red]Error checking watcher status: {exc}")
@@ -0,0 +1,337 @@
+"""
+Unix domain socket control channel for a running watcher.
+
+The protocol is newline-delimited JSON over one connection: each request
+is {"command": <name>, "args": {...}} and each response is either
+{"ok": true, "result": ...} or {"ok": false, "error": <message>}. The
+socket is created next to the PID file, readable only by its owner.
+"""
+
+from socketserver import StreamRequestHandler, ThreadingMixIn, UnixStreamServer
+import json
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import structlog  # type: ignore
+
+from rename_watcher.metrics import get_metrics
+
+from .metrics_server import bridge_gauges
+from .watcher_bridge import WatcherBridge
+
+Handler = Callable[..., Any]
+
+# Seconds "flush" waits for the writer by default; below send_command's timeout
+FLUSH_WAIT = 3.0
+
+
+class ControlError(Exception):
+    """A control request failed, or no watcher is listening."""
+
+
+def control_supported() -> bool:
+    """Whether this platform has Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def control_path(pidfile: str) -> str:
+    """Path of the control socket a watcher creates next to its PID file."""
+    return f"{pidfile}.sock"
+
+
+def send_command(path: str, command: str, timeout: float = 5.0, **args: Any) -> Any:
+    """
+    Send one request to a watcher's control socket.
+
+    Args:
+        path (str): Control socket path.
+        command (str): Command name (e.g. "status").
+        timeout (float): Seconds to wait for the connection and the reply.
+        **args: Command arguments.
+
+    Returns:
+        Any: The command's result.
+
+    Raises:
+        ControlError: If nothing is listening, or the command failed.
+    """
+    if not control_supported():
+        raise ControlError("Unix domain sockets are not supported on this platform")
+    request = json.dumps({"command": command, "args": args}) + "\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(request.encode())
+            with sock.makefile("r", encoding="utf-8") as reader:
+                line = reader.readline()
+    except OSError as exc:
+        raise ControlError(f"No watcher listening on {path}: {exc}") from exc
+    if not line:
+        raise ControlError(f"Watcher closed the connection on {path}")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise ControlError(response.get("error", "unknown error"))
+    return response.get("result")
+
+
+class _Server(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+class ControlServer:
+    """
+    Serve control requests on a Unix domain socket from a daemon thread.
+    Like MetricsServer, the thread blocks in accept() while idle.
+    """
+
+    def __init__(self, path: str, handlers: Dict[str, Handler]) -> None:
+        """
+        Args:
+            path (str): Socket path to create.
+            handlers (Dict[str, Handler]): Command name -> callable taking the
+                request's args as keyword arguments and returning a
+                JSON-serialisable result.
+        """
+        self.path = path
+        self.handlers = handlers
+        self.logger = structlog.get_logger("ControlServer")
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """
+        Create the socket and start serving.
+
+        Raises:
+            ControlError: If another watcher already listens on the path.
+        """
+        if os.path.exists(self.path):
+            try:
+                send_command(self.path, "ping", timeout=1.0)
+            except ControlError:
+                os.unlink(self.path)  # stale socket from a crashed watcher
+            else:
+                raise ControlError(f"A watcher is already listening on {self.path}")
+        # Owner-only from the moment bind() creates the file
+        umask = os.umask(0o177)
+        try:
+            server = _Server(self.path, self._handler())
+        finally:
+            os.umask(umask)
+        server.timeout = None
+        self._server = server
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._serve, name="blendman-control", daemon=True
+        )
+        self._thread.start()
+        self.logger.info("[ControlServer] Listening", path=self.path)
+
+    def stop(self) -> None:
+        """Stop serving and remove the socket file."""
+        if self._server is None:
+            return
+        self._stopping = True
+        # Wake the blocked accept() so the loop sees the flag
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(1)
+                sock.connect(self.path)
+        except OSError:
+            pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _serve(self) -> None:
+        server = self._server
+        while server is not None and not self._stopping:
+            server.handle_request()
+
+    def dispatch(self, line: str) -> Dict[str, Any]:
+        """Run one request line and build its response."""
+        try:
+            request = json.loads(line)
+            command = request["command"]
+            args = request.get("args") or {}
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "error": "Malformed request"}
+        if command == "ping":
+            return {"ok": True, "result": "pong"}
+        handler = self.handlers.get(command)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown command: {command}"}
+        try:
+            return {"ok": True, "result": handler(**args)}
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Report the failure to the client instead of killing the channel
+            self.logger.error(
+                "[ControlServer] Command failed", command=command, error=str(exc)
+            )
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    def _handler(self) -> type:
+        owner = self
+
+        class Handler(StreamRequestHandler):
+            """Answers each request line with one response line."""
+
+            timeout = 30
+
+            def handle(self) -> None:
+                for raw in self.rfile:
+                    line = raw.decode("utf-8").strip()
+                    if not line:
+                        continue
+                    response = owner.dispatch(line)
+                    self.wfile.write((json.dumps(response) + "\n").encode())
+                    self.wfile.flush()
+
+        return Handler
+
+
+class WatcherControl:
+    """
+    Control commands for a running WatcherBridge: status, stats, flush,
+    pause, resume, reload, snapshot and stop.
+    """
+
+    def __init__(
+        self,
+        bridge: WatcherBridge,
+        stop_event: Optional[threading.Event] = None,
+        reload: Optional[Callable[[], Dict[str, Any]]] = None,
+        snapshot_path: str = "blendman_snapshot.json",
+    ) -> None:
+        """
+        Args:
+            bridge (WatcherBridge): The running bridge.
+            stop_event (Optional[threading.Event]): Set by "stop" to end the
+                watcher's main loop.
+            reload (Optional[Callable[[], Dict[str, Any]]]): Re-reads the
+                config and swaps the matcher; returns a summary.
+            snapshot_path (str): Default file for "snapshot".
+        """
+        self.bridge = bridge
+        self.stop_event = stop_event
+        self.reload_config = reload
+        self.snapshot_path = snapshot_path
+
+    def handlers(self) -> Dict[str, Handler]:
+        """Command table for ControlServer."""
+        return {
+            "status": self.status,
+            "stats": self.stats,
+            "flush": self.flush,
+            "pause": self.pause,
+            "resume": self.resume,
+            "reload": self.reload,
+            "snapshot": self.snapshot,
+            "stop": self.stop,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """Liveness and queue state."""
+        db = self.bridge.db_interface
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - get_metrics().started,
+            "watch_path": self.bridge.watcher.path,
+            "paused": self.bridge.paused,
+            "queued": self.bridge.queued,
+            "pending": self.bridge.watcher.pending_events(),
+            "backend": db.backend_state(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Pipeline metrics snapshot plus current gauges and cache counters."""
+        snapshot = get_metrics().snapshot()
+        snapshot["pid"] = os.getpid()
+        return {
+            "metrics": snapshot,
+            # name -> [help, value], as render_prometheus(gauges=...) takes
+            "gauges": bridge_gauges(self.bridge),
+            "cache": self.bridge.db_interface.cache_stats(),
+        }
+
+    def flush(self, wait: float = FLUSH_WAIT) -> Dict[str, Any]:
+        """
+        Emit debounced events now and, unless paused, wait up to `wait`
+        seconds for the writer thread to persist them.
+
+        Returns:
+            Dict[str, Any]: Events emitted ("flushed") and whether everything
+            queued was persisted in time ("drained"; False while paused).
+        """
+        flushed = self.bridge.watcher.flush()
+        drained = not self.bridge.paused and self.bridge.drain(wait)
+        return {"flushed": flushed, "drained": drained}
+
+    def pause(self) -> Dict[str, Any]:
+        """Queue events instead of persisting them."""
+        self.bridge.pause()
+        return {"paused": True}
+
+    def resume(self) -> Dict[str, Any]:
+        """Persist queued events and resume."""
+        queued = self.bridge.queued
+        self.bridge.resume()
+        return {"paused": False, "replayed": queued}
+
+    def reload(self) -> Dict[str, Any]:
+        """Re-read the config file and apply its patterns."""
+        if self.reload_config is None:
+            raise ControlError("Reload is not available for this watcher")
+        return self.reload_config()
+
+    def snapshot(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Write the path -> inode map, its directory digests and metrics to a
+        JSON file.
+
+        Args:
+            path (Optional[str]): Target file (default: snapshot_path).
+        """
+        target = os.path.abspath(path or self.snapshot_path)
+        tracked = self.bridge.watcher.tracked_paths()
+        digests = self.bridge.watcher.digest_tree().digests()
+        data = {
+            "pid": os.getpid(),
+            "written": time.time(),
+            "watch_path": self.bridge.watcher.path,
+            "paths": tracked,
+            # directory -> [local, tree] (see rename_watcher.digests)
+            "digests": {d: list(digest) for d, digest in digests.items()},
+            "metrics": get_metrics().snapshot(),
+        }
+        tmp_path = f"{target}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, target)
+        return {"path": target, "entries": len(tracked)}
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Drain debounced events and the events queued while paused, then ask
+        the main loop to exit.
+        """
+        flushed = self.bridge.watcher.flush()
+        queued = self.bridge.queued
+        if self.bridge.paused:
+            self.bridge.resume()
+        if self.stop_event is not None:
+            self.stop_event.set()
+        return {
+            "stopping": self.stop_event is not None,
+            "flushed": flushed,
+            "queued": queued,
+        }
@@ -2,72 +2,206 @@
 Main interface logic for DB operations and queries.
 
 Exposes APIs for persisting and querying file/dir state and rename logs.
+Records are kept by a pluggable storage backend (see blendman.storage).
 """
 
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 import os
+import threading
+import time
 
 import structlog  # type: ignore
 
-from pocketbase.api import PocketBaseAPI
-from pocketbase.auth import AuthClient
-from pocketbase.exceptions import PocketBaseError
+from pocketbase.resilience import OPEN
+from rename_watcher.metrics import get_metrics
+
+from .record_cache import RecordCache, get_shared_cache
+from .record_index import RecordIndex
+from .dir_digests import StaleDirs
+from .storage import (
+    NOT_FOUND_ERRORS,
+    STORAGE_ERRORS,
+    BatchCommitError,
+    StorageBackend,
+    create_storage,
+)
+
+# Optional `files` fields copied from events when present
+FILE_FIELDS = (
+    "inode",
+    "size",
+    "mtime",
+    "partial_hash",
+    "blender_version",
+    "scene_count",
+    "object_count",
+    "compression",
+)
 
 
 class DBInterface:
     """
     Interface for all DB operations related to files, directories, and rename logs.
+
+    Construction does no I/O: the PocketBase backend logs in on first use, and
+    tests or benchmarks can pass store=MemoryStorage() to run without a server.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[RecordCache] = None,
+        store: Optional[StorageBackend] = None,
+    ):
+        """
+        Args:
+            cache (Optional[RecordCache]): Lookup cache (shared one by default).
+            store (Optional[StorageBackend]): Record store (the backend
+                configured by BLENDMAN_STORAGE / [storage] by default).
+        """
         self.logger = structlog.get_logger("DBInterface")
-        self.auth_client = AuthClient()
-        self.api = PocketBaseAPI()
-        self._ensure_auth()
+        self.store = store if store is not None else create_storage()
+        # Optional JSON file keeping the path/inode -> record id index across runs
+        self.record_index = RecordIndex(os.environ.get("BLENDMAN_RECORD_INDEX"))
+        # Read-through cache for file state and log lookups, shared per process
+        self.cache = cache if cache is not None else get_shared_cache()
+        # Directory digests blanked by live events
+        self.stale_dirs = StaleDirs(self.store)
+        # Open transaction of each thread: units of writes, cache tags to drop
+        self._local = threading.local()
 
-    def _ensure_auth(self) -> None:
-        """Ensure the AuthClient is logged in, prompting if needed."""
-        if self.auth_client.is_authenticated():
-            return
-        admin_email = os.environ.get("POCKETBASE_ADMIN_EMAIL")
-        admin_password = os.environ.get("POCKETBASE_ADMIN_PASSWORD")
-        if not admin_email or not admin_password:
-            admin_email = input("PocketBase admin email: ")
-            import getpass
+    def warm_index(self, page_size: int = 500) -> int:
+        """
+        Load path/inode -> record id mappings for every `files` record not
+        marked deleted, streaming the collection with a single paginated
+        query.
 
-            admin_password = getpass.getpass("PocketBase admin password: ")
+        Returns:
+            int: Number of records indexed.
+        """
+        count = 0
         try:
-            self.auth_client.login(admin_email, admin_password)
-        except PocketBaseError as exc:
-            self.logger.error("Auth login failed", error=str(exc))
-            raise
+            for record in self.store.iter_records(
+                "files", fields="id,path,inode,deleted", page_size=page_size
+            ):
+                # Deleted files keep their record (and history), not their inode
+                if record.get("path") and not record.get("deleted"):
+                    self.record_index.put(
+                        record["id"], record["path"], record.get("inode") or None
+                    )
+                    count += 1
+        except STORAGE_ERRORS as exc:
+            self.logger.error(
+                "[DBInterface] Record index warm-up failed", error=str(exc)
+            )
+        self.logger.info("[DBInterface] Record index warmed", records=count)
+        return count
+
+    def close(self) -> None:
+        """Persist the record index, if configured, and close the store."""
+        try:
+            self.record_index.save()
+        except OSError as exc:
+            self.logger.error(
+                "[DBInterface] Saving record index failed", error=str(exc)
+            )
+        self.store.close()
+
+    def _upsert_file(self, event: dict, file_data: dict) -> dict:
+        """
+        Update the existing record for a moved/renamed file, or create one.
+        Events that name their record (``file_id``) skip the index lookup.
+        """
+        if event.get("merge"):
+            record_id = self._merge_target(event)
+        else:
+            record_id = event.get("file_id") or self.record_index.lookup(
+                path=event.get("old_path") or event["new_path"],
+                inode=event.get("inode"),
+            )
+        if record_id:
+            try:
+                record = self.store.update("files", record_id, file_data)
+                self.logger.info("[DBInterface] File record updated", record=record)
+                return record
+            except NOT_FOUND_ERRORS:
+                # Stale index entry: the record was deleted server-side
+                self.record_index.remove(record_id)
+                self.cache.invalidate(record_id)
+        record = self.store.create("files", file_data)
+        self.logger.info("[DBInterface] File record created", record=record)
+        return record
+
+    def _merge_target(self, event: dict) -> Optional[str]:
+        """
+        Record of the original file for a ``merge`` move: a move paired by
+        content after the copy was already recorded as created, or the
+        original as deleted. The original's record (found by its old path,
+        even if deleted) is kept and takes over the copy's logs; the copy's
+        record is dropped.
+        """
+        old_path = event.get("old_path") or ""
+        record_id = self.record_index.lookup(path=old_path)
+        if record_id is None and old_path:
+            # Deleted records leave the index but stay in the store
+            found = self.store.list("files", filter={"path": old_path}, fields="id")
+            record_id = found[0]["id"] if found else None
+        duplicate = self.record_index.lookup(path=event["new_path"])
+        if record_id is None:
+            return duplicate
+        if duplicate and duplicate != record_id:
+            with self.store.transaction():
+                for log in self.store.list(
+                    "rename_logs", filter={"file_id": duplicate}, fields="id"
+                ):
+                    self.store.update("rename_logs", log["id"], {"file_id": record_id})
+                self.store.delete("files", duplicate)
+            self.record_index.remove(duplicate)
+            self._invalidate(duplicate, record_id, "rename_logs")
+            self.logger.info(
+                "[DBInterface] Merged duplicate record",
+                record_id=record_id,
+                duplicate=duplicate,
+            )
+        return record_id
 
     def persist_event(self, event: dict) -> None:
         """
-        Persist a watcher event: update FileDir and insert RenameLog.
+        Persist a watcher event: upsert FileDir and insert RenameLog.
+
+        Moves and renames PATCH the file's existing record (found through the
+        record index by inode or previous path) instead of creating a new one.
+        Successful calls are timed as the "persist" pipeline stage.
         """
-        # Upsert file/dir record
+        start = time.monotonic()
         file_data = {
             "name": event["name"],
             "path": event["new_path"],
             "parent_id": event.get("parent_id"),
             "type": event["type"],
+            # Kept for the history; moves and re-creations revive the record
+            "deleted": event["event_type"] == "deleted",
         }
-        self.logger.info("[DBInterface] Creating file record", data=file_data)
-        if not self.auth_client.is_authenticated():
-            self._ensure_auth()
+        for field in FILE_FIELDS:
+            if event.get(field) is not None:
+                file_data[field] = event[field]
+        self.logger.info("[DBInterface] Upserting file record", data=file_data)
         try:
-            file_record = self.api.collections.create(  # pylint: disable=no-member
-                "files", file_data
-            )
-            self.logger.info("[DBInterface] File record created", record=file_record)
-        except PocketBaseError as exc:
+            file_record = self._upsert_file(event, file_data)
+        except STORAGE_ERRORS as exc:
             self.logger.error(
-                "[DBInterface] File record creation failed",
+                "[DBInterface] File record upsert failed",
                 data=file_data,
                 error=str(exc),
             )
             raise
+        self._invalidate(file_record["id"])
+        if event["event_type"] == "deleted":
+            self.record_index.remove(file_record["id"])
+        else:
+            self.record_index.put(
+                file_record["id"], event["new_path"], event.get("inode")
+            )
 
         # Insert rename log
         log_data = {
@@ -78,53 +212,266 @@ class DBInterface:
         }
         self.logger.info("[DBInterface] Creating rename log", data=log_data)
         try:
-            log_record = self.api.collections.create(  # pylint: disable=no-member
-                "rename_logs", log_data
-            )
+            log_record = self.store.create("rename_logs", log_data)
+            self._invalidate(file_record["id"], "rename_logs")
             self.logger.info("[DBInterface] Rename log created", record=log_record)
-        except PocketBaseError as exc:
+        except STORAGE_ERRORS as exc:
             self.logger.error(
                 "[DBInterface] Rename log creation failed",
                 data=log_data,
                 error=str(exc),
             )
             raise
+        get_metrics().since("persist", start)
+
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """
+        Storage transaction: writes made inside it are committed together.
+
+        Record index changes apply at once, as later writes in the same
+        transaction look them up, and are undone for the units of writes
+        (see _checkpoint()) that were not committed. Cached lookups of the
+        written records are dropped again at the end, since reads do not see
+        queued writes. Nested blocks join the outer one.
+        """
+        if getattr(self._local, "units", None) is not None:
+            with self.store.transaction() as store:
+                yield store
+            return
+        units: List[Tuple[int, int]] = []
+        tags: set = set()
+        self._local.units, self._local.tags = units, tags
+        self.record_index.begin()
+        try:
+            with self.store.transaction() as store:
+                yield store
+        except BaseException as exc:
+            committed = exc.committed if isinstance(exc, BatchCommitError) else 0
+            marks = [mark for queued, mark in units if queued <= committed]
+            self.record_index.rollback(marks[-1] if committed and marks else 0)
+            raise
+        finally:
+            self.record_index.end()
+            self._local.units = self._local.tags = None
+            self.cache.invalidate(*tags)
+
+    def _checkpoint(self) -> int:
+        """
+        End a unit of writes (one event, one refreshed record) in the open
+        transaction, so a partial commit keeps the index of whole units only.
 
-    def get_logs_for_file(self, file_id: str) -> List[dict]:
+        Returns:
+            int: Writes queued so far: the unit is stored if at least that
+                many were committed.
+        """
+        queued = self.store.queued()
+        units = getattr(self._local, "units", None)
+        if units is not None:
+            units.append((queued, self.record_index.mark()))
+        return queued
+
+    def _invalidate(self, *tags: str) -> None:
+        """Drop cached lookups now, and again when the transaction ends."""
+        self.cache.invalidate(*tags)
+        pending = getattr(self._local, "tags", None)
+        if pending is not None:
+            pending.update(tags)
+
+    def persist_events(self, events: Iterable[dict]) -> int:
+        """
+        Persist a batch of watcher events in one storage transaction (a single
+        commit for local backends, batch requests for PocketBase). Failed
+        events are logged and skipped.
+
+        A failed commit stores nothing, except with PocketBase, where the
+        requests sent before the failed one are kept. If that one failed
+        because a record was deleted meanwhile (a stale record id), the
+        events not committed are persisted again one by one, which creates
+        such records anew.
+
+        Returns:
+            int: Number of events persisted.
+        """
+        done: List[Tuple[dict, int]] = []  # persisted events, writes queued after
+        try:
+            with self.transaction():
+                for event in events:
+                    try:
+                        self.persist_event(event)
+                    except STORAGE_ERRORS:
+                        continue
+                    done.append((event, self._checkpoint()))
+        except STORAGE_ERRORS as exc:
+            committed = exc.committed if isinstance(exc, BatchCommitError) else 0
+            landed = sum(1 for _, queued in done if committed and queued <= committed)
+            self.logger.error(
+                "[DBInterface] Batch commit failed",
+                events=len(done),
+                committed=landed,
+                error=str(exc),
+            )
+            if not isinstance(exc.__cause__, NOT_FOUND_ERRORS):
+                return landed
+            for event, _ in done[landed:]:
+                try:
+                    self.persist_event(event)
+                except STORAGE_ERRORS:
+                    continue
+                landed += 1
+            return landed
+        return len(done)
+
+    def refresh_files(self, changes: Iterable[Tuple[str, dict]]) -> int:
+        """
+        Update file metadata (inode, size, mtime, ...) that changed without a
+        rename, in one storage transaction and without rename logs. Failed
+        updates are logged and skipped.
+
+        Args:
+            changes (Iterable[Tuple[str, dict]]): (record id, fields) pairs.
+
+        Returns:
+            int: Number of records updated.
+        """
+        updated = 0
+        with self.transaction():
+            for record_id, data in changes:
+                try:
+                    record = self.store.update("files", record_id, data)
+                except STORAGE_ERRORS as exc:
+                    self.logger.error(
+                        "[DBInterface] File refresh failed",
+                        record_id=record_id,
+                        error=str(exc),
+                    )
+                    continue
+                self._invalidate(record_id)
+                if "inode" in data:
+                    path = data.get("path") or record["path"]
+                    self.record_index.put(record_id, path, data["inode"])
+                self._checkpoint()
+                updated += 1
+        return updated
+
+    def mark_dirs_stale(self, *paths: Optional[str]) -> None:
+        """
+        Blank the stored digests (`dir_digests`) of the directories holding
+        these paths, so startup reconciliation re-examines them even if they
+        are gone by then (see StaleDirs).
+        """
+        self.stale_dirs.mark(*paths)
+
+    def invalidate_cached(self, collection: str, record: dict) -> None:
+        """
+        Drop cached lookups affected by a change made elsewhere, e.g. by
+        another process and reported through PocketBase realtime events.
+
+        Args:
+            collection (str): Collection of the changed record.
+            record (dict): The changed record.
+        """
+        if collection == "files":
+            self.cache.invalidate(record.get("id", ""))
+        elif collection == "rename_logs":
+            self.cache.invalidate(record.get("file_id", ""), "rename_logs")
+
+    def follow_remote_changes(self, realtime: Any) -> Callable[[], None]:
+        """
+        Invalidate cached lookups from PocketBase realtime events.
+
+        Args:
+            realtime: A started or startable pocketbase.realtime.RealtimeClient.
+
+        Returns:
+            Callable[[], None]: Function removing the subscriptions.
+        """
+        unsubscribes = [
+            realtime.subscribe(
+                collection,
+                lambda event: self.invalidate_cached(event.topic, event.record),
+            )
+            for collection in ("files", "rename_logs")
+        ]
+        realtime.start()
+        return lambda: [unsubscribe() for unsubscribe in unsubscribes]
+
+    def backend_state(self) -> str:
+        """
+        Availability of the store: "closed", "open" or "half_open". For
+        PocketBase this is the shared circuit breaker; while open, writes fail
+        fast with CircuitOpenError.
+        """
+        return self.store.state()
+
+    def backend_available(self) -> bool:
+        """Whether writes are currently attempted (circuit not open)."""
+        return self.backend_state() != OPEN
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the lookup cache."""
+        return self.cache.stats()
+
+    def get_logs_for_file(
+        self, file_id: str, fields: Optional[str] = None
+    ) -> List[dict]:
         """
         Fetch all logs for a given file/dir by file_id.
+
+        `fields` limits the returned columns (comma-separated). Results are
+        served from the lookup cache while fresh.
         """
         try:
-            return self.api.collections.list(  # pylint: disable=no-member
-                "rename_logs", filter={"file_id": file_id}, sort="timestamp"
+            return self.cache.get_or_load(
+                ("logs", file_id, fields),
+                lambda: self.store.list(
+                    "rename_logs",
+                    filter={"file_id": file_id},
+                    sort="timestamp",
+                    fields=fields,
+                ),
+                tags=(file_id,),
             )
-        except PocketBaseError as exc:
+        except STORAGE_ERRORS as exc:
             self.logger.error(
                 "DB get_logs_for_file failed", file_id=file_id, error=str(exc)
             )
             return []
 
-    def get_global_log(self) -> List[dict]:
+    def get_global_log(
+        self,
+        filter: Optional[str] = None,  # pylint: disable=redefined-builtin
+        fields: Optional[str] = None,
+    ) -> List[dict]:
         """
         Fetch all rename logs, ordered by timestamp.
+
+        `filter` is a PocketBase filter expression (see pocketbase.filters)
+        and `fields` limits the returned columns.
         """
         try:
-            return self.api.collections.list(  # pylint: disable=no-member
-                "rename_logs", sort="timestamp"
+            return self.cache.get_or_load(
+                ("global_log", filter, fields),
+                lambda: self.store.list(
+                    "rename_logs", filter=filter, sort="timestamp", fields=fields
+                ),
+                tags=("rename_logs",),
             )
-        except PocketBaseError as exc:
+        except STORAGE_ERRORS as exc:
             self.logger.error("DB get_global_log failed", error=str(exc))
             return []
 
     def get_file_state(self, file_id: str) -> Optional[dict]:
         """
-        Fetch the current state of a file/dir by file_id.
+        Fetch the current state of a file/dir by file_id (cached while fresh).
         """
         try:
-            return self.api.collections.get(  # pylint: disable=no-member
-                "files", file_id
+            return self.cache.get_or_load(
+                ("files", file_id),
+                lambda: self.store.get("files", file_id),
+                tags=(file_id,),
             )
-        except PocketBaseError as exc:
+        except STORAGE_ERRORS as exc:
             self.logger.error(
                 "DB get_file_state failed", file_id=file_id, error=str(exc)
             )
@@ -0,0 +1,136 @@
+"""
+Stored directory digests (the `dir_digests` collection) of startup
+reconciliation (see blendman.reconcile): loading and saving them, and
+blanking those of directories touched by live events, so the next pass
+re-examines them.
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+import os
+
+import structlog  # type: ignore
+
+from rename_watcher.digests import DigestTree, DirDigest
+
+from .storage import NOT_FOUND_ERRORS, STORAGE_ERRORS, StorageBackend
+
+if TYPE_CHECKING:
+    from .db_interface import DBInterface
+
+
+def under(path: str, root: str) -> bool:
+    """Whether `path` is `root` or below it."""
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def load_digests(db: "DBInterface", root: str) -> Dict[str, Tuple[str, DirDigest]]:
+    """
+    Stored directory digests under `root`.
+
+    Returns:
+        Dict[str, Tuple[str, DirDigest]]: Directory -> (record id, digests).
+
+    Raises:
+        PocketBaseNotFoundError, RecordNotFoundError: If the store has no
+            `dir_digests` collection.
+    """
+    return {
+        record["path"]: (record["id"], DirDigest(record["local"], record["tree"]))
+        for record in db.store.iter_records(
+            "dir_digests", fields="id,path,local,tree", page_size=1000
+        )
+        if under(record.get("path") or "", root)
+    }
+
+
+def save_digests(db: "DBInterface", tree: DigestTree) -> int:
+    """
+    Replace the stored directory digests under the tree's root, in one
+    storage transaction.
+
+    Returns:
+        int: Records written or deleted.
+    """
+    stored = load_digests(db, tree.root)
+    writes = 0
+    with db.store.transaction():
+        for directory, digest in tree.digests().items():
+            record_id, old = stored.pop(directory, (None, None))
+            if old == digest:
+                continue
+            data = {"path": directory, "local": digest.local, "tree": digest.tree}
+            if record_id:
+                db.store.update("dir_digests", record_id, data)
+            else:
+                db.store.create("dir_digests", data)
+            writes += 1
+        for record_id, _ in stored.values():
+            db.store.delete("dir_digests", record_id)
+            writes += 1
+    return writes
+
+
+class StaleDirs:
+    """
+    Blanks each directory's digest once per process. The record ids are read
+    in one query on first use, so live events only pay for the first write
+    per directory.
+    """
+
+    def __init__(self, store: StorageBackend) -> None:
+        self.logger = structlog.get_logger("StaleDirs")
+        self.store = store
+        # Directories whose stored digest this process blanked (or tried to)
+        self._marked: set = set()
+        # dir_digests path -> record id, loaded on the first blanked directory
+        self._ids: Optional[Dict[str, str]] = None
+        # Cleared when the store has no dir_digests collection
+        self._enabled = True
+
+    def _load_ids(self) -> Optional[Dict[str, str]]:
+        """
+        Record ids of the stored directory digests. Returns None, and turns
+        marking off, when the store has no `dir_digests` collection.
+        """
+        if self._ids is None:
+            try:
+                self._ids = {
+                    record["path"]: record["id"]
+                    for record in self.store.iter_records(
+                        "dir_digests", fields="id,path", page_size=1000
+                    )
+                }
+            except NOT_FOUND_ERRORS as exc:
+                self.logger.warning(
+                    "[StaleDirs] No dir_digests collection; "
+                    "not marking directories stale",
+                    error=str(exc),
+                )
+                self._enabled = False
+        return self._ids
+
+    def mark(self, *paths: Optional[str]) -> None:
+        """
+        Blank the digests of the directories holding these paths. Each
+        directory is tried once, failed or not.
+        """
+        for path in paths:
+            directory = os.path.dirname(path) if path else ""
+            if not self._enabled or not directory or directory in self._marked:
+                continue
+            self._marked.add(directory)
+            data = {"path": directory, "local": "", "tree": ""}
+            try:
+                ids = self._load_ids()
+                if ids is None:
+                    return
+                if directory in ids:
+                    self.store.update("dir_digests", ids[directory], data)
+                else:
+                    ids[directory] = self.store.create("dir_digests", data)["id"]
+            except STORAGE_ERRORS as exc:
+                self.logger.error(
+                    "[StaleDirs] Marking directory stale failed",
+                    directory=directory,
+                    error=str(exc),
+                )
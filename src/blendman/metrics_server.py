@@ -0,0 +1,192 @@
+"""
+Optional HTTP endpoint exposing a running watcher's metrics.
+
+Serves GET /metrics (Prometheus text) and GET /health (JSON summary). The
+server thread blocks in accept() between requests, so an unscraped watcher
+does no extra work; metrics and health are only computed per request.
+"""
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import structlog  # type: ignore
+
+from pocketbase.resilience import OPEN
+from rename_watcher.metrics import get_metrics, render_prometheus
+
+from .watcher_bridge import WatcherBridge
+
+Gauges = Dict[str, Tuple[str, float]]
+
+
+def bridge_gauges(bridge: WatcherBridge) -> Gauges:
+    """Queue depths and backend state of a running bridge, as Prometheus gauges."""
+    cache = bridge.db_interface.cache_stats()
+    gauges: Gauges = {
+        "processor_pending": (
+            "Raw events held back by the debounce window.",
+            bridge.watcher.pending_events(),
+        ),
+        "bridge_queued": (
+            "Events queued while persistence is paused.",
+            bridge.queued,
+        ),
+        "bridge_paused": ("1 while persistence is paused.", int(bridge.paused)),
+        "backend_available": (
+            "0 while the storage backend's circuit is open.",
+            int(bridge.db_interface.backend_available()),
+        ),
+        "cache_hits": ("Lookup cache hits.", cache["hits"]),
+        "cache_misses": ("Lookup cache misses.", cache["misses"]),
+    }
+    fingerprinter = bridge.watcher.fingerprinter
+    if fingerprinter is not None:
+        fingerprints = fingerprinter.stats()
+        gauges["fingerprint_hits"] = (
+            "Fingerprints served from the hash cache.",
+            fingerprints["hits"],
+        )
+        gauges["fingerprint_misses"] = (
+            "Fingerprints that had to read the file.",
+            fingerprints["misses"],
+        )
+    return gauges
+
+
+def bridge_health(bridge: WatcherBridge) -> Dict[str, Any]:
+    """
+    JSON health summary of a running bridge. Status is "degraded" while
+    persistence is paused or the backend's circuit is open.
+    """
+    metrics = get_metrics()
+    backend = bridge.db_interface.backend_state()
+    degraded = bridge.paused or backend == OPEN
+    return {
+        "status": "degraded" if degraded else "ok",
+        "pid": os.getpid(),
+        "uptime": time.time() - metrics.started,
+        "backend": backend,
+        "paused": bridge.paused,
+        "queued": bridge.queued,
+        "pending": bridge.watcher.pending_events(),
+        "events": {
+            "in": metrics.counter("events_in"),
+            "out": metrics.counter("events_out"),
+            "persist_errors": metrics.counter("events_dropped", reason="persist_error"),
+        },
+    }
+
+
+class MetricsServer:
+    """
+    Minimal HTTP server for /metrics and /health, run on a daemon thread.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        host: str = "127.0.0.1",
+        gauges: Optional[Callable[[], Gauges]] = None,
+        health: Optional[Callable[[], Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Args:
+            port (int): Port to bind (0 picks a free one; see `port` after start).
+            host (str): Interface to bind; loopback by default.
+            gauges (Optional[Callable[[], Gauges]]): Extra gauges per scrape.
+            health (Optional[Callable[[], Dict[str, Any]]]): Health summary;
+                a "status" other than "ok" is served with 503.
+        """
+        self.host = host
+        self.port = port
+        self.gauges = gauges
+        self.health = health or (lambda: {"status": "ok", "pid": os.getpid()})
+        self.logger = structlog.get_logger("MetricsServer")
+        self._server: Optional[HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> None:
+        """Bind and start serving on a daemon thread."""
+        server = HTTPServer((self.host, self.port), self._handler())
+        server.timeout = None
+        self._server = server
+        self.port = server.server_address[1]
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._serve, name="blendman-metrics", daemon=True
+        )
+        self._thread.start()
+        self.logger.info("[MetricsServer] Serving metrics", url=self.url)
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._server is None:
+            return
+        self._stopping = True
+        # Wake the blocked accept() so the loop sees the flag
+        try:
+            socket.create_connection((self.host, self.port), timeout=1).close()
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+    def _serve(self) -> None:
+        server = self._server
+        while server is not None and not self._stopping:
+            server.handle_request()
+
+    def render(self, path: str) -> Tuple[int, str, bytes]:
+        """Build the (status, content type, body) answer for a request path."""
+        if path == "/metrics":
+            gauges = self.gauges() if self.gauges else None
+            text = render_prometheus(get_metrics().snapshot(), gauges=gauges)
+            return 200, "text/plain; version=0.0.4; charset=utf-8", text.encode()
+        if path == "/health":
+            summary = self.health()
+            status = 200 if summary.get("status") == "ok" else 503
+            return status, "application/json", json.dumps(summary).encode()
+        return 404, "text/plain; charset=utf-8", b"Not found\n"
+
+    def _handler(self) -> type:
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Routes GET requests to MetricsServer.render."""
+
+            # One request at a time: a stalled client must not block scrapes
+            timeout = 5
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """Answer one scrape."""
+                try:
+                    status, content_type, body = owner.render(self.path.split("?")[0])
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    # A failing gauge must not take the endpoint down
+                    owner.logger.error("[MetricsServer] Render failed", error=str(exc))
+                    status, content_type = 500, "text/plain; charset=utf-8"
+                    body = f"{exc}\n".encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+                """Scrapes are frequent; keep them out of the watcher log."""
+
+        return Handler
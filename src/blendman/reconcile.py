@@ -0,0 +1,465 @@
+"""
+Startup reconciliation between the watched tree and the `files` records.
+
+Renames, moves and deletes that happen while the watcher is stopped produce
+no events. On start, the stored records are streamed and compared with a
+parallel scan of the tree, and the differences are persisted as synthesized
+events, in batches of one storage transaction each.
+
+Disk files are matched to records in phases, cheapest evidence first:
+
+1. same path and inode: unchanged (stale size/mtime are refreshed);
+2. same inode at another path, with the same size and mtime (or partial
+   hash): moved;
+3. same path, new inode: rewritten in place (e.g. Blender's save-by-rename);
+4. same size and mtime at another path: moved across devices, or copied
+   and deleted. A partial hash confirms the match when the record has one
+   or when several files qualify.
+
+Records left over are deleted and files left over are created. Only
+records and files the path matcher includes are considered. Created files
+and files changed in place also get their .blend header metadata
+(blendman.blendfile).
+
+The per-directory digests of the scanned tree (rename_watcher.digests) are
+kept in the `dir_digests` collection. The next pass only loads and diffs
+records in directories whose digest changed since, so an unchanged tree
+costs one scan and one comparison.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import chain
+import os
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import structlog  # type: ignore
+
+from pocketbase.filters import all_of, cond, like
+from rename_watcher.digests import DigestTree
+from rename_watcher.fingerprint import Fingerprinter, partial_hash
+from rename_watcher.metrics import get_metrics
+
+from .blendfile import blend_metadata
+from .db_interface import DBInterface
+from .dir_digests import load_digests, save_digests, under
+from .storage import NOT_FOUND_ERRORS
+
+Matcher = Callable[[str], bool]
+Hasher = Callable[[Iterable[Tuple[str, int]]], Dict[str, str]]
+Describer = Callable[[str], dict]
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Above this many changed directories, one stream beats a query per directory
+DIR_QUERY_LIMIT = 200
+
+
+class FileStat(NamedTuple):
+    """What the scan keeps per file."""
+
+    inode: int
+    size: int
+    mtime: float
+
+
+class Known(NamedTuple):
+    """What reconciliation keeps per stored `files` record."""
+
+    id: str
+    inode: Optional[int]
+    size: Optional[int]
+    mtime: Optional[float]
+    partial_hash: Optional[str]
+
+
+def _mtime_key(mtime: float) -> float:
+    # Millisecond precision survives copies to filesystems with coarser clocks
+    return round(mtime, 3)
+
+
+def _same_stat(record: Known, stat: FileStat) -> bool:
+    return record.size == stat.size and _mtime_key(record.mtime or 0.0) == (
+        _mtime_key(stat.mtime)
+    )
+
+
+def _scan_dir(
+    path: str, matcher: Optional[Matcher]
+) -> Tuple[Dict[str, FileStat], List[str]]:
+    files: Dict[str, FileStat] = {}
+    subdirs: List[str] = []
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return files, subdirs
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and (
+                    matcher is None or matcher(entry.path)
+                ):
+                    st = entry.stat(follow_symlinks=False)
+                    files[entry.path] = FileStat(st.st_ino, st.st_size, st.st_mtime)
+            except OSError:
+                # Vanished while scanning; the watcher reports it
+                continue
+    return files, subdirs
+
+
+def scan_tree(
+    root: str,
+    matcher: Optional[Matcher] = None,
+    workers: Optional[int] = None,
+) -> Tuple[Dict[str, FileStat], Set[str]]:
+    """
+    List the tree under `root`, one directory per task on a thread pool
+    (scandir and stat release the GIL, so directories are read in parallel).
+
+    Args:
+        root (str): Absolute directory to scan.
+        matcher (Optional[Matcher]): Files it rejects are skipped unstatted.
+        workers (Optional[int]): Pool size (default: 4 per CPU, at most 32).
+
+    Returns:
+        Tuple[Dict[str, FileStat], Set[str]]: Included files and every
+            directory found, by absolute path.
+    """
+    workers = workers or min(32, 4 * (os.cpu_count() or 1))
+    files: Dict[str, FileStat] = {}
+    dirs = {root}
+    with ThreadPoolExecutor(workers, thread_name_prefix="blendman-scan") as pool:
+        pending = {pool.submit(_scan_dir, root, matcher)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, subdirs = future.result()
+                files.update(found)
+                dirs.update(subdirs)
+                pending.update(pool.submit(_scan_dir, d, matcher) for d in subdirs)
+    return files, dirs
+
+
+def load_known(
+    db: DBInterface,
+    root: str,
+    matcher: Optional[Matcher] = None,
+    dirs: Optional[Set[str]] = None,
+) -> Dict[str, Known]:
+    """
+    Stream the `files` records under `root` that `matcher` includes,
+    leaving out those of deleted files.
+
+    Args:
+        dirs (Optional[Set[str]]): Only keep records directly in these
+            directories; a few are queried one by one instead of streaming
+            the collection.
+
+    Returns:
+        Dict[str, Known]: Records by path.
+    """
+    fields = "id,path,inode,size,mtime,partial_hash,deleted"
+    if dirs is not None and len(dirs) <= DIR_QUERY_LIMIT:
+        records: Iterable[dict] = chain.from_iterable(
+            db.store.list("files", filter=_children_filter(d), fields=fields)
+            for d in sorted(dirs)
+        )
+    else:
+        records = db.store.iter_records("files", fields=fields, page_size=1000)
+    known: Dict[str, Known] = {}
+    for record in records:
+        path = record.get("path") or ""
+        if (
+            path == root
+            or record.get("deleted")
+            or not under(path, root)
+            or (dirs is not None and os.path.dirname(path) not in dirs)
+            or (matcher and not matcher(path))
+        ):
+            continue
+        known[path] = Known(
+            record["id"],
+            record.get("inode") or None,
+            record.get("size"),
+            record.get("mtime"),
+            record.get("partial_hash") or None,
+        )
+    return known
+
+
+def _children_filter(directory: str) -> str:
+    # LIKE wildcards in names only widen the match; load_known filters exactly
+    prefix = directory.rstrip(os.sep).replace("%", "_") + os.sep
+    return all_of(like("path", f"{prefix}%"), cond("path", "!~", f"{prefix}%{os.sep}%"))
+
+
+def _event(
+    event_type: str,
+    path: str,
+    stat: Optional[FileStat] = None,
+    old_path: str = "",
+    file_id: Optional[str] = None,
+    inode: Optional[int] = None,
+    digest: Optional[str] = None,
+) -> dict:
+    event = {
+        "event_type": event_type,
+        "name": os.path.basename(path),
+        "old_path": old_path,
+        "new_path": path,
+        "type": "file",
+    }
+    if file_id:
+        event["file_id"] = file_id
+    if stat is not None:
+        event.update(inode=stat.inode, size=stat.size, mtime=stat.mtime)
+    elif inode is not None:
+        event["inode"] = inode
+    if digest:
+        event["partial_hash"] = digest
+    return event
+
+
+def _refresh(record: Known, stat: FileStat) -> dict:
+    changes: dict = {}
+    if record.inode != stat.inode:
+        changes["inode"] = stat.inode
+    if record.size != stat.size or record.mtime != stat.mtime:
+        changes.update(size=stat.size, mtime=stat.mtime)
+        if record.partial_hash:
+            changes["partial_hash"] = ""  # content changed; hash again on demand
+    return changes
+
+
+class Plan(NamedTuple):
+    """Differences found by plan()."""
+
+    events: List[dict]
+    refreshes: List[Tuple[str, dict]]
+
+
+def plan(
+    known: Dict[str, Known],
+    disk: Dict[str, FileStat],
+    dirs: Iterable[str] = (),
+    hasher: Optional[Hasher] = None,
+    describe: Optional[Describer] = None,
+) -> Plan:
+    """
+    Match stored records against scanned files.
+
+    Args:
+        known (Dict[str, Known]): Records by path (consumed).
+        disk (Dict[str, FileStat]): Scanned files by path (consumed).
+        dirs (Iterable[str]): Directories on disk; records at these paths
+            are neither matched nor deleted.
+        hasher (Optional[Hasher]): Maps (path, size) pairs to partial
+            hashes, skipping unreadable files (default: hash_files on one
+            thread).
+        describe (Optional[Describer]): Extra record fields for files
+            created or changed in place (e.g. blend_metadata).
+
+    Returns:
+        Plan: Events to persist (moved, created, deleted) and metadata
+            refreshes (record id, changes) for unmoved records.
+    """
+    hasher = hasher or (lambda items: hash_files(items, workers=1))
+    events: List[dict] = []
+    refreshes: List[Tuple[str, dict]] = []
+
+    def refresh(path: str, record: Known, stat: FileStat) -> None:
+        changes = _refresh(record, stat)
+        if "inode" in changes:
+            # Lets the record index be updated without reading the record
+            changes["path"] = path
+        if describe is not None and "size" in changes:
+            changes.update(describe(path))
+        if changes:
+            refreshes.append((record.id, changes))
+
+    def move(old_path: str, record: Known, path: str, digest: str = "") -> None:
+        events.append(
+            _event("moved", path, disk.pop(path), old_path, record.id, digest=digest)
+        )
+        del known[old_path]
+
+    # 1. Unchanged paths
+    for path in [p for p, r in known.items() if p in disk]:
+        record = known[path]
+        if record.inode is None or record.inode == disk[path].inode:
+            refresh(path, record, disk.pop(path))
+            del known[path]
+    for path in dirs:
+        known.pop(path, None)
+
+    # 2. Same inode elsewhere; freed inodes get reused, so the content must
+    # look the same too (records without size/mtime predate this check)
+    by_inode = {stat.inode: path for path, stat in disk.items()}
+    reused: Dict[str, str] = {}
+    for old_path, record in list(known.items()):
+        path = by_inode.get(record.inode)  # type: ignore[arg-type]
+        if path is None or path not in disk or path in known:
+            continue
+        stat = disk[path]
+        if record.size is None or record.mtime is None or _same_stat(record, stat):
+            move(old_path, record, path)
+        elif record.partial_hash and record.size == stat.size:
+            reused[old_path] = path
+    if reused:
+        digests = hasher((path, disk[path].size) for path in reused.values())
+        for old_path, path in reused.items():
+            if digests.get(path) == known[old_path].partial_hash:
+                move(old_path, known[old_path], path, digests[path])
+
+    # 3. Rewritten in place under a new inode
+    for path in [p for p in known if p in disk]:
+        refresh(path, known.pop(path), disk.pop(path))
+
+    # 4. Same size and mtime elsewhere, confirmed by content when ambiguous
+    by_content: Dict[Tuple[int, float], List[str]] = {}
+    for path, stat in disk.items():
+        by_content.setdefault((stat.size, _mtime_key(stat.mtime)), []).append(path)
+    candidates: Dict[str, List[str]] = {}
+    for old_path, record in known.items():
+        if record.size is None or record.mtime is None:
+            continue
+        paths = by_content.get((record.size, _mtime_key(record.mtime)))
+        if paths:
+            candidates[old_path] = paths
+    to_hash = {
+        path
+        for old_path, paths in candidates.items()
+        if known[old_path].partial_hash or len(paths) > 1
+        for path in paths
+    }
+    digests = hasher((path, disk[path].size) for path in to_hash) if to_hash else {}
+    for old_path, paths in candidates.items():
+        record = known[old_path]
+        paths = [p for p in paths if p in disk]
+        if record.partial_hash:
+            paths = [p for p in paths if digests.get(p) == record.partial_hash]
+        elif len(paths) > 1:
+            continue  # no way to tell which copy is the original
+        if len(paths) == 1:
+            move(old_path, record, paths[0], digests.get(paths[0], ""))
+
+    # Leftovers
+    for path, record in known.items():
+        events.append(_event("deleted", path, file_id=record.id, inode=record.inode))
+    for path, stat in disk.items():
+        event = _event("created", path, stat)
+        if describe is not None:
+            event.update(describe(path))
+        events.append(event)
+    return Plan(events, refreshes)
+
+
+def hash_files(
+    items: Iterable[Tuple[str, int]], workers: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Partial hashes of (path, size) pairs, computed on a thread pool.
+    Files that cannot be read are left out.
+    """
+
+    def one(item: Tuple[str, int]) -> Tuple[str, Optional[str]]:
+        try:
+            return item[0], partial_hash(item[0], item[1])
+        except OSError:
+            return item[0], None
+
+    workers = workers or min(32, 4 * (os.cpu_count() or 1))
+    with ThreadPoolExecutor(workers, thread_name_prefix="blendman-hash") as pool:
+        return {path: digest for path, digest in pool.map(one, items) if digest}
+
+
+def reconcile(
+    db: DBInterface,
+    root: str,
+    matcher: Optional[Matcher] = None,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fingerprinter: Optional[Fingerprinter] = None,
+) -> Dict[str, int]:
+    """
+    Bring the `files` records under `root` in line with the tree.
+
+    Expects db's record index to be warm (DBInterface.warm_index()), and the
+    watcher's own events to be held back (WatcherBridge.pause()) meanwhile.
+
+    Args:
+        db (DBInterface): Target database.
+        root (str): Watched directory.
+        matcher (Optional[Matcher]): Include/ignore path matcher.
+        workers (Optional[int]): Threads for scanning and hashing.
+        batch_size (int): Events persisted per storage transaction.
+        fingerprinter (Optional[Fingerprinter]): Shared hash cache of the
+            live watcher. Every scanned file is queued on it, so files
+            deleted later can be matched by content.
+
+    Returns:
+        Dict[str, int]: Counts of files scanned, changed directories,
+            records compared, events per type, refreshed records and events
+            that failed to persist.
+    """
+    logger = structlog.get_logger("Reconciler")
+    root = os.path.abspath(root)
+    disk, dirs = scan_tree(root, matcher, workers)
+    tree = DigestTree.from_entries(root, disk)
+    if fingerprinter is not None:
+        fingerprinter.prefetch(disk)
+    try:
+        digests = load_digests(db, root)
+    except NOT_FOUND_ERRORS as exc:
+        # Stores set up before digests existed: compare every record
+        logger.warning(
+            "[Reconciler] No dir_digests collection, comparing all records",
+            error=str(exc),
+        )
+        digests = None
+    stored = {path: digest for path, (_, digest) in (digests or {}).items()}
+    # Directories gone from disk, and ones blanked by mark_dirs_stale() (their
+    # ancestors look unchanged), are not reached by the walk from the root
+    unreached = {d for d, digest in stored.items() if d not in tree or not digest.local}
+    changed = set(tree.changed(stored)) | unreached
+    summary = {"files": len(disk), "changed_dirs": len(changed)}
+    if not stored:
+        # Without digests every record is a candidate, wherever it lives
+        known = load_known(db, root, matcher)
+    else:
+        known = load_known(db, root, matcher, dirs=changed)
+        disk = {p: s for p, s in disk.items() if os.path.dirname(p) in changed}
+    summary["records"] = len(known)
+
+    def hasher(items: Iterable[Tuple[str, int]]) -> Dict[str, str]:
+        if fingerprinter is None:
+            return hash_files(items, workers)
+        return fingerprinter.fingerprint_many(path for path, _ in items)
+
+    result = plan(known, disk, dirs, hasher, describe=blend_metadata)
+    summary["refreshed"] = db.refresh_files(result.refreshes)
+    persisted = 0
+    for start in range(0, len(result.events), batch_size):
+        persisted += db.persist_events(result.events[start : start + batch_size])
+    metrics = get_metrics()
+    for event_type in ("moved", "created", "deleted"):
+        count = sum(1 for e in result.events if e["event_type"] == event_type)
+        summary[event_type] = count
+        if count:
+            metrics.inc("events_reconciled", count, type=event_type)
+    summary["failed"] = len(result.events) - persisted
+    if digests is not None and not summary["failed"] and changed:
+        # Keep the old digests after failures, so those directories are retried
+        save_digests(db, tree)
+    logger.info("[Reconciler] Reconciled with disk", root=root, **summary)
+    return summary
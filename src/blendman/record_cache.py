@@ -0,0 +1,177 @@
+"""
+Bounded read-through cache for PocketBase records and log lists.
+
+DBInterface consults it before hitting the server for file state and history
+lookups. Entries expire after a TTL and are tagged with the record ids they
+depend on, so the watcher's own writes (and remote change notifications) can
+drop exactly the affected entries.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+import os
+import threading
+import time
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL = 30.0
+
+MISSING = object()
+
+_shared: Optional["RecordCache"] = None
+_shared_lock = threading.Lock()
+
+
+class RecordCache:
+    """
+    Thread-safe LRU map with per-entry TTL and tag-based invalidation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used is
+                evicted. 0 disables caching.
+            ttl (float): Seconds an entry stays valid.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        if max_entries < 0 or ttl < 0:
+            raise ValueError("max_entries and ttl must not be negative.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Tuple[str, ...]]]" = (
+            OrderedDict()
+        )
+        self._by_tag: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Look up a live entry, refreshing its LRU position.
+
+        Returns:
+            The cached value, or MISSING.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return MISSING
+
+    def put(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): Cache key.
+            value: Value to cache.
+            tags (Iterable[str]): Record ids/collections the value depends on.
+        """
+        if self.max_entries == 0:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (self._clock() + self.ttl, value, tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def get_or_load(
+        self, key: Hashable, loader: Callable[[], Any], tags: Iterable[str] = ()
+    ) -> Any:
+        """
+        Return the cached value or call loader and cache its result.
+        Exceptions from loader propagate and nothing is cached.
+        """
+        value = self.get(key)
+        if value is MISSING:
+            value = loader()
+            self.put(key, value, tags)
+        return value
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry tagged with any of the given tags."""
+        with self._lock:
+            for tag in tags:
+                for key in self._by_tag.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of cache counters for tuning.
+
+        Returns:
+            dict: hits, misses, hit_ratio, evictions, invalidations, size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+    def _drop(self, key: Hashable) -> None:
+        """Remove one entry and its tag links. Caller must hold the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+
+def get_shared_cache() -> RecordCache:
+    """
+    Return the process-wide cache, sized from BLENDMAN_CACHE_SIZE and
+    BLENDMAN_CACHE_TTL, so DBInterface instances created per shell command
+    share hits.
+    """
+    global _shared  # pylint: disable=global-statement
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = RecordCache(
+                    int(os.environ.get("BLENDMAN_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+                    float(os.environ.get("BLENDMAN_CACHE_TTL", DEFAULT_TTL)),
+                )
+    return _shared
@@ -0,0 +1,195 @@
+"""
+Local index from inode and path to PocketBase `files` record ids.
+
+Lets DBInterface turn moves and renames into a PATCH of the existing record
+instead of creating a new one. The index lives in memory and can optionally be
+persisted to a JSON file between runs.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import threading
+
+# Journal entry: table, key, previous value (_MISSING if the key was absent)
+_MISSING = object()
+Change = Tuple[Dict[Any, Any], Any, Any]
+
+
+class RecordIndex:
+    """
+    Thread-safe two-key map (inode, path) -> record id.
+    Inode lookups win over path lookups since they survive renames.
+
+    Between begin() and end(), a thread's changes are journaled, so those
+    made for writes that never reached the store can be undone (rollback()).
+    """
+
+    def __init__(self, persist_path: Optional[str] = None) -> None:
+        """
+        Args:
+            persist_path (Optional[str]): JSON file to load from and save to.
+        """
+        self.persist_path = persist_path
+        self._by_path: Dict[str, str] = {}
+        self._by_inode: Dict[int, str] = {}
+        # Reverse maps so re-pointing a record stays O(1)
+        self._path_of: Dict[str, str] = {}
+        self._inode_of: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Journal of the thread's open begin() block, if any
+        self._local = threading.local()
+        if persist_path:
+            self.load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._path_of.keys() | self._inode_of.keys())
+
+    def lookup(
+        self, path: Optional[str] = None, inode: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Find the record id for an inode or path.
+
+        Args:
+            path (Optional[str]): File/dir path.
+            inode (Optional[int]): File/dir inode.
+
+        Returns:
+            Optional[str]: Record id, or None if unknown.
+        """
+        with self._lock:
+            if inode is not None and inode in self._by_inode:
+                return self._by_inode[inode]
+            if path is not None:
+                return self._by_path.get(path)
+            return None
+
+    def put(self, record_id: str, path: str, inode: Optional[int] = None) -> None:
+        """
+        Map a path (and inode) to a record id, dropping the record's old path.
+
+        Args:
+            record_id (str): PocketBase record id.
+            path (str): Current path of the file/dir.
+            inode (Optional[int]): Current inode, if known.
+        """
+        with self._lock:
+            self._drop(record_id, keep_inode=inode is None)
+            self._map(record_id, path, inode)
+
+    def remove(self, record_id: str) -> None:
+        """
+        Forget every mapping pointing at a record id.
+
+        Args:
+            record_id (str): PocketBase record id.
+        """
+        with self._lock:
+            self._drop(record_id)
+
+    def begin(self) -> None:
+        """Start journaling this thread's changes."""
+        self._local.journal = []
+
+    def mark(self) -> int:
+        """Position in the journal, to roll back to later (0 if not journaling)."""
+        journal = self._journal()
+        return len(journal) if journal is not None else 0
+
+    def rollback(self, mark: int = 0) -> None:
+        """Undo this thread's journaled changes made after `mark`."""
+        journal = self._journal()
+        if not journal:
+            return
+        with self._lock:
+            while len(journal) > mark:
+                table, key, previous = journal.pop()
+                if previous is _MISSING:
+                    table.pop(key, None)
+                else:
+                    table[key] = previous
+
+    def end(self) -> None:
+        """Stop journaling, keeping the changes."""
+        self._local.journal = None
+
+    def _journal(self) -> Optional[List[Change]]:
+        return getattr(self._local, "journal", None)
+
+    def _set(self, table: Dict[Any, Any], key: Any, value: Any) -> None:
+        """Set a key, journaling its old value. Caller must hold the lock."""
+        journal = self._journal()
+        if journal is not None:
+            journal.append((table, key, table.get(key, _MISSING)))
+        table[key] = value
+
+    def _pop(self, table: Dict[Any, Any], key: Any) -> Any:
+        """Remove a key, journaling its old value. Caller must hold the lock."""
+        if key not in table:
+            return None
+        journal = self._journal()
+        if journal is not None:
+            journal.append((table, key, table[key]))
+        return table.pop(key)
+
+    def clear(self) -> None:
+        """Drop all mappings."""
+        with self._lock:
+            self._by_path.clear()
+            self._by_inode.clear()
+            self._path_of.clear()
+            self._inode_of.clear()
+
+    def _map(self, record_id: str, path: str, inode: Optional[int]) -> None:
+        """Add forward and reverse entries. Caller must hold the lock."""
+        self._set(self._by_path, path, record_id)
+        self._set(self._path_of, record_id, path)
+        if inode is not None:
+            self._set(self._by_inode, inode, record_id)
+            self._set(self._inode_of, record_id, inode)
+
+    def _drop(self, record_id: str, keep_inode: bool = False) -> None:
+        """Remove entries for a record id. Caller must hold the lock."""
+        old_path = self._pop(self._path_of, record_id)
+        if old_path is not None and self._by_path.get(old_path) == record_id:
+            self._pop(self._by_path, old_path)
+        if keep_inode:
+            return
+        old_inode = self._pop(self._inode_of, record_id)
+        if old_inode is not None and self._by_inode.get(old_inode) == record_id:
+            self._pop(self._by_inode, old_inode)
+
+    def load(self) -> None:
+        """Load mappings from persist_path, ignoring a missing or corrupt file."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            records = [
+                (str(rid), str(entry["path"]), entry.get("inode"))
+                for rid, entry in data.get("records", {}).items()
+            ]
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            return
+        with self._lock:
+            for record_id, path, inode in records:
+                self._map(record_id, path, int(inode) if inode is not None else None)
+
+    def save(self) -> None:
+        """Atomically write mappings to persist_path, if configured."""
+        if not self.persist_path:
+            return
+        with self._lock:
+            data = {
+                "records": {
+                    rid: {"path": path, "inode": self._inode_of.get(rid)}
+                    for rid, path in self._path_of.items()
+                }
+            }
+        tmp_path = f"{self.persist_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.persist_path)
@@ -0,0 +1,84 @@
+"""
+Pluggable storage backends for DBInterface.
+
+The backend is chosen by the BLENDMAN_STORAGE environment variable or the
+``[storage]`` table of blendman_config.toml:
+
+    [storage]
+    backend = "sqlite"      # "pocketbase" (default), "sqlite" or "memory"
+    path = "blendman.db"    # SQLite database file (BLENDMAN_SQLITE_PATH)
+"""
+
+from typing import Any, Dict, Optional
+import os
+
+from rename_watcher.config import get_toml_config
+
+from .base import (
+    NOT_FOUND_ERRORS,
+    STORAGE_ERRORS,
+    BatchCommitError,
+    RecordNotFoundError,
+    StorageBackend,
+    StorageError,
+)
+from .memory_store import MemoryStorage
+from .pocketbase_store import PocketBaseStorage
+from .sqlite_store import SQLiteStorage
+
+BACKENDS = ("pocketbase", "sqlite", "memory")
+
+__all__ = [
+    "BACKENDS",
+    "BatchCommitError",
+    "MemoryStorage",
+    "NOT_FOUND_ERRORS",
+    "STORAGE_ERRORS",
+    "PocketBaseStorage",
+    "RecordNotFoundError",
+    "SQLiteStorage",
+    "StorageBackend",
+    "StorageError",
+    "create_storage",
+    "storage_settings",
+]
+
+
+def storage_settings() -> Dict[str, Any]:
+    """
+    Resolve the configured backend; environment variables win over the TOML
+    ``[storage]`` table.
+
+    Returns:
+        Dict[str, Any]: {"backend": name, "path": SQLite file}.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    section = get_toml_config().get("storage", {})
+    backend = os.environ.get("BLENDMAN_STORAGE") or section.get("backend")
+    backend = (backend or "pocketbase").lower()
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage backend {backend!r}; use one of {', '.join(BACKENDS)}."
+        )
+    path = os.environ.get("BLENDMAN_SQLITE_PATH") or section.get("path")
+    return {"backend": backend, "path": path or "blendman.db"}
+
+
+def create_storage(backend: Optional[str] = None) -> StorageBackend:
+    """
+    Build the configured storage backend.
+
+    Args:
+        backend (Optional[str]): Override the configured backend name.
+    """
+    settings = storage_settings()
+    name = (backend or settings["backend"]).lower()
+    if name == "sqlite":
+        return SQLiteStorage(settings["path"])
+    if name == "memory":
+        return MemoryStorage()
+    if name == "pocketbase":
+        return PocketBaseStorage()
+    raise ValueError(f"Unknown storage backend {name!r}.")
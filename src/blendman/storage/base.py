@@ -0,0 +1,124 @@
+"""
+Storage backend interface used by DBInterface.
+
+A backend stores the `files` and `rename_logs` collections (see
+blendman.models) as records: plain dicts with an ``id``. Filters are
+PocketBase filter expressions or field/value mappings (pocketbase.filters),
+and ``sort``/``fields`` follow PocketBase's comma-separated syntax, so the
+same queries work against every backend.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Protocol, Tuple
+
+from pocketbase.exceptions import PocketBaseError, PocketBaseNotFoundError
+from pocketbase.filters import FilterSpec
+
+
+class StorageError(Exception):
+    """Raised by local storage backends when an operation fails."""
+
+
+class RecordNotFoundError(StorageError):
+    """Raised when a record id does not exist."""
+
+
+class BatchCommitError(StorageError):
+    """
+    Raised when a transaction committed in several requests fails part way:
+    its first `committed` writes are stored, the others are not. The error
+    of the failed request is the ``__cause__``.
+    """
+
+    def __init__(self, message: str, committed: int) -> None:
+        super().__init__(message)
+        self.committed = committed
+
+
+# Fields of each collection (blendman.models plus PocketBase's autodates)
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "files": (
+        "id",
+        "name",
+        "path",
+        "parent_id",
+        "type",
+        "inode",
+        "size",
+        "mtime",
+        "partial_hash",
+        "blender_version",
+        "scene_count",
+        "object_count",
+        "compression",
+        "deleted",
+        "created",
+        "updated",
+    ),
+    "rename_logs": (
+        "id",
+        "file_id",
+        "old_path",
+        "new_path",
+        "event_type",
+        "timestamp",
+        "created",
+        "updated",
+    ),
+    # Directory digests from startup reconciliation (blendman.reconcile)
+    "dir_digests": ("id", "path", "local", "tree", "created", "updated"),
+}
+
+
+def now_timestamp() -> str:
+    """Current UTC time in PocketBase's datetime format."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] + "Z"
+
+
+# Errors DBInterface handles, whichever backend is configured
+STORAGE_ERRORS = (PocketBaseError, StorageError)
+NOT_FOUND_ERRORS = (PocketBaseNotFoundError, RecordNotFoundError)
+
+
+class StorageBackend(Protocol):
+    """Record store behind DBInterface."""
+
+    name: str
+
+    def create(self, collection: str, data: dict) -> dict:
+        """Insert a record and return it (with its id)."""
+
+    def update(self, collection: str, record_id: str, data: dict) -> dict:
+        """Update fields of an existing record and return it."""
+
+    def get(self, collection: str, record_id: str) -> dict:
+        """Return a record by id."""
+
+    def delete(self, collection: str, record_id: str) -> None:
+        """Delete a record by id."""
+
+    def list(
+        self,
+        collection: str,
+        filter: Optional[FilterSpec] = None,  # pylint: disable=redefined-builtin
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[dict]:
+        """Return all records matching a filter."""
+
+    def iter_records(
+        self, collection: str, fields: Optional[str] = None, page_size: int = 500
+    ) -> Iterator[dict]:
+        """Stream every record of a collection."""
+
+    def transaction(self) -> ContextManager[Any]:
+        """Group writes, committed together (through /api/batch for PocketBase)."""
+
+    def queued(self) -> int:
+        """Writes made in this thread's open transaction and not yet sent."""
+
+    def state(self) -> str:
+        """Availability: "closed" (usable), "open" or "half_open"."""
+
+    def close(self) -> None:
+        """Release connections."""
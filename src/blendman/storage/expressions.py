@@ -0,0 +1,49 @@
+"""
+SQL rendering of PocketBase filter expressions for the SQLite backend.
+
+Parsing and in-memory evaluation live in pocketbase.filters; this module
+turns a parsed tree into a parameterised SQL condition.
+"""
+
+from typing import Any, Callable, Collection, List, Tuple
+
+from pocketbase.filters import Node, like_pattern, matches, parse
+
+__all__ = ["like_pattern", "matches", "parse", "to_sql"]
+
+
+def to_sql(
+    node: Node, columns: Collection[str], quote: Callable[[str], str] = str
+) -> Tuple[str, List[Any]]:
+    """
+    Render a parsed filter as an SQL condition with placeholders.
+
+    Args:
+        node (Node): Tree from parse().
+        columns (Collection[str]): Fields that may be referenced.
+        quote (Callable[[str], str]): Column name quoting.
+
+    Returns:
+        Tuple[str, List[Any]]: SQL text and its parameters.
+
+    Raises:
+        ValueError: If the filter references an unknown field.
+    """
+    if node[0] in ("and", "or"):
+        parts, params = [], []
+        for child in node[1]:
+            sql, child_params = to_sql(child, columns, quote)
+            parts.append(f"({sql})")
+            params.extend(child_params)
+        return f" {node[0].upper()} ".join(parts), params
+    _, name, op, value = node
+    if name not in columns:
+        raise ValueError(f"Unknown filter field: {name!r}")
+    column = quote(name)
+    if value is None and op in ("=", "!="):
+        return f"{column} IS {'NOT ' if op == '!=' else ''}NULL", []
+    if op == "~":
+        return f"{column} LIKE ?", [like_pattern(value)]
+    if op == "!~":
+        return f"{column} NOT LIKE ?", [like_pattern(value)]
+    return f"{column} {op} ?", [value]
@@ -0,0 +1,197 @@
+"""
+In-process storage backend: records live in dicts.
+
+Needs no server, credentials or files, so the watcher -> bridge -> store
+path can be tested, benchmarked and profiled anywhere. Filters, sorting and
+field selection behave like the SQLite backend; nothing is persisted.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import threading
+
+from pocketbase.filters import FilterSpec, to_expression
+from pocketbase.resilience import CLOSED, new_record_id
+
+from .base import COLUMNS, RecordNotFoundError, StorageError, now_timestamp
+from .expressions import matches, parse
+
+
+class MemoryStorage:
+    """
+    Store records in memory. Thread-safe; transaction() rolls back through an
+    undo log instead of copying the data.
+    """
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._records: Dict[str, Dict[str, dict]] = {c: {} for c in COLUMNS}
+        self._lock = threading.RLock()
+        self._undo: Optional[List[Tuple[str, str, Optional[dict]]]] = None
+        self._depth = 0
+
+    def _table(self, collection: str) -> Dict[str, dict]:
+        try:
+            return self._records[collection]
+        except KeyError as exc:
+            raise StorageError(f"Unknown collection: {collection!r}") from exc
+
+    def _write(self, collection: str, record: dict) -> None:
+        """Store a record, remembering the previous version inside a transaction."""
+        table = self._table(collection)
+        if self._undo is not None:
+            previous = table.get(record["id"])
+            self._undo.append((collection, record["id"], previous))
+        table[record["id"]] = record
+
+    @staticmethod
+    def _project(record: dict, fields: Optional[str]) -> dict:
+        if not fields:
+            return dict(record)
+        return {f: record.get(f) for f in (f.strip() for f in fields.split(",")) if f}
+
+    def create(self, collection: str, data: dict) -> dict:
+        """
+        Insert a record; unknown keys are ignored.
+
+        Raises:
+            StorageError: If the id already exists.
+        """
+        table = self._table(collection)
+        now = now_timestamp()
+        record: Dict[str, Any] = {c: data.get(c) for c in COLUMNS[collection]}
+        record["id"] = record["id"] or new_record_id()
+        record["created"] = record["updated"] = now
+        if collection == "rename_logs":
+            record["timestamp"] = record["timestamp"] or now
+            record["old_path"] = record["old_path"] or ""
+        with self._lock:
+            if record["id"] in table:
+                raise StorageError(f"{collection} record {record['id']} exists")
+            self._write(collection, record)
+        return dict(record)
+
+    def update(self, collection: str, record_id: str, data: dict) -> dict:
+        """
+        Update the given fields of a record.
+
+        Raises:
+            RecordNotFoundError: If no record has this id.
+        """
+        with self._lock:
+            current = self._table(collection).get(record_id)
+            if current is None:
+                raise RecordNotFoundError(f"{collection} record {record_id} not found")
+            record = {
+                **current,
+                **{k: v for k, v in data.items() if k in current and k != "id"},
+                "updated": now_timestamp(),
+            }
+            self._write(collection, record)
+        return dict(record)
+
+    def delete(self, collection: str, record_id: str) -> None:
+        """
+        Delete a record.
+
+        Raises:
+            RecordNotFoundError: If no record has this id.
+        """
+        table = self._table(collection)
+        with self._lock:
+            previous = table.pop(record_id, None)
+            if previous is None:
+                raise RecordNotFoundError(f"{collection} record {record_id} not found")
+            if self._undo is not None:
+                self._undo.append((collection, record_id, previous))
+
+    def get(self, collection: str, record_id: str) -> dict:
+        """
+        Fetch a record by id.
+
+        Raises:
+            RecordNotFoundError: If no record has this id.
+        """
+        record = self._table(collection).get(record_id)
+        if record is None:
+            raise RecordNotFoundError(f"{collection} record {record_id} not found")
+        return dict(record)
+
+    def list(
+        self,
+        collection: str,
+        filter: Optional[FilterSpec] = None,  # pylint: disable=redefined-builtin
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Fetch matching records (same filter/sort/fields syntax as PocketBase).
+
+        Raises:
+            StorageError: On unsupported filter syntax.
+        """
+        with self._lock:
+            records = list(self._table(collection).values())
+        expression = to_expression(filter) if filter else ""
+        if expression:
+            try:
+                node = parse(expression)
+            except ValueError as exc:
+                raise StorageError(str(exc)) from exc
+            records = [r for r in records if matches(node, r)]
+        # Stable sorts applied last-key-first give a multi-key ordering
+        for term in reversed([t.strip() for t in (sort or "").split(",") if t.strip()]):
+            name = term.lstrip("+-")
+            records.sort(
+                key=lambda r, n=name: (r.get(n) is not None, r.get(n)),
+                reverse=term.startswith("-"),
+            )
+        return [self._project(r, fields) for r in records]
+
+    def iter_records(
+        self, collection: str, fields: Optional[str] = None, page_size: int = 500
+    ) -> Iterator[dict]:
+        """Stream a collection in insertion order (page_size is ignored)."""
+        del page_size
+        with self._lock:
+            records = list(self._table(collection).values())
+        for record in records:
+            yield self._project(record, fields)
+
+    @contextmanager
+    def transaction(self) -> Iterator["MemoryStorage"]:
+        """Undo all writes made inside the block if it raises."""
+        with self._lock:
+            if self._depth == 0:
+                self._undo = []
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._rollback()
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._undo = None
+
+    def queued(self) -> int:
+        """Writes are applied at once (and undone on failure)."""
+        return 0
+
+    def _rollback(self) -> None:
+        undo, self._undo = self._undo or [], None
+        for collection, record_id, previous in reversed(undo):
+            if previous is None:
+                self._records[collection].pop(record_id, None)
+            else:
+                self._records[collection][record_id] = previous
+
+    def state(self) -> str:
+        """Always available."""
+        return CLOSED
+
+    def close(self) -> None:
+        """Nothing to release."""
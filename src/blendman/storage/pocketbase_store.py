@@ -0,0 +1,248 @@
+"""
+PocketBase storage backend: records live on a PocketBase server.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+import getpass
+import os
+import threading
+
+import structlog  # type: ignore
+
+from pocketbase.api import PocketBaseAPI
+from pocketbase.auth import AuthClient
+from pocketbase.collections import BATCH_LIMIT
+from pocketbase.exceptions import PocketBaseAuthError, PocketBaseError
+from pocketbase.filters import FilterSpec
+from pocketbase.resilience import get_breaker, new_record_id
+
+from .base import BatchCommitError
+
+# Queued write: method, collection, record id (PATCH/DELETE), body
+Write = Tuple[str, str, Optional[str], Optional[dict]]
+
+
+def _batch_request(
+    method: str, collection: str, record_id: Optional[str], body: Optional[dict]
+) -> dict:
+    """Sub-request of an /api/batch call for a queued write."""
+    url = f"/api/collections/{collection}/records"
+    request: dict = {
+        "method": method,
+        "url": f"{url}/{record_id}" if record_id else url,
+    }
+    if body is not None:
+        request["body"] = body
+    return request
+
+
+class PocketBaseStorage:
+    """
+    Store records through the PocketBase REST API, logging in as the admin
+    from POCKETBASE_ADMIN_EMAIL / POCKETBASE_ADMIN_PASSWORD (or a prompt).
+    Login happens on the first request, not on construction. Writes made
+    inside transaction() are sent together through ``/api/batch``.
+    """
+
+    name = "pocketbase"
+
+    def __init__(self) -> None:
+        self.logger = structlog.get_logger("PocketBaseStorage")
+        self.auth_client = AuthClient()
+        self.api = PocketBaseAPI()
+        # Writes queued by the transaction open in each thread
+        self._local = threading.local()
+        # Cleared when the server refuses /api/batch
+        self.batch_enabled = True
+
+    def _ensure_auth(self) -> None:
+        """Ensure the AuthClient is logged in, prompting if needed."""
+        if self.auth_client.is_authenticated():
+            return
+        admin_email = os.environ.get("POCKETBASE_ADMIN_EMAIL")
+        admin_password = os.environ.get("POCKETBASE_ADMIN_PASSWORD")
+        if not admin_email or not admin_password:
+            admin_email = input("PocketBase admin email: ")
+            admin_password = getpass.getpass("PocketBase admin password: ")
+        try:
+            self.auth_client.login(admin_email, admin_password)
+        except PocketBaseError as exc:
+            self.logger.error("Auth login failed", error=str(exc))
+            raise
+
+    def _with_reauth(self, operation: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a PocketBase call, re-authenticating and retrying once if the
+        server rejects the cached token.
+        """
+        if not self.auth_client.is_authenticated():
+            self._ensure_auth()
+        try:
+            return operation(*args)
+        except PocketBaseAuthError:
+            self.logger.warning(
+                "[PocketBaseStorage] Token rejected, re-authenticating",
+                operation=getattr(operation, "__name__", repr(operation)),
+            )
+            self.auth_client.invalidate()
+            self._ensure_auth()
+            return operation(*args)
+
+    def _batch(self) -> Optional[List[Write]]:
+        """Writes queued by the transaction open in this thread, if any."""
+        return getattr(self._local, "batch", None)
+
+    def create(self, collection: str, data: dict) -> dict:
+        """
+        Create a record (see _with_reauth). Inside a transaction the id is
+        chosen here and the record is returned as queued.
+        """
+        batch = self._batch()
+        if batch is not None:
+            record = {**data, "id": data.get("id") or new_record_id()}
+            batch.append(("POST", collection, None, record))
+            return dict(record, collectionName=collection)
+        return self._with_reauth(
+            self.api.collections.create,  # pylint: disable=no-member
+            collection,
+            data,
+        )
+
+    def update(self, collection: str, record_id: str, data: dict) -> dict:
+        """
+        Update a record (see _with_reauth). Inside a transaction only the
+        id and the changed fields are returned.
+        """
+        batch = self._batch()
+        if batch is not None:
+            batch.append(("PATCH", collection, record_id, data))
+            return dict(data, id=record_id)
+        return self._with_reauth(
+            self.api.collections.update,  # pylint: disable=no-member
+            collection,
+            record_id,
+            data,
+        )
+
+    def delete(self, collection: str, record_id: str) -> None:
+        """Delete a record (see _with_reauth)."""
+        batch = self._batch()
+        if batch is not None:
+            batch.append(("DELETE", collection, record_id, None))
+            return
+        self._with_reauth(
+            self.api.collections.delete,  # pylint: disable=no-member
+            collection,
+            record_id,
+        )
+
+    def _send(
+        self,
+        method: str,
+        collection: str,
+        record_id: Optional[str],
+        body: Optional[dict],
+    ) -> None:
+        """Send a queued write on its own (outside any transaction)."""
+        if method == "POST":
+            self.create(collection, body or {})
+        elif method == "PATCH":
+            self.update(collection, record_id or "", body or {})
+        else:
+            self.delete(collection, record_id or "")
+
+    def get(self, collection: str, record_id: str) -> dict:
+        """Fetch a record by id (see _with_reauth)."""
+        return self._with_reauth(
+            self.api.collections.get,  # pylint: disable=no-member
+            collection,
+            record_id,
+        )
+
+    def list(
+        self,
+        collection: str,
+        filter: Optional[FilterSpec] = None,  # pylint: disable=redefined-builtin
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[dict]:
+        """Fetch every matching record (paginated on the server)."""
+        return self._with_reauth(
+            lambda: self.api.collections.list(  # pylint: disable=no-member
+                collection, filter=filter, sort=sort, fields=fields
+            )
+        )
+
+    def iter_records(
+        self, collection: str, fields: Optional[str] = None, page_size: int = 500
+    ) -> Iterator[dict]:
+        """Stream a collection page by page."""
+        if not self.auth_client.is_authenticated():
+            self._ensure_auth()
+        return self.api.collections.iter_records(  # pylint: disable=no-member
+            collection, fields=fields, page_size=page_size
+        )
+
+    def queued(self) -> int:
+        """Writes queued by this thread's transaction, not sent yet."""
+        batch = self._batch()
+        return len(batch) if batch is not None else 0
+
+    @contextmanager
+    def transaction(self) -> Iterator["PocketBaseStorage"]:
+        """
+        Queue the creates, updates and deletes made inside the block and send
+        them through ``/api/batch`` on exit, BATCH_LIMIT per request, each
+        applied all or nothing. Nothing is sent if the block raises. Reads
+        are not queued and do not see queued writes. Nested blocks join the
+        outer one.
+
+        If the server refuses batch requests (the Batch API is disabled in
+        its settings), the writes are sent one by one, now and from then on.
+
+        Raises:
+            BatchCommitError: If a request failed. The writes of the requests
+                before it are stored (``committed``); later ones are not sent.
+        """
+        if self._batch() is not None or not self.batch_enabled:
+            yield self
+            return
+        self._local.batch = []
+        try:
+            yield self
+            writes = self._local.batch
+        finally:
+            self._local.batch = None
+        committed = 0
+        try:
+            for start in range(0, len(writes), BATCH_LIMIT):
+                chunk = writes[start : start + BATCH_LIMIT]
+                try:
+                    self._with_reauth(
+                        self.api.collections.batch,  # pylint: disable=no-member
+                        [_batch_request(*write) for write in chunk],
+                    )
+                except PocketBaseAuthError as exc:
+                    # Still refused after logging in again: batching is disabled
+                    self.logger.warning(
+                        "[PocketBaseStorage] Batch API unavailable, writing one by one",
+                        error=str(exc),
+                    )
+                    self.batch_enabled = False
+                    for write in writes[start:]:
+                        self._send(*write)
+                        committed += 1
+                    return
+                committed += len(chunk)
+        except PocketBaseError as exc:
+            raise BatchCommitError(
+                f"{committed} of {len(writes)} writes committed: {exc}", committed
+            ) from exc
+
+    def state(self) -> str:
+        """State of the shared circuit breaker."""
+        return get_breaker().state
+
+    def close(self) -> None:
+        """The shared HTTP session outlives the backend; nothing to close."""
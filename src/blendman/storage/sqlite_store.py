@@ -0,0 +1,334 @@
+"""
+Embedded SQLite storage backend for single-workstation use.
+
+Stores the same `files` / `rename_logs` records as PocketBase in a local
+database file, without a server or HTTP round trips. The database runs in WAL
+mode with ``synchronous=NORMAL`` (no fsync per commit), statements are fixed
+SQL strings reused from sqlite3's prepared-statement cache, and
+``transaction()`` groups a batch of events into a single commit.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional, Tuple
+import sqlite3
+import threading
+
+from pocketbase.filters import FilterSpec, to_expression
+from pocketbase.resilience import CLOSED, new_record_id
+
+from .base import COLUMNS, RecordNotFoundError, StorageError, now_timestamp
+from .expressions import parse, to_sql
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    parent_id TEXT,
+    type TEXT NOT NULL,
+    inode INTEGER,
+    size INTEGER,
+    mtime REAL,
+    partial_hash TEXT,
+    blender_version TEXT,
+    scene_count INTEGER,
+    object_count INTEGER,
+    compression TEXT,
+    deleted INTEGER,
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_path ON files (path);
+CREATE INDEX IF NOT EXISTS idx_files_inode ON files (inode);
+CREATE TABLE IF NOT EXISTS rename_logs (
+    id TEXT PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    old_path TEXT NOT NULL DEFAULT '',
+    new_path TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rename_logs_file_id ON rename_logs (file_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_rename_logs_timestamp ON rename_logs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_rename_logs_new_path ON rename_logs (new_path);
+CREATE TABLE IF NOT EXISTS dir_digests (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    local TEXT NOT NULL DEFAULT '',
+    tree TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dir_digests_path ON dir_digests (path);
+"""
+
+# Columns added after a table was first created; older databases get them
+# through ALTER TABLE when opened
+ADDED_COLUMNS = {
+    "files": (
+        ("size", "INTEGER"),
+        ("mtime", "REAL"),
+        ("partial_hash", "TEXT"),
+        ("blender_version", "TEXT"),
+        ("scene_count", "INTEGER"),
+        ("object_count", "INTEGER"),
+        ("compression", "TEXT"),
+        ("deleted", "INTEGER"),
+    ),
+}
+
+DEFAULT_PATH = "blendman.db"
+
+
+def _quote(name: str) -> str:
+    return f'"{name}"'
+
+
+@lru_cache(maxsize=64)
+def _insert_sql(collection: str, names: Tuple[str, ...]) -> str:
+    """INSERT statement for a column set (reused, so sqlite3 caches it)."""
+    columns = ", ".join(_quote(c) for c in names)
+    marks = ", ".join("?" for _ in names)
+    return f"INSERT INTO {collection} ({columns}) VALUES ({marks})"
+
+
+class SQLiteStorage:
+    """
+    Store records in a local SQLite database.
+
+    The connection is shared between threads and serialised with a lock.
+    Writes outside transaction() commit individually.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        """
+        Args:
+            path (str): Database file (":memory:" for a throwaway database).
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        try:
+            self._conn = sqlite3.connect(
+                path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+        except sqlite3.Error as exc:
+            raise StorageError(f"Cannot open SQLite store {path!r}: {exc}") from exc
+
+    def _migrate(self) -> None:
+        for table, added in ADDED_COLUMNS.items():
+            existing = {
+                row["name"] for row in self._conn.execute(f"PRAGMA table_info({table})")
+            }
+            for name, sql_type in added:
+                if name not in existing:
+                    self._conn.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {_quote(name)} {sql_type}"
+                    )
+
+    def _columns(self, collection: str) -> Tuple[str, ...]:
+        try:
+            return COLUMNS[collection]
+        except KeyError as exc:
+            raise StorageError(f"Unknown collection: {collection!r}") from exc
+
+    def _execute(self, sql: str, params: Any = ()) -> sqlite3.Cursor:
+        try:
+            with self._lock:
+                return self._conn.execute(sql, params)
+        except sqlite3.Error as exc:
+            raise StorageError(f"SQLite error: {exc}") from exc
+
+    def _select(self, collection: str, fields: Optional[str]) -> str:
+        columns = self._columns(collection)
+        if not fields:
+            return ", ".join(_quote(c) for c in columns)
+        wanted = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in wanted if f not in columns]
+        if unknown:
+            raise StorageError(f"Unknown fields for {collection}: {unknown}")
+        return ", ".join(_quote(c) for c in wanted)
+
+    def create(self, collection: str, data: dict) -> dict:
+        """
+        Insert a record; unknown keys are ignored, as PocketBase does.
+
+        Raises:
+            StorageError: On constraint violations (e.g. duplicate id).
+        """
+        columns = self._columns(collection)
+        now = now_timestamp()
+        record = {c: data[c] for c in columns if c in data}
+        record["id"] = record.get("id") or new_record_id()
+        record["created"] = record["updated"] = now
+        if collection == "rename_logs":
+            record.setdefault("timestamp", now)
+            record["old_path"] = record.get("old_path") or ""
+        self._execute(_insert_sql(collection, tuple(record)), tuple(record.values()))
+        return {c: record.get(c) for c in columns}
+
+    def update(self, collection: str, record_id: str, data: dict) -> dict:
+        """
+        Update the given fields of a record.
+
+        Raises:
+            RecordNotFoundError: If no record has this id.
+        """
+        columns = self._columns(collection)
+        changes = {c: data[c] for c in columns if c in data and c != "id"}
+        changes["updated"] = now_timestamp()
+        assignments = ", ".join(f"{_quote(c)} = ?" for c in changes)
+        with self._lock:
+            cursor = self._execute(
+                f"UPDATE {collection} SET {assignments} WHERE id = ?",
+                [*changes.values(), record_id],
+            )
+            if cursor.rowcount == 0:
+                raise RecordNotFoundError(f"{collection} record {record_id} not found")
+            return self.get(collection, record_id)
+
+    def delete(self, collection: str, record_id: str) -> None:
+        """
+        Delete a record.
+
+        Raises:
+            RecordNotFoundError: If no record has this id.
+        """
+        self._columns(collection)
+        cursor = self._execute(f"DELETE FROM {collection} WHERE id = ?", (record_id,))
+        if cursor.rowcount == 0:
+            raise RecordNotFoundError(f"{collection} record {record_id} not found")
+
+    def get(self, collection: str, record_id: str) -> dict:
+        """
+        Fetch a record by id.
+
+        Raises:
+            RecordNotFoundError: If no record has this id.
+        """
+        row = self._execute(
+            f"SELECT {self._select(collection, None)} FROM {collection} WHERE id = ?",
+            (record_id,),
+        ).fetchone()
+        if row is None:
+            raise RecordNotFoundError(f"{collection} record {record_id} not found")
+        return dict(row)
+
+    def list(
+        self,
+        collection: str,
+        filter: Optional[FilterSpec] = None,  # pylint: disable=redefined-builtin
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Fetch matching records.
+
+        Args:
+            collection (str): Collection name.
+            filter (Optional[FilterSpec]): PocketBase filter expression or mapping.
+            sort (Optional[str]): e.g. "timestamp" or "-timestamp,path".
+            fields (Optional[str]): Comma-separated columns to return.
+
+        Raises:
+            StorageError: On unknown fields or unsupported filter syntax.
+        """
+        columns = self._columns(collection)
+        sql = f"SELECT {self._select(collection, fields)} FROM {collection}"
+        params: List[Any] = []
+        expression = to_expression(filter) if filter else ""
+        if expression:
+            try:
+                where, params = to_sql(parse(expression), columns, _quote)
+            except ValueError as exc:
+                raise StorageError(str(exc)) from exc
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {self._order_by(columns, sort)}"
+        return [dict(row) for row in self._execute(sql, params).fetchall()]
+
+    @staticmethod
+    def _order_by(columns: Tuple[str, ...], sort: Optional[str]) -> str:
+        terms = []
+        for term in (sort or "").split(","):
+            term = term.strip()
+            if not term:
+                continue
+            descending = term.startswith("-")
+            name = term.lstrip("+-")
+            if name not in columns:
+                raise StorageError(f"Unknown sort field: {name!r}")
+            terms.append(f"{_quote(name)}{' DESC' if descending else ''}")
+        # Insertion order breaks ties, matching a server-side default sort
+        terms.append("rowid")
+        return ", ".join(terms)
+
+    def iter_records(
+        self, collection: str, fields: Optional[str] = None, page_size: int = 500
+    ) -> Iterator[dict]:
+        """
+        Stream a collection in rowid order, one page per query, so the lock is
+        not held while the caller processes records.
+        """
+        select = self._select(collection, fields)
+        last = 0
+        while True:
+            rows = self._execute(
+                f"SELECT rowid AS _rowid, {select} FROM {collection} "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last, page_size),
+            ).fetchall()
+            for row in rows:
+                record = dict(row)
+                last = record.pop("_rowid")
+                yield record
+            if len(rows) < page_size:
+                return
+
+    @contextmanager
+    def transaction(self) -> Iterator["SQLiteStorage"]:
+        """
+        Commit all writes made inside the block together (rolled back on an
+        exception). Nested blocks join the outer transaction.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._execute("COMMIT")
+
+    def queued(self) -> int:
+        """Writes go to the open SQLite transaction at once."""
+        return 0
+
+    def state(self) -> str:
+        """A local database is always available."""
+        return CLOSED
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
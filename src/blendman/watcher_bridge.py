@@ -2,30 +2,72 @@
 Bridge between RenameWatcher events and DB operations.
 
 Subscribes to RenameWatcher events and persists them using the DB interface.
+With a batch size, a writer thread persists them instead: whatever queued up
+while the previous batch was written goes into one storage transaction, so a
+burst of events costs one commit instead of one per event.
 """
 
+from collections import deque
 import os
+import stat
+import threading
+import time
 import structlog  # type: ignore
 from rename_watcher.api import RenameWatcherAPI
-from pocketbase.exceptions import PocketBaseError
+from rename_watcher.fingerprint import Fingerprinter
+from rename_watcher.metrics import current_origin, get_metrics, origin
+from .blendfile import blend_metadata
 from .db_interface import DBInterface
+from .storage import STORAGE_ERRORS
+
+# Most events the writer thread persists per storage transaction
+DEFAULT_BATCH_SIZE = 500
 
 
 class WatcherBridge:
     """Bridge class to subscribe to watcher events and persist them in the DB."""
 
     def __init__(
-        self, db_interface: DBInterface, path: str | None = None, matcher=None
+        self,
+        db_interface: DBInterface,
+        path: str | None = None,
+        matcher=None,
+        patterns: dict | None = None,
+        fingerprinter: Fingerprinter | None = None,
+        batch_size: int = 0,
     ) -> None:
-        """Initialize the bridge with the given DB interface and watcher settings."""
+        """
+        Initialize the bridge with the given DB interface and watcher settings.
+        `patterns` are the include/ignore patterns behind `matcher`, used to
+        keep pattern reloads incremental. A `fingerprinter` lets the watcher
+        pair deletes and creates by content. With a `batch_size`, start()
+        also starts a writer thread persisting up to that many events per
+        storage transaction; otherwise events are persisted as they arrive.
+        """
         self.db_interface = db_interface
         self.logger = structlog.get_logger("WatcherBridge")
-        self.watcher = RenameWatcherAPI(path=path, matcher=matcher)
+        self.watcher = RenameWatcherAPI(
+            path=path, matcher=matcher, patterns=patterns, fingerprinter=fingerprinter
+        )
+        # (event, arrival time) received while the backend is down, replayed on resume
+        self._pending: deque[tuple[dict, float]] = deque()
+        self._paused = False
+        self._lock = threading.Lock()
+        self.batch_size = batch_size
+        # (event, transformed event, arrival time) waiting for the writer thread
+        self._outbox: deque[tuple[dict, dict, float]] = deque()
+        self._outbox_changed = threading.Condition()
+        self._writer: threading.Thread | None = None
+        self._writing = False
+        self._closing = False
 
     def start(self):
         """
-        Start subscribing to watcher events and start the watcher.
+        Start subscribing to watcher events and start the watcher (and the
+        writer thread, with a batch size).
         """
+        if self.batch_size > 0:
+            self.start_writer()
         self.logger.info(
             "[WatcherBridge] Registering handle_event as watcher subscriber."
         )
@@ -37,49 +79,223 @@ class WatcherBridge:
         )
 
     def stop(self) -> None:
-        """Stop watching for events."""
+        """Stop watching for events, then persist what the writer still holds."""
         self.logger.info("[WatcherBridge] Stopping watcher.")
         self.watcher.stop()
+        self.stop_writer()
+
+    def start_writer(self) -> None:
+        """Persist events from a writer thread, in batches (see batch_size)."""
+        if self._writer is not None:
+            return
+        self._closing = False
+        self._writer = threading.Thread(
+            target=self._run_writer, name="blendman-writer", daemon=True
+        )
+        self._writer.start()
+
+    def stop_writer(self) -> None:
+        """Persist the events still queued for the writer and stop it."""
+        writer = self._writer
+        if writer is None:
+            return
+        with self._outbox_changed:
+            self._closing = True
+            self._outbox_changed.notify_all()
+        writer.join()
+        self._writer = None
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """
+        Wait until the writer thread has persisted every queued event.
+
+        Returns:
+            bool: False if `timeout` seconds passed first.
+        """
+        with self._outbox_changed:
+            return self._outbox_changed.wait_for(
+                lambda: not self._outbox and not self._writing, timeout
+            )
+
+    @property
+    def paused(self) -> bool:
+        """Whether persistence is paused."""
+        return self._paused
+
+    @property
+    def queued(self) -> int:
+        """Events not persisted yet: held while paused or waiting for the writer."""
+        return len(self._pending) + len(self._outbox)
+
+    def pause(self) -> None:
+        """Stop persisting; incoming events are queued until resume()."""
+        with self._lock:
+            if not self._paused:
+                self.logger.warning("[WatcherBridge] Persistence paused.")
+            self._paused = True
+
+    def resume(self) -> None:
+        """Persist queued events in arrival order and resume normal handling."""
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+            self._paused = False
+        self.logger.info("[WatcherBridge] Persistence resumed.", queued=len(pending))
+        for event, received in pending:
+            with origin(received):
+                self.handle_event(event)
+
+    def on_backend_state(self, state: str) -> None:
+        """Supervisor listener: pause on "down", resume on "up"."""
+        if state == "down":
+            self.pause()
+        elif state == "up":
+            self.resume()
 
     def handle_event(self, event: dict) -> None:
         """Handle a watcher event and persist it using the DB interface."""
+        start = time.monotonic()
+        received = current_origin() or start
+        with self._lock:
+            if self._paused:
+                self._pending.append((event, received))
+                return
         self.logger.info(
             "[WatcherBridge] handle_event called", pid=os.getpid(), event_data=event
         )
         self.logger.info(f"[WatcherBridge] Received event: {event}")
-        try:
-            # Transform event to match DBInterface.persist_event schema
-            transformed = {}
-            event_type = event.get("type")
-            transformed["event_type"] = event_type
-            # Path fields
-            if event_type == "moved":
-                transformed["name"] = (
-                    event.get("path", "").split("/")[-1]
-                    or event.get("path", "").split("\\")[-1]
-                )
-                transformed["new_path"] = event.get("new_parent") or event.get("path")
-                transformed["old_path"] = event.get("old_parent") or ""
+        if not event.get("path") and not event.get("new_parent"):
+            # Nothing to key a file record on
+            get_metrics().inc("events_dropped", reason="invalid")
+            self.logger.warning("[WatcherBridge] Ignoring event without a path")
+            return
+        transformed = self._transform(event)
+        self.logger.info(f"[WatcherBridge] Transformed event for DB: {transformed}")
+        get_metrics().since("bridge", start)
+        if self._writer is None:
+            if self._persist(event, transformed):
+                self._count_persisted(received)
+            return
+        with self._outbox_changed:
+            self._outbox.append((event, transformed, received))
+            self._outbox_changed.notify_all()
+
+    def _transform(self, event: dict) -> dict:
+        """Map a watcher event onto the DBInterface.persist_event schema."""
+        transformed = {}
+        event_type = event.get("type")
+        transformed["event_type"] = event_type
+        # Path fields
+        path = event.get("path", "")
+        transformed["name"] = path.split("/")[-1] or path.split("\\")[-1]
+        if event_type == "moved":
+            new_parent = event.get("new_parent") or ""
+            old_parent = event.get("old_parent") or ""
+            transformed["new_path"] = path or new_parent
+            # Descendants of a moved folder carry the folder's old/new paths
+            if path and new_parent and path.startswith(new_parent + "/"):
+                transformed["old_path"] = old_parent + path[len(new_parent) :]
             else:
-                transformed["name"] = (
-                    event.get("path", "").split("/")[-1]
-                    or event.get("path", "").split("\\")[-1]
-                )
-                transformed["new_path"] = event.get("path")
-                transformed["old_path"] = event.get("old_path", "")
-            # Type: file or dir (try to infer from inode or fallback to file)
-            transformed["type"] = (
-                event.get("file_type") or event.get("type_hint") or "file"
-            )
-            # Parent id (optional, not always available)
-            if "parent_id" in event:
-                transformed["parent_id"] = event["parent_id"]
-            self.logger.info(f"[WatcherBridge] Transformed event for DB: {transformed}")
+                transformed["old_path"] = old_parent
+            if event.get("merge"):
+                # Paired by content after one side was already persisted
+                transformed["merge"] = True
+        else:
+            transformed["new_path"] = event.get("path")
+            transformed["old_path"] = event.get("old_path", "")
+        if event.get("inode") is not None:
+            transformed["inode"] = event["inode"]
+        # Type: file or dir (try to infer from inode or fallback to file)
+        transformed["type"] = event.get("file_type") or event.get("type_hint") or "file"
+        # Parent id (optional, not always available)
+        if "parent_id" in event:
+            transformed["parent_id"] = event["parent_id"]
+        return transformed
+
+    @staticmethod
+    def _describe(transformed: dict) -> None:
+        """
+        Add size, mtime and .blend header metadata to a transformed event.
+
+        Runs when the event is persisted (on the writer thread, with a batch
+        size) so the watchdog callback never reads the file. Only created and
+        modified files are parsed: a move keeps the content, and therefore
+        the metadata, already stored for the file.
+        """
+        event_type = transformed["event_type"]
+        if event_type == "deleted" or not transformed["new_path"]:
+            return
+        # Size and mtime let startup reconciliation recognise the file
+        try:
+            st = os.stat(transformed["new_path"])
+        except OSError:
+            return
+        if not stat.S_ISREG(st.st_mode):
+            return
+        transformed["size"] = st.st_size
+        transformed["mtime"] = st.st_mtime
+        if event_type in ("created", "modified"):
+            # Header-only pass: Blender version, scene/object counts
+            transformed.update(blend_metadata(transformed["new_path"]))
+
+    def _persist(self, event: dict, transformed: dict) -> bool:
+        """Persist one transformed event; failures are logged and counted."""
+        self._describe(transformed)
+        try:
             self.db_interface.persist_event(transformed)
-            self.logger.info(f"[WatcherBridge] Event persisted to DB: {transformed}")
-        except PocketBaseError as exc:
+            self.db_interface.mark_dirs_stale(
+                transformed["new_path"], transformed.get("old_path")
+            )
+        except STORAGE_ERRORS as exc:
+            get_metrics().inc("events_dropped", reason="persist_error")
             self.logger.error(
                 "[WatcherBridge] Failed to persist watcher event",
                 event_data=event,
                 error=str(exc),
             )
+            return False
+        self.logger.info(f"[WatcherBridge] Event persisted to DB: {transformed}")
+        return True
+
+    @staticmethod
+    def _count_persisted(*received: float) -> None:
+        metrics = get_metrics()
+        metrics.inc("events_out", len(received))
+        for arrival in received:
+            metrics.since("end_to_end", arrival)
+
+    def _run_writer(self) -> None:
+        """Writer thread: persist queued events, one transaction per batch."""
+        while True:
+            with self._outbox_changed:
+                self._outbox_changed.wait_for(lambda: self._outbox or self._closing)
+                if not self._outbox:
+                    return
+                size = min(len(self._outbox), self.batch_size)
+                batch = [self._outbox.popleft() for _ in range(size)]
+                self._writing = True
+            try:
+                self._write_batch(batch)
+            finally:
+                with self._outbox_changed:
+                    self._writing = False
+                    self._outbox_changed.notify_all()
+
+    def _write_batch(self, batch: list[tuple[dict, dict, float]]) -> None:
+        """Persist a batch in one storage transaction; count it once committed."""
+        persisted = []
+        try:
+            with self.db_interface.transaction():
+                for event, transformed, received in batch:
+                    if self._persist(event, transformed):
+                        persisted.append(received)
+        except STORAGE_ERRORS as exc:
+            # The commit itself failed: nothing in the batch was stored
+            get_metrics().inc("events_dropped", len(persisted), reason="persist_error")
+            self.logger.error(
+                "[WatcherBridge] Failed to commit event batch",
+                events=len(batch),
+                error=str(exc),
+            )
+            return
+        self._count_persisted(*persisted)
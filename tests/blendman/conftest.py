@@ -1,5 +1,8 @@
 """
 Pytest fixture to ensure PocketBase has required collections for integration tests.
+
+Only tests that need a live server request it, so the rest of the suite runs
+without PocketBase.
 """
 
 import pytest  # type: ignore
@@ -11,7 +14,7 @@ ADMIN_EMAIL = os.environ.get("POCKETBASE_ADMIN_EMAIL", "admin@example.com")
 ADMIN_PASSWORD = os.environ.get("POCKETBASE_ADMIN_PASSWORD", "changeme")
 
 
-@pytest.fixture(scope="session", autouse=True)
+@pytest.fixture(scope="session")
 def ensure_pocketbase_collections():
     """
     Ensure PocketBase has 'files' and 'rename_logs' collections for integration tests.
@@ -46,6 +49,15 @@ def ensure_pocketbase_collections():
                         {"name": "path", "type": "text", "required": True},
                         {"name": "parent_id", "type": "text"},
                         {"name": "type", "type": "text", "required": True},
+                        {"name": "inode", "type": "number"},
+                        {"name": "size", "type": "number"},
+                        {"name": "mtime", "type": "number"},
+                        {"name": "partial_hash", "type": "text"},
+                        {"name": "blender_version", "type": "text"},
+                        {"name": "scene_count", "type": "number"},
+                        {"name": "object_count", "type": "number"},
+                        {"name": "compression", "type": "text"},
+                        {"name": "deleted", "type": "bool"},
                     ],
                 },
                 timeout=5,
@@ -70,5 +82,24 @@ def ensure_pocketbase_collections():
                 },
                 timeout=5,
             )
+        # Create 'dir_digests' collection if missing
+        digests_resp = requests.get(
+            f"{POCKETBASE_URL}/api/collections/dir_digests", headers=headers, timeout=5
+        )
+        if digests_resp.status_code == 404:
+            requests.post(
+                f"{POCKETBASE_URL}/api/collections",
+                headers=headers,
+                json={
+                    "name": "dir_digests",
+                    "type": "base",
+                    "schema": [
+                        {"name": "path", "type": "text", "required": True},
+                        {"name": "local", "type": "text"},
+                        {"name": "tree", "type": "text"},
+                    ],
+                },
+                timeout=5,
+            )
     except Exception as e:
         pytest.skip(f"PocketBase not available or could not seed collections: {e}")
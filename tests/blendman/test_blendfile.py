@@ -0,0 +1,116 @@
+import gzip
+import struct
+
+import pytest  # type: ignore
+
+from blendman.blendfile import (
+    BlendFileError,
+    blend_metadata,
+    iter_blocks,
+    parse_header,
+    read_info,
+)
+
+BLOCKS = [
+    (b"REND", 8),
+    (b"SC\0\0", 40),
+    (b"OB\0\0", 100),
+    (b"DATA", 16),
+    (b"OB\0\0", 100),
+    (b"ME\0\0", 64),
+]
+
+
+def blend_bytes(blocks=BLOCKS, pointer_size=8, little=True, version=b"405", new=False):
+    order = "<" if little else ">"
+    endian = b"v" if little else b"V"
+    if new:
+        header = b"BLENDER17-01" + endian + version
+        block = struct.Struct(f"{order}4siQqq")
+
+        def pack(code, length):
+            return block.pack(code, 0, 0, length, 1)
+
+    else:
+        header = b"BLENDER" + (b"_" if pointer_size == 4 else b"-") + endian + version
+        block = struct.Struct(f"{order}4si{'I' if pointer_size == 4 else 'Q'}ii")
+
+        def pack(code, length):
+            return block.pack(code, length, 0, 0, 1)
+
+    body = b"".join(pack(code, n) + b"\xff" * n for code, n in blocks)
+    return header + body + pack(b"ENDB", 0)
+
+
+def test_expected_header_and_counts(tmp_path):
+    """
+    Expected: version, pointer size and endianness come from the header;
+    scenes and objects are counted from block codes.
+    """
+    path = tmp_path / "shot.blend"
+    path.write_bytes(blend_bytes())
+
+    info = read_info(str(path))
+
+    assert (info.header.version_string, info.header.pointer_size) == ("4.5", 8)
+    assert info.header.little_endian
+    assert (info.blocks, info.scenes, info.objects) == (6, 1, 2)
+    assert blend_metadata(str(path)) == {
+        "compression": "none",
+        "blender_version": "4.5",
+        "scene_count": 1,
+        "object_count": 2,
+    }
+
+
+@pytest.mark.parametrize(
+    "kwargs, version",
+    [
+        ({"pointer_size": 4, "little": False, "version": b"279"}, "2.79"),
+        ({"new": True, "version": b"0500"}, "5.0"),
+    ],
+)
+def test_edge_other_layouts(kwargs, version):
+    """Edge: 32-bit big-endian files and the Blender 5.0 header layout."""
+    data = blend_bytes(**kwargs)
+    header = parse_header(data[:17])
+
+    codes = [code for code, _, _ in iter_blocks(data, header)]
+
+    assert header.version_string == version
+    assert codes == [code for code, _ in BLOCKS]
+
+
+def test_edge_compressed_files(tmp_path):
+    """
+    Edge: gzip files report their version from the decompressed header;
+    zstd files are only detected. Neither is walked.
+    """
+    packed = tmp_path / "a.blend"
+    packed.write_bytes(gzip.compress(blend_bytes(version=b"293")))
+    zstd = tmp_path / "b.blend"
+    zstd.write_bytes(b"\x28\xb5\x2f\xfd" + b"\0" * 32)
+
+    assert blend_metadata(str(packed)) == {
+        "compression": "gzip",
+        "blender_version": "2.93",
+    }
+    assert blend_metadata(str(zstd)) == {"compression": "zstd"}
+
+
+def test_failure_truncated_or_foreign_files(tmp_path):
+    """
+    Failure: a file cut off before ENDB (e.g. mid-save) or not a .blend
+    file raises, and gives no record fields.
+    """
+    cut = tmp_path / "cut.blend"
+    cut.write_bytes(blend_bytes()[:-30])
+    other = tmp_path / "other.blend"
+    other.write_bytes(b"not a blend file")
+
+    with pytest.raises(BlendFileError):
+        read_info(str(cut))
+    with pytest.raises(BlendFileError):
+        read_info(str(other))
+    assert blend_metadata(str(cut)) == {}
+    assert blend_metadata(str(tmp_path / "missing.blend")) == {}
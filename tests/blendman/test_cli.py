@@ -2,6 +2,7 @@
 Unit tests for the blendman CLI using Typer's test client.
 """
 
+import json
 import sys
 import os
 from typer.testing import CliRunner  # type: ignore
@@ -43,6 +44,67 @@ def test_watcher_status():
     assert "Watcher is not running" in result.output
 
 
+def test_watcher_status_shows_metrics(tmp_path):
+    """
+    Expected: status reads the running watcher's metrics snapshot and can
+    print it as Prometheus text.
+    """
+    from rename_watcher.metrics import PipelineMetrics
+    from blendman.commands.watcher import metrics_path
+
+    pidfile = tmp_path / "watcher.pid"
+    pidfile.write_text(str(os.getpid()))
+    metrics = PipelineMetrics()
+    metrics.inc("events_out", 4)
+    metrics.observe("end_to_end", 0.02)
+    snapshot = dict(metrics.snapshot(), pid=os.getpid())
+    with open(metrics_path(str(pidfile)), "w") as f:
+        json.dump(snapshot, f)
+    result = runner.invoke(app, ["watcher", "status", "--pidfile", str(pidfile)])
+    assert result.exit_code == 0
+    assert "events_out" in result.output and "end_to_end" in result.output
+    result = runner.invoke(
+        app, ["watcher", "status", "--pidfile", str(pidfile), "--prometheus"]
+    )
+    assert "blendman_watcher_events_out_total 4" in result.output
+
+
+def test_watcher_control_commands(tmp_path):
+    """
+    Expected: status and pause/resume talk to a watcher over its control socket.
+    """
+    from blendman.control import ControlServer, WatcherControl, control_path
+    from blendman.db_interface import DBInterface
+    from blendman.record_cache import RecordCache
+    from blendman.storage import MemoryStorage
+    from blendman.watcher_bridge import WatcherBridge
+
+    pidfile = str(tmp_path / "w.pid")
+    bridge = WatcherBridge(
+        DBInterface(cache=RecordCache(), store=MemoryStorage()), path=str(tmp_path)
+    )
+    server = ControlServer(control_path(pidfile), WatcherControl(bridge).handlers())
+    server.start()
+    try:
+        result = runner.invoke(app, ["watcher", "status", "--pidfile", pidfile])
+        assert "Watcher is running" in result.output
+        assert "paused: False" in result.output
+        result = runner.invoke(app, ["watcher", "pause", "--pidfile", pidfile])
+        assert result.exit_code == 0 and bridge.paused
+        runner.invoke(app, ["watcher", "resume", "--pidfile", pidfile])
+        assert not bridge.paused
+        bridge.db_interface.cache.hits = 3
+        result = runner.invoke(app, ["backend", "cache-stats", "--pidfile", pidfile])
+        assert result.exit_code == 0 and "'hits': 3" in result.output
+    finally:
+        server.stop()
+    result = runner.invoke(app, ["watcher", "flush", "--pidfile", pidfile])
+    assert result.exit_code == 1
+    assert "flush failed" in result.output
+    result = runner.invoke(app, ["backend", "cache-stats", "--pidfile", pidfile])
+    assert result.exit_code == 1
+
+
 def test_backend_manage():
     result = runner.invoke(app, ["backend", "manage", "start"])
     assert result.exit_code == 0
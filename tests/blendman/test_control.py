@@ -0,0 +1,134 @@
+import json
+import os
+import socket
+import threading
+import pytest  # type: ignore
+from blendman.control import (
+    ControlError,
+    ControlServer,
+    WatcherControl,
+    send_command,
+)
+from blendman.db_interface import DBInterface
+from blendman.record_cache import RecordCache
+from blendman.storage import MemoryStorage
+from blendman.watcher_bridge import WatcherBridge
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def control(tmp_path):
+    store = MemoryStorage()
+    bridge = WatcherBridge(
+        DBInterface(cache=RecordCache(), store=store), path=str(tmp_path)
+    )
+    stop_event = threading.Event()
+    reloads = []
+    commands = WatcherControl(
+        bridge,
+        stop_event=stop_event,
+        reload=lambda: reloads.append(1) or {"reloaded": len(reloads)},
+        snapshot_path=str(tmp_path / "snap.json"),
+    )
+    server = ControlServer(str(tmp_path / "w.sock"), commands.handlers())
+    server.start()
+    yield server.path, bridge, store, stop_event
+    server.stop()
+
+
+def test_status_pause_resume_and_flush(control):
+    """
+    Expected: commands act on the running bridge and report its state.
+    """
+    path, bridge, store, _stop = control
+    assert send_command(path, "status")["paused"] is False
+    assert send_command(path, "pause") == {"paused": True}
+    bridge.handle_event({"type": "created", "path": "/root/a.blend"})
+    assert send_command(path, "status")["queued"] == 1
+    assert send_command(path, "resume") == {"paused": False, "replayed": 1}
+    assert len(store.list("rename_logs")) == 1
+    assert send_command(path, "flush") == {"flushed": 0, "drained": True}
+    assert send_command(path, "reload") == {"reloaded": 1}
+    stats = send_command(path, "stats")
+    assert stats["gauges"]["bridge_queued"][1] == 0
+
+
+def test_flush_waits_for_the_writer(tmp_path):
+    """
+    Edge: with a batch writer, flush returns once the events are persisted,
+    and reports a drain that ran out of time.
+    """
+    store = MemoryStorage()
+    db = DBInterface(cache=RecordCache(), store=store)
+    bridge = WatcherBridge(db, path=str(tmp_path), batch_size=10)
+    commands = WatcherControl(bridge)
+    release = threading.Event()
+    persist = db.persist_event
+
+    def slow_persist(event):
+        release.wait(5)
+        return persist(event)
+
+    db.persist_event = slow_persist
+    bridge.start_writer()
+    try:
+        bridge.handle_event({"type": "created", "path": "/root/a.blend"})
+        assert commands.flush(wait=0.05) == {"flushed": 0, "drained": False}
+        release.set()
+        assert commands.flush() == {"flushed": 0, "drained": True}
+        assert len(store.list("rename_logs")) == 1
+        bridge.pause()
+        assert commands.flush()["drained"] is False
+    finally:
+        release.set()
+        bridge.stop_writer()
+
+
+def test_snapshot_and_stop(control, tmp_path):
+    """
+    Expected: snapshot writes the path map and digests to JSON; stop persists
+    the events queued while paused and sets the stop event. The socket is
+    owner-only.
+    """
+    path, bridge, store, stop_event = control
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    result = send_command(path, "snapshot")
+    with open(result["path"]) as f:
+        data = json.load(f)
+    assert data["paths"] == {}
+    # Only the (empty) root directory has digests
+    assert [len(d) for d in data["digests"].values()] == [2]
+    send_command(path, "pause")
+    bridge.handle_event({"type": "created", "path": "/root/a.blend"})
+    result = send_command(path, "stop")
+    assert (result["stopping"], result["queued"]) == (True, 1)
+    assert stop_event.is_set()
+    assert not bridge.paused and len(store.list("rename_logs")) == 1
+
+
+def test_errors_and_stale_socket(control, tmp_path):
+    """
+    Failure: unknown commands and bad arguments are reported; a socket left
+    by a dead watcher is replaced, a live one is refused.
+    """
+    path, _bridge, _store, _stop = control
+    with pytest.raises(ControlError, match="Unknown command"):
+        send_command(path, "explode")
+    with pytest.raises(ControlError, match="TypeError"):
+        send_command(path, "status", verbose=True)
+    with pytest.raises(ControlError, match="already listening"):
+        ControlServer(path, {}).start()
+    stale = tmp_path / "stale.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(stale))
+    sock.close()
+    server = ControlServer(str(stale), {"status": lambda: "ok"})
+    server.start()
+    assert send_command(str(stale), "status") == "ok"
+    server.stop()
+    assert not stale.exists()
+    with pytest.raises(ControlError, match="No watcher listening"):
+        send_command(str(stale), "status")
@@ -1,6 +1,10 @@
 import pytest  # type: ignore
+from structlog.testing import capture_logs
 from unittest.mock import MagicMock
 from blendman.db_interface import DBInterface
+from blendman.record_cache import RecordCache
+from blendman.storage import MemoryStorage, PocketBaseStorage
+from pocketbase.exceptions import PocketBaseAuthError, PocketBaseError
 
 
 class DummyAPI:
@@ -11,8 +15,11 @@ class DummyAPI:
 
 @pytest.fixture
 def db(monkeypatch):
-    monkeypatch.setattr("blendman.db_interface.PocketBaseAPI", lambda: DummyAPI())
-    return DBInterface()
+    monkeypatch.setattr(
+        "blendman.storage.pocketbase_store.PocketBaseAPI", lambda: DummyAPI()
+    )
+    monkeypatch.setattr("blendman.storage.pocketbase_store.AuthClient", MagicMock)
+    return DBInterface(cache=RecordCache(), store=PocketBaseStorage())
 
 
 def test_persist_event_expected(db):
@@ -22,43 +29,172 @@ def test_persist_event_expected(db):
         "type": "file",
         "event_type": "create",
     }
-    db.api.collections.create.return_value = {"id": "1"}
+    db.store.api.collections.create.return_value = {"id": "1"}
     db.persist_event(event)
-    assert db.api.collections.create.call_count == 2
+    assert db.store.api.collections.create.call_count == 2
 
 
 def test_get_logs_for_file_expected(db):
-    db.api.collections.list.return_value = ["log1", "log2"]
+    db.store.api.collections.list.return_value = ["log1", "log2"]
     logs = db.get_logs_for_file("1")
     assert logs == ["log1", "log2"]
 
 
 def test_get_global_log_expected(db):
-    db.api.collections.list.return_value = ["log1", "log2"]
+    db.store.api.collections.list.return_value = ["log1", "log2"]
     logs = db.get_global_log()
     assert logs == ["log1", "log2"]
 
 
 def test_get_file_state_expected(db):
-    db.api.collections.get.return_value = {"id": "1", "name": "foo.txt"}
+    db.store.api.collections.get.return_value = {"id": "1", "name": "foo.txt"}
     state = db.get_file_state("1")
     assert state["name"] == "foo.txt"
 
 
 def test_get_file_history_expected(db):
-    db.api.collections.list.return_value = ["log1", "log2"]
+    db.store.api.collections.list.return_value = ["log1", "log2"]
     history = db.get_file_history("1")
     assert history == ["log1", "log2"]
 
 
-def test_failure_persist_event(db, caplog):
-    db.api.collections.create.side_effect = Exception("fail")
-    with caplog.at_level("ERROR"):
+def test_failure_persist_event(db):
+    db.store.api.collections.create.side_effect = PocketBaseError("fail")
+    with capture_logs() as logs:
         event = {
             "name": "foo.txt",
             "new_path": "/root/foo.txt",
             "type": "file",
             "event_type": "create",
         }
-        db.persist_event(event)
-    assert "DB persist_event failed" in caplog.text
+        with pytest.raises(PocketBaseError):
+            db.persist_event(event)
+    assert any("File record upsert failed" in log["event"] for log in logs)
+
+
+def test_persist_event_reauths_on_rejected_token(db):
+    event = {
+        "name": "foo.txt",
+        "new_path": "/root/foo.txt",
+        "type": "file",
+        "event_type": "create",
+    }
+    db.store.api.collections.create.side_effect = [
+        PocketBaseAuthError("Create failed: 401"),
+        {"id": "1"},
+        {"id": "2"},
+    ]
+    db.persist_event(event)
+    db.store.auth_client.invalidate.assert_called_once()
+    assert db.store.api.collections.create.call_count == 3
+
+
+def test_persist_event_move_patches_existing_record(db):
+    db.record_index.put("rec1", "/root/foo.txt", 42)
+    db.store.api.collections.update.return_value = {"id": "rec1"}
+    db.store.api.collections.create.return_value = {"id": "log1"}
+    event = {
+        "name": "bar.txt",
+        "old_path": "/root/foo.txt",
+        "new_path": "/root/bar.txt",
+        "inode": 42,
+        "type": "file",
+        "event_type": "moved",
+    }
+    db.persist_event(event)
+    db.store.api.collections.update.assert_called_once()
+    assert db.store.api.collections.update.call_args.args[:2] == ("files", "rec1")
+    # Only the rename log is created
+    assert db.store.api.collections.create.call_count == 1
+    assert db.record_index.lookup(path="/root/bar.txt") == "rec1"
+
+
+def _persist(db, event_type, path, old_path="", **extra):
+    db.persist_event(
+        {
+            "event_type": event_type,
+            "name": path.rsplit("/", 1)[-1],
+            "old_path": old_path,
+            "new_path": path,
+            "type": "file",
+            **extra,
+        }
+    )
+
+
+@pytest.mark.parametrize("deleted_first", [False, True])
+def test_merge_move_folds_copy_into_original(deleted_first):
+    """
+    A move paired by content after the copy was recorded as created (and,
+    or, the original as deleted) keeps the original record, which takes over
+    the copy's logs, and drops the copy's record.
+    """
+    db = DBInterface(cache=RecordCache(), store=MemoryStorage())
+    _persist(db, "created", "/d1/a.blend", inode=1)
+    original = db.record_index.lookup(path="/d1/a.blend")
+    if deleted_first:
+        _persist(db, "deleted", "/d1/a.blend")
+    _persist(db, "created", "/d2/a.blend", inode=2)
+    copy = db.record_index.lookup(path="/d2/a.blend")
+
+    _persist(db, "moved", "/d2/a.blend", "/d1/a.blend", inode=2, merge=True)
+
+    records = list(db.store.iter_records("files"))
+    assert [(r["id"], r["path"]) for r in records] == [(original, "/d2/a.blend")]
+    assert db.store.list("rename_logs", filter={"file_id": copy}) == []
+    logs = [
+        (log["event_type"], log["new_path"]) for log in db.get_logs_for_file(original)
+    ]
+    assert logs[-2:] == [("created", "/d2/a.blend"), ("moved", "/d2/a.blend")]
+    assert len(logs) == (4 if deleted_first else 3)
+    assert db.record_index.lookup(inode=2) == original
+
+
+def test_warm_index_streams_files(db):
+    db.store.api.collections.iter_records.return_value = iter(
+        [{"id": "a", "path": "/a", "inode": 1}, {"id": "b", "path": "/b"}]
+    )
+    assert db.warm_index() == 2
+    assert db.record_index.lookup(inode=1) == "a"
+    assert db.record_index.lookup(path="/b") == "b"
+
+
+def test_file_state_cached_until_own_write(db):
+    db.store.api.collections.get.return_value = {"id": "rec1", "name": "a.txt"}
+    db.get_file_state("rec1")
+    db.get_file_state("rec1")
+    assert db.store.api.collections.get.call_count == 1
+    assert db.cache_stats()["hits"] == 1
+    db.record_index.put("rec1", "/root/a.txt", 7)
+    db.store.api.collections.update.return_value = {"id": "rec1"}
+    db.store.api.collections.create.return_value = {"id": "log1"}
+    db.persist_event(
+        {
+            "name": "b.txt",
+            "old_path": "/root/a.txt",
+            "new_path": "/root/b.txt",
+            "inode": 7,
+            "type": "file",
+            "event_type": "moved",
+        }
+    )
+    db.get_file_state("rec1")
+    assert db.store.api.collections.get.call_count == 2
+
+
+def test_remote_log_change_invalidates_lists(db):
+    db.store.api.collections.list.return_value = ["log1"]
+    db.get_logs_for_file("rec1")
+    db.get_global_log()
+    db.invalidate_cached("rename_logs", {"id": "log2", "file_id": "rec1"})
+    db.get_logs_for_file("rec1")
+    db.get_global_log()
+    assert db.store.api.collections.list.call_count == 4
+
+
+def test_follow_remote_changes_subscribes(db):
+    realtime = MagicMock()
+    db.follow_remote_changes(realtime)
+    topics = [c.args[0] for c in realtime.subscribe.call_args_list]
+    assert topics == ["files", "rename_logs"]
+    realtime.start.assert_called_once()
@@ -4,6 +4,8 @@ import pytest
 from blendman.db_interface import DBInterface
 from blendman.watcher_bridge import WatcherBridge
 
+pytestmark = pytest.mark.usefixtures("ensure_pocketbase_collections")
+
 
 @pytest.mark.integration
 def test_end_to_end_file_create_and_log(monkeypatch):
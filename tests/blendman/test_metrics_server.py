@@ -0,0 +1,67 @@
+import requests  # type: ignore
+import pytest  # type: ignore
+from rename_watcher.metrics import get_metrics
+from blendman.db_interface import DBInterface
+from blendman.metrics_server import MetricsServer, bridge_gauges, bridge_health
+from blendman.record_cache import RecordCache
+from blendman.storage import MemoryStorage
+from blendman.watcher_bridge import WatcherBridge
+
+
+@pytest.fixture
+def served(tmp_path):
+    db = DBInterface(cache=RecordCache(), store=MemoryStorage())
+    bridge = WatcherBridge(db, path=str(tmp_path))
+    server = MetricsServer(
+        0,
+        gauges=lambda: bridge_gauges(bridge),
+        health=lambda: bridge_health(bridge),
+    )
+    get_metrics().reset()
+    server.start()
+    yield server, bridge
+    server.stop()
+    get_metrics().reset()
+
+
+def test_metrics_and_health(served):
+    """
+    Expected: /metrics serves Prometheus text with pipeline counters and
+    bridge gauges; /health summarises the bridge as JSON.
+    """
+    server, bridge = served
+    bridge.handle_event({"type": "created", "path": "/root/a.blend"})
+    metrics = requests.get(f"{server.url}/metrics", timeout=5)
+    assert metrics.status_code == 200
+    assert metrics.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "blendman_watcher_events_out_total 1" in metrics.text
+    assert "blendman_watcher_bridge_queued 0" in metrics.text
+    health = requests.get(f"{server.url}/health", timeout=5)
+    assert health.status_code == 200
+    assert health.json()["events"]["out"] == 1
+    assert requests.get(f"{server.url}/nope", timeout=5).status_code == 404
+
+
+def test_health_degraded_while_paused(served):
+    """
+    Edge: a paused bridge reports 503 with its queue depth.
+    """
+    server, bridge = served
+    bridge.pause()
+    bridge.handle_event({"type": "created", "path": "/root/a.blend"})
+    health = requests.get(f"{server.url}/health", timeout=5)
+    assert health.status_code == 503
+    assert health.json()["status"] == "degraded"
+    assert health.json()["queued"] == 1
+
+
+def test_stop_releases_port(served):
+    """
+    Expected: stop() ends the serving thread and closes the socket.
+    """
+    server, _bridge = served
+    thread = server._thread
+    server.stop()
+    assert not thread.is_alive()
+    with pytest.raises(requests.ConnectionError):
+        requests.get(f"{server.url}/metrics", timeout=1)
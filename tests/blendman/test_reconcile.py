@@ -0,0 +1,382 @@
+import os
+import shutil
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest  # type: ignore
+
+from blendman.db_interface import DBInterface
+from rename_watcher.fingerprint import partial_hash
+from blendman.reconcile import FileStat, Known, plan, reconcile, scan_tree
+from blendman.record_cache import RecordCache
+from blendman.storage import (
+    MemoryStorage,
+    RecordNotFoundError,
+    SQLiteStorage,
+    StorageError,
+)
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def db(request, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteStorage(str(tmp_path / "blendman.db"))
+    else:
+        store = MemoryStorage()
+    db = DBInterface(cache=RecordCache(), store=store)
+    yield db
+    store.close()
+
+
+def write(path, data=b"data"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def records(db):
+    return {r["path"]: r for r in db.store.iter_records("files")}
+
+
+def test_expected_offline_changes_become_events(db, tmp_path):
+    """
+    Expected: after a first pass records the tree, offline renames, deletes
+    and creations are persisted as moved/deleted/created events.
+    """
+    root = tmp_path / "tree"
+    write(root / "a.blend", b"a" * 10)
+    write(root / "shots" / "b.blend", b"b" * 20)
+    write(root / "gone.blend", b"g")
+    write(root / "same.blend", b"s")
+    first = reconcile(db, str(root), workers=2)
+    assert first["created"] == 4
+    before = records(db)
+
+    os.rename(root / "a.blend", root / "shots" / "a2.blend")
+    os.remove(root / "gone.blend")
+    write(root / "new.blend", b"new file")
+    summary = reconcile(db, str(root), workers=2)
+
+    assert (summary["moved"], summary["deleted"], summary["created"]) == (1, 1, 1)
+    after = records(db)
+    moved = after[str(root / "shots" / "a2.blend")]
+    assert moved["id"] == before[str(root / "a.blend")]["id"]
+    logs = db.get_logs_for_file(moved["id"])
+    assert [(log["event_type"], log["old_path"]) for log in logs][-1] == (
+        "moved",
+        str(root / "a.blend"),
+    )
+    assert (
+        after[str(root / "same.blend")]["updated"]
+        == (before[str(root / "same.blend")]["updated"])
+    )
+    assert reconcile(db, str(root))["moved"] == 0
+
+
+def test_edge_rewrite_in_place_refreshes_without_events(db, tmp_path):
+    """
+    Edge: a file saved by writing a copy and renaming it over the original
+    keeps its record; only inode, size and mtime are refreshed.
+    """
+    root = tmp_path / "tree"
+    path = write(root / "a.blend", b"v1")
+    reconcile(db, str(root))
+    write(root / "a.blend@", b"version 2")
+    os.replace(root / "a.blend@", path)
+
+    summary = reconcile(db, str(root))
+
+    assert summary["refreshed"] == 1
+    assert (summary["moved"], summary["created"], summary["deleted"]) == (0, 0, 0)
+    record = records(db)[path]
+    assert record["inode"] == os.stat(path).st_ino
+    assert record["size"] == len(b"version 2")
+
+
+def test_expected_content_match_across_devices(db, tmp_path):
+    """
+    Expected: a file copied elsewhere (new inode) and deleted is matched by
+    size and mtime, and the copy is recorded as a move.
+    """
+    root = tmp_path / "tree"
+    original = write(root / "a.blend", b"x" * 1000)
+    reconcile(db, str(root))
+    shutil.copy2(original, root / "moved.blend")
+    os.remove(original)
+
+    summary = reconcile(db, str(root))
+
+    assert (summary["moved"], summary["created"], summary["deleted"]) == (1, 0, 0)
+    assert str(root / "moved.blend") in records(db)
+
+
+def test_edge_ambiguous_copies_are_not_guessed():
+    """
+    Edge: two files share the vanished record's size and mtime; without a
+    stored hash to tell them apart, both are created and the record deleted.
+    """
+    known = {"/r/a": Known("rec1", 1, 5, 10.0, None)}
+    disk = {"/r/b": FileStat(2, 5, 10.0), "/r/c": FileStat(3, 5, 10.0)}
+
+    result = plan(known, disk, hasher=lambda items: {})
+
+    kinds = sorted(e["event_type"] for e in result.events)
+    assert kinds == ["created", "created", "deleted"]
+
+
+def test_expected_stored_hash_picks_the_copy(tmp_path):
+    """
+    Expected: with a stored partial hash, the candidate with matching
+    content is the move target, and the other is a new file.
+    """
+    a = write(tmp_path / "a", b"one")
+    b = write(tmp_path / "b", b"two")
+    stat_a, stat_b = os.stat(a), os.stat(b)
+    known = {"/old": Known("rec1", 99, 3, stat_a.st_mtime, partial_hash(a))}
+    disk = {
+        a: FileStat(stat_a.st_ino, 3, stat_a.st_mtime),
+        b: FileStat(stat_b.st_ino, 3, stat_a.st_mtime),
+    }
+
+    events = plan(known, disk).events
+
+    moved = [e for e in events if e["event_type"] == "moved"]
+    assert [(e["old_path"], e["new_path"], e["file_id"]) for e in moved] == [
+        ("/old", a, "rec1")
+    ]
+    assert [e["new_path"] for e in events if e["event_type"] == "created"] == [b]
+
+
+def test_edge_directories_and_ignored_files(tmp_path):
+    """
+    Edge: records at directory paths survive; files the matcher rejects
+    are not scanned.
+    """
+    write(tmp_path / "d" / "keep.blend")
+    write(tmp_path / "d" / "skip.tmp")
+
+    files, dirs = scan_tree(str(tmp_path), matcher=lambda p: p.endswith(".blend"))
+    assert list(files) == [str(tmp_path / "d" / "keep.blend")]
+    assert str(tmp_path / "d") in dirs
+    result = plan(
+        {str(tmp_path / "d"): Known("dir1", 7, None, None, None)}, files, dirs
+    )
+
+    assert [e["new_path"] for e in result.events] == [
+        str(tmp_path / "d" / "keep.blend")
+    ]
+
+
+def test_edge_sqlite_migration_adds_columns(tmp_path):
+    """
+    Edge: a database created before size/mtime/partial_hash existed gets
+    the columns when opened.
+    """
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE files (id TEXT PRIMARY KEY, name TEXT NOT NULL, "
+        "path TEXT NOT NULL, parent_id TEXT, type TEXT NOT NULL, inode INTEGER, "
+        "created TEXT NOT NULL, updated TEXT NOT NULL)"
+    )
+    conn.close()
+
+    store = SQLiteStorage(path)
+    record = store.create(
+        "files", {"name": "a", "path": "/a", "type": "file", "size": 3, "mtime": 1.5}
+    )
+    store.close()
+
+    assert (record["size"], record["mtime"]) == (3, 1.5)
+
+
+def test_failure_reused_inode_is_not_a_move():
+    """
+    Failure: a new file that got a deleted file's inode, with different size
+    and mtime, is not mistaken for the deleted file.
+    """
+    known = {"/r/gone": Known("rec1", 5, 1, 10.0, None)}
+    disk = {"/r/new": FileStat(5, 8, 20.0)}
+
+    kinds = sorted(e["event_type"] for e in plan(known, disk).events)
+
+    assert kinds == ["created", "deleted"]
+
+
+def test_expected_unchanged_tree_loads_no_records(db, tmp_path):
+    """
+    Expected: with stored directory digests, an unchanged tree is verified
+    without loading records, and a change only loads its directory.
+    """
+    root = tmp_path / "tree"
+    for d in range(5):
+        for f in range(3):
+            write(root / f"d{d}" / f"f{f}.blend", bytes([d, f]))
+    reconcile(db, str(root))
+
+    summary = reconcile(db, str(root))
+    assert (summary["changed_dirs"], summary["records"]) == (0, 0)
+
+    os.rename(root / "d1" / "f0.blend", root / "d1" / "g0.blend")
+    summary = reconcile(db, str(root))
+    assert (summary["changed_dirs"], summary["records"], summary["moved"]) == (1, 3, 1)
+    assert reconcile(db, str(root))["changed_dirs"] == 0
+
+
+def test_edge_live_directory_deleted_offline(db, tmp_path):
+    """
+    Edge: a directory recorded by the live watcher (after the last pass)
+    and deleted while stopped is still found through its stale digest.
+    """
+    root = tmp_path / "tree"
+    write(root / "a.blend")
+    reconcile(db, str(root))
+    path = write(root / "late" / "b.blend")
+    db.persist_event(
+        {"event_type": "created", "name": "b.blend", "new_path": path, "type": "file"}
+    )
+    db.mark_dirs_stale(path)
+    shutil.rmtree(root / "late")
+
+    summary = reconcile(db, str(root))
+
+    assert summary["deleted"] == 1
+    assert str(root / "late") not in {
+        r["path"] for r in db.store.iter_records("dir_digests")
+    }
+
+
+def test_edge_live_file_deleted_offline_under_unchanged_parents(tmp_path):
+    """
+    Edge: a file created live in an existing directory and deleted while
+    stopped leaves every ancestor digest unchanged; the blanked digest of
+    its directory still gets it compared.
+    """
+    db = DBInterface(cache=RecordCache(), store=MemoryStorage())
+    root = tmp_path / "tree"
+    write(root / "x" / "old.blend")
+    reconcile(db, str(root))
+    path = write(root / "x" / "new.blend")
+    db.persist_event(
+        {"event_type": "created", "name": "new.blend", "new_path": path, "type": "file"}
+    )
+    db.mark_dirs_stale(path)
+    os.remove(path)
+
+    summary = reconcile(db, str(root))
+
+    assert summary["deleted"] == 1
+    logs = db.get_logs_for_file(records(db)[path]["id"])
+    assert logs[-1]["event_type"] == "deleted"
+
+
+def test_edge_deleted_records_stay_out_of_matching(db, tmp_path):
+    """
+    Edge: a file deleted offline is reported once. Its record stays, for
+    the history, but is neither compared again nor indexed, so a new file
+    on the same inode gets a record of its own.
+    """
+    root = tmp_path / "tree"
+    path = write(root / "a.blend", b"a")
+    write(root / "b.blend", b"bb")
+    reconcile(db, str(root))
+    os.remove(path)
+    assert reconcile(db, str(root))["deleted"] == 1
+    write(root / "b.blend", b"bbb")  # the directory changes again
+    summary = reconcile(db, str(root))
+
+    assert (summary["changed_dirs"], summary["deleted"]) == (1, 0)
+    dead = records(db)[path]
+    logs = db.get_logs_for_file(dead["id"])
+    assert [log["event_type"] for log in logs] == ["created", "deleted"]
+
+    restarted = DBInterface(cache=RecordCache(), store=db.store)
+    assert restarted.warm_index() == 1
+    assert restarted.record_index.lookup(inode=dead["inode"]) is None
+    restarted.persist_event(
+        {
+            "event_type": "created",
+            "name": "c.blend",
+            "new_path": str(root / "c.blend"),
+            "type": "file",
+            "inode": dead["inode"],
+        }
+    )
+    assert records(db)[path]["id"] == dead["id"]
+    assert records(db)[str(root / "c.blend")]["id"] != dead["id"]
+
+
+class NoDigestsStorage(MemoryStorage):
+    """A store set up before the dir_digests collection existed."""
+
+    def iter_records(self, collection, fields=None, page_size=500):
+        if collection == "dir_digests":
+            raise RecordNotFoundError("Missing collection: dir_digests")
+        return super().iter_records(collection, fields, page_size)
+
+
+def test_failure_store_without_digest_collection(tmp_path):
+    """
+    Failure: without a dir_digests collection, every pass compares all
+    records and no digests are saved.
+    """
+    store = NoDigestsStorage()
+    db = DBInterface(cache=RecordCache(), store=store)
+    root = tmp_path / "tree"
+    write(root / "a.blend")
+    write(root / "shots" / "b.blend")
+    assert reconcile(db, str(root))["created"] == 2
+
+    os.remove(root / "shots" / "b.blend")
+    summary = reconcile(db, str(root))
+
+    assert (summary["records"], summary["deleted"]) == (2, 1)
+    assert store.list("dir_digests") == []
+
+
+def test_failure_stale_marking_tried_once(tmp_path):
+    """
+    Failure: a failed write is not retried for the same directory, and a
+    store without dir_digests turns stale marking off after one query.
+    """
+    store = MagicMock()
+    store.create.side_effect = StorageError("down")
+    store.iter_records.return_value = iter([])
+    db = DBInterface(cache=RecordCache(), store=store)
+    db.mark_dirs_stale("/w/a/1.blend", "/w/a/2.blend")
+    assert store.create.call_count == 1
+
+    store = MagicMock()
+    store.iter_records.side_effect = RecordNotFoundError("no dir_digests")
+    db = DBInterface(cache=RecordCache(), store=store)
+    db.mark_dirs_stale("/w/a/1.blend", "/w/b/2.blend")
+    db.mark_dirs_stale("/w/c/3.blend")
+    assert store.iter_records.call_count == 1
+    assert not store.create.called and not store.update.called
+
+
+def test_expected_blend_metadata_recorded(db, tmp_path):
+    """
+    Expected: created .blend files and ones rewritten in place get their
+    Blender version and scene/object counts in the file record.
+    """
+    header = b"BLENDER-v405"
+
+    def blend(objects):
+        blocks = [(b"SC\0\0", 8)] + [(b"OB\0\0", 8)] * objects
+        body = b"".join(
+            code + (8).to_bytes(4, "little") + bytes(16) + b"\0" * 8
+            for code, _ in blocks
+        )
+        return header + body + b"ENDB" + bytes(20)
+
+    path = write(tmp_path / "tree" / "a.blend", blend(2))
+    reconcile(db, str(tmp_path / "tree"))
+    record = records(db)[path]
+    assert (record["blender_version"], record["scene_count"]) == ("4.5", 1)
+    assert record["object_count"] == 2
+
+    write(tmp_path / "tree" / "a.blend", blend(5))
+    os.utime(path, (0, 1000))
+    reconcile(db, str(tmp_path / "tree"))
+    assert records(db)[path]["object_count"] == 5
@@ -0,0 +1,46 @@
+import pytest  # type: ignore
+from blendman.record_cache import MISSING, RecordCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_expected_hit_and_ttl_expiry():
+    clock = FakeClock()
+    cache = RecordCache(max_entries=4, ttl=10, clock=clock)
+    cache.put("k", {"id": "1"})
+    assert cache.get("k") == {"id": "1"}
+    clock.now = 11
+    assert cache.get("k") is MISSING
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_edge_lru_eviction_and_tags():
+    cache = RecordCache(max_entries=2)
+    cache.put("a", 1, tags=("rec1",))
+    cache.put("b", 2, tags=("rec2",))
+    cache.get("a")
+    cache.put("c", 3, tags=("rec1",))
+    assert cache.get("b") is MISSING
+    cache.invalidate("rec1")
+    assert len(cache) == 0
+    assert cache.stats()["evictions"] == 1
+
+
+def test_failure_loader_error_not_cached():
+    cache = RecordCache()
+
+    def boom():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", boom)
+    assert cache.get_or_load("k", lambda: 5) == 5
+    with pytest.raises(ValueError):
+        RecordCache(max_entries=-1)
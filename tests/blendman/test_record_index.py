@@ -0,0 +1,35 @@
+from blendman.record_index import RecordIndex
+
+
+def test_expected_lookup_by_inode_and_path():
+    index = RecordIndex()
+    index.put("rec1", "/root/a.blend", 11)
+    assert index.lookup(path="/root/a.blend") == "rec1"
+    assert index.lookup(path="/elsewhere", inode=11) == "rec1"
+    assert len(index) == 1
+
+
+def test_edge_put_repoints_record():
+    index = RecordIndex()
+    index.put("rec1", "/root/a.blend", 11)
+    index.put("rec1", "/root/b.blend")
+    assert index.lookup(path="/root/a.blend") is None
+    assert index.lookup(path="/root/b.blend") == "rec1"
+    assert index.lookup(inode=11) == "rec1"
+    index.remove("rec1")
+    assert index.lookup(path="/root/b.blend", inode=11) is None
+
+
+def test_persisted_roundtrip(tmp_path):
+    store = tmp_path / "index.json"
+    index = RecordIndex(str(store))
+    index.put("rec1", "/root/a.blend", 11)
+    index.save()
+    reloaded = RecordIndex(str(store))
+    assert reloaded.lookup(inode=11) == "rec1"
+
+
+def test_failure_corrupt_file_ignored(tmp_path):
+    store = tmp_path / "index.json"
+    store.write_text("{not json")
+    assert len(RecordIndex(str(store))) == 0
@@ -0,0 +1,293 @@
+import pytest  # type: ignore
+from unittest.mock import MagicMock
+from pocketbase.collections import BATCH_LIMIT
+from pocketbase.exceptions import PocketBaseNotFoundError
+from pocketbase.filters import all_of, cond, like
+from pocketbase.resilience import get_breaker
+from pocketbase.testing import FakePocketBase
+from pocketbase.tokens import TokenManager
+from blendman.db_interface import DBInterface
+from blendman.record_cache import RecordCache
+from blendman.storage import (
+    BatchCommitError,
+    MemoryStorage,
+    PocketBaseStorage,
+    RecordNotFoundError,
+    SQLiteStorage,
+    StorageError,
+    create_storage,
+    storage_settings,
+)
+from blendman.storage.expressions import matches, parse, to_sql
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteStorage(str(tmp_path / "blendman.db"))
+    else:
+        store = MemoryStorage()
+    yield store
+    store.close()
+
+
+def event(name, event_type="created", old_path="", inode=None):
+    return {
+        "name": name,
+        "old_path": old_path,
+        "new_path": f"/root/{name}",
+        "type": "file",
+        "event_type": event_type,
+        "inode": inode,
+    }
+
+
+def test_parse_filter_to_sql():
+    """
+    Expected: pocketbase.filters output round-trips into parameterised SQL.
+    """
+    expr = all_of(like("new_path", 'it"s'), cond("event_type", "=", None))
+    sql, params = to_sql(parse(expr), {"new_path", "event_type"})
+    assert sql == "(new_path LIKE ?) AND (event_type IS NULL)"
+    assert params == ['%it"s%']
+
+
+def test_matches_agrees_with_sql_semantics():
+    """
+    Expected: in-memory evaluation follows the LIKE / NULL rules of SQL.
+    """
+    record = {"new_path": "/root/Scene.blend", "event_type": None, "inode": 3}
+    assert matches(parse(like("new_path", "scene")), record)
+    assert matches(parse('new_path ~ "/root/%.blend"'), record)
+    assert matches(parse("event_type = null && inode >= 3"), record)
+    assert not matches(parse('event_type != null || inode > "x"'), record)
+
+
+def test_parse_filter_rejects_unknown_fields_and_syntax():
+    """
+    Failure: unknown fields and unsupported operators are refused.
+    """
+    with pytest.raises(ValueError, match="Unknown filter field"):
+        to_sql(parse('name="x"'), {"path"})
+    with pytest.raises(ValueError):
+        parse('tags?="x"')
+
+
+def test_store_crud_and_queries(store):
+    """
+    Expected: records round-trip and list() honours filter, sort and fields.
+    """
+    rec = store.create("files", {"name": "a.blend", "path": "/a.blend", "type": "file"})
+    assert len(rec["id"]) == 15
+    store.update("files", rec["id"], {"path": "/b.blend", "unknown": 1})
+    assert store.get("files", rec["id"])["path"] == "/b.blend"
+    for i, kind in enumerate(["created", "moved", "moved"]):
+        store.create(
+            "rename_logs",
+            {
+                "file_id": rec["id"],
+                "new_path": f"/p{i}",
+                "event_type": kind,
+                "timestamp": f"2024-01-0{i + 1} 00:00:00.000Z",
+            },
+        )
+    logs = store.list(
+        "rename_logs",
+        filter={"file_id": rec["id"], "event_type": "moved"},
+        sort="-timestamp",
+        fields="new_path",
+    )
+    assert logs == [{"new_path": "/p2"}, {"new_path": "/p1"}]
+    assert [r["id"] for r in store.iter_records("files", page_size=1)] == [rec["id"]]
+    store.delete("files", rec["id"])
+    assert store.list("files") == []
+
+
+def test_store_errors(store):
+    """
+    Failure: missing ids, unknown collections and fields raise StorageError.
+    """
+    with pytest.raises(RecordNotFoundError):
+        store.update("files", "missing", {"name": "x"})
+    with pytest.raises(RecordNotFoundError):
+        store.get("files", "missing")
+    with pytest.raises(RecordNotFoundError):
+        store.delete("files", "missing")
+    with pytest.raises(StorageError):
+        store.list("users")
+    with pytest.raises(StorageError):
+        store.list("files", filter='tags?="x"')
+
+
+def test_transaction_rolls_back(store):
+    """
+    Edge: an exception inside transaction() discards the batch.
+    """
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.create("files", {"name": "a", "path": "/a", "type": "file"})
+            raise RuntimeError("abort")
+    assert store.list("files") == []
+    kept = store.create("files", {"name": "b", "path": "/b", "type": "file"})
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.delete("files", kept["id"])
+            raise RuntimeError("abort")
+    assert store.get("files", kept["id"])["path"] == "/b"
+
+
+def test_db_interface_on_local_store(store):
+    """
+    Expected: DBInterface persists batches and follows moves on local stores.
+    """
+    db = DBInterface(cache=RecordCache(), store=store)
+    assert db.persist_events([event("a.blend", inode=5), event("b.blend")]) == 2
+    db.persist_event(
+        event("c.blend", event_type="moved", old_path="/root/a.blend", inode=5)
+    )
+    files = store.list("files", sort="path")
+    assert [f["path"] for f in files] == ["/root/b.blend", "/root/c.blend"]
+    history = db.get_file_history(files[1]["id"])
+    assert [h["event_type"] for h in history] == ["created", "moved"]
+    moved = db.get_global_log(filter=like("new_path", "c.blend"))
+    assert len(moved) == 1
+    assert db.backend_available()
+
+
+def test_storage_selected_from_env(monkeypatch, tmp_path):
+    """
+    Expected: BLENDMAN_STORAGE / BLENDMAN_SQLITE_PATH select the backend;
+    unknown names are rejected.
+    """
+    monkeypatch.setenv("BLENDMAN_CONFIG_TOML", str(tmp_path / "missing.toml"))
+    monkeypatch.setenv("BLENDMAN_STORAGE", "sqlite")
+    monkeypatch.setenv("BLENDMAN_SQLITE_PATH", str(tmp_path / "x.db"))
+    store = create_storage()
+    assert isinstance(store, SQLiteStorage)
+    store.close()
+    monkeypatch.setenv("BLENDMAN_STORAGE", "mongo")
+    with pytest.raises(ValueError, match="Unknown storage backend"):
+        storage_settings()
+
+
+def test_pocketbase_storage_logs_in_lazily(monkeypatch):
+    """
+    Edge: constructing DBInterface on PocketBase does not log in; the first
+    request does.
+    """
+    auth = MagicMock()
+    auth.is_authenticated.return_value = False
+    monkeypatch.setattr(
+        "blendman.storage.pocketbase_store.PocketBaseAPI",
+        MagicMock(return_value=MagicMock()),
+    )
+    monkeypatch.setattr(
+        "blendman.storage.pocketbase_store.AuthClient", MagicMock(return_value=auth)
+    )
+    monkeypatch.setenv("POCKETBASE_ADMIN_EMAIL", "admin@example.com")
+    monkeypatch.setenv("POCKETBASE_ADMIN_PASSWORD", "secret")
+    store = PocketBaseStorage()
+    assert store.auth_client is auth
+    db = DBInterface(cache=RecordCache(), store=store)
+    auth.login.assert_not_called()
+    db.get_file_state("rec1")
+    auth.login.assert_called_once_with("admin@example.com", "secret")
+
+
+@pytest.fixture
+def fake_pocketbase(monkeypatch):
+    with FakePocketBase() as server:
+        monkeypatch.setenv("POCKETBASE_URL", server.url)
+        monkeypatch.setenv("POCKETBASE_ADMIN_EMAIL", server.admin_email)
+        monkeypatch.setenv("POCKETBASE_ADMIN_PASSWORD", server.admin_password)
+        monkeypatch.setenv("POCKETBASE_RETRY_BASE_DELAY", "0")
+        TokenManager().clear_token()
+        get_breaker().reset()
+        yield server
+        TokenManager().clear_token()
+
+
+def test_pocketbase_transaction_sends_one_batch(fake_pocketbase):
+    """
+    Expected: on PocketBase, persist_events sends its writes through
+    /api/batch (at most BATCH_LIMIT per request), not one request per write.
+    """
+    db = DBInterface(cache=RecordCache(), store=PocketBaseStorage())
+    events = [event(f"{i}.blend") for i in range(20)]
+    events.append(event("0_v2.blend", "moved", old_path="/root/0.blend"))
+    assert db.persist_events(events) == 21
+    # Login, then one batch holding 20 file and 21 log creates and a move
+    assert fake_pocketbase.request_count("POST /api/batch") == 1
+    assert fake_pocketbase.request_count() == 1 + 1 + 42
+    files = db.store.list("files")
+    assert len(files) == 20
+    moved = db.record_index.lookup(path="/root/0_v2.blend")
+    assert [log["event_type"] for log in db.get_logs_for_file(moved)] == [
+        "created",
+        "moved",
+    ]
+
+
+def test_pocketbase_failed_batch_persists_nothing(fake_pocketbase):
+    """
+    Failure: a rejected batch is rolled back on the server and reported as
+    nothing persisted.
+    """
+    db = DBInterface(cache=RecordCache(), store=PocketBaseStorage())
+    fake_pocketbase.inject_error(400, method="POST", path=r"^/api/batch$")
+    assert db.persist_events([event("a.blend"), event("b.blend")]) == 0
+    assert db.store.list("files") == []
+    assert db.record_index.lookup(path="/root/a.blend") is None
+
+
+def test_pocketbase_partial_commit_reports_committed_writes(fake_pocketbase):
+    """
+    Failure: when a later batch request fails, the writes of the earlier
+    ones are stored and counted, and the error names the failed sub-request.
+    """
+    store = PocketBaseStorage()
+    with pytest.raises(BatchCommitError) as info:
+        with store.transaction():
+            for i in range(BATCH_LIMIT + 5):
+                store.create("files", {"name": str(i), "path": f"/root/{i}"})
+            store.update("files", "x" * 15, {"name": "gone"})
+    assert info.value.committed == BATCH_LIMIT
+    assert isinstance(info.value.__cause__, PocketBaseNotFoundError)
+    assert len(store.list("files")) == BATCH_LIMIT
+
+
+def test_pocketbase_stale_record_id_does_not_sink_the_batch(fake_pocketbase):
+    """
+    Edge: a move of a file whose record was deleted server-side fails its
+    batch request; the events of earlier requests stay persisted, and the
+    rest are persisted one by one, the stale record being created anew.
+    """
+    db = DBInterface(cache=RecordCache(), store=PocketBaseStorage())
+    db.persist_events([event("a.blend", inode=1)])
+    stale = db.record_index.lookup(path="/root/a.blend")
+    db.store.delete("files", stale)
+    # 25 events fill the first request (two writes each)
+    events = [event(f"{i}.blend") for i in range(30)]
+    events.append(event("a2.blend", "moved", old_path="/root/a.blend", inode=1))
+    events.append(event("b.blend"))
+
+    assert db.persist_events(events) == 32
+
+    assert len(db.store.list("files")) == 32
+    assert db.record_index.lookup(path="/root/a2.blend") not in (None, stale)
+    assert db.persist_events([event("b2.blend", "moved", "/root/b.blend")]) == 1
+    assert db.store.list("files", filter={"path": "/root/b2.blend"})
+
+
+def test_pocketbase_without_batch_api_writes_one_by_one(fake_pocketbase):
+    """
+    Edge: a server with the Batch API disabled (403) gets the same writes
+    one request at a time, and is not sent batches again.
+    """
+    db = DBInterface(cache=RecordCache(), store=PocketBaseStorage())
+    fake_pocketbase.inject_error(403, method="POST", path=r"^/api/batch$", count=-1)
+    assert db.persist_events([event("a.blend"), event("b.blend")]) == 2
+    assert db.persist_events([event("c.blend")]) == 1
+    assert len(db.store.list("files")) == 3
+    assert not db.store.batch_enabled
+    assert fake_pocketbase.request_count("POST /api/batch") == 2
@@ -1,6 +1,10 @@
+import time
 import pytest  # type: ignore
+from structlog.testing import capture_logs
 from unittest.mock import MagicMock
+from rename_watcher.metrics import get_metrics, origin
 from blendman.watcher_bridge import WatcherBridge
+from pocketbase.exceptions import PocketBaseError
 
 
 class DummyDBInterface:
@@ -10,6 +14,9 @@ class DummyDBInterface:
     def persist_event(self, event):
         self.persisted.append(event)
 
+    def mark_dirs_stale(self, *paths):
+        pass
+
 
 class DummyWatcher:
     def __init__(self):
@@ -27,6 +34,9 @@ class DummyWatcher:
     def start(self):
         pass
 
+    def stop(self):
+        pass
+
 
 @pytest.fixture
 def bridge():
@@ -39,14 +49,10 @@ def bridge():
 def test_expected_event(bridge):
     bridge, db = bridge
     bridge.start()
-    event = {
-        "name": "foo.txt",
-        "new_path": "/root/foo.txt",
-        "type": "file",
-        "event_type": "create",
-    }
-    bridge.watcher.emit(event)
-    assert db.persisted[0]["name"] == "foo.txt"
+    bridge.watcher.emit({"type": "created", "path": "/root/foo.txt"})
+    persisted = db.persisted[0]
+    assert (persisted["name"], persisted["new_path"]) == ("foo.txt", "/root/foo.txt")
+    assert persisted["event_type"] == "created"
 
 
 def test_edge_empty_event(bridge):
@@ -56,17 +62,158 @@ def test_edge_empty_event(bridge):
     assert db.persisted == []
 
 
-def test_failure_db_error(bridge, caplog):
+def test_failure_db_error(bridge):
+    bridge, db = bridge
+    bridge.start()
+    db.persist_event = MagicMock(side_effect=PocketBaseError("fail"))
+    with capture_logs() as logs:
+        bridge.watcher.emit({"type": "created", "path": "/root/foo.txt"})
+    assert any("Failed to persist watcher event" in log["event"] for log in logs)
+
+
+def test_moved_descendant_paths(bridge):
+    bridge, db = bridge
+    bridge.start()
+    bridge.watcher.emit(
+        {
+            "type": "moved",
+            "path": "/new/dir/scene.blend",
+            "inode": 7,
+            "old_parent": "/old/dir",
+            "new_parent": "/new/dir",
+        }
+    )
+    persisted = db.persisted[0]
+    assert persisted["old_path"] == "/old/dir/scene.blend"
+    assert persisted["new_path"] == "/new/dir/scene.blend"
+    assert persisted["inode"] == 7
+
+
+def test_pause_queues_events_until_resume(bridge):
+    """
+    Expected: events arriving while the backend is down are persisted in
+    order once the supervisor reports it up again.
+    """
     bridge, db = bridge
     bridge.start()
-    db.persist_event = MagicMock(side_effect=Exception("fail"))
-    with caplog.at_level("ERROR"):
+    bridge.on_backend_state("down")
+    assert bridge.paused
+    bridge.watcher.emit({"type": "created", "path": "/root/a.blend"})
+    bridge.watcher.emit({"type": "created", "path": "/root/b.blend"})
+    assert db.persisted == []
+    bridge.on_backend_state("up")
+    assert not bridge.paused
+    assert [e["name"] for e in db.persisted] == ["a.blend", "b.blend"]
+
+
+def test_metrics_time_events_from_origin(bridge):
+    """
+    Expected: persisted events are counted and timed end to end from their
+    origin, including events replayed after a pause.
+    """
+    bridge, _db = bridge
+    metrics = get_metrics()
+    metrics.reset()
+    bridge.start()
+    received = time.monotonic() - 1.0
+    bridge.on_backend_state("down")
+    with origin(received):
+        bridge.watcher.emit({"type": "created", "path": "/root/a.blend"})
+    bridge.on_backend_state("up")
+    snapshot = metrics.snapshot()
+    assert metrics.counter("events_out") == 1
+    end_to_end = snapshot["stages"]["end_to_end"]
+    assert end_to_end["count"] == 1 and end_to_end["sum"] >= 1.0
+    assert snapshot["stages"]["bridge"]["count"] == 1
+    metrics.reset()
+
+
+def test_writer_thread_persists_in_batches():
+    """
+    Expected: with a batch size, queued events are persisted by the writer
+    thread in one transaction per batch, and stop() drains the queue.
+    """
+    from blendman.db_interface import DBInterface
+    from blendman.record_cache import RecordCache
+    from blendman.storage import MemoryStorage
+
+    store = MemoryStorage()
+    db = DBInterface(cache=RecordCache(), store=store)
+    transactions = []
+
+    def transaction():
+        transactions.append(1)
+        return store.transaction()
+
+    db.transaction = transaction
+    bridge = WatcherBridge(db, batch_size=2)
+    bridge.watcher = DummyWatcher()
+    bridge.start()
+    assert bridge.drain(timeout=1)
+    # Hold the writer back so that the events pile up
+    with bridge._outbox_changed:  # pylint: disable=protected-access
+        for name in ("a", "b", "c"):
+            bridge.handle_event({"type": "created", "path": f"/root/{name}.blend"})
+        assert bridge.queued == 3
+    bridge.stop()
+    paths = sorted(r["new_path"] for r in store.list("rename_logs"))
+    assert paths == ["/root/a.blend", "/root/b.blend", "/root/c.blend"]
+    assert len(transactions) == 2
+    assert bridge.queued == 0
+
+
+def test_edge_blend_headers_parsed_on_writer_thread(tmp_path, monkeypatch):
+    """
+    Edge: .blend headers are parsed by the writer thread, not the watchdog
+    callback, and only for created/modified files; moves just get a stat.
+    """
+    import contextlib
+    import threading
+    import blendman.watcher_bridge as watcher_bridge
+
+    parsed = []
+
+    def fake_metadata(path):
+        parsed.append((path, threading.current_thread().name))
+        return {"blender_version": "4.2"}
+
+    monkeypatch.setattr(watcher_bridge, "blend_metadata", fake_metadata)
+    a = tmp_path / "a.blend"
+    b = tmp_path / "b.blend"
+    a.write_bytes(b"BLENDER")
+    b.write_bytes(b"BLENDER")
+    db = DummyDBInterface()
+    db.transaction = contextlib.nullcontext
+    bridge = WatcherBridge(db, batch_size=10)
+    bridge.watcher = DummyWatcher()
+    bridge.start()
+    with bridge._outbox_changed:  # pylint: disable=protected-access
+        bridge.watcher.emit({"type": "created", "path": str(a)})
         bridge.watcher.emit(
-            {
-                "name": "foo.txt",
-                "new_path": "/root/foo.txt",
-                "type": "file",
-                "event_type": "create",
-            }
+            {"type": "moved", "path": str(b), "old_parent": "/old", "new_parent": ""}
         )
-    assert "Failed to persist watcher event" in caplog.text
+        bridge.watcher.emit({"type": "modified", "path": str(a)})
+        assert not parsed
+    bridge.stop()
+    assert parsed == [(str(a), "blendman-writer")] * 2
+    created, moved, modified = db.persisted
+    assert created["blender_version"] == modified["blender_version"] == "4.2"
+    assert "blender_version" not in moved and moved["size"] == 7
+
+
+def test_storage_errors_are_counted_as_dropped(bridge):
+    """
+    Failure: a storage error (not only a PocketBase one) is logged and
+    counted as a dropped event.
+    """
+    from blendman.storage import StorageError
+
+    bridge, db = bridge
+    metrics = get_metrics()
+    metrics.reset()
+    db.persist_event = MagicMock(side_effect=StorageError("disk full"))
+    bridge.start()
+    bridge.watcher.emit({"type": "created", "path": "/root/a.blend"})
+    assert metrics.counter("events_dropped", reason="persist_error") == 1
+    assert metrics.counter("events_out") == 0
+    metrics.reset()